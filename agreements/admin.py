@@ -1,3 +1,26 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Agreement, AgreementClause, AgreementTemplate
+
+
+class AgreementClauseInline(admin.StackedInline):
+    model = AgreementClause
+    extra = 0
+
+
+@admin.register(AgreementTemplate)
+class AgreementTemplateAdmin(admin.ModelAdmin):
+    list_display = ('name', 'version', 'is_active', 'updated_at')
+    list_filter = ('is_active',)
+    readonly_fields = ('version',)
+    inlines = [AgreementClauseInline]
+
+
+@admin.register(Agreement)
+class AgreementAdmin(admin.ModelAdmin):
+    list_display = ('contract', 'template', 'template_version', 'rendered_at')
+    list_filter = ('template',)
+    list_select_related = ('contract', 'template')
+    raw_id_fields = ('contract',)
+    search_fields = ('contract__contract_number',)
+    readonly_fields = ('template_version', 'rendered_at')
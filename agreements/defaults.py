@@ -0,0 +1,69 @@
+"""بنود نموذج عقد الإيجار الافتراضي"""
+from django.db import transaction
+
+from .models import AgreementClause, AgreementTemplate
+
+DEFAULT_TEMPLATE_NAME = 'عقد إيجار موحد'
+
+DEFAULT_CLAUSES = (
+    (
+        'موضوع العقد',
+        'Subject',
+        'أجّر الطرف الأول {{ landlord_name }} إلى الطرف الثاني {{ tenant_name }} الوحدة رقم {{ unit_number }} '
+        '({{ unit_type_label }}) في مبنى {{ building_name }} بمدينة {{ city }}{% if area %} بمساحة {{ area }} م²{% endif %}.',
+        'The first party, {{ landlord_name_english|default:landlord_name }}, leases to the second party, '
+        '{{ tenant_name_english|default:tenant_name }}, unit {{ unit_number }} in '
+        '{{ building_name_english|default:building_name }}, {{ city }}{% if area %} with an area of {{ area }} m²{% endif %}.',
+    ),
+    (
+        'مدة العقد',
+        'Term',
+        'مدة هذا العقد {{ duration_months }} شهراً تبدأ في {{ start_date|date:"Y-m-d" }} '
+        'وتنتهي في {{ end_date|date:"Y-m-d" }}.',
+        'This agreement is for {{ duration_months }} months starting on {{ start_date|date:"Y-m-d" }} '
+        'and ending on {{ end_date|date:"Y-m-d" }}.',
+    ),
+    (
+        'الأجرة',
+        'Rent',
+        'الأجرة الشهرية {{ monthly_rent }} ريال عماني (سنوياً {{ annual_rent }} ريال عماني) تُدفع بشكل '
+        '{{ payment_frequency_label }}{% if annual_escalation %} وتزداد بنسبة {{ annual_escalation }}% '
+        'في بداية كل سنة تعاقدية{% endif %}.',
+        'The monthly rent is OMR {{ monthly_rent }} (OMR {{ annual_rent }} per year), payable every '
+        '{{ payment_frequency }} month(s){% if annual_escalation %}, increasing by {{ annual_escalation }}% '
+        'at the start of each contract year{% endif %}.',
+    ),
+    (
+        'التزامات المستأجر',
+        'Tenant Obligations',
+        'يلتزم المستأجر باستعمال الوحدة للغرض المتفق عليه والمحافظة عليها وعدم التأجير من الباطن '
+        'إلا بموافقة كتابية من المؤجر.',
+        'The tenant shall use the unit for the agreed purpose, keep it in good condition and shall not '
+        'sublet it without the landlord\'s written consent.',
+    ),
+    (
+        'القانون الواجب التطبيق',
+        'Governing Law',
+        'يخضع هذا العقد لأحكام قانون الإيجار في سلطنة عُمان، ويُعتمد النص العربي عند الاختلاف.',
+        'This agreement is governed by the tenancy laws of the Sultanate of Oman; the Arabic text prevails '
+        'in case of conflict.',
+    ),
+)
+
+
+def create_default_template(name=DEFAULT_TEMPLATE_NAME):
+    """إنشاء نموذج العقد الافتراضي مع بنوده"""
+    with transaction.atomic():
+        template = AgreementTemplate.objects.create(name=name)
+        AgreementClause.objects.bulk_create([
+            AgreementClause(
+                template=template,
+                order=order,
+                title=title,
+                title_english=title_english,
+                body=body,
+                body_english=body_english,
+            )
+            for order, (title, title_english, body, body_english) in enumerate(DEFAULT_CLAUSES, start=1)
+        ])
+    return template
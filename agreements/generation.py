@@ -0,0 +1,204 @@
+"""توليد مستندات عقود الإيجار (عربي/إنجليزي) من نماذج بنود مترجمة مسبقاً
+
+تُترجم بنود النموذج إلى قوالب Django مرة واحدة لكل إصدار وتُخزن في ذاكرة العملية
+بمفتاح (معرّف النموذج، الإصدار)، فأي تعديل على النموذج أو بنوده يرفع الإصدار ويُبطل
+النسخة القديمة تلقائياً. تُقرأ بيانات العقود على دفعات باستعلام واحد لكل دفعة وتُرسل
+كقواميس بسيطة إلى عمليات التوليد مع نصوص البنود عند تهيئتها، فلا تلمس العمليات قاعدة
+البيانات ولا تترجم القوالب إلا مرة واحدة في كل عملية.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
+
+from django.db.models import Exists, F, OuterRef
+from django.template import Context, engines
+from django.template.loader import render_to_string
+from django.utils.text import get_valid_filename
+
+from contracts.models import Contract
+from core.batching import process_batches, setup_worker
+from core.dates import add_months
+from core.pdf import save_document
+from units.models import Unit
+
+from .models import Agreement, AgreementClause, AgreementTemplate
+
+TEMPLATE_NAME = 'agreements/agreement.html'
+# عدد إصدارات النماذج المترجمة المحتفظ بها في كل عملية
+COMPILED_CACHE_SIZE = 16
+
+CONTRACT_FIELDS = (
+    'id', 'contract_number', 'start_date', 'end_date', 'monthly_rent', 'payment_frequency', 'annual_escalation',
+)
+RELATED_FIELDS = {
+    'tenant_name': F('tenant__user__company_name'),
+    'tenant_name_english': F('tenant__user__company_name_english'),
+    'tenant_registration': F('tenant__user__commercial_registration'),
+    'landlord_name': F('unit__building__owner__user__company_name'),
+    'landlord_name_english': F('unit__building__owner__user__company_name_english'),
+    'landlord_registration': F('unit__building__owner__user__commercial_registration'),
+    'building_name': F('unit__building__name'),
+    'building_name_english': F('unit__building__name_english'),
+    'city': F('unit__building__city'),
+    'unit_number': F('unit__unit_number'),
+    'unit_type': F('unit__unit_type'),
+    'area': F('unit__area'),
+}
+
+
+@dataclass(frozen=True)
+class CompiledClause:
+    title: str
+    title_english: str
+    body: object
+    body_english: object
+
+
+_compiled = {}
+
+
+def clause_sources(template_id):
+    """نصوص بنود النموذج مرتبة: (العنوان، العنوان بالإنجليزية، النص، النص بالإنجليزية)"""
+    return tuple(
+        AgreementClause.objects.filter(template_id=template_id).order_by('order').values_list(
+            'title', 'title_english', 'body', 'body_english'
+        )
+    )
+
+
+def compile_clauses(template_id, version, sources):
+    """ترجمة بنود إصدار النموذج مرة واحدة وتخزينها بمفتاح (النموذج، الإصدار)"""
+    key = (template_id, version)
+    compiled = _compiled.get(key)
+    if compiled is None:
+        engine = engines['django'].engine
+        compiled = tuple(
+            CompiledClause(
+                title,
+                title_english,
+                engine.from_string(body),
+                engine.from_string(body_english) if body_english else None,
+            )
+            for title, title_english, body, body_english in sources
+        )
+        if len(_compiled) >= COMPILED_CACHE_SIZE:
+            _compiled.clear()
+        _compiled[key] = compiled
+    return compiled
+
+
+def compiled_template(template):
+    """البنود المترجمة لإصدار النموذج الحالي؛ تُقرأ من قاعدة البيانات عند أول طلب فقط"""
+    key = (template.pk, template.version)
+    if key in _compiled:
+        return _compiled[key]
+    return compile_clauses(template.pk, template.version, clause_sources(template.pk))
+
+
+def duration_months(start, end):
+    """عدد الأشهر الكاملة في الفترة [start, end]"""
+    following = end + timedelta(days=1)
+    months = (following.year - start.year) * 12 + following.month - start.month
+    if add_months(start, months) > following:
+        months -= 1
+    return months
+
+
+def contract_context(row):
+    """متغيرات البنود: حقول صف العقد مع قيم مشتقة منها"""
+    return {
+        **row,
+        'duration_months': duration_months(row['start_date'], row['end_date']),
+        'annual_rent': row['monthly_rent'] * 12,
+        'payment_frequency_label': str(Contract.Frequency(row['payment_frequency']).label),
+        'unit_type_label': str(Unit.UnitType(row['unit_type']).label),
+    }
+
+
+def fill_agreement(clauses, row):
+    """ملء البنود المترجمة ببيانات عقد واحد وإعادة مستند HTML"""
+    data = contract_context(row)
+    context = Context(data)
+    rendered = [
+        {
+            'number': index,
+            'title': clause.title,
+            'title_english': clause.title_english,
+            'body': clause.body.render(context),
+            'body_english': clause.body_english.render(context) if clause.body_english else '',
+        }
+        for index, clause in enumerate(clauses, start=1)
+    ]
+    return render_to_string(TEMPLATE_NAME, {**data, 'clauses': rendered})
+
+
+def _init_render_worker(template_key, sources):
+    setup_worker()
+    compile_clauses(*template_key, sources)
+
+
+def render_html(row, template_key):
+    return fill_agreement(_compiled[template_key], row)
+
+
+def render_agreement(row, template_key):
+    """توليد مستند عقد واحد وحفظه؛ يعيد اسم الملف"""
+    template_id, version = template_key
+    return save_document(
+        render_html(row, template_key),
+        f"agreements/{template_id}/v{version}/{get_valid_filename(row['contract_number'])}",
+    )
+
+
+def active_template():
+    """آخر نموذج معتمد تعديلاً"""
+    return AgreementTemplate.objects.filter(is_active=True).latest('updated_at')
+
+
+def pending_contracts(template, contracts=None):
+    """العقود التي لم يُولَّد لها مستند من الإصدار الحالي للنموذج"""
+    if contracts is None:
+        contracts = Contract.objects.filter(status__in=[Contract.Status.DRAFT, Contract.Status.ACTIVE])
+    return contracts.exclude(Exists(Agreement.objects.filter(
+        contract_id=OuterRef('pk'),
+        template_id=template.pk,
+        template_version=template.version,
+    )))
+
+
+def contract_rows(contracts):
+    return contracts.values(*CONTRACT_FIELDS, **RELATED_FIELDS)
+
+
+def generate_agreements(template=None, contracts=None, batch_size=500, workers=None, on_batch=None):
+    """توليد مستندات العقود على دفعات؛ يعيد (عدد المولَّد، قائمة الأخطاء)
+
+    العقود التي يفشل توليدها تبقى دون مستند فتُعاد محاولتها في التشغيل التالي.
+    """
+    template = template or active_template()
+    # الإصدار يُقرأ قبل البنود: تعديل متزامن يرفعه فيُعاد توليد العقود في التشغيل التالي
+    template.refresh_from_db(fields=['version'])
+    template_key = (template.pk, template.version)
+    sources = clause_sources(template.pk)
+    compile_clauses(*template_key, sources)
+
+    def save(results):
+        Agreement.objects.bulk_create(
+            [
+                Agreement(contract_id=contract_id, template=template, template_version=template.version, document=name)
+                for contract_id, name in results
+            ],
+            ignore_conflicts=True,
+        )
+
+    return process_batches(
+        contract_rows(pending_contracts(template, contracts)),
+        partial(render_agreement, template_key=template_key),
+        save,
+        batch_size,
+        key='id',
+        workers=workers,
+        initializer=_init_render_worker,
+        initargs=(template_key, sources),
+        on_batch=on_batch,
+    )
@@ -0,0 +1,97 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.template import engines
+
+from agreements.defaults import create_default_template
+from agreements.generation import (
+    CompiledClause,
+    _init_render_worker,
+    clause_sources,
+    compile_clauses,
+    contract_rows,
+    fill_agreement,
+    render_html,
+)
+from contracts.models import Contract
+
+
+def naive_render(row, sources):
+    """التوليد المباشر: تحليل نصوص البنود من جديد لكل عقد"""
+    engine = engines['django'].engine
+    clauses = [
+        CompiledClause(
+            title,
+            title_english,
+            engine.from_string(body),
+            engine.from_string(body_english) if body_english else None,
+        )
+        for title, title_english, body, body_english in sources
+    ]
+    return fill_agreement(clauses, row)
+
+
+class Command(BaseCommand):
+    help = 'قياس سرعة توليد مستندات العقود (HTML) بالبنود المترجمة مسبقاً مقابل التحليل لكل عقد؛ لا يُحفظ شيء'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contracts', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--naive-sample', type=int, default=1000, help='عدد العقود في قياس التحليل لكل عقد')
+
+    def handle(self, *args, **options):
+        rows = list(contract_rows(Contract.objects.all())[:options['contracts']])
+        if not rows:
+            raise CommandError('يتطلب القياس عقوداً موجودة')
+        # تكرار العقود الموجودة للوصول إلى العدد المطلوب
+        rows = list(itertools.islice(itertools.cycle(rows), options['contracts']))
+
+        with transaction.atomic():
+            template = create_default_template('benchmark')
+            template_key = (template.pk, template.version)
+            sources = clause_sources(template.pk)
+            transaction.set_rollback(True)
+
+        sample = rows[:options['naive_sample']]
+        started = time.perf_counter()
+        for row in sample:
+            naive_render(row, sources)
+        naive = len(sample) / (time.perf_counter() - started)
+        self.stdout.write(f'التحليل لكل عقد: {naive:.0f} عقد/ث ({len(sample)} عقد)')
+
+        started = time.perf_counter()
+        compile_clauses(*template_key, sources)
+        for row in rows:
+            render_html(row, template_key)
+        compiled = len(rows) / (time.perf_counter() - started)
+        self.stdout.write(f'بنود مترجمة مسبقاً: {compiled:.0f} عقد/ث ({len(rows)} عقد)')
+
+        workers = options['workers'] or 1
+        results = {'naive': naive, 'compiled': compiled}
+        if workers > 1:
+            started = time.perf_counter()
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_render_worker,
+                initargs=(template_key, sources),
+            ) as executor:
+                size = sum(map(len, executor.map(
+                    partial(render_html, template_key=template_key),
+                    rows,
+                    chunksize=max(1, len(rows) // (workers * 4)),
+                )))
+            pooled = len(rows) / (time.perf_counter() - started)
+            results['pooled'] = pooled
+            self.stdout.write(
+                f'{workers} عمليات: {pooled:.0f} عقد/ث ({size / len(rows) / 1024:.1f} ك.ب/عقد)'
+            )
+
+        best = max(results.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(rows)} عقد بسرعة {best:.0f} عقد/ث؛ التسريع مقابل التحليل لكل عقد {best / naive:.1f}x'
+        ))
@@ -0,0 +1,45 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from agreements.generation import active_template, generate_agreements
+from agreements.models import AgreementTemplate
+
+
+class Command(BaseCommand):
+    help = 'توليد مستندات عقود الإيجار من الإصدار الحالي لنموذج العقد (آمن لإعادة التشغيل بعد الانقطاع)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--template', type=int, help='معرّف النموذج (الافتراضي: آخر نموذج معتمد)')
+        parser.add_argument('--batch-size', type=int, default=500, help='عدد العقود في كل دفعة')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='عدد عمليات توليد الملفات')
+
+    def handle(self, *args, **options):
+        try:
+            if options['template']:
+                template = AgreementTemplate.objects.get(pk=options['template'])
+            else:
+                template = active_template()
+        except AgreementTemplate.DoesNotExist as exc:
+            raise CommandError('لا يوجد نموذج عقد مطابق') from exc
+
+        started = time.monotonic()
+
+        def report(count, failed):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f'وُلّد {count} عقد، فشل {failed} ({count / elapsed:.0f} عقد/ث)')
+
+        generated, errors = generate_agreements(
+            template,
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            on_batch=report,
+        )
+        elapsed = time.monotonic() - started
+        for contract_id, error in errors[:20]:
+            self.stderr.write(f'العقد {contract_id}: {error}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{template}: {generated} عقد خلال {elapsed:.1f} ث ({generated / max(elapsed, 1e-9):.0f} عقد/ث)، '
+            f'فشل {len(errors)}'
+        ))
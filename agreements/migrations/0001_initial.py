@@ -0,0 +1,72 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contracts', '0002_installment_contracts_i_paid_at_746f5f_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgreementTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='اسم النموذج')),
+                ('version', models.PositiveIntegerField(default=1, editable=False, help_text='يُستخدم مع معرّف النموذج مفتاحاً للنسخة المترجمة المخزنة مؤقتاً', verbose_name='الإصدار')),
+                ('is_active', models.BooleanField(default=True, verbose_name='النموذج المعتمد')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='آخر تعديل')),
+            ],
+            options={
+                'verbose_name': 'نموذج عقد',
+                'verbose_name_plural': 'نماذج العقود',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AgreementClause',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveSmallIntegerField(verbose_name='الترتيب')),
+                ('title', models.CharField(max_length=200, verbose_name='العنوان')),
+                ('title_english', models.CharField(blank=True, default='', max_length=200, verbose_name='العنوان بالإنجليزية')),
+                ('body', models.TextField(help_text='يدعم متغيرات مثل {{ tenant_name }} و{{ monthly_rent }} و{{ start_date|date:"Y-m-d" }}', verbose_name='النص')),
+                ('body_english', models.TextField(blank=True, default='', verbose_name='النص بالإنجليزية')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clauses', to='agreements.agreementtemplate', verbose_name='النموذج')),
+            ],
+            options={
+                'verbose_name': 'بند عقد',
+                'verbose_name_plural': 'بنود العقود',
+                'ordering': ['template', 'order'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Agreement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('template_version', models.PositiveIntegerField(verbose_name='إصدار النموذج')),
+                ('document', models.FileField(upload_to='agreements/%Y/%m/', verbose_name='ملف العقد')),
+                ('rendered_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ التوليد')),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='agreements', to='contracts.contract', verbose_name='العقد')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='agreements', to='agreements.agreementtemplate', verbose_name='النموذج')),
+            ],
+            options={
+                'verbose_name': 'مستند عقد',
+                'verbose_name_plural': 'مستندات العقود',
+                'ordering': ['-rendered_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='agreementclause',
+            constraint=models.UniqueConstraint(fields=('template', 'order'), name='unique_agreement_clause_order'),
+        ),
+        migrations.AddConstraint(
+            model_name='agreement',
+            constraint=models.UniqueConstraint(fields=('contract', 'template', 'template_version'), name='unique_agreement_version'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:08
+
+from django.db import migrations
+
+from agreements.defaults import DEFAULT_CLAUSES, DEFAULT_TEMPLATE_NAME
+
+
+def create_default_template(apps, schema_editor):
+    AgreementTemplate = apps.get_model('agreements', 'AgreementTemplate')
+    AgreementClause = apps.get_model('agreements', 'AgreementClause')
+    template = AgreementTemplate.objects.create(name=DEFAULT_TEMPLATE_NAME)
+    AgreementClause.objects.bulk_create([
+        AgreementClause(
+            template=template,
+            order=order,
+            title=title,
+            title_english=title_english,
+            body=body,
+            body_english=body_english,
+        )
+        for order, (title, title_english, body, body_english) in enumerate(DEFAULT_CLAUSES, start=1)
+    ])
+
+
+def remove_default_template(apps, schema_editor):
+    AgreementTemplate = apps.get_model('agreements', 'AgreementTemplate')
+    AgreementTemplate.objects.filter(name=DEFAULT_TEMPLATE_NAME, agreements__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agreements', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_template, remove_default_template),
+    ]
@@ -1,3 +1,127 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class AgreementTemplate(models.Model):
+    """نموذج عقد إيجار ثنائي اللغة مكوّن من بنود؛ يزداد رقم إصداره مع كل تعديل عليه أو على بنوده"""
+    name = models.CharField(
+        _('اسم النموذج'),
+        max_length=100
+    )
+    version = models.PositiveIntegerField(
+        _('الإصدار'),
+        default=1,
+        editable=False,
+        help_text=_('يُستخدم مع معرّف النموذج مفتاحاً للنسخة المترجمة المخزنة مؤقتاً')
+    )
+    is_active = models.BooleanField(
+        _('النموذج المعتمد'),
+        default=True
+    )
+    updated_at = models.DateTimeField(
+        _('آخر تعديل'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('نموذج عقد')
+        verbose_name_plural = _('نماذج العقود')
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} (v{self.version})"
+
+    def save(self, *args, **kwargs):
+        bump = self.pk is not None and not self._state.adding
+        if bump:
+            self.version = models.F('version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['version'])
+
+
+class AgreementClause(models.Model):
+    """بند في نموذج العقد؛ نصه بصيغة قوالب Django ويُملأ من بيانات العقد"""
+    template = models.ForeignKey(
+        AgreementTemplate,
+        on_delete=models.CASCADE,
+        related_name='clauses',
+        verbose_name=_('النموذج')
+    )
+    order = models.PositiveSmallIntegerField(
+        _('الترتيب')
+    )
+    title = models.CharField(
+        _('العنوان'),
+        max_length=200
+    )
+    title_english = models.CharField(
+        _('العنوان بالإنجليزية'),
+        max_length=200,
+        blank=True,
+        default=''
+    )
+    body = models.TextField(
+        _('النص'),
+        help_text=_('يدعم متغيرات مثل {{ tenant_name }} و{{ monthly_rent }} و{{ start_date|date:"Y-m-d" }}')
+    )
+    body_english = models.TextField(
+        _('النص بالإنجليزية'),
+        blank=True,
+        default=''
+    )
+
+    class Meta:
+        verbose_name = _('بند عقد')
+        verbose_name_plural = _('بنود العقود')
+        ordering = ['template', 'order']
+        constraints = [
+            models.UniqueConstraint(fields=['template', 'order'], name='unique_agreement_clause_order'),
+        ]
+
+    def __str__(self):
+        return f"{self.order}. {self.title}"
+
+
+class Agreement(models.Model):
+    """مستند عقد مولَّد لعقد إيجار من إصدار محدد لنموذج"""
+    contract = models.ForeignKey(
+        'contracts.Contract',
+        on_delete=models.CASCADE,
+        related_name='agreements',
+        verbose_name=_('العقد')
+    )
+    template = models.ForeignKey(
+        AgreementTemplate,
+        on_delete=models.PROTECT,
+        related_name='agreements',
+        verbose_name=_('النموذج')
+    )
+    template_version = models.PositiveIntegerField(
+        _('إصدار النموذج')
+    )
+    document = models.FileField(
+        _('ملف العقد'),
+        upload_to='agreements/%Y/%m/'
+    )
+    rendered_at = models.DateTimeField(
+        _('تاريخ التوليد'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('مستند عقد')
+        verbose_name_plural = _('مستندات العقود')
+        ordering = ['-rendered_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['contract', 'template', 'template_version'],
+                name='unique_agreement_version',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.contract} (v{self.template_version})"
@@ -0,0 +1,26 @@
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import AgreementClause, AgreementTemplate
+
+
+def _bump_version(template_id):
+    # إصدار جديد يُبطل النسخة المترجمة المخزنة للنموذج
+    AgreementTemplate.objects.filter(pk=template_id).update(version=F('version') + 1)
+
+
+@receiver(post_save, sender=AgreementClause)
+def bump_version_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _bump_version(instance.template_id)
+
+
+@receiver(post_delete, sender=AgreementClause)
+def bump_version_on_delete(sender, instance, origin=None, **kwargs):
+    # حذف النموذج نفسه يحذف بنوده ولا حاجة لرفع إصداره
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is AgreementTemplate:
+        return
+    _bump_version(instance.template_id)
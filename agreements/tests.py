@@ -1,3 +1,138 @@
-from django.test import TestCase
+import tempfile
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from contracts.models import Contract
+from core.testing import capture_queries, make_contract, make_tenant
+
+from . import generation
+from .defaults import create_default_template
+from .generation import (
+    compiled_template,
+    contract_rows,
+    duration_months,
+    fill_agreement,
+    generate_agreements,
+    pending_contracts,
+)
+from .models import Agreement, AgreementClause, AgreementTemplate
+
+
+class TemplateVersionTests(TestCase):
+    def setUp(self):
+        generation._compiled.clear()
+        self.addCleanup(generation._compiled.clear)
+        self.template = AgreementTemplate.objects.create(name='نموذج')
+        self.clause = AgreementClause.objects.create(
+            template=self.template, order=1, title='الأجرة', body='الأجرة {{ monthly_rent }} ريال'
+        )
+        self.template.refresh_from_db()
+
+    def test_clause_changes_bump_version(self):
+        version = self.template.version
+        self.clause.body = 'الأجرة الشهرية {{ monthly_rent }}'
+        self.clause.save()
+        AgreementClause.objects.create(template=self.template, order=2, title='المدة', body='{{ duration_months }}')
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.version, version + 2)
+
+        self.clause.delete()
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.version, version + 3)
+
+        self.template.name = 'نموذج معدل'
+        self.template.save()
+        self.assertEqual(self.template.version, version + 4)
+
+    def test_clause_delete_bumps_and_template_delete_cascades(self):
+        version = self.template.version
+        AgreementClause.objects.filter(template=self.template).delete()
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.version, version + 1)
+
+        template_id = self.template.pk
+        AgreementClause.objects.create(template=self.template, order=1, title='المدة', body='{{ duration_months }}')
+        self.template.delete()
+        self.assertFalse(AgreementClause.objects.filter(template_id=template_id).exists())
+
+    def test_compiled_clauses_are_reused_until_version_changes(self):
+        first = compiled_template(self.template)
+        _compiled, queries = capture_queries(lambda: compiled_template(self.template))
+        self.assertIs(_compiled, first)
+        self.assertEqual(queries, [])
+
+        self.clause.body = 'الأجرة الجديدة {{ monthly_rent }}'
+        self.clause.save()
+        self.template.refresh_from_db()
+        second = compiled_template(self.template)
+        self.assertIsNot(second, first)
+
+        row = contract_rows(Contract.objects.filter(pk=make_contract(monthly_rent=Decimal('250.00')).pk)).get()
+        self.assertIn('الأجرة الجديدة 250', fill_agreement(second, row))
+        self.assertIn('الأجرة 250', fill_agreement(first, row))
+        self.assertNotIn('الأجرة الجديدة', fill_agreement(first, row))
+
+
+class PendingContractsTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        generation._compiled.clear()
+        self.addCleanup(generation._compiled.clear)
+
+        self.template = create_default_template()
+        tenant = make_tenant()
+        self.active = make_contract(tenant=tenant)
+        self.draft = make_contract(tenant=tenant, status=Contract.Status.DRAFT)
+        make_contract(tenant=tenant, status=Contract.Status.TERMINATED)
+
+    def test_pending_contracts_follow_template_version(self):
+        self.assertEqual(set(pending_contracts(self.template)), {self.active, self.draft})
+
+        self.assertEqual(generate_agreements(self.template), (2, []))
+        self.assertFalse(pending_contracts(self.template).exists())
+        agreement = Agreement.objects.get(contract=self.active)
+        self.assertEqual(agreement.template_version, self.template.version)
+        self.assertTrue(default_storage.exists(agreement.document.name))
+
+        # تعديل بند يرفع الإصدار فتعود كل العقود إلى قائمة الانتظار
+        clause = self.template.clauses.first()
+        clause.body += ' '
+        clause.save()
+        self.template.refresh_from_db()
+        self.assertEqual(set(pending_contracts(self.template)), {self.active, self.draft})
+        self.assertEqual(
+            set(pending_contracts(self.template, Contract.objects.filter(pk=self.active.pk))), {self.active}
+        )
+
+    def test_failed_contract_is_retried(self):
+        broken = AgreementClause.objects.filter(template=self.template).order_by('order').first()
+        original = broken.body
+        broken.body = '{% if monthly_rent|divisibleby:0 %}{% endif %}'
+        broken.save()
+        self.template.refresh_from_db()
+
+        generated, errors = generate_agreements(self.template)
+
+        self.assertEqual(generated, 0)
+        self.assertEqual({contract_id for contract_id, _error in errors}, {self.active.pk, self.draft.pk})
+        self.assertFalse(Agreement.objects.exists())
+
+        broken.body = original
+        broken.save()
+        self.assertEqual(generate_agreements(self.template), (2, []))
+
+
+class DurationTests(SimpleTestCase):
+    def test_duration_months(self):
+        self.assertEqual(duration_months(date(2024, 1, 1), date(2024, 12, 31)), 12)
+        self.assertEqual(duration_months(date(2024, 1, 15), date(2024, 3, 14)), 2)
+        self.assertEqual(duration_months(date(2024, 1, 15), date(2024, 2, 13)), 0)
+        # ينتهي العقد بنهاية الشهر التالي فيُحسب شهراً كاملاً
+        self.assertEqual(duration_months(date(2024, 1, 31), date(2024, 2, 29)), 1)
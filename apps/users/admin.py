@@ -0,0 +1,71 @@
+from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.utils.translation import gettext_lazy as _
+
+from core.admin import LargeTableAdminMixin
+
+from .forms import UserCreationForm
+from .models import Investor, Owner, Tenant, User
+
+
+@admin.register(User)
+class UserAdmin(LargeTableAdminMixin, BaseUserAdmin):
+    add_form = UserCreationForm
+    list_display = ('email', 'company_name', 'user_type', 'city', 'is_verified', 'is_active')
+    # كل تصفية يخدمها فهرس يبدأ بحقلها ويتبعه المعرّف لترتيب الصفحات
+    list_filter = ('user_type', 'is_verified', 'is_active', 'country', 'city')
+    search_fields = ('search_name',)
+    readonly_fields = ('last_login', 'date_joined', 'last_updated')
+    fieldsets = (
+        (None, {'fields': ('email', 'password')}),
+        (_('معلومات الشركة'), {'fields': (
+            'company_name', 'company_name_english', 'commercial_registration', 'tax_number',
+            'establishment_date', 'company_logo', 'website',
+        )}),
+        (_('العنوان'), {'fields': ('country', 'city', 'address', 'postal_code')}),
+        (_('الحساب والصلاحيات'), {'fields': (
+            'user_type', 'is_active', 'is_verified', 'is_staff', 'is_superuser', 'groups', 'user_permissions',
+        )}),
+        (_('التواريخ'), {'fields': ('last_login', 'date_joined', 'last_updated')}),
+    )
+    add_fieldsets = (
+        (None, {
+            'classes': ('wide',),
+            'fields': (
+                'email', 'company_name', 'commercial_registration', 'user_type', 'address', 'password1', 'password2',
+            ),
+        }),
+    )
+
+    def get_search_results(self, request, queryset, search_term):
+        # البحث عبر فهرس نص البحث الموحد بدلاً من LIKE على كل حقل، مرتباً كبقية القائمة (-pk)
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term).order_by(), False
+
+
+class ProfileAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    search_fields = ('user__search_name',)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.filter(user__in=User.objects.search(search_term).values('pk')), False
+
+
+@admin.register(Owner)
+class OwnerAdmin(ProfileAdmin):
+    list_display = ('user', 'ownership_percentage', 'preferred_payment_method', 'bank_name')
+    list_filter = ('preferred_payment_method',)
+
+
+@admin.register(Investor)
+class InvestorAdmin(ProfileAdmin):
+    list_display = ('user', 'investment_amount', 'investment_percentage', 'investment_date', 'contract_end_date')
+
+
+@admin.register(Tenant)
+class TenantAdmin(ProfileAdmin):
+    list_display = ('user', 'company_activity', 'authorized_person', 'insurance_expiry')
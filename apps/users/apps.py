@@ -8,4 +8,8 @@ class UsersConfig(AppConfig):
     verbose_name = _('إدارة المستخدمين')
 
     def ready(self):
-        pass
+        from django.db.models.signals import post_migrate
+
+        from . import signals
+
+        post_migrate.connect(signals.restore_search_index, sender=self)
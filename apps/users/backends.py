@@ -0,0 +1,111 @@
+"""مصادقة بالبريد الإلكتروني مع تخزين صف المستخدم مؤقتاً
+
+يقرأ AuthenticationMiddleware المستخدم من قاعدة البيانات في كل طلب. يحفظ هذا الخلفي
+حقول المستخدم في ذاكرة PROFILE_CACHE_ALIAS بمعرّفه دون كلمة المرور: يُخزن بدلاً منها بصمة
+الجلسة المشتقة منها (get_session_auth_hash) التي يتحقق بها get_user، فتبقى كلمة المرور
+مؤجلة لا تُقرأ إلا عند الحاجة. الدخول نفسه يقرأ المستخدم من قاعدة البيانات كما في ModelBackend.
+يُبطل المخزن عند الحفظ أو الحذف (signals.py) وعند التحديث الجماعي (UserQuerySet.update).
+لا يُخزن شيء ما لم يُفعَّل AUTH_USER_CACHE_ENABLED (ذاكرة مشتركة بين العمليات)، فيعمل الخلفي
+عندها كـ ModelBackend تماماً.
+"""
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import connection, models, router, transaction
+
+UserModel = get_user_model()
+
+# يُرفع عند تغيير بنية الصف المخزن فتُتجاهل الصفوف القديمة
+CACHE_VERSION = 1
+# حقول لا تُخزن: كلمة المرور، ونص البحث الذي لا يُستخدم إلا في استعلامات البحث
+EXCLUDED_FIELDS = frozenset({'password', 'search_name'})
+
+
+def _cache():
+    return caches[settings.PROFILE_CACHE_ALIAS]
+
+
+def user_key(user_id):
+    return f'users:auth:{CACHE_VERSION}:{user_id}'
+
+
+def _cached_fields():
+    return [field for field in UserModel._meta.concrete_fields if field.name not in EXCLUDED_FIELDS]
+
+
+def _pack(user):
+    values = []
+    for field in _cached_fields():
+        value = user.__dict__[field.attname]
+        if isinstance(field, models.FileField):
+            # FieldFile يحمل مرجعاً للمستخدم كاملاً، فيُخزن اسم الملف فقط
+            value = getattr(value, 'name', value)
+        values.append(value)
+    return (user.get_session_auth_hash(), *values)
+
+
+def _unpack(row):
+    session_auth_hash, *values = row
+    fields = _cached_fields()
+    user = UserModel.from_db(router.db_for_read(UserModel), [field.attname for field in fields], values)
+    user._session_auth_hash = session_auth_hash
+    return user
+
+
+def cache_enabled():
+    return settings.AUTH_USER_CACHE_ENABLED
+
+
+def _remember(user):
+    # بيانات قُرئت داخل معاملة قد تُلغى فلا تُخزن، ولا مستخدم حُملت بعض حقوله فقط
+    if not cache_enabled() or connection.in_atomic_block or user.get_deferred_fields():
+        return
+    _cache().set(user_key(user.pk), _pack(user), settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+def cached_user(user_id):
+    """المستخدم بمعرّفه من الذاكرة المؤقتة أو قاعدة البيانات؛ None إن لم يوجد"""
+    row = _cache().get(user_key(user_id)) if cache_enabled() else None
+    if row is not None:
+        return _unpack(row)
+    try:
+        user = UserModel._default_manager.get(pk=user_id)
+    except UserModel.DoesNotExist:
+        return None
+    _remember(user)
+    return user
+
+
+def invalidate_user(user_id):
+    """حذف المستخدم المخزن الآن وبعد تثبيت المعاملة الجارية"""
+    key = user_key(user_id)
+    _cache().delete(key)
+    transaction.on_commit(partial(_cache().delete, key))
+
+
+def invalidate_users(user_ids):
+    keys = [user_key(user_id) for user_id in user_ids]
+    if keys:
+        _cache().delete_many(keys)
+        transaction.on_commit(partial(_cache().delete_many, keys))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend يقرأ المستخدم في كل طلب من الذاكرة المؤقتة
+
+    الدخول يتحقق من كلمة المرور ويعيد تجزئتها عند تغيير الخوارزمية أو معاملاتها كما في
+    ModelBackend، ثم يخزن المستخدم لتُخدم الطلبات التالية دون استعلام.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username=username, password=password, **kwargs)
+        if user is not None:
+            _remember(user)
+        return user
+
+    def get_user(self, user_id):
+        user = cached_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
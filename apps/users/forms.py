@@ -0,0 +1,12 @@
+from django.contrib.auth.forms import UserCreationForm as BaseUserCreationForm
+
+from .models import User
+
+
+class UserCreationForm(BaseUserCreationForm):
+    """إنشاء مستخدم من لوحة الإدارة بالبريد الإلكتروني بدلاً من اسم المستخدم"""
+
+    class Meta(BaseUserCreationForm.Meta):
+        model = User
+        fields = ('email', 'company_name', 'commercial_registration', 'user_type', 'address')
+        field_classes = {}
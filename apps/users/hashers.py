@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id بمعاملات من الإعدادات (ARGON2_TIME_COST وARGON2_MEMORY_COST وARGON2_PARALLELISM)
+
+    تغيير المعاملات لا يُبطل كلمات المرور الحالية: تُعاد تجزئتها بالمعاملات الجديدة عند
+    الدخول التالي. لا يُدرج معه Argon2PasswordHasher الأصلي لأن الاسم (argon2) واحد.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
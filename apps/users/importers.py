@@ -0,0 +1,289 @@
+"""استيراد جماعي للمستخدمين وملفاتهم (ملاك، مستثمرون، مستأجرون) من ملفات CSV/XLSX"""
+import csv
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from django.utils.translation import gettext as _
+
+from core.batching import chunked
+
+from .models import Investor, Owner, Tenant, User
+
+PASSWORD_MODE_HASH = 'hash'
+PASSWORD_MODE_INVITE = 'invite'
+
+# حقول المستخدم المسموح باستيرادها من الملف
+USER_IMPORT_FIELDS = (
+    'company_name_english',
+    'tax_number',
+    'establishment_date',
+    'country',
+    'city',
+    'address',
+    'postal_code',
+    'website',
+)
+UNIQUE_FIELDS = ('email', 'commercial_registration', 'tax_number')
+
+PROFILE_MODELS = {
+    User.UserType.OWNER: Owner,
+    User.UserType.INVESTOR: Investor,
+    User.UserType.TENANT: Tenant,
+}
+PROFILE_FIELDS = {
+    model: tuple(
+        f.name for f in model._meta.concrete_fields
+        if f.name != 'user' and f.editable and not isinstance(f, models.JSONField)
+    )
+    for model in PROFILE_MODELS.values()
+}
+
+
+def read_rows(path):
+    """قراءة صفوف الملف بشكل متدفق دون تحميله كاملاً في الذاكرة"""
+    if os.path.splitext(path)[1].lower() == '.xlsx':
+        return _read_xlsx(path)
+    return _read_csv(path)
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        for row in csv.DictReader(handle):
+            yield {key.strip(): (value or '').strip() for key, value in row.items() if key}
+
+
+def _read_xlsx(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise ImportError(_('يتطلب استيراد ملفات XLSX تثبيت الحزمة openpyxl')) from exc
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+        for values in rows:
+            # الصفوف في وضع القراءة فقط قد تكون أقصر أو أطول من صف العناوين
+            yield {key: _cell_to_text(value) for key, value in zip(header, values, strict=False) if key}
+    finally:
+        workbook.close()
+
+
+def _cell_to_text(value):
+    """توحيد قيم خلايا Excel إلى نصوص كما في CSV"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        # أرقام السجل التجاري تُقرأ من Excel كأعداد عشرية
+        return str(int(value))
+    return str(value).strip()
+
+
+def _init_hash_worker():
+    import django
+    django.setup()
+
+
+@dataclass
+class ImportEntry:
+    row_number: int
+    user: User
+    profile: models.Model
+    password: str = None
+
+
+@dataclass
+class ImportResult:
+    processed: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row_number, email, message):
+        self.errors.append((row_number, email or '', message))
+
+
+class UserImporter:
+    """يتحقق من الصفوف على دفعات وينشئ المستخدمين وملفاتهم عبر bulk_create
+
+    أخطاء الصفوف تُسجّل في النتيجة دون إيقاف الدفعة، وتُجزّأ كلمات المرور في
+    مجموعة عمليات منفصلة أو تُستبدل بكلمات مرور غير صالحة مع رموز دعوة.
+    """
+
+    def __init__(self, batch_size=1000, password_mode=PASSWORD_MODE_HASH, workers=None,
+                 on_progress=None, on_invites=None):
+        if password_mode not in (PASSWORD_MODE_HASH, PASSWORD_MODE_INVITE):
+            raise ValueError(_('طريقة كلمات مرور غير معروفة: %s') % password_mode)
+        self.batch_size = batch_size
+        self.password_mode = password_mode
+        self.workers = workers or 1
+        self.on_progress = on_progress
+        self.on_invites = on_invites
+        self._executor = None
+
+    def run(self, rows):
+        result = ImportResult()
+        if self.password_mode == PASSWORD_MODE_HASH and self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_hash_worker)
+        try:
+            for chunk in chunked(enumerate(rows, start=2), self.batch_size):
+                self._process_chunk(chunk, result)
+                if self.on_progress:
+                    self.on_progress(result)
+        finally:
+            if self._executor:
+                self._executor.shutdown()
+                self._executor = None
+        return result
+
+    def _process_chunk(self, chunk, result):
+        entries = []
+        for row_number, row in chunk:
+            try:
+                entries.append(self._prepare_row(row_number, row))
+            except ValidationError as exc:
+                result.add_error(row_number, row.get('email'), _format_validation_error(exc))
+            except ValueError as exc:
+                result.add_error(row_number, row.get('email'), str(exc))
+        result.processed += len(chunk)
+
+        entries = self._drop_duplicates(entries, result)
+        self._assign_passwords(entries)
+        created = self._insert(entries, result)
+        result.created += len(created)
+
+        if self.on_invites and self.password_mode == PASSWORD_MODE_INVITE and created:
+            self.on_invites([
+                (entry.user.email, urlsafe_base64_encode(force_bytes(entry.user.pk)),
+                 default_token_generator.make_token(entry.user))
+                for entry in created
+            ])
+
+    def _prepare_row(self, row_number, row):
+        user_type = (row.get('user_type') or '').strip().upper()
+        profile_model = PROFILE_MODELS.get(user_type)
+        if profile_model is None:
+            raise ValidationError({'user_type': _('نوع مستخدم غير صالح للاستيراد')})
+
+        extra_fields = {name: row[name] for name in USER_IMPORT_FIELDS if row.get(name)}
+        user = User.objects.build_user(
+            row.get('email'),
+            row.get('company_name'),
+            row.get('commercial_registration'),
+            user_type=user_type,
+            **extra_fields
+        )
+        user.full_clean(exclude=['password'], validate_unique=False)
+        # bulk_create لا يستدعي save() لذا يُحسب نص البحث هنا
+        user.refresh_search_name()
+
+        profile = profile_model(
+            user=user,
+            **{name: row[name] for name in PROFILE_FIELDS[profile_model] if row.get(name)}
+        )
+        profile.full_clean(exclude=['user'], validate_unique=False)
+        # كنص البحث: الحقول المشتقة تُحسب هنا لأن bulk_create لا يستدعي save()
+        if isinstance(profile, Investor):
+            profile.refresh_contract_end_date()
+        return ImportEntry(row_number, user, profile, row.get('password') or None)
+
+    def _drop_duplicates(self, entries, result):
+        """استبعاد القيم المكررة داخل الدفعة أو الموجودة مسبقاً بقاعدة البيانات باستعلام واحد لكل حقل"""
+        taken = {}
+        for name in UNIQUE_FIELDS:
+            values = {getattr(entry.user, name) for entry in entries} - {None, ''}
+            taken[name] = set(
+                User.objects.filter(**{f'{name}__in': values}).values_list(name, flat=True)
+            ) if values else set()
+
+        kept = []
+        for entry in entries:
+            conflict = next((
+                name for name in UNIQUE_FIELDS
+                if getattr(entry.user, name) and getattr(entry.user, name) in taken[name]
+            ), None)
+            if conflict:
+                result.add_error(
+                    entry.row_number,
+                    entry.user.email,
+                    _('القيمة مكررة في الحقل: %s') % User._meta.get_field(conflict).verbose_name,
+                )
+                continue
+            for name in UNIQUE_FIELDS:
+                if getattr(entry.user, name):
+                    taken[name].add(getattr(entry.user, name))
+            kept.append(entry)
+        return kept
+
+    def _assign_passwords(self, entries):
+        pending = []
+        for entry in entries:
+            if self.password_mode == PASSWORD_MODE_HASH and entry.password:
+                pending.append(entry)
+            else:
+                entry.user.set_unusable_password()
+        if not pending:
+            return
+
+        passwords = [entry.password for entry in pending]
+        if self._executor:
+            chunksize = max(1, len(passwords) // (self.workers * 4))
+            hashes = self._executor.map(make_password, passwords, chunksize=chunksize)
+        else:
+            hashes = map(make_password, passwords)
+        for entry, encoded in zip(pending, hashes, strict=True):
+            entry.user.password = encoded
+
+    def _insert(self, entries, result):
+        if not entries:
+            return []
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([entry.user for entry in entries])
+                profiles = defaultdict(list)
+                for entry in entries:
+                    entry.profile.user = entry.user
+                    profiles[type(entry.profile)].append(entry.profile)
+                for profile_model, objs in profiles.items():
+                    profile_model.objects.bulk_create(objs)
+            return entries
+        except IntegrityError:
+            # تعارض متزامن مع عملية أخرى: إعادة المحاولة صفاً صفاً لعزل الصفوف المتعارضة فقط
+            return self._insert_one_by_one(entries, result)
+
+    def _insert_one_by_one(self, entries, result):
+        created = []
+        for entry in entries:
+            entry.user.pk = None
+            entry.user._state.adding = True
+            try:
+                with transaction.atomic():
+                    entry.user.save()
+                    entry.profile.user = entry.user
+                    entry.profile.save(force_insert=True)
+            except IntegrityError as exc:
+                result.add_error(entry.row_number, entry.user.email, str(exc))
+                continue
+            created.append(entry)
+        return created
+
+
+def _format_validation_error(exc):
+    if hasattr(exc, 'error_dict'):
+        return '; '.join(
+            f'{name}: {" ".join(str(message) for message in messages)}'
+            for name, messages in exc.message_dict.items()
+        )
+    return ' '.join(str(message) for message in exc.messages)
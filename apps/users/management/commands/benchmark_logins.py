@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.users.backends import CachedModelBackend
+from apps.users.models import User
+
+HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'apps.users.hashers.TunedArgon2PasswordHasher',
+}
+PASSWORD = 'Bench-Login-2024!'
+
+
+class Command(BaseCommand):
+    help = 'قياس عدد عمليات الدخول في الثانية لكل نواة لكل خوارزمية تجزئة ولخلفي المصادقة المخزن مؤقتاً'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--logins', type=int, default=200, help='عدد محاولات الدخول لكل قياس')
+        parser.add_argument('--hasher', choices=sorted(HASHERS), action='append', dest='hashers')
+
+    def handle(self, *args, **options):
+        hashers = options['hashers'] or [name for name in HASHERS if name != 'argon2' or settings.ARGON2_AVAILABLE]
+        if 'argon2' in hashers and not settings.ARGON2_AVAILABLE:
+            self.stderr.write('Argon2 غير متاح (ثبّت argon2-cffi)')
+            hashers.remove('argon2')
+
+        # المستخدمون يُحفظون خارج المعاملة ليُخزَّنوا مؤقتاً، ويُحذفون بعد القياس
+        users = User.objects.bulk_create([
+            User(
+                email=f'bench-login-{index}@example.om',
+                company_name=f'قياس الدخول {index}',
+                commercial_registration=f'8{index:011d}',
+                address='-',
+                user_type=User.UserType.TENANT,
+            )
+            for index in range(options['users'])
+        ])
+        emails = [user.email for user in users]
+        try:
+            for name in hashers:
+                with override_settings(PASSWORD_HASHERS=[HASHERS[name]]):
+                    for user in users:
+                        user.set_password(PASSWORD)
+                    User.objects.bulk_update(users, ['password'])
+                    for label, backend in (('ModelBackend', ModelBackend()), ('CachedModelBackend', CachedModelBackend())):
+                        self._measure(name, label, backend, emails, options['logins'])
+        finally:
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def _measure(self, hasher, label, backend, emails, logins):
+        # دخول أول لكل مستخدم يملأ الذاكرة المؤقتة كما في موجة دخول بداية الشهر
+        for email in emails:
+            backend.authenticate(None, username=email, password=PASSWORD)
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            for index in range(logins):
+                user = backend.authenticate(None, username=emails[index % len(emails)], password=PASSWORD)
+                backend.get_user(user.pk)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{hasher} / {label}: {logins / elapsed:.1f} دخول/ث لكل نواة '
+            f'({elapsed * 1000 / logins:.1f} م.ث، {len(queries) / logins:.2f} استعلام/دخول)'
+        )
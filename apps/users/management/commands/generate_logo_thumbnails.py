@@ -0,0 +1,43 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.thumbnails import LOGO_SIZES, backfill_thumbnails
+
+
+class Command(BaseCommand):
+    help = f'توليد مصغرات WebP لشعارات الشركات الموجودة بالتوازي (الأحجام: {", ".join(map(str, LOGO_SIZES))})'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='عدد الشعارات في كل دفعة')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='عدد عمليات التوليد')
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='إعادة توليد مصغرات كل الشعارات ولو كانت موجودة',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('يجب أن يكون حجم الدفعة أكبر من صفر')
+
+        started = time.monotonic()
+
+        def report(count, failed):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f'عولج {count} شعار، فشل {failed} ({count / elapsed:.1f} شعار/ث)')
+
+        processed, errors = backfill_thumbnails(
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            force=options['force'],
+            on_batch=report,
+        )
+        elapsed = time.monotonic() - started
+        for user_id, error in errors[:20]:
+            self.stderr.write(f'المستخدم {user_id}: {error}')
+        self.stdout.write(self.style.SUCCESS(
+            f'عولج {processed} شعار خلال {elapsed:.1f} ث ({processed / max(elapsed, 1e-9):.1f} شعار/ث)، '
+            f'فشل {len(errors)}'
+        ))
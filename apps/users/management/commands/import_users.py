@@ -0,0 +1,89 @@
+import csv
+import os
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.importers import (
+    PASSWORD_MODE_HASH,
+    PASSWORD_MODE_INVITE,
+    UserImporter,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = 'استيراد المستخدمين وملفاتهم (ملاك، مستثمرون، مستأجرون) من ملف CSV أو XLSX على دفعات'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='مسار ملف CSV أو XLSX (يتطلب XLSX الحزمة openpyxl)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='عدد الصفوف في كل دفعة')
+        parser.add_argument(
+            '--passwords',
+            choices=[PASSWORD_MODE_HASH, PASSWORD_MODE_INVITE],
+            default=PASSWORD_MODE_HASH,
+            help='تجزئة عمود password أو إصدار كلمات مرور غير صالحة مع رموز دعوة',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='عدد العمليات المستخدمة لتجزئة كلمات المرور',
+        )
+        parser.add_argument('--errors', help='مسار ملف CSV لكتابة أخطاء الصفوف')
+        parser.add_argument('--invites', help='مسار ملف CSV لكتابة رموز الدعوة')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'الملف غير موجود: {path}')
+        if options['batch_size'] < 1:
+            raise CommandError('يجب أن يكون حجم الدفعة أكبر من صفر')
+        if options['invites'] and options['passwords'] != PASSWORD_MODE_INVITE:
+            raise CommandError('الخيار --invites يتطلب --passwords=invite')
+
+        started = time.monotonic()
+
+        def report(result):
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{result.processed} صف | {result.created} أُنشئ | {len(result.errors)} خطأ '
+                f'| {result.processed / elapsed if elapsed else 0:.0f} صف/ث'
+            )
+
+        with ExitStack() as stack:
+            invites_writer = None
+            if options['invites']:
+                invites_writer = csv.writer(
+                    stack.enter_context(open(options['invites'], 'w', newline='', encoding='utf-8'))
+                )
+                invites_writer.writerow(['email', 'uid', 'token'])
+
+            importer = UserImporter(
+                batch_size=options['batch_size'],
+                password_mode=options['passwords'],
+                workers=options['workers'],
+                on_progress=report,
+                on_invites=invites_writer.writerows if invites_writer else None,
+            )
+            try:
+                result = importer.run(read_rows(path))
+            except ImportError as exc:
+                raise CommandError(str(exc)) from exc
+
+        if options['errors'] and result.errors:
+            with open(options['errors'], 'w', newline='', encoding='utf-8') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['row', 'email', 'error'])
+                writer.writerows(result.errors)
+        elif result.errors:
+            for row_number, email, message in result.errors[:20]:
+                self.stderr.write(f'صف {row_number} ({email}): {message}')
+            if len(result.errors) > 20:
+                self.stderr.write(f'... و{len(result.errors) - 20} خطأ آخر (استخدم --errors لحفظها كاملة)')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'اكتمل الاستيراد: {result.created} من {result.processed} صف '
+            f'خلال {time.monotonic() - started:.1f} ث'
+        ))
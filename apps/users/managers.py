@@ -0,0 +1,43 @@
+from django.db import models
+
+from .search import search_users
+
+# اسم علاقة الملف العكسية لكل نوع مستخدم
+PROFILE_RELATED_NAMES = {
+    'OWNER': 'owner_profile',
+    'INVESTOR': 'investor_profile',
+    'TENANT': 'tenant_profile',
+}
+
+
+class UserQuerySet(models.QuerySet):
+    """استعلامات مخصصة لنموذج المستخدم"""
+
+    def search(self, query):
+        """بحث مرتب حسب درجة التطابق في أسماء الشركات والسجل التجاري والبريد"""
+        return search_users(self, query)
+
+    def update(self, **kwargs):
+        """التحديث الجماعي لا يرسل post_save، فتُبطل هنا النسخ المخزنة للمستخدمين المعنيين"""
+        from .backends import invalidate_users
+        from .profiles import invalidate_profiles
+
+        user_ids = list(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+        invalidate_users(user_ids)
+        invalidate_profiles(user_ids)
+        return updated
+
+    def with_profile(self):
+        """تحميل ملف كل مستخدم (مالك/مستثمر/مستأجر) في الاستعلام نفسه
+
+        يكفي استعلام واحد لقائمة مختلطة الأنواع، فالوصول إلى user.profile لا يستعلم لكل صف.
+        """
+        return self.select_related(*PROFILE_RELATED_NAMES.values())
+
+
+class ProfileManager(models.Manager):
+    """مدير ملفات المستخدمين: يحمّل حساب المستخدم دائماً لأن عرض الملف يعتمد على اسم الشركة"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
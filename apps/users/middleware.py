@@ -0,0 +1,17 @@
+from django.utils.functional import SimpleLazyObject
+
+from .profiles import get_profile
+
+
+class ProfileMiddleware:
+    """إتاحة ملف المستخدم المخزن مؤقتاً كـ request.profile (None للزائر)
+
+    يُقرأ الملف عند أول استخدام فقط، لذا يجب وضعها بعد AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = SimpleLazyObject(lambda: get_profile(request.user))
+        return self.get_response(request)
@@ -2,6 +2,7 @@
 
 import django.core.validators
 import django.db.models.deletion
+import django.utils.timezone
 import django_countries.fields
 from django.conf import settings
 from django.db import migrations, models
@@ -53,7 +54,7 @@ class Migration(migrations.Migration):
         migrations.AddField(
             model_name='investor',
             name='investment_date',
-            field=models.DateField(default='', help_text='تاريخ بداية الاستثمار', verbose_name='تاريخ الاستثمار'),
+            field=models.DateField(default=django.utils.timezone.now, help_text='تاريخ بداية الاستثمار', verbose_name='تاريخ الاستثمار'),
             preserve_default=False,
         ),
         migrations.AddField(
@@ -0,0 +1,98 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:44
+
+import re
+
+from django.db import migrations, models
+
+# نسخة مجمدة من apps.users.utils وapps.users.search: الهجرات لا تستورد كود التطبيق
+# لأنه قد يتغير لاحقاً بما لا يتوافق مع حالة قاعدة البيانات عند هذه الهجرة
+SEARCH_TABLE = 'users_user_search'
+TRIGRAM_INDEX = 'users_user_search_name_trgm'
+ARABIC_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+ARABIC_LETTER_FORMS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ى': 'ي', 'ئ': 'ي', 'ؤ': 'و', 'ة': 'ه',
+    '٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
+    '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9',
+})
+WHITESPACE = re.compile(r'\s+')
+
+
+def build_search_text(user):
+    text = ' '.join(filter(None, [
+        user.company_name,
+        user.company_name_english,
+        user.commercial_registration,
+        user.email,
+    ]))
+    text = ARABIC_DIACRITICS.sub('', text).translate(ARABIC_LETTER_FORMS).casefold()
+    return WHITESPACE.sub(' ', text).strip()
+
+
+def populate_search_name(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    batch = []
+    for user in User.objects.using(schema_editor.connection.alias).only(
+        'company_name', 'company_name_english', 'commercial_registration', 'email'
+    ).iterator(chunk_size=2000):
+        user.search_name = build_search_text(user)
+        batch.append(user)
+        if len(batch) >= 2000:
+            User.objects.using(schema_editor.connection.alias).bulk_update(batch, ['search_name'])
+            batch = []
+    if batch:
+        User.objects.using(schema_editor.connection.alias).bulk_update(batch, ['search_name'])
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} '
+            'ON users_user USING gin (search_name gin_trgm_ops)'
+        )
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+            "search_name, content='users_user', content_rowid='id', tokenize='trigram')"
+        )
+        delete_old = (
+            f'INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, search_name) '
+            "VALUES ('delete', old.id, old.search_name);"
+        )
+        insert_new = f'INSERT INTO {SEARCH_TABLE}(rowid, search_name) VALUES (new.id, new.search_name);'
+        for statement in (
+            f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON users_user BEGIN {insert_new} END',
+            f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON users_user BEGIN {delete_old} END',
+            f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF search_name ON users_user '
+            f'BEGIN {delete_old} {insert_new} END',
+        ):
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+    elif connection.vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_user_options_remove_user_first_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_name',
+            field=models.TextField(blank=True, default='', editable=False, help_text='نص موحد من اسم الشركة والسجل التجاري والبريد يستخدم في البحث', verbose_name='نص البحث'),
+        ),
+        migrations.RunPython(populate_search_name, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
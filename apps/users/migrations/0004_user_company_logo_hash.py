@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_search_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='company_logo_hash',
+            field=models.CharField(blank=True, default='', editable=False, help_text='بصمة SHA-256 لمحتوى الشعار؛ تُسجل بعد توليد صوره المصغرة', max_length=64, verbose_name='بصمة الشعار'),
+        ),
+    ]
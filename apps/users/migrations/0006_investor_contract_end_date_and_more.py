@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+from core.dates import add_months
+
+
+def populate_contract_end_date(apps, schema_editor):
+    Investor = apps.get_model('users', 'Investor')
+    investors = Investor.objects.using(schema_editor.connection.alias)
+    batch = []
+    for investor in investors.exclude(investment_date=None).only(
+        'investment_date', 'contract_duration'
+    ).iterator(chunk_size=2000):
+        investor.contract_end_date = add_months(investor.investment_date, 12 * investor.contract_duration)
+        batch.append(investor)
+        if len(batch) >= 2000:
+            investors.bulk_update(batch, ['contract_end_date'])
+            batch = []
+    if batch:
+        investors.bulk_update(batch, ['contract_end_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_user_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='investor',
+            name='contract_end_date',
+            field=models.DateField(blank=True, editable=False, help_text='يُحسب من تاريخ الاستثمار ومدة العقد عند الحفظ', null=True, verbose_name='تاريخ انتهاء العقد'),
+        ),
+        migrations.RunPython(populate_contract_end_date, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='investor',
+            index=models.Index(fields=['contract_end_date'], name='users_investor_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(fields=['insurance_expiry'], name='users_tenant_insurance_idx'),
+        ),
+    ]
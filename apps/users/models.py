@@ -5,18 +5,26 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.files import File
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
 
+from core.dates import add_months
+
+from .managers import PROFILE_RELATED_NAMES, ProfileManager, UserQuerySet
+from .search import SEARCH_SOURCE_FIELDS, build_search_text
+
 #from phonenumber_field.modelfields import PhoneNumberField
 
 
-class CustomUserManager(BaseUserManager):
+class CustomUserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """مدير مستخدمين متطور مع تحسينات للأمان"""
 
-    def _create_user(self, email, company_name, commercial_registration, password=None, **extra_fields):
+    def build_user(self, email, company_name, commercial_registration, **extra_fields):
+        """تجهيز كائن مستخدم دون حفظه (يستخدم في الإنشاء الفردي والاستيراد الجماعي)"""
         if not email:
             raise ValueError(_('يجب توفير عنوان بريد إلكتروني صحيح'))
         if not company_name:
@@ -25,12 +33,15 @@ class CustomUserManager(BaseUserManager):
             raise ValueError(_('يجب توفير السجل التجاري'))
 
         email = self.normalize_email(email)
-        user = self.model(
+        return self.model(
             email=email,
             company_name=company_name,
             commercial_registration=commercial_registration,
             **extra_fields
         )
+
+    def _create_user(self, email, company_name, commercial_registration, password=None, **extra_fields):
+        user = self.build_user(email, company_name, commercial_registration, **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
         return user
@@ -158,6 +169,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         null=True,
         help_text=_('شعار الشركة الرسمي')
     )
+    company_logo_hash = models.CharField(
+        _('بصمة الشعار'),
+        max_length=64,
+        blank=True,
+        default='',
+        editable=False,
+        help_text=_('بصمة SHA-256 لمحتوى الشعار؛ تُسجل بعد توليد صوره المصغرة')
+    )
     website = models.URLField(
         _('الموقع الإلكتروني'),
         blank=True,
@@ -192,6 +211,15 @@ class User(AbstractBaseUser, PermissionsMixin):
         help_text=_('تاريخ آخر تعديل على بيانات الحساب')
     )
 
+    # البحث
+    search_name = models.TextField(
+        _('نص البحث'),
+        blank=True,
+        default='',
+        editable=False,
+        help_text=_('نص موحد من اسم الشركة والسجل التجاري والبريد يستخدم في البحث')
+    )
+
     # إعدادات المصادقة
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['company_name', 'commercial_registration']
@@ -207,11 +235,55 @@ class User(AbstractBaseUser, PermissionsMixin):
             models.Index(fields=['company_name']),
             models.Index(fields=['commercial_registration']),
             models.Index(fields=['user_type']),
+            # فهارس تصفية قوائم الإدارة مع ترتيب الصفحات بالمعرّف تنازلياً
+            models.Index(fields=['user_type', '-id'], name='users_type_id_idx'),
+            models.Index(fields=['is_verified', '-id'], name='users_verified_id_idx'),
+            models.Index(fields=['is_active', '-id'], name='users_active_id_idx'),
+            models.Index(fields=['city', '-id'], name='users_city_id_idx'),
+            models.Index(fields=['country', 'city'], name='users_country_city_idx'),
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # حفظ اسم الشعار المحمل لاكتشاف رفع شعار جديد عند الحفظ (None إن كان الحقل مؤجلاً)
+        self._loaded_logo = self._logo_name() if 'company_logo' in self.__dict__ else None
+
     def __str__(self):
         return f"{self.company_name} ({self.get_user_type_display()})"
 
+    def get_session_auth_hash(self):
+        # المستخدم المستعاد من ذاكرة CachedModelBackend يحمل بصمة الجلسة بدلاً من كلمة المرور
+        if 'password' not in self.__dict__ and getattr(self, '_session_auth_hash', None):
+            return self._session_auth_hash
+        return super().get_session_auth_hash()
+
+    def _logo_name(self):
+        # القيمة الخام دون المرور بواصف الحقل حتى لا يُحمَّل حقل مؤجل
+        value = self.__dict__.get('company_logo')
+        return getattr(value, 'name', value) or ''
+
+    def _logo_changed(self, update_fields):
+        if self._loaded_logo is None or 'company_logo' not in self.__dict__:
+            return False
+        if update_fields is not None and 'company_logo' not in update_fields:
+            return False
+        value = self.__dict__['company_logo']
+        # ملف مرفوع لم يُحفظ بعد في التخزين
+        if isinstance(value, File) and not getattr(value, '_committed', False):
+            return True
+        return self._logo_name() != self._loaded_logo
+
+    @property
+    def profile(self):
+        """ملف المستخدم حسب نوعه أو None؛ استخدم with_profile() عند عرض قائمة مستخدمين"""
+        related_name = PROFILE_RELATED_NAMES.get(self.user_type)
+        if related_name is None:
+            return None
+        try:
+            return getattr(self, related_name)
+        except ObjectDoesNotExist:
+            return None
+
     @property
     def company_age(self):
         """حساب عمر الشركة بالسنوات"""
@@ -222,6 +294,31 @@ class User(AbstractBaseUser, PermissionsMixin):
             )
         return None
 
+    def refresh_search_name(self):
+        """تحديث نص البحث الموحد من بيانات الشركة"""
+        self.search_name = build_search_text(self)
+
+    def save(self, *args, **kwargs):
+        self.refresh_search_name()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+
+        logo_changed = self._logo_changed(update_fields)
+        if logo_changed:
+            # المصغرات القديمة لا تخص الشعار الجديد؛ يُعرض الأصلي حتى تُولَّد مصغراته
+            self.company_logo_hash = ''
+            if update_fields is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'company_logo_hash'}
+        super().save(*args, **kwargs)
+
+        if logo_changed:
+            self._loaded_logo = logo_name = self._logo_name()
+            if logo_name:
+                from .thumbnails import schedule_thumbnails
+
+                transaction.on_commit(lambda: schedule_thumbnails(self.pk, logo_name))
+
 class Owner(models.Model):
     """نموذج متطور لمالك المبنى"""
     user = models.OneToOneField(
@@ -269,6 +366,8 @@ class Owner(models.Model):
         help_text=_('الطريقة المفضلة لاستلام المدفوعات')
     )
 
+    objects = ProfileManager()
+
     class Meta:
         verbose_name = _('مالك')
         verbose_name_plural = _('الملاك')
@@ -309,6 +408,13 @@ class Investor(models.Model):
         default=1,
         help_text=_('مدة عقد الاستثمار بالسنوات')
     )
+    contract_end_date = models.DateField(
+        _('تاريخ انتهاء العقد'),
+        blank=True,
+        null=True,
+        editable=False,
+        help_text=_('يُحسب من تاريخ الاستثمار ومدة العقد عند الحفظ')
+    )
     bank_details = models.JSONField(
         _('تفاصيل البنك'),
         blank=True,
@@ -316,21 +422,30 @@ class Investor(models.Model):
         help_text=_('تفاصيل الحساب البنكي لتحويل الأرباح')
     )
 
+    objects = ProfileManager()
+
     class Meta:
         verbose_name = _('مستثمر')
         verbose_name_plural = _('المستثمرون')
+        indexes = [
+            models.Index(fields=['contract_end_date'], name='users_investor_end_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.company_name} ({self.investment_percentage}%)"
 
-    @property
-    def contract_end_date(self):
-        """حساب تاريخ انتهاء عقد الاستثمار"""
-        if self.investment_date:
-            return self.investment_date.replace(
-                year=self.investment_date.year + self.contract_duration
-            )
-        return None
+    def refresh_contract_end_date(self):
+        """حساب تاريخ انتهاء عقد الاستثمار من تاريخه ومدته (29 فبراير ينتهي في 28 فبراير)"""
+        self.contract_end_date = (
+            add_months(self.investment_date, 12 * self.contract_duration) if self.investment_date else None
+        )
+
+    def save(self, *args, **kwargs):
+        self.refresh_contract_end_date()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'investment_date', 'contract_duration'}.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'contract_end_date'}
+        super().save(*args, **kwargs)
 
 class Tenant(models.Model):
     """نموذج متطور للمستأجر (شركة)"""
@@ -385,9 +500,14 @@ class Tenant(models.Model):
         help_text=_('تاريخ انتهاء بوليصة التأمين')
     )
 
+    objects = ProfileManager()
+
     class Meta:
         verbose_name = _('مستأجر')
         verbose_name_plural = _('المستأجرون')
+        indexes = [
+            models.Index(fields=['insurance_expiry'], name='users_tenant_insurance_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.company_name} ({self.company_activity})"
@@ -0,0 +1,131 @@
+"""ذاكرة مؤقتة لملفات المستخدمين (بيانات الشركة مع ملف المالك/المستثمر/المستأجر)
+
+يُخزن لكل مستخدم صف مضغوط واحد (tuple) في ذاكرة PROFILE_CACHE_ALIAS يجمع حقول
+المستخدم المعروضة في الصفحات وحقول ملفه حسب نوعه، فلا يكلف الطلب استعلاماً إضافياً
+لملف المستخدم إلا عند أول طلب بعد الإبطال. يُبطل الصف عند حفظ المستخدم أو ملفه أو
+حذفهما (signals.py)، والتحديثات الجماعية التي لا تمر بالإشارات تُبطله صراحة.
+"""
+from dataclasses import dataclass
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from .managers import PROFILE_RELATED_NAMES
+from .models import User
+
+# يُرفع عند تغيير بنية الصف المخزن فتُتجاهل الصفوف القديمة
+BUNDLE_VERSION = 1
+
+USER_FIELDS = (
+    'user_type', 'email', 'company_name', 'company_name_english', 'commercial_registration',
+    'company_logo', 'company_logo_hash', 'is_verified',
+)
+PROFILE_FIELDS = {
+    User.UserType.OWNER: ('ownership_percentage', 'bank_name', 'iban_number', 'preferred_payment_method'),
+    User.UserType.INVESTOR: ('investment_amount', 'investment_percentage', 'investment_date', 'contract_duration'),
+    User.UserType.TENANT: (
+        'company_activity', 'authorized_person', 'emergency_contact', 'insurance_policy', 'insurance_expiry',
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ProfileBundle:
+    """بيانات المستخدم وملفه للعرض؛ profile قاموس حقول الملف أو None إن لم يوجد"""
+    user_id: int
+    user_type: str
+    email: str
+    company_name: str
+    company_name_english: str
+    commercial_registration: str
+    company_logo: str
+    company_logo_hash: str
+    is_verified: bool
+    profile: dict = None
+
+    @property
+    def is_owner(self):
+        return self.user_type == User.UserType.OWNER
+
+    @property
+    def is_investor(self):
+        return self.user_type == User.UserType.INVESTOR
+
+    @property
+    def is_tenant(self):
+        return self.user_type == User.UserType.TENANT
+
+    @property
+    def display_name(self):
+        return self.company_name
+
+
+def _cache():
+    return caches[settings.PROFILE_CACHE_ALIAS]
+
+
+def cache_key(user_id):
+    return f'users:profile:{BUNDLE_VERSION}:{user_id}'
+
+
+def _profile_values(user):
+    related_name = PROFILE_RELATED_NAMES.get(user.user_type)
+    if not related_name:
+        return None
+    fields = PROFILE_FIELDS[user.user_type]
+    # قراءة الملف من المستخدم المحمَّل إن سبق تحميله وإلا باستعلام واحد للحقول المطلوبة فقط
+    profile = user._state.fields_cache.get(related_name)
+    if profile is not None:
+        return tuple(getattr(profile, name) for name in fields)
+    model = user._meta.get_field(related_name).related_model
+    return model.objects.filter(user_id=user.pk).values_list(*fields).first()
+
+
+def _pack(user):
+    values = tuple(
+        user._logo_name() if name == 'company_logo' else getattr(user, name)
+        for name in USER_FIELDS
+    )
+    return values + (_profile_values(user),)
+
+
+def _unpack(user_id, row):
+    *values, profile = row
+    bundle = dict(zip(USER_FIELDS, values, strict=True))
+    if profile is not None:
+        profile = dict(zip(PROFILE_FIELDS[bundle['user_type']], profile, strict=True))
+    return ProfileBundle(user_id, profile=profile, **bundle)
+
+
+def get_profile(user):
+    """ملف المستخدم من الذاكرة المؤقتة؛ يُبنى ويُخزن عند عدم وجوده"""
+    if not getattr(user, 'is_authenticated', False):
+        return None
+    cache = _cache()
+    key = cache_key(user.pk)
+    row = cache.get(key)
+    if row is None:
+        row = _pack(user)
+        # بيانات قُرئت داخل معاملة قد تُلغى فلا تُخزن
+        if not connection.in_atomic_block:
+            cache.set(key, row, settings.PROFILE_CACHE_TIMEOUT)
+    return _unpack(user.pk, row)
+
+
+def invalidate_profile(user_id):
+    """حذف ملف المستخدم من الذاكرة المؤقتة الآن وبعد تثبيت المعاملة الجارية
+
+    الحذف الثاني يمنع بقاء نسخة قديمة خزّنها طلب متزامن قرأ البيانات قبل التثبيت.
+    """
+    key = cache_key(user_id)
+    _cache().delete(key)
+    transaction.on_commit(partial(_cache().delete, key))
+
+
+def invalidate_profiles(user_ids):
+    keys = [cache_key(user_id) for user_id in user_ids]
+    if keys:
+        _cache().delete_many(keys)
+        transaction.on_commit(partial(_cache().delete_many, keys))
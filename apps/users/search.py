@@ -0,0 +1,148 @@
+"""البحث في دليل المستخدمين عبر عمود نصي موحد
+
+يعتمد على فهرس trigram على PostgreSQL وجدول FTS5 (مُقسِّم trigram) على SQLite
+يُحدَّث بالمشغلات (triggers)، مع ترتيب النتائج حسب درجة التطابق.
+"""
+from django.db import connections
+from django.db.models import F, FloatField, Func, Value
+from django.db.models.expressions import RawSQL
+
+from .utils import normalize_search_text
+
+SEARCH_TABLE = 'users_user_search'
+TRIGRAM_INDEX = 'users_user_search_name_trgm'
+
+# مقسِّم trigram لا يطابق المقاطع الأقصر من ثلاثة أحرف
+MIN_TOKEN_LENGTH = 3
+
+
+# الحقول التي يُبنى منها User.search_name
+SEARCH_SOURCE_FIELDS = frozenset({
+    'company_name',
+    'company_name_english',
+    'commercial_registration',
+    'email',
+})
+
+
+def build_search_text(user):
+    """النص الموحد المخزن في User.search_name"""
+    return normalize_search_text(' '.join(filter(None, [
+        user.company_name,
+        user.company_name_english,
+        user.commercial_registration,
+        user.email,
+    ])))
+
+
+def search_users(queryset, query):
+    """تصفية queryset حسب نص البحث وترتيبها تنازلياً حسب درجة التطابق (search_rank)"""
+    terms = normalize_search_text(query).split()
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return _search_postgresql(queryset, terms)
+    if vendor == 'sqlite' and any(len(term) >= MIN_TOKEN_LENGTH for term in terms):
+        return _search_sqlite(queryset, terms)
+    return _search_fallback(queryset, terms)
+
+
+def _search_postgresql(queryset, terms):
+    # فهرس gin_trgm_ops يخدم LIKE '%...%' مباشرة، و similarity() للترتيب فقط
+    for term in terms:
+        queryset = queryset.filter(search_name__contains=term)
+    rank = Func(F('search_name'), Value(' '.join(terms)), function='similarity', output_field=FloatField())
+    return queryset.annotate(search_rank=rank).order_by('-search_rank', 'company_name')
+
+
+def _search_sqlite(queryset, terms):
+    match = ' '.join(
+        '"{}"'.format(term.replace('"', '""'))
+        for term in terms if len(term) >= MIN_TOKEN_LENGTH
+    )
+    table = queryset.model._meta.db_table
+    queryset = queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [match]
+    ))
+    # المقاطع القصيرة لا يفهرسها trigram فتُطبق كتصفية إضافية على النتائج
+    for term in terms:
+        if len(term) < MIN_TOKEN_LENGTH:
+            queryset = queryset.filter(search_name__contains=term)
+    # bm25 تعيد قيماً سالبة، والأصغر هو الأفضل تطابقاً
+    rank = RawSQL(
+        f'SELECT -bm25({SEARCH_TABLE}) FROM {SEARCH_TABLE} '
+        f'WHERE {SEARCH_TABLE} MATCH %s AND rowid = "{table}"."id"',
+        [match],
+        output_field=FloatField(),
+    )
+    return queryset.annotate(search_rank=rank).order_by('-search_rank', 'company_name')
+
+
+def _search_fallback(queryset, terms):
+    for term in terms:
+        queryset = queryset.filter(search_name__contains=term)
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).order_by('company_name')
+
+
+def install_search_index(connection):
+    """إنشاء فهرس البحث المناسب لمحرك قاعدة البيانات (يُستدعى من الهجرات)"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} '
+                'ON users_user USING gin (search_name gin_trgm_ops)'
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+                "search_name, content='users_user', content_rowid='id', tokenize='trigram')"
+            )
+            for statement in _sqlite_triggers():
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+def ensure_search_index(connection):
+    """إعادة تثبيت مشغلات SQLite إن فُقدت (إعادة بناء الجدول في الهجرات تحذفها)"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        # بعد التراجع عن الهجرة 0003 لا يوجد العمود الذي تفهرسه المشغلات
+        if 'users_user' not in connection.introspection.table_names(cursor):
+            return
+        columns = {column.name for column in connection.introspection.get_table_description(cursor, 'users_user')}
+        if 'search_name' not in columns:
+            return
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+            [f'{SEARCH_TABLE}_%'],
+        )
+        if cursor.fetchone()[0] < len(_sqlite_triggers()):
+            install_search_index(connection)
+
+
+def uninstall_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+def _sqlite_triggers():
+    delete_old = (
+        f'INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, search_name) '
+        "VALUES ('delete', old.id, old.search_name);"
+    )
+    insert_new = f'INSERT INTO {SEARCH_TABLE}(rowid, search_name) VALUES (new.id, new.search_name);'
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON users_user BEGIN {insert_new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON users_user BEGIN {delete_old} END',
+        f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF search_name ON users_user '
+        f'BEGIN {delete_old} {insert_new} END',
+    ]
@@ -0,0 +1,26 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import invalidate_user
+from .models import Investor, Owner, Tenant, User
+from .profiles import invalidate_profile
+from .search import ensure_search_index
+
+
+def restore_search_index(sender, using, **kwargs):
+    """التأكد من وجود فهرس البحث بعد كل ترحيل"""
+    ensure_search_index(connections[using])
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_profile(sender, instance, **kwargs):
+    invalidate_profile(instance.pk)
+    invalidate_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Owner)
+@receiver([post_save, post_delete], sender=Investor)
+@receiver([post_save, post_delete], sender=Tenant)
+def invalidate_related_profile(sender, instance, **kwargs):
+    invalidate_profile(instance.user_id)
@@ -0,0 +1,40 @@
+from django import template
+from django.utils.html import format_html
+
+from apps.users.thumbnails import LOGO_SIZES, thumbnail_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def logo_srcset(user):
+    """قيمة srcset لمصغرات شعار المستخدم، أو نص فارغ إن لم تُولَّد بعد"""
+    if not user.company_logo or not user.company_logo_hash:
+        return ''
+    return ', '.join(f'{thumbnail_url(user.company_logo_hash, size)} {size}w' for size in LOGO_SIZES)
+
+
+@register.simple_tag
+def company_logo(user, width=LOGO_SIZES[0], css_class=''):
+    """وسم img لشعار الشركة بعرض width مع srcset لمصغرات WebP
+
+    قبل توليد المصغرات يُعرض الشعار الأصلي بالعرض نفسه.
+    {% company_logo user 96 "rounded" %}
+    """
+    if not user.company_logo:
+        return ''
+    srcset = logo_srcset(user)
+    if srcset:
+        # أصغر مصغرة لا يقل عرضها عن العرض المعروض
+        size = next((size for size in LOGO_SIZES if size >= width), LOGO_SIZES[-1])
+        src = thumbnail_url(user.company_logo_hash, size)
+    else:
+        src = user.company_logo.url
+    return format_html(
+        '<img src="{}"{} width="{}" alt="{}" class="{}" loading="lazy" decoding="async">',
+        src,
+        format_html(' srcset="{}" sizes="{}px"', srcset, width) if srcset else '',
+        width,
+        user.company_name,
+        css_class,
+    )
@@ -0,0 +1,424 @@
+import csv
+import os
+import tempfile
+from datetime import date, datetime
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils.http import urlsafe_base64_decode
+
+from core.testing import (
+    assert_constant_queries,
+    capture_queries,
+    make_investor,
+    make_owner,
+    make_tenant,
+    make_user,
+)
+
+from . import backends, profiles, thumbnails
+from .importers import (
+    PASSWORD_MODE_HASH,
+    PASSWORD_MODE_INVITE,
+    UserImporter,
+    _cell_to_text,
+    read_rows,
+)
+from .models import Investor, Owner, Tenant, User
+from .utils import normalize_search_text
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+class ProfileQueryTests(TestCase):
+    """عرض قوائم المستخدمين مع ملفاتهم لا يستعلم لكل صف"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for _ in range(3):
+            make_owner()
+            make_investor()
+            make_tenant()
+        cls.staff = make_user(User.UserType.ADMIN, is_staff=True, is_superuser=True)
+
+    def test_with_profile_resolves_mixed_list_in_one_query(self):
+        def profiles(queryset):
+            return [(user.profile, str(user)) for user in queryset]
+
+        users = User.objects.with_profile().order_by('pk')
+        count = assert_constant_queries(profiles, users[:2], users[:9])
+        self.assertEqual(count, 1)
+
+    def test_profile_str_does_not_query_user(self):
+        assert_constant_queries(lambda queryset: [str(tenant) for tenant in queryset], Tenant.objects.all()[:1],
+                                Tenant.objects.all()[:3])
+
+    def test_directory_search_queries_do_not_grow_with_limit(self):
+        self.client.force_login(self.staff)
+        url = reverse('users:directory_search')
+
+        def search(limit):
+            response = self.client.get(url, {'q': 'شركة الاختبار', 'limit': limit})
+            self.assertEqual(response.status_code, 200)
+            return response.json()['results']
+
+        assert_constant_queries(search, 1, 8)
+
+    def test_directory_search_clamps_limit(self):
+        self.client.force_login(self.staff)
+        url = reverse('users:directory_search')
+        for limit, expected in (('0', 1), ('-5', 1), ('abc', 10), ('1000', 10)):
+            with self.subTest(limit=limit):
+                response = self.client.get(url, {'q': 'شركة الاختبار', 'limit': limit})
+                self.assertEqual(len(response.json()['results']), expected)
+
+    def test_profile_admin_changelists_do_not_query_per_row(self):
+        self.client.force_login(self.staff)
+        urls = [reverse(f'admin:users_{name}_changelist') for name in ('owner', 'investor', 'tenant', 'user')]
+
+        def render_all():
+            for url in urls:
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+        _, before = capture_queries(render_all)
+        for _ in range(4):
+            make_owner()
+            make_investor()
+            make_tenant()
+        _, after = capture_queries(render_all)
+        self.assertEqual(len(before), len(after))
+
+
+class SearchTests(TestCase):
+    """توحيد النص العربي للبحث وترتيب نتائج دليل المستخدمين"""
+
+    def test_normalize_letter_forms_diacritics_and_digits(self):
+        cases = {
+            'أحمد إبراهيم آل ٱلسعيد': 'احمد ابراهيم ال السعيد',
+            'مستشفى شاطئ مؤسسة': 'مستشفي شاطي موسسه',
+            'مُحَمَّدٌ الـــعُمانيّ': 'محمد العماني',
+            'سجل ١٢٣٤٥٦٧٨٩٠': 'سجل 1234567890',
+            '  Oman   LLC\t': 'oman llc',
+            None: '',
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(normalize_search_text(text), expected)
+
+    def test_search_matches_spelling_variants(self):
+        user = make_user(company_name='مؤسسة الإعمار الحديثة')
+        make_user(company_name='شركة الخليج')
+        for query in ('مؤسسه الاعمار', 'مُؤسَّسة الإِعمار', 'الأعمار'):
+            with self.subTest(query=query):
+                self.assertEqual(list(User.objects.search(query)), [user])
+
+    def test_short_terms_filter_indexed_matches(self):
+        # حرف عربي لا يظهر في البريد أو السجل التجاري المولدين
+        user = make_user(company_name='شركة النور ب')
+        make_user(company_name='شركة النور ج')
+        self.assertEqual(list(User.objects.search('النور ب')), [user])
+
+    def test_closer_matches_rank_first(self):
+        exact = make_user(company_name='الرواد', company_name_english='Pioneers')
+        partial = make_user(company_name='مجموعة الرواد للتجارة والمقاولات والخدمات العامة')
+        make_user(company_name='شركة الخليج')
+
+        results = list(User.objects.search('الرواد'))
+
+        self.assertEqual(results, [exact, partial])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+    def test_blank_query_returns_nothing(self):
+        make_user()
+        self.assertFalse(User.objects.search(' \u064e '))
+
+
+class UserImporterTests(TestCase):
+    """الاستيراد على دفعات: التحقق، التكرار، التراجع صفاً صفاً، وكلمات المرور"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_csv(self, rows):
+        path = os.path.join(self.directory.name, 'users.csv')
+        columns = sorted({key for row in rows for key in row})
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.DictWriter(handle, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    @staticmethod
+    def row(number, user_type='OWNER', **fields):
+        row = {
+            'email': f'import{number}@example.om',
+            'company_name': f'شركة مستوردة {number}',
+            'commercial_registration': f'9{number:09d}',
+            'address': 'صحار',
+            'user_type': user_type,
+        }
+        if user_type == 'TENANT':
+            row.update(company_activity='تجارة', authorized_person='المفوض', authorized_person_id='1234')
+        elif user_type == 'INVESTOR':
+            row.update(investment_date='2024-02-29', contract_duration='2')
+        row.update(fields)
+        return row
+
+    def run_import(self, rows, **options):
+        options.setdefault('batch_size', 2)
+        chunks = []
+        importer = UserImporter(on_progress=lambda result: chunks.append(result.processed), **options)
+        return importer.run(read_rows(self.write_csv(rows))), chunks
+
+    def test_csv_rows_are_validated_per_chunk(self):
+        rows = [
+            self.row(1),
+            self.row(2, user_type='ADMIN'),
+            self.row(3, 'TENANT'),
+            self.row(4, email='not-an-email'),
+            self.row(5, 'INVESTOR'),
+            self.row(6, 'TENANT', company_name=''),
+        ]
+        result, chunks = self.run_import(rows)
+
+        self.assertEqual(chunks, [2, 4, 6])
+        self.assertEqual((result.processed, result.created), (6, 3))
+        # أرقام الصفوف تبدأ من 2 (بعد صف العناوين)
+        self.assertEqual([error[0] for error in result.errors], [3, 5, 7])
+        self.assertEqual(Owner.objects.count(), 1)
+        self.assertEqual(Tenant.objects.count(), 1)
+        investor = Investor.objects.get()
+        self.assertEqual(investor.contract_end_date, date(2026, 2, 28))
+        self.assertTrue(User.objects.filter(email='import3@example.om').exclude(search_name='').exists())
+
+    def test_duplicates_within_chunk_across_chunks_and_in_database(self):
+        make_user(email='existing@example.om')
+        rows = [
+            self.row(1),
+            self.row(2, email='import1@example.om'),
+            self.row(3, commercial_registration='9000000001'),
+            self.row(4, email='existing@example.om'),
+            self.row(5),
+        ]
+        result, _chunks = self.run_import(rows)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([error[0] for error in result.errors], [3, 4, 5])
+        self.assertEqual(
+            set(User.objects.filter(email__startswith='import').values_list('email', flat=True)),
+            {'import1@example.om', 'import5@example.om'},
+        )
+
+    def test_integrity_error_falls_back_to_row_by_row(self):
+        # تعارض متزامن: صف أضافته عملية أخرى بعد فحص التكرار
+        make_user(email='import2@example.om')
+        rows = [self.row(1), self.row(2), self.row(3)]
+        with mock.patch.object(UserImporter, '_drop_duplicates', side_effect=lambda entries, _result: entries):
+            result, _chunks = self.run_import(rows, batch_size=10)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([error[0] for error in result.errors], [3])
+        self.assertEqual(Owner.objects.count(), 2)
+        self.assertEqual(User.objects.filter(email='import2@example.om').count(), 1)
+
+    def test_hash_mode_hashes_password_column(self):
+        rows = [self.row(1, password='Secret-2024'), self.row(2)]
+        result, _chunks = self.run_import(rows, password_mode=PASSWORD_MODE_HASH)
+
+        self.assertEqual(result.created, 2)
+        self.assertTrue(User.objects.get(email='import1@example.om').check_password('Secret-2024'))
+        self.assertFalse(User.objects.get(email='import2@example.om').has_usable_password())
+
+    def test_invite_mode_issues_tokens_instead_of_passwords(self):
+        invites = []
+        rows = [self.row(1, password='ignored'), self.row(2)]
+        importer = UserImporter(batch_size=2, password_mode=PASSWORD_MODE_INVITE, on_invites=invites.extend)
+        result = importer.run(read_rows(self.write_csv(rows)))
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([email for email, _uid, _token in invites], ['import1@example.om', 'import2@example.om'])
+        for email, uid, token in invites:
+            user = User.objects.get(email=email)
+            self.assertFalse(user.has_usable_password())
+            self.assertEqual(urlsafe_base64_decode(uid).decode(), str(user.pk))
+            self.assertTrue(default_token_generator.check_token(user, token))
+
+    def test_xlsx_cells_are_normalized_like_csv(self):
+        self.assertEqual(_cell_to_text(1234567.0), '1234567')
+        self.assertEqual(_cell_to_text(datetime(2024, 3, 1, 10, 30)), '2024-03-01')
+        self.assertEqual(_cell_to_text(None), '')
+        self.assertEqual(_cell_to_text(' نص '), 'نص')
+
+    @skipUnless(openpyxl, 'openpyxl غير مثبتة')
+    def test_xlsx_import(self):
+        path = os.path.join(self.directory.name, 'users.xlsx')
+        rows = [self.row(1), self.row(2, commercial_registration=None), self.row(3, 'TENANT')]
+        columns = list(rows[0]) + ['company_activity', 'authorized_person', 'authorized_person_id']
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(columns)
+        for row in rows:
+            sheet.append([row.get(column) for column in columns])
+        # سجل تجاري رقمي كما يخزنه Excel
+        sheet.cell(row=3, column=columns.index('commercial_registration') + 1, value=9000000002.0)
+        workbook.save(path)
+
+        result = UserImporter(batch_size=2).run(read_rows(path))
+
+        self.assertEqual((result.created, result.errors), (3, []))
+        self.assertTrue(User.objects.filter(commercial_registration='9000000002').exists())
+
+
+class ThumbnailCacheTests(TestCase):
+    def setUp(self):
+        self.cache = caches[settings.PROFILE_CACHE_ALIAS]
+        self.cache.clear()
+        self.user = make_user(company_logo='logos/old.png')
+
+    def remember(self):
+        # داخل معاملة الاختبار لا تُخزن القراءات، فتُوضع النسخ المخزنة مباشرة
+        self.cache.set(backends.user_key(self.user.pk), backends._pack(User.objects.get(pk=self.user.pk)))
+        self.cache.set(profiles.cache_key(self.user.pk), profiles._pack(self.user))
+
+    def assert_forgotten(self):
+        self.assertIsNone(self.cache.get(backends.user_key(self.user.pk)))
+        self.assertIsNone(self.cache.get(profiles.cache_key(self.user.pk)))
+        self.assertEqual(backends.cached_user(self.user.pk).company_logo_hash, 'f' * 64)
+
+    @mock.patch('apps.users.thumbnails.generate_thumbnails', return_value='f' * 64)
+    def test_process_logo_invalidates_cached_user(self, _generate):
+        self.remember()
+        self.assertEqual(thumbnails.process_logo(self.user.pk, 'logos/old.png'), 'f' * 64)
+        self.assert_forgotten()
+
+    @mock.patch('apps.users.thumbnails.generate_thumbnails', return_value='f' * 64)
+    def test_backfill_invalidates_cached_users(self, _generate):
+        self.remember()
+        processed, errors = thumbnails.backfill_thumbnails()
+        self.assertEqual((processed, errors), (1, []))
+        self.assert_forgotten()
+
+
+@override_settings(
+    AUTHENTICATION_BACKENDS=['apps.users.backends.CachedModelBackend'], AUTH_USER_CACHE_ENABLED=True
+)
+class CachedBackendTests(TransactionTestCase):
+    """خارج معاملة الاختبار كي تُخزن القراءات كما في الطلبات الفعلية"""
+
+    password = 'Secret-2024'
+
+    def setUp(self):
+        self.cache = caches[settings.PROFILE_CACHE_ALIAS]
+        self.cache.clear()
+        self.addCleanup(self.cache.clear)
+        self.user = make_user(password=self.password)
+        self.backend = backends.CachedModelBackend()
+
+    def login(self):
+        return self.backend.authenticate(None, username=self.user.email, password=self.password)
+
+    def test_cache_holds_no_password(self):
+        self.assertEqual(self.login(), self.user)
+        row = self.cache.get(backends.user_key(self.user.pk))
+        self.assertNotIn(self.user.password, row)
+        self.assertNotIn(self.user.password.split('$')[-1], repr(row))
+
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.pk)
+            session_hash = user.get_session_auth_hash()
+        self.assertEqual(user.email, self.user.email)
+        self.assertIn('password', user.get_deferred_fields())
+        self.assertEqual(session_hash, self.user.get_session_auth_hash())
+
+        # كلمة المرور الجديدة تغير بصمة الجلسة ولو كان المستخدم مستعاداً من الذاكرة
+        user.set_password('Changed-2024')
+        self.assertNotEqual(user.get_session_auth_hash(), session_hash)
+
+    def test_session_uses_cached_user_until_password_changes(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        self.assertTrue(self.client.login(email=self.user.email, password=self.password))
+        url = reverse('users:directory_search')
+        self.assertEqual(self.client.get(url, {'q': 'شركة'}).status_code, 200)
+
+        _response, queries = capture_queries(lambda: self.client.get(url, {'q': 'شركة'}))
+        # استعلام البحث وحده يقرأ جدول المستخدمين؛ مستخدم الجلسة من الذاكرة
+        self.assertEqual([query for query in queries if '"users_user"."id" =' in query], [])
+
+        self.user.set_password('Changed-2024')
+        self.user.save(update_fields=['password'])
+        self.assertEqual(self.client.get(url, {'q': 'شركة'}).status_code, 302)
+
+    def test_bulk_update_invalidates_cached_user(self):
+        self.login()
+        self.assertIsNotNone(self.backend.get_user(self.user.pk))
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertIsNone(self.cache.get(backends.user_key(self.user.pk)))
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_bulk_update_helper_invalidates_cached_user(self):
+        self.login()
+        self.user.company_name = 'اسم جديد'
+        User.objects.bulk_update([self.user], ['company_name'])
+        self.assertEqual(self.backend.get_user(self.user.pk).company_name, 'اسم جديد')
+
+    def test_save_and_delete_invalidate_cached_user(self):
+        self.login()
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+        self.user.delete()
+        self.assertIsNone(self.cache.get(backends.user_key(self.user.pk)))
+
+    @override_settings(AUTH_USER_CACHE_ENABLED=False)
+    def test_process_local_cache_is_not_used(self):
+        # دون ذاكرة مشتركة يُقرأ المستخدم من قاعدة البيانات في كل طلب كما في ModelBackend
+        self.assertEqual(self.login(), self.user)
+        self.assertIsNone(self.cache.get(backends.user_key(self.user.pk)))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        self.assertIsNone(self.cache.get(backends.user_key(self.user.pk)))
+
+        # تعطيل الحساب من عملية أخرى (دون إبطال يصل إلى هذه العملية) يسري فوراً
+        with mock.patch.object(backends, 'invalidate_users'):
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+
+@override_settings(LOGIN_RATE_LIMIT=(0.5, 2))
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        self.url = reverse('users:login')
+
+    def attempt(self, address='10.0.0.1'):
+        return self.client.post(
+            self.url, {'username': 'nobody@example.om', 'password': 'wrong'}, REMOTE_ADDR=address
+        )
+
+    def test_burst_is_throttled_per_address(self):
+        self.assertEqual([self.attempt().status_code for _ in range(2)], [200, 200])
+
+        response = self.attempt()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '3')
+        self.assertEqual(self.attempt('10.0.0.2').status_code, 200)
+
+    @mock.patch('apps.users.backends.CachedModelBackend.authenticate')
+    def test_throttled_attempt_does_not_check_password(self, authenticate):
+        authenticate.return_value = None
+        for _ in range(3):
+            self.attempt()
+        self.assertEqual(authenticate.call_count, 2)
@@ -0,0 +1,154 @@
+"""صور مصغرة WebP لشعارات الشركات بأحجام ثابتة
+
+تُحفظ المصغرات تحت مسار مشتق من بصمة SHA-256 لمحتوى الشعار، فالشعار نفسه لا يُعالج
+مرتين ولو رُفع لأكثر من حساب، والحجم الموجود مسبقاً يُتخطى. بعد رفع شعار جديد تُولَّد
+المصغرات في مجموعة خيوط بالخلفية بعد تأكيد المعاملة، ثم تُسجل البصمة في حساب المستخدم
+فتبدأ القوالب باستخدام المصغرات (وحتى ذلك الحين تعرض الشعار الأصلي).
+"""
+import hashlib
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection
+
+from core.batching import process_batches
+
+logger = logging.getLogger(__name__)
+
+# عرض كل مصغرة بالبكسل (يُحفظ تناسب الأبعاد)
+LOGO_SIZES = (48, 96, 192)
+THUMBNAIL_PREFIX = 'thumbnails/logos'
+WEBP_QUALITY = 80
+CHUNK_SIZE = 64 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def thumbnail_name(sha256, size):
+    return f'{THUMBNAIL_PREFIX}/{sha256[:2]}/{sha256}/{size}.webp'
+
+
+def thumbnail_url(sha256, size):
+    return default_storage.url(thumbnail_name(sha256, size))
+
+
+def file_hash(name, chunk_size=CHUNK_SIZE):
+    """بصمة SHA-256 لملف في التخزين بقراءته على أجزاء"""
+    digest = hashlib.sha256()
+    with default_storage.open(name, 'rb') as source:
+        for chunk in iter(lambda: source.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generate_thumbnails(source_name, sizes=LOGO_SIZES, force=False):
+    """توليد المصغرات الناقصة لشعار في التخزين؛ يعيد بصمة محتواه"""
+    from PIL import Image, ImageOps
+
+    sha256 = file_hash(source_name)
+    missing = [
+        size for size in sizes
+        if force or not default_storage.exists(thumbnail_name(sha256, size))
+    ]
+    if not missing:
+        return sha256
+
+    with default_storage.open(source_name, 'rb') as source, Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+        for size in missing:
+            thumbnail = image.copy()
+            # لا يُكبَّر شعار أصغر من الحجم المطلوب
+            if thumbnail.width > size:
+                thumbnail = thumbnail.resize(
+                    (size, max(1, round(thumbnail.height * size / thumbnail.width))),
+                    Image.Resampling.LANCZOS,
+                )
+            name = thumbnail_name(sha256, size)
+            with tempfile.SpooledTemporaryFile() as target:
+                thumbnail.save(target, 'WEBP', quality=WEBP_QUALITY, method=4)
+                target.seek(0)
+                if default_storage.exists(name):
+                    default_storage.delete(name)
+                default_storage.save(name, File(target, name=f'{size}.webp'))
+    return sha256
+
+
+def process_logo(user_id, source_name):
+    """توليد مصغرات شعار مستخدم وتسجيل بصمته إن لم يتغير الشعار أثناء المعالجة"""
+    from .models import User
+
+    sha256 = generate_thumbnails(source_name)
+    # UserQuerySet.update يبطل ملف المستخدم ونسخته المخزنة للمصادقة
+    User.objects.filter(pk=user_id, company_logo=source_name).update(company_logo_hash=sha256)
+    return sha256
+
+
+def _process_in_background(user_id, source_name):
+    close_old_connections()
+    try:
+        process_logo(user_id, source_name)
+    except Exception:  # شعار تالف لا يوقف الخيط؛ يبقى الشعار الأصلي معروضاً
+        logger.exception('تعذر توليد مصغرات شعار المستخدم %s', user_id)
+    finally:
+        # اتصالات خيوط المجموعة لا تمر بدورة الطلب فتُغلق يدوياً
+        connection.close()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.LOGO_THUMBNAIL_WORKERS,
+                thread_name_prefix='logo-thumbnails',
+            )
+        return _executor
+
+
+def schedule_thumbnails(user_id, source_name):
+    """جدولة توليد المصغرات في الخلفية؛ عند LOGO_THUMBNAIL_WORKERS = 0 يتم التوليد فوراً"""
+    if settings.LOGO_THUMBNAIL_WORKERS:
+        return _get_executor().submit(_process_in_background, user_id, source_name)
+    _process_in_background(user_id, source_name)
+    return None
+
+
+def _generate_for_backfill(row, force=False):
+    return row['company_logo'], generate_thumbnails(row['company_logo'], force=force)
+
+
+def backfill_thumbnails(users=None, batch_size=200, workers=None, force=False, on_batch=None):
+    """توليد مصغرات الشعارات الموجودة بالتوازي؛ يعيد (عدد المعالَج، قائمة الأخطاء)
+
+    العمليات تقرأ من التخزين وتكتب إليه فقط، وتُسجل البصمات في العملية الرئيسية بعد كل دفعة.
+    """
+    from .models import User
+
+    queryset = User.objects.exclude(company_logo='').exclude(company_logo__isnull=True)
+    if users is not None:
+        queryset = queryset.filter(pk__in=users)
+    if not force:
+        queryset = queryset.filter(company_logo_hash='')
+
+    def save(results):
+        for user_id, (source_name, sha256) in results:
+            # مشروط بعدم تغيير الشعار منذ القراءة
+            User.objects.filter(pk=user_id, company_logo=source_name).update(company_logo_hash=sha256)
+
+    return process_batches(
+        queryset.values('pk', 'company_logo'),
+        partial(_generate_for_backfill, force=force),
+        save,
+        batch_size,
+        workers=workers,
+        on_batch=on_batch,
+    )
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'users'
+
+urlpatterns = [
+    path('login/', views.LoginView.as_view(), name='login'),
+    path('search/', views.directory_search, name='directory_search'),
+]
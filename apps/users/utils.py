@@ -0,0 +1,29 @@
+import re
+
+# التشكيل (الفتحة، الضمة، الكسرة، التنوين، الشدة، السكون...) والألف الخنجرية والتطويل
+ARABIC_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+
+ARABIC_LETTER_FORMS = str.maketrans({
+    'أ': 'ا',
+    'إ': 'ا',
+    'آ': 'ا',
+    'ٱ': 'ا',
+    'ى': 'ي',
+    'ئ': 'ي',
+    'ؤ': 'و',
+    'ة': 'ه',
+    # الأرقام العربية الهندية
+    '٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
+    '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9',
+})
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_search_text(text):
+    """توحيد النص للبحث: إزالة التشكيل وتوحيد أشكال الألف والياء والتاء المربوطة وتصغير الحروف اللاتينية"""
+    if not text:
+        return ''
+    text = ARABIC_DIACRITICS.sub('', str(text))
+    text = text.translate(ARABIC_LETTER_FORMS).casefold()
+    return WHITESPACE.sub(' ', text).strip()
@@ -1,3 +1,71 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth import views as auth_views
+from django.http import JsonResponse
 
-# Create your views here.
+from core.ratelimit import CacheTokenBucket
+
+from .models import User
+
+SEARCH_RESULTS_LIMIT = 20
+SEARCH_RESULTS_MAX = 100
+
+
+@staff_member_required
+def directory_search(request):
+    """بحث الموظفين في دليل المستخدمين بالعربية أو الإنجليزية"""
+    try:
+        limit = max(1, min(int(request.GET.get('limit', SEARCH_RESULTS_LIMIT)), SEARCH_RESULTS_MAX))
+    except ValueError:
+        limit = SEARCH_RESULTS_LIMIT
+
+    users = User.objects.search(request.GET.get('q', '')).only(
+        'email', 'company_name', 'company_name_english', 'commercial_registration', 'user_type'
+    )[:limit]
+    return JsonResponse({
+        'results': [
+            {
+                'id': user.pk,
+                'email': user.email,
+                'company_name': user.company_name,
+                'company_name_english': user.company_name_english,
+                'commercial_registration': user.commercial_registration,
+                'user_type': user.user_type,
+                'rank': user.search_rank,
+            }
+            for user in users
+        ]
+    })
+
+
+def client_ip(request):
+    """عنوان العميل؛ خلف وكلاء موثوقين (TRUSTED_PROXY_COUNT) يُؤخذ من X-Forwarded-For"""
+    proxies = settings.TRUSTED_PROXY_COUNT
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        addresses = [address.strip() for address in forwarded.split(',')]
+        # كل وكيل موثوق يضيف عنوان من قبله في آخر القائمة
+        return addresses[-min(proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def login_bucket():
+    rate, capacity = settings.LOGIN_RATE_LIMIT
+    return CacheTokenBucket(rate, capacity, prefix='login')
+
+
+class LoginView(auth_views.LoginView):
+    """تسجيل الدخول بالبريد مع تحديد معدل المحاولات لكل عنوان IP (LOGIN_RATE_LIMIT)"""
+
+    template_name = 'users/login.html'
+    redirect_authenticated_user = True
+
+    def post(self, request, *args, **kwargs):
+        if not login_bucket().consume(client_ip(request)):
+            # الرفض قبل التحقق من النموذج فلا تُجزَّأ كلمة المرور
+            # نموذج غير مربوط: عرض أخطاء النموذج المربوط يستدعي authenticate
+            form = self.get_form_class()(request, initial={'username': request.POST.get('username', '')})
+            response = self.render_to_response(self.get_context_data(form=form, throttled=True), status=429)
+            response['Retry-After'] = str(int(1 / settings.LOGIN_RATE_LIMIT[0]) + 1)
+            return response
+        return super().post(request, *args, **kwargs)
@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Building, OccupancySnapshot
+
+
+@admin.register(Building)
+class BuildingAdmin(admin.ModelAdmin):
+    list_display = ('name', 'owner', 'building_type', 'city')
+    list_filter = ('building_type', 'city')
+    list_select_related = ('owner__user',)
+    search_fields = ('name', 'name_english')
+
+
+@admin.register(OccupancySnapshot)
+class OccupancySnapshotAdmin(admin.ModelAdmin):
+    list_display = ('building', 'unit_type', 'month', 'total_units', 'occupied_units', 'occupancy_rate')
+    list_filter = ('unit_type', 'month')
+    list_select_related = ('building',)
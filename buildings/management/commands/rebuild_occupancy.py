@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from buildings.occupancy import rebuild_snapshots
+from core.dates import parse_month
+
+
+class Command(BaseCommand):
+    help = 'إعادة حساب لقطات الإشغال الشهرية لفترة محددة من سجل تغيّرات حالة الوحدات'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help='الشهر الأول بالصيغة YYYY-MM')
+        parser.add_argument('--end', help='الشهر الأخير بالصيغة YYYY-MM (الافتراضي: الشهر الحالي)')
+        parser.add_argument('--building', type=int, action='append', dest='buildings', help='تقييد إعادة البناء بمبنى (يمكن تكراره)')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_month(options['start'])
+            end = parse_month(options['end']) if options['end'] else timezone.localdate()
+        except (ValueError, IndexError) as exc:
+            raise CommandError(f'صيغة شهر غير صحيحة: {exc}') from exc
+        if start > end:
+            raise CommandError('يجب أن يسبق الشهر الأول الشهر الأخير')
+
+        started = time.monotonic()
+        written = rebuild_snapshots(start, end, options['buildings'], options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'تمت كتابة {written} لقطة خلال {time.monotonic() - started:.1f} ث'
+        ))
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0003_user_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Building',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='الاسم المعتمد للمبنى', max_length=150, verbose_name='اسم المبنى')),
+                ('name_english', models.CharField(blank=True, help_text='اسم المبنى باللغة الإنجليزية إن وجد', max_length=150, null=True, verbose_name='اسم المبنى (الإنجليزية)')),
+                ('building_type', models.CharField(choices=[('RESIDENTIAL', 'سكني'), ('COMMERCIAL', 'تجاري'), ('MIXED', 'متعدد الاستخدامات'), ('WAREHOUSE', 'مستودعات')], default='RESIDENTIAL', help_text='الاستخدام الرئيسي للمبنى', max_length=20, verbose_name='نوع المبنى')),
+                ('city', models.CharField(default='مسقط', help_text='المدينة التي يقع فيها المبنى', max_length=50, verbose_name='المدينة')),
+                ('address', models.TextField(help_text='عنوان المبنى', verbose_name='العنوان التفصيلي')),
+                ('floors_count', models.PositiveSmallIntegerField(default=1, help_text='إجمالي عدد طوابق المبنى', verbose_name='عدد الطوابق')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإضافة')),
+                ('owner', models.ForeignKey(help_text='المالك المسؤول عن المبنى', on_delete=django.db.models.deletion.PROTECT, related_name='buildings', to='users.owner', verbose_name='المالك')),
+            ],
+            options={
+                'verbose_name': 'مبنى',
+                'verbose_name_plural': 'المباني',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OccupancySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_type', models.CharField(choices=[('APARTMENT', 'شقة'), ('OFFICE', 'مكتب'), ('SHOP', 'محل تجاري'), ('WAREHOUSE', 'مستودع')], max_length=20, verbose_name='نوع الوحدة')),
+                ('month', models.DateField(help_text='أول يوم في الشهر', verbose_name='الشهر')),
+                ('total_units', models.PositiveIntegerField(default=0, verbose_name='إجمالي الوحدات')),
+                ('occupied_units', models.PositiveIntegerField(default=0, verbose_name='الوحدات المؤجرة')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='آخر تحديث')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy_snapshots', to='buildings.building', verbose_name='المبنى')),
+            ],
+            options={
+                'verbose_name': 'لقطة إشغال',
+                'verbose_name_plural': 'لقطات الإشغال',
+                'ordering': ['-month', 'building'],
+                'indexes': [models.Index(fields=['month', 'building'], name='buildings_o_month_2ef04f_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='occupancysnapshot',
+            constraint=models.UniqueConstraint(fields=('building', 'unit_type', 'month'), name='unique_occupancy_snapshot'),
+        ),
+    ]
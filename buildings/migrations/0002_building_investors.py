@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_search_name'),
+        ('buildings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='building',
+            name='investors',
+            field=models.ManyToManyField(blank=True, help_text='المستثمرون المشاركون في أرباح المبنى', related_name='buildings', to='users.investor', verbose_name='المستثمرون'),
+        ),
+    ]
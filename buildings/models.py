@@ -1,3 +1,133 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from units.models import Unit
+
+
+class Building(models.Model):
+    """نموذج المبنى"""
+
+    class BuildingType(models.TextChoices):
+        RESIDENTIAL = 'RESIDENTIAL', _('سكني')
+        COMMERCIAL = 'COMMERCIAL', _('تجاري')
+        MIXED = 'MIXED', _('متعدد الاستخدامات')
+        WAREHOUSE = 'WAREHOUSE', _('مستودعات')
+
+    name = models.CharField(
+        _('اسم المبنى'),
+        max_length=150,
+        help_text=_('الاسم المعتمد للمبنى')
+    )
+    name_english = models.CharField(
+        _('اسم المبنى (الإنجليزية)'),
+        max_length=150,
+        blank=True,
+        null=True,
+        help_text=_('اسم المبنى باللغة الإنجليزية إن وجد')
+    )
+    owner = models.ForeignKey(
+        'users.Owner',
+        on_delete=models.PROTECT,
+        related_name='buildings',
+        verbose_name=_('المالك'),
+        help_text=_('المالك المسؤول عن المبنى')
+    )
+    investors = models.ManyToManyField(
+        'users.Investor',
+        blank=True,
+        related_name='buildings',
+        verbose_name=_('المستثمرون'),
+        help_text=_('المستثمرون المشاركون في أرباح المبنى')
+    )
+    building_type = models.CharField(
+        _('نوع المبنى'),
+        max_length=20,
+        choices=BuildingType.choices,
+        default=BuildingType.RESIDENTIAL,
+        help_text=_('الاستخدام الرئيسي للمبنى')
+    )
+    city = models.CharField(
+        _('المدينة'),
+        max_length=50,
+        default='مسقط',
+        help_text=_('المدينة التي يقع فيها المبنى')
+    )
+    address = models.TextField(
+        _('العنوان التفصيلي'),
+        help_text=_('عنوان المبنى')
+    )
+    floors_count = models.PositiveSmallIntegerField(
+        _('عدد الطوابق'),
+        default=1,
+        help_text=_('إجمالي عدد طوابق المبنى')
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإضافة'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('مبنى')
+        verbose_name_plural = _('المباني')
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class OccupancySnapshot(models.Model):
+    """لقطة إشغال شهرية محسوبة مسبقاً لكل مبنى ونوع وحدة
+
+    تُحدَّث تدريجياً عند تغيّر حالة أي وحدة، وتُعاد بناؤها بالأمر rebuild_occupancy.
+    """
+    building = models.ForeignKey(
+        Building,
+        on_delete=models.CASCADE,
+        related_name='occupancy_snapshots',
+        verbose_name=_('المبنى')
+    )
+    unit_type = models.CharField(
+        _('نوع الوحدة'),
+        max_length=20,
+        choices=Unit.UnitType.choices
+    )
+    month = models.DateField(
+        _('الشهر'),
+        help_text=_('أول يوم في الشهر')
+    )
+    total_units = models.PositiveIntegerField(
+        _('إجمالي الوحدات'),
+        default=0
+    )
+    occupied_units = models.PositiveIntegerField(
+        _('الوحدات المؤجرة'),
+        default=0
+    )
+    updated_at = models.DateTimeField(
+        _('آخر تحديث'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('لقطة إشغال')
+        verbose_name_plural = _('لقطات الإشغال')
+        ordering = ['-month', 'building']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['building', 'unit_type', 'month'],
+                name='unique_occupancy_snapshot',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'building']),
+        ]
+
+    def __str__(self):
+        return f"{self.building} - {self.get_unit_type_display()} ({self.month:%Y-%m})"
+
+    @property
+    def occupancy_rate(self):
+        """نسبة الإشغال المئوية"""
+        if not self.total_units:
+            return 0
+        return round(self.occupied_units * 100 / self.total_units, 2)
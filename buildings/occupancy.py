@@ -0,0 +1,188 @@
+"""لقطات الإشغال الشهرية: تحديث تدريجي عند تغيّر الوحدات، إعادة بناء جماعية، وقراءة للوحات المعلومات"""
+from collections import defaultdict
+from datetime import datetime, time
+from itertools import groupby
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from core.dates import add_months, iter_months, month_start
+from units.models import Unit, UnitStatusChange
+
+from .models import OccupancySnapshot
+
+
+def apply_occupancy_delta(building_id, unit_type, total_delta, occupied_delta, month=None):
+    """تطبيق فرق الإشغال على لقطة الشهر الحالي دون إعادة عد الوحدات"""
+    if not total_delta and not occupied_delta:
+        return
+    month = month or month_start(timezone.localdate())
+    snapshot = OccupancySnapshot.objects.filter(building_id=building_id, unit_type=unit_type, month=month)
+    with transaction.atomic():
+        updated = snapshot.update(
+            total_units=F('total_units') + total_delta,
+            occupied_units=F('occupied_units') + occupied_delta,
+        )
+        if updated:
+            return
+        # أول تغيير لهذه الفئة في الشهر: تُزرع اللقطة من العد الحالي الذي يتضمن التغيير بالفعل
+        try:
+            with transaction.atomic():
+                OccupancySnapshot.objects.create(
+                    building_id=building_id,
+                    unit_type=unit_type,
+                    month=month,
+                    **_count_units(building_id, unit_type),
+                )
+        except IntegrityError:
+            # أنشأتها عملية متزامنة قبل أن يُحتسب هذا التغيير
+            snapshot.update(
+                total_units=F('total_units') + total_delta,
+                occupied_units=F('occupied_units') + occupied_delta,
+            )
+
+
+def _count_units(building_id, unit_type):
+    return Unit.objects.filter(building_id=building_id, unit_type=unit_type).aggregate(
+        total_units=Count('pk'),
+        occupied_units=Count('pk', filter=Q(status=Unit.Status.OCCUPIED)),
+    )
+
+
+def record_unit_change(unit, created, previous_state):
+    """تحديث اللقطات وسجل الحالة بعد حفظ وحدة"""
+    occupied = int(unit.status == Unit.Status.OCCUPIED)
+    if created:
+        apply_occupancy_delta(unit.building_id, unit.unit_type, 1, occupied)
+        UnitStatusChange.objects.create(unit=unit, status=unit.status, changed_at=unit.status_changed_at)
+        return
+
+    old_building_id, old_unit_type, old_status = previous_state
+    was_occupied = int(old_status == Unit.Status.OCCUPIED)
+    if (old_building_id, old_unit_type) != (unit.building_id, unit.unit_type):
+        apply_occupancy_delta(old_building_id, old_unit_type, -1, -was_occupied)
+        apply_occupancy_delta(unit.building_id, unit.unit_type, 1, occupied)
+    elif occupied != was_occupied:
+        apply_occupancy_delta(unit.building_id, unit.unit_type, 0, occupied - was_occupied)
+
+    if old_status != unit.status:
+        UnitStatusChange.objects.create(unit=unit, status=unit.status, changed_at=unit.status_changed_at)
+
+
+def rebuild_snapshots(start, end, building_ids=None, chunk_size=2000):
+    """إعادة حساب لقطات الأشهر من start حتى end من سجل تغيّرات الحالة
+
+    تُقرأ التغيّرات مرتبة حسب الوحدة على دفعات، وتُحسب حالة كل وحدة في نهاية كل شهر،
+    ثم تُستبدل لقطات الفترة بإدراج جماعي واحد. يعيد عدد اللقطات المكتوبة.
+    """
+    months = list(iter_months(start, end))
+    if not months:
+        return 0
+    tz = timezone.get_current_timezone()
+    boundaries = [
+        timezone.make_aware(datetime.combine(add_months(month, 1), time.min), tz)
+        for month in months
+    ]
+
+    changes = UnitStatusChange.objects.filter(changed_at__lt=boundaries[-1])
+    if building_ids:
+        changes = changes.filter(unit__building_id__in=building_ids)
+    rows = changes.order_by('unit_id', 'changed_at').values_list(
+        'unit_id', 'unit__building_id', 'unit__unit_type', 'status', 'changed_at'
+    ).iterator(chunk_size=chunk_size)
+
+    counters = defaultdict(lambda: [0, 0])
+    for _unit_id, unit_changes in groupby(rows, key=lambda row: row[0]):
+        unit_changes = list(unit_changes)
+        building_id, unit_type = unit_changes[0][1], unit_changes[0][2]
+        position, status = 0, None
+        for month, boundary in zip(months, boundaries, strict=True):
+            while position < len(unit_changes) and unit_changes[position][4] < boundary:
+                status = unit_changes[position][3]
+                position += 1
+            if status is None:
+                # الوحدة لم تكن موجودة بعد في هذا الشهر
+                continue
+            counter = counters[(building_id, unit_type, month)]
+            counter[0] += 1
+            counter[1] += status == Unit.Status.OCCUPIED
+
+    snapshots = [
+        OccupancySnapshot(
+            building_id=building_id,
+            unit_type=unit_type,
+            month=month,
+            total_units=total,
+            occupied_units=occupied,
+        )
+        for (building_id, unit_type, month), (total, occupied) in counters.items()
+    ]
+    existing = OccupancySnapshot.objects.filter(month__range=(months[0], months[-1]))
+    if building_ids:
+        existing = existing.filter(building_id__in=building_ids)
+    with transaction.atomic():
+        existing.delete()
+        OccupancySnapshot.objects.bulk_create(snapshots, batch_size=chunk_size)
+    return len(snapshots)
+
+
+def occupancy_summary(start, end, buildings=None, by_building=False, by_unit_type=False):
+    """قراءة الإشغال الشهري من اللقطات المحسوبة مسبقاً دون عد الوحدات
+
+    اللقطة تُكتب فقط في الأشهر التي تتغير فيها الفئة، لذا تُرحَّل آخر لقطة سابقة
+    لكل فئة إلى الأشهر التالية التي لا تملك لقطة.
+    """
+    months = list(iter_months(start, end))
+    if not months:
+        return []
+    snapshots = OccupancySnapshot.objects.all()
+    if buildings is not None:
+        snapshots = snapshots.filter(building__in=buildings)
+
+    fields = ('building_id', 'unit_type', 'month', 'total_units', 'occupied_units')
+    last_before_start = OccupancySnapshot.objects.filter(
+        building_id=OuterRef('building_id'),
+        unit_type=OuterRef('unit_type'),
+        month__lt=months[0],
+    ).order_by('-month').values('month')[:1]
+    rows = snapshots.filter(
+        Q(month__range=(months[0], months[-1]))
+        | Q(month__lt=months[0], month=Subquery(last_before_start))
+    ).values_list(*fields)
+
+    by_bucket = defaultdict(dict)
+    for building_id, unit_type, month, total, occupied in rows:
+        by_bucket[(building_id, unit_type)][month] = (total, occupied)
+
+    totals = defaultdict(lambda: [0, 0])
+    for (building_id, unit_type), history in by_bucket.items():
+        current = None
+        earlier = [month for month in history if month < months[0]]
+        if earlier:
+            current = history[max(earlier)]
+        for month in months:
+            current = history.get(month, current)
+            if current is None:
+                continue
+            key = (
+                month,
+                building_id if by_building else None,
+                unit_type if by_unit_type else None,
+            )
+            totals[key][0] += current[0]
+            totals[key][1] += current[1]
+
+    return [
+        {
+            'month': month,
+            'building_id': building_id,
+            'unit_type': unit_type,
+            'total_units': total,
+            'occupied_units': occupied,
+            'occupancy_rate': round(occupied * 100 / total, 2) if total else 0,
+        }
+        for (month, building_id, unit_type), (total, occupied) in sorted(
+            totals.items(), key=lambda item: (item[0][0], item[0][1] or 0, item[0][2] or '')
+        )
+    ]
@@ -1,3 +1,38 @@
+from datetime import date
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import make_unit, make_user
+from units.models import Unit
+
+from .occupancy import occupancy_summary, rebuild_snapshots
+
+
+class OccupancyDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = make_user(is_staff=True)
+        make_unit(status=Unit.Status.OCCUPIED)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+        self.url = reverse('buildings:occupancy_dashboard')
+
+    def test_reversed_range_is_rejected(self):
+        response = self.client.get(self.url, {'start': '2024-06', 'end': '2024-01'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_single_month_range(self):
+        today = timezone.localdate().strftime('%Y-%m')
+        response = self.client.get(self.url, {'start': today, 'end': today})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row['month'], row['occupied_units']) for row in response.json()['results']],
+            [(today, 1)],
+        )
 
-# Create your tests here.
+    def test_empty_range_reads_and_writes_nothing(self):
+        self.assertEqual(occupancy_summary(date(2024, 6, 1), date(2024, 1, 1)), [])
+        self.assertEqual(rebuild_snapshots(date(2024, 6, 1), date(2024, 1, 1)), 0)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'buildings'
+
+urlpatterns = [
+    path('occupancy/', views.occupancy_dashboard, name='occupancy_dashboard'),
+]
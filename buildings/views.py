@@ -1,3 +1,41 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
+from django.utils import timezone
 
-# Create your views here.
+from config.routers import read_from_replica
+from core.dates import add_months, parse_month
+
+from .models import Building
+from .occupancy import occupancy_summary
+
+
+@login_required
+def occupancy_dashboard(request):
+    """نسب الإشغال الشهرية لمحفظة المباني من اللقطات المحسوبة مسبقاً"""
+    if request.user.is_staff:
+        buildings = None
+    elif request.user.user_type == request.user.UserType.OWNER:
+        buildings = Building.objects.filter(owner__user=request.user)
+    else:
+        return HttpResponseForbidden()
+
+    try:
+        end = parse_month(request.GET['end']) if 'end' in request.GET else timezone.localdate()
+        start = parse_month(request.GET['start']) if 'start' in request.GET else add_months(end, -11)
+    except (ValueError, IndexError):
+        return HttpResponseBadRequest()
+    if start > end:
+        return HttpResponseBadRequest()
+
+    group_by = request.GET.getlist('by')
+    with read_from_replica():
+        rows = occupancy_summary(
+            start,
+            end,
+            buildings=buildings,
+            by_building='building' in group_by,
+            by_unit_type='unit_type' in group_by,
+        )
+    for row in rows:
+        row['month'] = row['month'].strftime('%Y-%m')
+    return JsonResponse({'results': rows})
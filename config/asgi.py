@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# تحميل كتالوجات العربية والإنجليزية عند بدء العامل بدلاً من أول طلب بكل لغة
+from core.i18n import warm_translations  # noqa: E402
+
+warm_translations()
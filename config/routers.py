@@ -0,0 +1,64 @@
+"""توجيه استعلامات القراءة الثقيلة (التقارير والتصدير) إلى نسخة القراءة
+
+يُوجَّه إلى نسخة القراءة ما يلي فقط، وكل ما عداه يبقى على قاعدة البيانات الرئيسية:
+- قراءة نماذج التطبيقات المذكورة في REPLICA_APPS.
+- أي قراءة تُنفذ داخل read_from_replica() أو أثناء تدفق stream_from_replica().
+في غياب الاسم المستعار replica (مثل بيئة التطوير) لا يتغير شيء.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+REPLICA = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def has_replica():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica():
+    """قراءة كل الاستعلامات داخل الكتلة من نسخة القراءة"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def stream_from_replica(iterable):
+    """تغليف مولّد استجابة متدفقة: الاستعلامات تُنفذ أثناء التدفق بعد عودة الـ view، لذا يُفعَّل
+    التوجيه حول كل خطوة منه"""
+    iterator = iter(iterable)
+    while True:
+        with read_from_replica():
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not has_replica():
+            return None
+        if _use_replica.get() or model._meta.app_label in settings.REPLICA_APPS:
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # نسخة القراءة مطابقة للرئيسية فالعلاقات بين كائناتهما صحيحة
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # نسخة القراءة تتبع الرئيسية بالتكرار ولا تُرحَّل مباشرة
+        if db == REPLICA:
+            return False
+        return None
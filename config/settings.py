@@ -12,20 +12,56 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+from dotenv import load_dotenv
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# متغيرات البيئة تُقرأ من ملف .env إن وُجد ولا تتجاوز المتغيرات المضبوطة مسبقاً
+load_dotenv(BASE_DIR / '.env')
+
+
+def env(name, default=None):
+    return os.environ.get(name, default)
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return default if value in (None, '') else int(value)
 
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
+
+def env_list(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# development (افتراضي): SQLite ووضع التصحيح؛ production: PostgreSQL ومفتاح سري إلزامي
+DJANGO_ENV = env('DJANGO_ENV', 'development')
+IS_PRODUCTION = DJANGO_ENV == 'production'
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-t&yqfekxfz+*ol56&ood$i-j-9^l_6_ov$uq==$(^k6o3t8rom'
+SECRET_KEY = env('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    if IS_PRODUCTION:
+        raise ImproperlyConfigured('DJANGO_SECRET_KEY مطلوب في بيئة الإنتاج')
+    SECRET_KEY = 'django-insecure-t&yqfekxfz+*ol56&ood$i-j-9^l_6_ov$uq==$(^k6o3t8rom'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env_bool('DJANGO_DEBUG', not IS_PRODUCTION)
 
-ALLOWED_HOSTS = ['*']
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', [] if IS_PRODUCTION else ['*'])
+CSRF_TRUSTED_ORIGINS = env_list('DJANGO_CSRF_TRUSTED_ORIGINS', [])
+SESSION_COOKIE_SECURE = CSRF_COOKIE_SECURE = IS_PRODUCTION
 
 
 # Application definition
@@ -56,26 +92,37 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    # لغة كل طلب من الجلسة/ملف تعريف الارتباط/Accept-Language (request.LANGUAGE_CODE)
+    'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.users.middleware.ProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
-        'APP_DIRS': True,
+        'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'OPTIONS': {
+            # في الإنتاج تُحلل القوالب مرة واحدة لكل عملية؛ في التطوير تُقرأ في كل عرض
+            'loaders': TEMPLATE_LOADERS if DEBUG else [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
+                'django.template.context_processors.i18n',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.page_shell',
             ],
         },
     },
@@ -87,12 +134,82 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE: sqlite أو postgresql (الافتراضي في الإنتاج)
+DB_ENGINE = env('DB_ENGINE', 'postgresql' if IS_PRODUCTION else 'sqlite')
+
+
+def postgres_database(host):
+    """إعدادات اتصال PostgreSQL: اتصالات دائمة مع فحص صلاحيتها قبل إعادة الاستخدام"""
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env('POSTGRES_DB', 'postgres'),
+        'USER': env('POSTGRES_USER', 'postgres'),
+        'PASSWORD': env('POSTGRES_PASSWORD', ''),
+        'HOST': host,
+        'PORT': env('POSTGRES_PORT', '5432'),
+        # مدة بقاء الاتصال مفتوحاً بين الطلبات (ث)، ويُفحص قبل إعادة استخدامه
+        'CONN_MAX_AGE': env_int('DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+        'OPTIONS': {
+            'connect_timeout': env_int('DB_CONNECT_TIMEOUT', 5),
+        },
+    }
+    return database
+
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': postgres_database(env('POSTGRES_HOST', 'localhost')),
     }
-}
+    # نسخة قراءة: تُوجَّه إليها استعلامات التقارير والتصدير (config.routers)
+    if env('POSTGRES_REPLICA_HOST'):
+        DATABASES['replica'] = {
+            **postgres_database(env('POSTGRES_REPLICA_HOST')),
+            'TEST': {'MIRROR': 'default'},
+        }
+elif DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': env('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+else:
+    raise ImproperlyConfigured(f'قيمة DB_ENGINE غير مدعومة: {DB_ENGINE}')
+
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter']
+# تطبيقات تُقرأ نماذجها دائماً من نسخة القراءة إن وُجدت
+REPLICA_APPS = ['reports']
+
+
+# Argon2id عند توفر الحزمة argon2-cffi، وإلا PBKDF2؛ كلمات المرور المجزأة بخوارزمية
+# أخرى من القائمة تُقبل وتُعاد تجزئتها بالأولى عند الدخول التالي
+try:
+    import argon2  # noqa: F401
+except ImportError:
+    ARGON2_AVAILABLE = False
+else:
+    ARGON2_AVAILABLE = True
+
+PASSWORD_HASHERS = [
+    *(['apps.users.hashers.TunedArgon2PasswordHasher'] if ARGON2_AVAILABLE else []),
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# معاملات Argon2id (توصية OWASP: 19 MiB، تكراران، خيط واحد)
+ARGON2_TIME_COST = env_int('ARGON2_TIME_COST', 2)
+ARGON2_MEMORY_COST = env_int('ARGON2_MEMORY_COST', 19 * 1024)
+ARGON2_PARALLELISM = env_int('ARGON2_PARALLELISM', 1)
+
+AUTHENTICATION_BACKENDS = ['apps.users.backends.CachedModelBackend']
+# مدة بقاء المستخدم المخزن مؤقتاً للمصادقة (ث)
+AUTH_USER_CACHE_TIMEOUT = env_int('AUTH_USER_CACHE_TIMEOUT', 300)
+LOGIN_URL = 'users:login'
+# محاولات الدخول لكل عنوان IP: (محاولة/ث، أقصى دفعة متتالية)
+LOGIN_RATE_LIMIT = (0.2, 10)
+# عدد الوكلاء العكسيين الموثوقين أمام التطبيق (لقراءة عنوان العميل من X-Forwarded-For)
+TRUSTED_PROXY_COUNT = env_int('TRUSTED_PROXY_COUNT', 0)
 
 
 # Password validation
@@ -143,9 +260,88 @@ LANGUAGES = [
 # المسارات المهمة
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # أسماء مبصومة بالمحتوى مع نسخ gzip/brotli مسبقة الضغط (collectstatic)؛ مشغّل الاختبارات
+    # يستبدلها بالتخزين العادي لأن الاختبارات تعرض القوالب دون manifest
+    'staticfiles': {'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage'},
+}
+TEST_RUNNER = 'core.testing.TestRunner'
+# حزم الملفات الثابتة لكل مجموعة صفحات (core.assets)؛ تُبنى بـ build_assets في static/bundles
+STATIC_BUNDLES = {
+    'base.css': ['css/main.css'],
+    'base-rtl.css': ['css/main.css', 'css/rtl.css'],
+    'dashboard.css': ['css/dashboard.css'],
+    'auth-rtl.css': ['users/css/rtl.css'],
+    'base.js': ['js/main.js'],
+    'auth.js': ['users/js/auth.js'],
+    'contracts.js': ['js/contracts.js'],
+    'payments.js': ['js/payments.js'],
+}
+# في التطوير تُربط الملفات المصدرية منفصلة بدلاً من الحزم المبنية
+STATIC_BUNDLES_ENABLED = env_bool('STATIC_BUNDLES_ENABLED', not DEBUG)
+# خدمة STATIC_ROOT من التطبيق نفسه بترويسات تخزين طويلة (دون nginx أو CDN)
+SERVE_STATIC = env_bool('SERVE_STATIC', False)
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 LOCALE_PATHS = [os.path.join(BASE_DIR, 'locale')]
-AUTH_USER_MODEL = 'users.User'
\ No newline at end of file
+AUTH_USER_MODEL = 'users.User'
+# الإشعارات: في بيئة التطوير تُطبع الرسائل بدلاً من إرسالها
+EMAIL_BACKEND = (
+    'django.core.mail.backends.console.EmailBackend' if DEBUG
+    else 'django.core.mail.backends.smtp.EmailBackend'
+)
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'tmp', 'email')
+NOTIFICATIONS_SMS_BACKEND = 'notifications.backends.ConsoleSMSBackend'
+NOTIFICATIONS_SMS_FILE_PATH = os.path.join(BASE_DIR, 'tmp', 'sms')
+# (رسالة/ث، أقصى عدد في دفعة واحدة) لكل قناة
+NOTIFICATIONS_RATE_LIMITS = {
+    'EMAIL': (10, 50),
+    'SMS': (5, 20),
+}
+# تذكيرات انتهاء التأمين والعقود: عدد الأيام قبل الانتهاء (notifications.expiry)
+NOTIFICATIONS_EXPIRY_REMINDER_DAYS = (30, 7, 1)
+
+# المستندات: django يقدم الملفات بدعم Range، أو x-accel (nginx) / x-sendfile (Apache)
+DOCUMENTS_SERVE_MODE = 'django'
+# موقع internal في nginx يشير إلى MEDIA_ROOT
+DOCUMENTS_ACCEL_PREFIX = '/protected-media/'
+
+# عدد خيوط توليد مصغرات الشعارات بعد الرفع (0: التوليد فوراً داخل الطلب)
+LOGO_THUMBNAIL_WORKERS = 2
+
+# الذاكرة المؤقتة: محلية في كل عملية افتراضياً، وRedis مشتركة بين العمليات عند ضبط REDIS_URL
+REDIS_URL = env('REDIS_URL')
+
+
+def cache_backend(name, max_entries=1000):
+    if REDIS_URL:
+        return {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': f'omanrental:{name}',
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': name,
+        'OPTIONS': {'MAX_ENTRIES': max_entries},
+    }
+
+
+CACHES = {
+    'default': cache_backend('default'),
+    'profiles': cache_backend('profiles', max_entries=10000),
+    # يستخدمها وسم {% cache %} تلقائياً لأجزاء القوالب (core.shell)
+    'template_fragments': cache_backend('template_fragments', max_entries=1000),
+}
+# أجزاء غلاف الصفحة المخزنة (الترويسة والقائمة والتذييل): مدة بقائها (ث) وإصدار النشر في مفاتيحها
+PAGE_SHELL_CACHE_TIMEOUT = env_int('PAGE_SHELL_CACHE_TIMEOUT', 3600)
+PAGE_SHELL_RELEASE = env('PAGE_SHELL_RELEASE', '1')
+# ملفات المستخدمين المخزنة مؤقتاً (apps.users.profiles) ومدة بقائها (ث)
+PROFILE_CACHE_ALIAS = 'profiles'
+# تخزين مستخدم الجلسة (apps.users.backends) يتطلب ذاكرة مشتركة: الإبطال في ذاكرة محلية لا يصل
+# إلى العمليات الأخرى فتبقى حالة التفعيل وبصمة الجلسة القديمتان فيها حتى انتهاء المدة
+AUTH_USER_CACHE_ENABLED = bool(REDIS_URL)
+PROFILE_CACHE_TIMEOUT = env_int('PROFILE_CACHE_TIMEOUT', 300)
@@ -14,9 +14,22 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path, re_path
+
+from core.views import serve_static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('i18n/', include('django.conf.urls.i18n')),
+    path('users/', include('apps.users.urls')),
+    path('buildings/', include('buildings.urls')),
+    path('documents/', include('documents.urls')),
+    path('reports/', include('reports.urls')),
 ]
+
+if settings.SERVE_STATIC:
+    urlpatterns += [
+        re_path(rf'^{settings.STATIC_URL.lstrip("/")}(?P<path>.*)$', serve_static),
+    ]
@@ -1,3 +1,19 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Contract, Installment
+
+
+class InstallmentInline(admin.TabularInline):
+    model = Installment
+    extra = 0
+    readonly_fields = ('sequence', 'period_start', 'period_end', 'due_date', 'amount')
+
+
+@admin.register(Contract)
+class ContractAdmin(admin.ModelAdmin):
+    list_display = ('contract_number', 'tenant', 'unit', 'start_date', 'end_date', 'monthly_rent', 'status')
+    list_filter = ('status', 'payment_frequency')
+    list_select_related = ('tenant__user', 'unit__building')
+    search_fields = ('contract_number',)
+    raw_id_fields = ('tenant', 'unit')
+    inlines = [InstallmentInline]
@@ -0,0 +1,43 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from contracts.models import Contract
+from contracts.schedules import ScheduleTerms, compute_schedules
+from core.batching import chunked
+
+
+class Command(BaseCommand):
+    help = 'قياس سرعة محرك جداول الأقساط (قسط/ث) على عقود افتراضية دون قاعدة البيانات'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contracts', type=int, default=40000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        frequencies = [choice.value for choice in Contract.Frequency]
+        terms = []
+        for contract_id in range(1, options['contracts'] + 1):
+            start = date(2025, 1, 1) + timedelta(days=rng.randrange(365))
+            terms.append(ScheduleTerms(
+                contract_id,
+                start,
+                start + timedelta(days=rng.choice([364, 729, 1094]) + rng.randrange(-15, 15)),
+                Decimal(rng.randrange(150, 5000)),
+                rng.choice(frequencies),
+                Decimal(rng.choice([0, 0, 3, 5])),
+            ))
+
+        started = time.perf_counter()
+        installments = sum(len(compute_schedules(batch)) for batch in chunked(terms, options['batch_size']))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f'العقود: {len(terms)}')
+        self.stdout.write(f'الأقساط: {installments}')
+        self.stdout.write(f'الزمن: {elapsed:.3f} ث')
+        self.stdout.write(self.style.SUCCESS(f'الإنتاجية: {installments / elapsed:.0f} قسط/ث'))
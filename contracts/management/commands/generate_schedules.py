@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from contracts.models import Contract
+from contracts.schedules import generate_schedules, pending_contracts
+
+
+class Command(BaseCommand):
+    help = 'توليد جداول أقساط الإيجار للعقود السارية على دفعات'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='عدد العقود في كل دفعة')
+        parser.add_argument('--contract', type=int, action='append', dest='contracts', help='تقييد التوليد بعقد محدد (يمكن تكراره)')
+        parser.add_argument('--regenerate', action='store_true', help='إعادة توليد جداول العقود السارية غير المسددة')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('يجب أن يكون حجم الدفعة أكبر من صفر')
+
+        if options['regenerate']:
+            contracts = Contract.objects.filter(status=Contract.Status.ACTIVE)
+        else:
+            contracts = pending_contracts()
+        if options['contracts']:
+            contracts = contracts.filter(pk__in=options['contracts'])
+
+        started = time.monotonic()
+
+        def report(contracts_done, installments_done):
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{contracts_done} عقد | {installments_done} قسط '
+                f'| {installments_done / elapsed if elapsed else 0:.0f} قسط/ث'
+            )
+
+        contracts_done, installments_done = generate_schedules(
+            contracts,
+            batch_size=options['batch_size'],
+            regenerate=options['regenerate'],
+            on_batch=report,
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'تم توليد {installments_done} قسط لـ {contracts_done} عقد خلال {elapsed:.1f} ث'
+        ))
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0003_user_search_name'),
+        ('units', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Contract',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contract_number', models.CharField(max_length=30, unique=True, verbose_name='رقم العقد')),
+                ('start_date', models.DateField(verbose_name='تاريخ البداية')),
+                ('end_date', models.DateField(help_text='آخر يوم مشمول بالعقد', verbose_name='تاريخ النهاية')),
+                ('monthly_rent', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='الإيجار الشهري')),
+                ('payment_frequency', models.PositiveSmallIntegerField(choices=[(1, 'شهري'), (3, 'ربع سنوي'), (12, 'سنوي')], default=1, verbose_name='دورية الدفع')),
+                ('annual_escalation', models.DecimalField(decimal_places=2, default=0, help_text='نسبة الزيادة في الإيجار عند بداية كل سنة تعاقدية', max_digits=5, verbose_name='الزيادة السنوية (%)')),
+                ('status', models.CharField(choices=[('DRAFT', 'مسودة'), ('ACTIVE', 'ساري'), ('TERMINATED', 'منتهي مبكراً'), ('EXPIRED', 'منتهي')], default='DRAFT', max_length=20, verbose_name='حالة العقد')),
+                ('schedule_generated_at', models.DateTimeField(blank=True, null=True, verbose_name='تاريخ توليد جدول الأقساط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='contracts', to='users.tenant', verbose_name='المستأجر')),
+                ('unit', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='contracts', to='units.unit', verbose_name='الوحدة')),
+            ],
+            options={
+                'verbose_name': 'عقد',
+                'verbose_name_plural': 'العقود',
+                'ordering': ['-start_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Installment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveSmallIntegerField(verbose_name='رقم القسط')),
+                ('period_start', models.DateField(verbose_name='بداية الفترة')),
+                ('period_end', models.DateField(help_text='آخر يوم مشمول بالقسط', verbose_name='نهاية الفترة')),
+                ('due_date', models.DateField(verbose_name='تاريخ الاستحقاق')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='المبلغ')),
+                ('amount_paid', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='المبلغ المدفوع')),
+                ('paid_at', models.DateTimeField(blank=True, null=True, verbose_name='تاريخ السداد')),
+                ('status', models.CharField(choices=[('PENDING', 'مستحق'), ('PARTIAL', 'مدفوع جزئياً'), ('PAID', 'مدفوع'), ('CANCELLED', 'ملغى')], default='PENDING', max_length=20, verbose_name='حالة القسط')),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='installments', to='contracts.contract', verbose_name='العقد')),
+            ],
+            options={
+                'verbose_name': 'قسط',
+                'verbose_name_plural': 'الأقساط',
+                'ordering': ['contract', 'sequence'],
+                'indexes': [models.Index(fields=['due_date', 'status'], name='contracts_i_due_dat_3e62f1_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='installment',
+            constraint=models.UniqueConstraint(fields=('contract', 'sequence'), name='unique_installment_sequence'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['status', 'schedule_generated_at'], name='contracts_c_status_10c7d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['unit', 'status'], name='contracts_c_unit_id_452a4e_idx'),
+        ),
+    ]
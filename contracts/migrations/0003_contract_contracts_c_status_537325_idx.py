@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0002_installment_contracts_i_paid_at_746f5f_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['status', 'end_date'], name='contracts_c_status_537325_idx'),
+        ),
+    ]
@@ -1,3 +1,162 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class Contract(models.Model):
+    """عقد إيجار وحدة لمستأجر"""
+
+    class Frequency(models.IntegerChoices):
+        MONTHLY = 1, _('شهري')
+        QUARTERLY = 3, _('ربع سنوي')
+        ANNUAL = 12, _('سنوي')
+
+    class Status(models.TextChoices):
+        DRAFT = 'DRAFT', _('مسودة')
+        ACTIVE = 'ACTIVE', _('ساري')
+        TERMINATED = 'TERMINATED', _('منتهي مبكراً')
+        EXPIRED = 'EXPIRED', _('منتهي')
+
+    contract_number = models.CharField(
+        _('رقم العقد'),
+        max_length=30,
+        unique=True
+    )
+    tenant = models.ForeignKey(
+        'users.Tenant',
+        on_delete=models.PROTECT,
+        related_name='contracts',
+        verbose_name=_('المستأجر')
+    )
+    unit = models.ForeignKey(
+        'units.Unit',
+        on_delete=models.PROTECT,
+        related_name='contracts',
+        verbose_name=_('الوحدة')
+    )
+    start_date = models.DateField(
+        _('تاريخ البداية')
+    )
+    end_date = models.DateField(
+        _('تاريخ النهاية'),
+        help_text=_('آخر يوم مشمول بالعقد')
+    )
+    monthly_rent = models.DecimalField(
+        _('الإيجار الشهري'),
+        max_digits=12,
+        decimal_places=2
+    )
+    payment_frequency = models.PositiveSmallIntegerField(
+        _('دورية الدفع'),
+        choices=Frequency.choices,
+        default=Frequency.MONTHLY
+    )
+    annual_escalation = models.DecimalField(
+        _('الزيادة السنوية (%)'),
+        max_digits=5,
+        decimal_places=2,
+        default=0,
+        help_text=_('نسبة الزيادة في الإيجار عند بداية كل سنة تعاقدية')
+    )
+    status = models.CharField(
+        _('حالة العقد'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.DRAFT
+    )
+    schedule_generated_at = models.DateTimeField(
+        _('تاريخ توليد جدول الأقساط'),
+        blank=True,
+        null=True
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإنشاء'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('عقد')
+        verbose_name_plural = _('العقود')
+        ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['status', 'schedule_generated_at']),
+            models.Index(fields=['unit', 'status']),
+            models.Index(fields=['status', 'end_date']),
+        ]
+
+    def __str__(self):
+        return self.contract_number
+
+    def clean(self):
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValidationError({'end_date': _('يجب أن يكون تاريخ النهاية بعد تاريخ البداية')})
+
+
+class Installment(models.Model):
+    """قسط إيجار مستحق ضمن جدول العقد"""
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', _('مستحق')
+        PARTIAL = 'PARTIAL', _('مدفوع جزئياً')
+        PAID = 'PAID', _('مدفوع')
+        CANCELLED = 'CANCELLED', _('ملغى')
+
+    contract = models.ForeignKey(
+        Contract,
+        on_delete=models.CASCADE,
+        related_name='installments',
+        verbose_name=_('العقد')
+    )
+    sequence = models.PositiveSmallIntegerField(
+        _('رقم القسط')
+    )
+    period_start = models.DateField(
+        _('بداية الفترة')
+    )
+    period_end = models.DateField(
+        _('نهاية الفترة'),
+        help_text=_('آخر يوم مشمول بالقسط')
+    )
+    due_date = models.DateField(
+        _('تاريخ الاستحقاق')
+    )
+    amount = models.DecimalField(
+        _('المبلغ'),
+        max_digits=12,
+        decimal_places=2
+    )
+    amount_paid = models.DecimalField(
+        _('المبلغ المدفوع'),
+        max_digits=12,
+        decimal_places=2,
+        default=0
+    )
+    paid_at = models.DateTimeField(
+        _('تاريخ السداد'),
+        blank=True,
+        null=True
+    )
+    status = models.CharField(
+        _('حالة القسط'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+
+    class Meta:
+        verbose_name = _('قسط')
+        verbose_name_plural = _('الأقساط')
+        ordering = ['contract', 'sequence']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['contract', 'sequence'],
+                name='unique_installment_sequence',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['due_date', 'status']),
+            models.Index(fields=['paid_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.contract} #{self.sequence}"
@@ -0,0 +1,168 @@
+"""محرك جداول الأقساط
+
+يحسب لدفعة من العقود تواريخ الاستحقاق والزيادات السنوية والفترات الجزئية في البداية
+والنهاية. تُجرى حسابات التواريخ على أرقام الأشهر الترتيبية (year * 12 + month) مع
+جداول تقويم وعوامل زيادة مخزنة مؤقتاً ومشتركة بين عقود الدفعة، ثم تُحفظ أقساط كل
+دفعة باستدعاء bulk_create واحد.
+"""
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.batching import keyset_batches
+
+from .models import Contract, Installment
+
+CENT = Decimal('0.01')
+ONE_DAY = timedelta(days=1)
+
+
+@lru_cache(maxsize=None)
+def _month_first(ordinal):
+    year, month = divmod(ordinal, 12)
+    return date(year, month + 1, 1)
+
+
+@lru_cache(maxsize=None)
+def _days_in_month(ordinal):
+    year, month = divmod(ordinal, 12)
+    return calendar.monthrange(year, month + 1)[1]
+
+
+@lru_cache(maxsize=4096)
+def _escalation_factor(rate, years):
+    return (1 + rate / 100) ** years
+
+
+def _month_ordinal(value):
+    return value.year * 12 + value.month - 1
+
+
+@dataclass(frozen=True)
+class ScheduleTerms:
+    """شروط العقد اللازمة لحساب الجدول (دون الحاجة لتحميل كائن العقد كاملاً)"""
+    contract_id: int
+    start_date: date
+    end_date: date
+    monthly_rent: Decimal
+    frequency: int
+    annual_escalation: Decimal = Decimal(0)
+
+    FIELDS = ('pk', 'start_date', 'end_date', 'monthly_rent', 'payment_frequency', 'annual_escalation')
+
+
+class ScheduleRow(NamedTuple):
+    contract_id: int
+    sequence: int
+    period_start: date
+    period_end: date
+    due_date: date
+    amount: Decimal
+
+
+def contract_periods(terms):
+    """فترات العقد كأزواج (البداية، النهاية غير المشمولة، عدد الأشهر المكافئ)
+
+    الفترات الكاملة تبدأ في أول الشهر؛ إذا بدأ العقد في منتصف الشهر تُضاف فترة أولى
+    جزئية حتى نهاية ذلك الشهر، وتُقتطع الفترة الأخيرة عند تاريخ نهاية العقد.
+    """
+    start, end = terms.start_date, terms.end_date + ONE_DAY
+    start_month = _month_ordinal(start)
+    end_month = _month_ordinal(end)
+
+    month = start_month
+    if start.day != 1:
+        month += 1
+        stub_end = min(_month_first(month), end)
+        yield start, stub_end, Decimal((stub_end - start).days) / _days_in_month(start_month)
+
+    while _month_first(month) < end:
+        next_month = month + terms.frequency
+        if _month_first(next_month) <= end:
+            yield _month_first(month), _month_first(next_month), Decimal(terms.frequency)
+        else:
+            months = Decimal(end_month - month)
+            if end.day > 1:
+                months += Decimal(end.day - 1) / _days_in_month(end_month)
+            yield _month_first(month), end, months
+        month = next_month
+
+
+def compute_schedules(batch):
+    """حساب أقساط دفعة من ScheduleTerms وإعادتها كصفوف ScheduleRow"""
+    rows = []
+    for terms in batch:
+        start_month = _month_ordinal(terms.start_date)
+        start_day = terms.start_date.day
+        for sequence, (period_start, period_end, months) in enumerate(contract_periods(terms), start=1):
+            # السنة التعاقدية التي تبدأ فيها الفترة تحدد عامل الزيادة
+            years = (_month_ordinal(period_start) - start_month - (period_start.day < start_day)) // 12
+            rent = terms.monthly_rent
+            if terms.annual_escalation and years:
+                rent *= _escalation_factor(terms.annual_escalation, years)
+            rows.append(ScheduleRow(
+                terms.contract_id,
+                sequence,
+                period_start,
+                period_end - ONE_DAY,
+                period_start,
+                (rent * months).quantize(CENT, rounding=ROUND_HALF_UP),
+            ))
+    return rows
+
+
+def pending_contracts():
+    """العقود السارية التي لم يُولَّد جدولها بعد"""
+    return Contract.objects.filter(status=Contract.Status.ACTIVE, schedule_generated_at__isnull=True)
+
+
+def generate_schedules(contracts=None, batch_size=1000, regenerate=False, on_batch=None):
+    """توليد الأقساط وحفظها على دفعات؛ كل دفعة في معاملة واحدة وbulk_create واحد
+
+    مع regenerate تُحذف أقساط العقود غير المسددة ويُعاد توليدها، وتُتجاوز العقود
+    التي سُجلت عليها دفعات أو صدرت لأقساطها فواتير أو قيود في الدفتر (محمية من الحذف).
+    يعيد (عدد العقود، عدد الأقساط).
+    """
+    queryset = pending_contracts() if contracts is None else contracts
+    if regenerate:
+        queryset = queryset.exclude(
+            Q(installments__amount_paid__gt=0)
+            | Q(installments__status=Installment.Status.PAID)
+            | Q(installments__invoice__isnull=False)
+            | Q(installments__ledger_entries__isnull=False)
+        )
+    queryset = queryset.only(*[name for name in ScheduleTerms.FIELDS if name != 'pk'])
+
+    contracts_done = installments_done = 0
+    for batch in keyset_batches(queryset, batch_size):
+        terms = [
+            ScheduleTerms(
+                contract.pk,
+                contract.start_date,
+                contract.end_date,
+                contract.monthly_rent,
+                contract.payment_frequency,
+                contract.annual_escalation,
+            )
+            for contract in batch
+        ]
+        rows = compute_schedules(terms)
+        contract_ids = [item.contract_id for item in terms]
+        with transaction.atomic():
+            if regenerate:
+                Installment.objects.filter(contract_id__in=contract_ids).delete()
+            Installment.objects.bulk_create([Installment(**row._asdict()) for row in rows])
+            Contract.objects.filter(pk__in=contract_ids).update(schedule_generated_at=timezone.now())
+
+        contracts_done += len(terms)
+        installments_done += len(rows)
+        if on_batch:
+            on_batch(contracts_done, installments_done)
+    return contracts_done, installments_done
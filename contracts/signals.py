@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from units.models import Unit
+
+from .models import Contract
+
+
+@receiver(post_save, sender=Contract)
+def sync_unit_status(sender, instance, raw=False, **kwargs):
+    """مزامنة حالة الوحدة مع حالة العقد (تُحدّث بدورها لقطات الإشغال)"""
+    if raw:
+        return
+    if instance.status == Contract.Status.ACTIVE:
+        status = Unit.Status.OCCUPIED
+    elif instance.status in (Contract.Status.TERMINATED, Contract.Status.EXPIRED):
+        if instance.unit.contracts.filter(status=Contract.Status.ACTIVE).exists():
+            return
+        status = Unit.Status.VACANT
+    else:
+        return
+
+    unit = instance.unit
+    if unit.status != status:
+        unit.status = status
+        unit.save(update_fields=['status'])
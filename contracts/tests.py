@@ -1,3 +1,121 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from core.testing import make_contract
+from invoices.billing import issue_invoices
+from invoices.models import Invoice
+from payments.ledger import post_entry
+from payments.models import LedgerEntry
+
+from .models import Contract, Installment
+from .schedules import (
+    ScheduleTerms,
+    compute_schedules,
+    generate_schedules,
+    pending_contracts,
+)
+
+
+class RegenerateSchedulesTests(TestCase):
+    def setUp(self):
+        self.invoiced = make_contract(start_date=date(2024, 1, 1), end_date=date(2024, 12, 31))
+        self.charged = make_contract(start_date=date(2030, 1, 1), end_date=date(2030, 12, 31))
+        self.untouched = make_contract(start_date=date(2031, 1, 1), end_date=date(2031, 6, 30))
+        generate_schedules(Contract.objects.all())
+
+    def test_regenerate_skips_invoiced_and_ledger_contracts(self):
+        # فاتورة لأول قسط مستحق من العقد الأول فقط، ومطالبة في الدفتر لقسط من الثاني
+        self.assertEqual(issue_invoices(date(2024, 1, 15)), 1)
+        charged_installment = self.charged.installments.order_by('sequence').first()
+        post_entry(
+            self.charged.tenant_id,
+            LedgerEntry.EntryType.CHARGE,
+            Decimal('100.00'),
+            contract_id=self.charged.pk,
+            installment_id=charged_installment.pk,
+        )
+        kept = set(Installment.objects.exclude(contract=self.untouched).values_list('pk', flat=True))
+
+        contracts_done, installments_done = generate_schedules(Contract.objects.all(), regenerate=True)
+
+        self.assertEqual((contracts_done, installments_done), (1, 6))
+        self.assertEqual(set(Installment.objects.exclude(contract=self.untouched).values_list('pk', flat=True)), kept)
+        self.assertEqual(self.untouched.installments.count(), 6)
+        self.assertTrue(Invoice.objects.filter(installment__contract=self.invoiced).exists())
+
+    def test_regenerate_replaces_unbilled_schedules(self):
+        old = set(Installment.objects.values_list('pk', flat=True))
+        contracts_done, installments_done = generate_schedules(Contract.objects.all(), regenerate=True)
+        self.assertEqual((contracts_done, installments_done), (3, 30))
+        self.assertFalse(old & set(Installment.objects.values_list('pk', flat=True)))
+
+
+class ComputeSchedulesTests(SimpleTestCase):
+    """الأقساط المولدة مقارنة بمبالغ محسوبة يدوياً"""
+
+    def schedule(self, start, end, rent='100.00', frequency=Contract.Frequency.MONTHLY, escalation='0'):
+        terms = ScheduleTerms(1, start, end, Decimal(rent), frequency, Decimal(escalation))
+        return [(row.period_start, row.period_end, row.due_date, row.amount) for row in compute_schedules([terms])]
+
+    def test_prorated_first_and_last_periods(self):
+        # 17/31 من يناير، فبراير كامل، 10/31 من مارس
+        self.assertEqual(self.schedule(date(2024, 1, 15), date(2024, 3, 10), rent='310.00'), [
+            (date(2024, 1, 15), date(2024, 1, 31), date(2024, 1, 15), Decimal('170.00')),
+            (date(2024, 2, 1), date(2024, 2, 29), date(2024, 2, 1), Decimal('310.00')),
+            (date(2024, 3, 1), date(2024, 3, 10), date(2024, 3, 1), Decimal('100.00')),
+        ])
+
+    def test_annual_escalation_compounds_per_contract_year(self):
+        rows = self.schedule(date(2024, 1, 1), date(2026, 12, 31), frequency=Contract.Frequency.ANNUAL, escalation='5')
+        # 1200، ثم 1200 × 1.05، ثم 1200 × 1.05²
+        self.assertEqual([row[3] for row in rows], [Decimal('1200.00'), Decimal('1260.00'), Decimal('1323.00')])
+        self.assertEqual([row[0] for row in rows], [date(2024, 1, 1), date(2025, 1, 1), date(2026, 1, 1)])
+
+    def test_escalation_follows_contract_anniversary_not_calendar_year(self):
+        rows = self.schedule(date(2024, 3, 15), date(2025, 6, 14), escalation='10')
+        amounts = {row[0]: row[3] for row in rows}
+        self.assertEqual(len(rows), 16)
+        # 17/31 × 100
+        self.assertEqual(amounts[date(2024, 3, 15)], Decimal('54.84'))
+        # مارس 2025 يبدأ قبل الذكرى السنوية (15 مارس) فيبقى على الإيجار الأول
+        self.assertEqual(amounts[date(2025, 3, 1)], Decimal('100.00'))
+        self.assertEqual(amounts[date(2025, 4, 1)], Decimal('110.00'))
+        # 14/30 × 110
+        self.assertEqual(amounts[date(2025, 6, 1)], Decimal('51.33'))
+
+    def test_quarterly_frequency_with_partial_last_period(self):
+        self.assertEqual(self.schedule(date(2024, 1, 1), date(2024, 8, 15), frequency=Contract.Frequency.QUARTERLY), [
+            (date(2024, 1, 1), date(2024, 3, 31), date(2024, 1, 1), Decimal('300.00')),
+            (date(2024, 4, 1), date(2024, 6, 30), date(2024, 4, 1), Decimal('300.00')),
+            # يوليو كامل و15/31 من أغسطس
+            (date(2024, 7, 1), date(2024, 8, 15), date(2024, 7, 1), Decimal('148.39')),
+        ])
+
+    def test_month_end_dates(self):
+        self.assertEqual(self.schedule(date(2024, 1, 31), date(2024, 4, 29)), [
+            (date(2024, 1, 31), date(2024, 1, 31), date(2024, 1, 31), Decimal('3.23')),
+            (date(2024, 2, 1), date(2024, 2, 29), date(2024, 2, 1), Decimal('100.00')),
+            (date(2024, 3, 1), date(2024, 3, 31), date(2024, 3, 1), Decimal('100.00')),
+            (date(2024, 4, 1), date(2024, 4, 29), date(2024, 4, 1), Decimal('96.67')),
+        ])
+        # عقد ينتهي في 29 فبراير من سنة كبيسة: شهران كاملان دون فترة جزئية
+        self.assertEqual(
+            [row[3] for row in self.schedule(date(2024, 1, 1), date(2024, 2, 29))],
+            [Decimal('100.00'), Decimal('100.00')],
+        )
+
+
+class GenerateSchedulesTests(TestCase):
+    def test_generates_pending_contracts_once(self):
+        contract = make_contract(start_date=date(2024, 1, 15), end_date=date(2024, 3, 10), monthly_rent=Decimal('310.00'))
+        make_contract(status=Contract.Status.DRAFT)
+
+        self.assertEqual(generate_schedules(), (1, 3))
+        self.assertEqual(
+            list(contract.installments.order_by('sequence').values_list('sequence', 'amount')),
+            [(1, Decimal('170.00')), (2, Decimal('310.00')), (3, Decimal('100.00'))],
+        )
+        self.assertFalse(pending_contracts().exists())
+        self.assertEqual(generate_schedules(), (0, 0))
@@ -1,3 +1,134 @@
-from django.contrib import admin
+"""أدوات لوحة الإدارة للجداول الكبيرة: عدّ تقديري وتصفح بالمفتاح (keyset)
 
-# Register your models here.
+COUNT(*) على ملايين الصفوف وOFFSET للصفحات البعيدة يمسحان الجدول في كل فتح للقائمة.
+على PostgreSQL يُقرأ العدد من إحصاءات الجدول (أو تقدير المخطط عند التصفية)، وتُقرأ
+الصفحات بشرط pk < آخر مفتاح معروض بدلاً من OFFSET ما دام ترتيب القائمة هو الافتراضي.
+"""
+import json
+
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# معاملا الرابط لصفحة تالية/سابقة في التصفح بالمفتاح
+AFTER_VAR = 'after'
+BEFORE_VAR = 'before'
+# تحت هذا العدد التقديري يُحسب العدد الفعلي
+ESTIMATE_THRESHOLD = 10000
+KEYSET_ORDERING = ('-pk',)
+
+
+def estimated_count(queryset):
+    """عدد صفوف تقديري على PostgreSQL دون مسح الجدول؛ None على المحركات الأخرى"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        if queryset.query.where:
+            sql, params = queryset.values('pk').query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # -1 لجدول لم تُجمع إحصاءاته بعد
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """ترقيم يستخدم العدد التقديري للجداول الكبيرة والعدد الفعلي للصغيرة"""
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and estimate > ESTIMATE_THRESHOLD:
+            self.estimated = True
+            return estimate
+        return super().count
+
+
+class KeysetChangeList(ChangeList):
+    """قائمة تتصفح بالمفتاح عند الترتيب الافتراضي (-pk) وبالصفحات المرقمة عند الفرز بعمود"""
+
+    keyset = False
+    next_cursor = None
+    previous_cursor = None
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(AFTER_VAR, None)
+        lookup_params.pop(BEFORE_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        # الترتيب الحتمي قد يكرر -pk في order_by
+        ordering = tuple(dict.fromkeys(self.queryset.query.order_by))
+        if ordering != KEYSET_ORDERING or self.list_editable:
+            return super().get_results(request)
+        self.keyset = True
+        after, before = self._cursor(request, AFTER_VAR), self._cursor(request, BEFORE_VAR)
+
+        per_page = self.list_per_page
+        if before is not None:
+            rows = list(self.queryset.filter(pk__gt=before).order_by('pk')[:per_page + 1])
+            has_more = len(rows) > per_page
+            rows = rows[:per_page][::-1]
+            has_previous, has_next = has_more, True
+        else:
+            queryset = self.queryset if after is None else self.queryset.filter(pk__lt=after)
+            rows = list(queryset[:per_page + 1])
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            has_previous = after is not None
+        if rows:
+            self.next_cursor = rows[-1].pk if has_next else None
+            self.previous_cursor = rows[0].pk if has_previous else None
+
+        paginator = self.model_admin.get_paginator(request, self.queryset, per_page)
+        self.paginator = paginator
+        self.result_count = paginator.count
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = has_next or has_previous
+
+    @staticmethod
+    def _cursor(request, name):
+        try:
+            return int(request.GET[name])
+        except (KeyError, ValueError):
+            return None
+
+    @property
+    def first_page_url(self):
+        return self.get_query_string(remove=[AFTER_VAR, BEFORE_VAR])
+
+    @property
+    def next_page_url(self):
+        return self.get_query_string({AFTER_VAR: self.next_cursor}, remove=[BEFORE_VAR])
+
+    @property
+    def previous_page_url(self):
+        return self.get_query_string({BEFORE_VAR: self.previous_cursor}, remove=[AFTER_VAR])
+
+
+class LargeTableAdminMixin:
+    """إعدادات قوائم الإدارة للجداول الكبيرة (يُضاف قالب pagination.html للتطبيق)"""
+
+    ordering = KEYSET_ORDERING
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
@@ -0,0 +1,121 @@
+"""حزم الملفات الثابتة: تجميع ملفات CSS/JS لكل مجموعة صفحات وتصغيرها وضغطها مسبقاً
+
+STATIC_BUNDLES تربط اسم كل حزمة بملفاتها المصدرية (مسارات static كما في {% static %}).
+build_assets تكتب الحزم في static/bundles/ ثم يضيف collectstatic بصمة المحتوى لأسمائها
+(ManifestStaticFilesStorage)، ويكتب CompressedManifestStaticFilesStorage نسخ gzip وbrotli
+بجانب كل ملف مبصوم، فتُخدم بترويسات تخزين طويلة (core.views.serve_static أو nginx).
+"""
+import gzip
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+BUNDLES_DIR = 'bundles'
+# أنواع الملفات النصية التي تُضغط مسبقاً
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.xml', '.html', '.ico')
+# الملفات الأصغر من هذا لا يفيد ضغطها
+MIN_COMPRESS_SIZE = 256
+
+CSS_COMMENT_RE = re.compile(r'/\*(?!!).*?\*/', re.S)
+CSS_SPACE_RE = re.compile(r'\s*([{};,>])\s*')
+# المسافة قبل : تفصل المحدد عن الصنف الزائف (a :hover غير a:hover) فتُحذف بعدها فقط
+CSS_COLON_RE = re.compile(r':\s+')
+CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def bundle_path(name):
+    return f'{BUNDLES_DIR}/{name}'
+
+
+def bundle_sources(name):
+    try:
+        return settings.STATIC_BUNDLES[name]
+    except KeyError:
+        raise ImproperlyConfigured(f'حزمة غير معرّفة في STATIC_BUNDLES: {name}') from None
+
+
+def minify_css(text):
+    """تصغير CSS بـ rcssmin إن وُجدت، وإلا بحذف التعليقات والمسافات الزائدة"""
+    if rcssmin:
+        return rcssmin.cssmin(text)
+    text = CSS_COMMENT_RE.sub('', text)
+    text = CSS_SPACE_RE.sub(r'\1', ' '.join(text.split()))
+    text = CSS_COLON_RE.sub(':', text)
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    """تصغير JS بـ rjsmin إن وُجدت؛ دونها يُكتفى بحذف الأسطر الفارغة (التصغير الآمن يحتاج محللاً)"""
+    if rjsmin:
+        return rjsmin.jsmin(text)
+    return '\n'.join(line.rstrip() for line in text.splitlines() if line.strip())
+
+
+def _rebase_css_urls(text, source):
+    """تحويل روابط url() النسبية لتبقى صحيحة من مجلد الحزم"""
+    source_dir = posixpath.dirname(source)
+
+    def rebase(match):
+        quote, url = match.groups()
+        if url.startswith(('/', '#', 'data:')) or '://' in url:
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(source_dir, url))
+        return f'url({quote}{posixpath.relpath(target, BUNDLES_DIR)}{quote})'
+
+    return CSS_URL_RE.sub(rebase, text)
+
+
+def build_bundle(name):
+    """محتوى الحزمة المصغر من ملفاتها المصدرية بالترتيب"""
+    is_css = name.endswith('.css')
+    parts = []
+    for source in bundle_sources(name):
+        path = finders.find(source)
+        if not path:
+            raise ImproperlyConfigured(f'الملف {source} في الحزمة {name} غير موجود')
+        with open(path, encoding='utf-8') as handle:
+            text = handle.read()
+        if is_css:
+            parts.append(minify_css(_rebase_css_urls(text, source)))
+        else:
+            # الفاصلة المنقوطة تمنع دمج آخر عبارة في ملف مع أول عبارة في التالي
+            parts.append(minify_js(text).rstrip().rstrip(';') + ';' if text.strip() else '')
+    content = '\n'.join(part for part in parts if part)
+    return content + '\n' if content else ''
+
+
+def compress(path):
+    """كتابة path.gz وpath.br (عند توفر brotli) إن كانت أصغر من الأصل؛ يعيد الامتدادات المكتوبة"""
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return []
+    written = []
+    # mtime=0 يجعل الناتج ثابتاً لنفس المحتوى
+    encoded = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        encoded['.br'] = brotli.compress(data, quality=11)
+    for extension, compressed in encoded.items():
+        if len(compressed) < len(data):
+            with open(path + extension, 'wb') as handle:
+                handle.write(compressed)
+            written.append(extension)
+    return written
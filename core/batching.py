@@ -0,0 +1,80 @@
+"""أدوات معالجة البيانات على دفعات دون تحميلها كاملة في الذاكرة"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+
+def chunked(iterable, size):
+    """تقسيم أي iterable إلى قوائم بطول size"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def keyset_batches(queryset, batch_size, key='pk'):
+    """قراءة queryset على دفعات مرتبة حسب المفتاح (keyset) بدلاً من OFFSET
+
+    آمنة عند تعديل الصفوف المقروءة أثناء المعالجة، وتسمح باستئناف العمل من آخر مفتاح.
+    """
+    last = None
+    while True:
+        batch = queryset.order_by(key)
+        if last is not None:
+            batch = batch.filter(**{f'{key}__gt': last})
+        batch = list(batch[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1][key] if isinstance(batch[-1], dict) else getattr(batch[-1], key)
+
+
+def setup_worker():
+    """تهيئة Django في عملية من مجموعة العمليات (ProcessPoolExecutor initializer)"""
+    import django
+    django.setup()
+
+
+def _call_safely(func, key, row):
+    try:
+        return row[key], func(row), None
+    except Exception as exc:  # فشل صف واحد لا يوقف الدفعة
+        return row[key], None, str(exc)
+
+
+def process_batches(rows, func, save, batch_size, key='pk', workers=None, initializer=setup_worker, initargs=(),
+                    on_batch=None):
+    """تطبيق func على قواميس rows دفعةً دفعة، في مجموعة عمليات عند workers > 1
+
+    func تعمل في العمليات دون قاعدة البيانات وتعيد ناتج الصف، وsave تحفظ نتائج كل دفعة
+    في العملية الرئيسية كقائمة (المفتاح، الناتج). الصفوف التي ترفع func عليها استثناءً
+    تُجمع في الأخطاء وتُتجاوز. يعيد (عدد الصفوف الناجحة، قائمة (المفتاح، رسالة الخطأ)).
+    """
+    workers = workers or 1
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) if workers > 1 else None
+    task = partial(_call_safely, func, key)
+
+    processed, errors = 0, []
+    try:
+        for batch in keyset_batches(rows, batch_size, key=key):
+            if executor:
+                results = executor.map(task, batch, chunksize=max(1, len(batch) // (workers * 4)))
+            else:
+                results = map(task, batch)
+
+            done = []
+            for row_key, value, error in results:
+                if error:
+                    errors.append((row_key, error))
+                else:
+                    done.append((row_key, value))
+            save(done)
+
+            processed += len(done)
+            if on_batch:
+                on_batch(processed, len(errors))
+    finally:
+        if executor:
+            executor.shutdown()
+    return processed, errors
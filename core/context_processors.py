@@ -0,0 +1,6 @@
+from .shell import PageShell
+
+
+def page_shell(request):
+    """مفاتيح أجزاء الغلاف المخزنة (core.shell) للقوالب"""
+    return {'page_shell': PageShell(request)}
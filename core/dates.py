@@ -0,0 +1,30 @@
+"""دوال مساعدة للتعامل مع الأشهر والفترات"""
+import calendar
+from datetime import date
+
+
+def month_start(value):
+    """أول يوم في شهر التاريخ المعطى"""
+    return value.replace(day=1)
+
+
+def add_months(value, months):
+    """إضافة عدد من الأشهر مع تقليص اليوم لآخر الشهر عند الحاجة (31 يناير + 1 = 28/29 فبراير)"""
+    ordinal = value.year * 12 + value.month - 1 + months
+    year, month = divmod(ordinal, 12)
+    month += 1
+    return date(year, month, min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def iter_months(start, end):
+    """أوائل الأشهر من شهر start حتى شهر end (شاملة)"""
+    current, last = month_start(start), month_start(end)
+    while current <= last:
+        yield current
+        current = add_months(current, 1)
+
+
+def parse_month(value):
+    """تحويل نص بالصيغة YYYY-MM أو YYYY-MM-DD إلى أول يوم في الشهر"""
+    parts = value.split('-')
+    return date(int(parts[0]), int(parts[1]), 1)
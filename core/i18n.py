@@ -0,0 +1,158 @@
+"""كتالوجات الترجمة: تحميلها مسبقاً عند بدء العامل والتحقق من تطابق django.po وdjango.mo
+
+يحمّل Django كتالوج كل لغة (ملفات .mo لكل التطبيقات المثبتة) عند أول تفعيل لها ويحتفظ
+به في ذاكرة العملية، فيدفع أول طلب بالعربية وأول طلب بالإنجليزية في كل عامل زمن التحميل.
+warm_translations تنقل هذا إلى بدء العامل (wsgi/asgi). التحقق يقرأ ملفات .po بمحلل بسيط
+ويقارن المدخلات المترجمة (غير fuzzy) بمحتوى .mo، ويمكنه إعادة كتابة .mo دون أدوات gettext.
+"""
+import ast
+import struct
+from array import array
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.utils.translation import (
+    check_for_language,
+    get_supported_language_variant,
+    trans_real,
+)
+
+MO_MAGIC = 0x950412de
+DOMAIN = 'django'
+
+
+def warm_translations():
+    """تحميل كتالوجات LANGUAGES واللغة الافتراضية في ذاكرة العملية؛ يعيد رموز اللغات المحملة"""
+    codes = [code for code, _name in settings.LANGUAGES]
+    if settings.LANGUAGE_CODE not in codes:
+        codes.append(settings.LANGUAGE_CODE)
+    for code in codes:
+        # نتائج هاتين الدالتين محفوظة (lru_cache) وتبحث في نظام الملفات عند أول استدعاء
+        check_for_language(code)
+        get_supported_language_variant(code)
+        trans_real.translation(code)
+    return codes
+
+
+def locale_dirs():
+    """مجلدات locale الخاصة بالمشروع: LOCALE_PATHS ومجلدات تطبيقاته (دون الحزم المثبتة)"""
+    base_dir = Path(settings.BASE_DIR).resolve()
+    dirs = [Path(path) for path in settings.LOCALE_PATHS]
+    for app_config in apps.get_app_configs():
+        path = Path(app_config.path).resolve() / 'locale'
+        if base_dir in path.parents:
+            dirs.append(path)
+    return [path for path in dict.fromkeys(dirs) if path.is_dir()]
+
+
+def catalog_files():
+    """أزواج (ملف .po، ملف .mo) لكل لغة في مجلدات المشروع"""
+    for locale_dir in locale_dirs():
+        for po_path in sorted(locale_dir.glob(f'*/LC_MESSAGES/{DOMAIN}.po')):
+            yield po_path, po_path.with_suffix('.mo')
+
+
+def _unquote(text):
+    return ast.literal_eval(text.strip())
+
+
+def parse_po(path):
+    """المدخلات التي يضعها msgfmt في .mo: {المعرّف الخام: الترجمة الخام}
+
+    تُستبعد المدخلات غير المترجمة وfuzzy (عدا الترويسة) والمهملة (#~). المعرّف الخام يضم
+    السياق (ctxt\\x04msgid) وصيغة الجمع (msgid\\0msgid_plural) كما في تنسيق .mo.
+    """
+    entries = {}
+    entry, fuzzy, field = {}, False, None
+
+    def flush():
+        if 'msgid' in entry:
+            msgid = entry['msgid']
+            if 'msgid_plural' in entry:
+                msgid = f"{msgid}\0{entry['msgid_plural']}"
+                forms = [entry[name] for name in sorted(k for k in entry if k.startswith('msgstr['))]
+                msgstr = '\0'.join(forms) if all(forms) else ''
+            else:
+                msgstr = entry.get('msgstr', '')
+            if 'msgctxt' in entry:
+                msgid = f"{entry['msgctxt']}\x04{msgid}"
+            if msgid == '':
+                # msgfmt يحذف تاريخ إنشاء القالب من الترويسة
+                msgstr = ''.join(
+                    line for line in msgstr.splitlines(keepends=True) if not line.startswith('POT-Creation-Date:')
+                )
+            if msgstr and (not fuzzy or msgid == ''):
+                entries[msgid] = msgstr
+
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith('#~'):
+                if not line:
+                    flush()
+                    entry, fuzzy, field = {}, False, None
+                continue
+            if line.startswith('#,'):
+                fuzzy = fuzzy or 'fuzzy' in line
+                continue
+            if line.startswith('#'):
+                continue
+            if line.startswith('"'):
+                if field:
+                    entry[field] += _unquote(line)
+                continue
+            keyword, _space, value = line.partition(' ')
+            if keyword in ('msgctxt', 'msgid') and any(k.startswith('msgstr') for k in entry):
+                # مدخل جديد دون سطر فارغ قبله
+                flush()
+                entry, fuzzy = {}, False
+            field = keyword
+            entry[field] = _unquote(value)
+    flush()
+    return entries
+
+
+def read_mo(path):
+    """محتوى ملف .mo الخام: {المعرّف: الترجمة}"""
+    data = Path(path).read_bytes()
+    magic = struct.unpack('<I', data[:4])[0]
+    order = '<' if magic == MO_MAGIC else '>'
+    _magic, _revision, count, ids_offset, strs_offset = struct.unpack(f'{order}5I', data[:20])
+    entries = {}
+    for index in range(count):
+        id_length, id_start = struct.unpack(f'{order}2I', data[ids_offset + index * 8:ids_offset + index * 8 + 8])
+        str_length, str_start = struct.unpack(
+            f'{order}2I', data[strs_offset + index * 8:strs_offset + index * 8 + 8]
+        )
+        entries[data[id_start:id_start + id_length].decode()] = data[str_start:str_start + str_length].decode()
+    return entries
+
+
+def write_mo(entries, path):
+    """كتابة ملف .mo من مدخلات parse_po (بتنسيق msgfmt دون جدول hash)"""
+    keys = sorted(entries)
+    ids, strs, offsets = b'', b'', []
+    for key in keys:
+        key_bytes, value_bytes = key.encode(), entries[key].encode()
+        offsets.append((len(ids), len(key_bytes), len(strs), len(value_bytes)))
+        ids += key_bytes + b'\0'
+        strs += value_bytes + b'\0'
+    ids_start = 7 * 4 + 16 * len(keys)
+    strs_start = ids_start + len(ids)
+    key_offsets, value_offsets = [], []
+    for id_offset, id_length, str_offset, str_length in offsets:
+        key_offsets += [id_length, id_offset + ids_start]
+        value_offsets += [str_length, str_offset + strs_start]
+    header = struct.pack('<7I', MO_MAGIC, 0, len(keys), 7 * 4, 7 * 4 + len(keys) * 8, 0, 0)
+    Path(path).write_bytes(header + array('I', key_offsets + value_offsets).tobytes() + ids + strs)
+
+
+def compare_catalog(po_path, mo_path):
+    """الفروق بين .po و.mo: (معرّفات ناقصة في .mo، معرّفات ترجمتها مختلفة، معرّفات زائدة في .mo)"""
+    expected = parse_po(po_path)
+    compiled = read_mo(mo_path) if Path(mo_path).exists() else {}
+    missing = sorted(expected.keys() - compiled.keys())
+    changed = sorted(key for key in expected.keys() & compiled.keys() if expected[key] != compiled[key])
+    extra = sorted(compiled.keys() - expected.keys())
+    return missing, changed, extra
@@ -0,0 +1,87 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.utils import translation
+
+from apps.users.models import User
+from apps.users.profiles import ProfileBundle
+from core.shell import STAFF, invalidate_page_shell
+
+TEMPLATE = 'base.html'
+
+
+def production_backend():
+    """محرك قوالب بإعدادات المشروع مع محمّل القوالب المخزن كما في الإنتاج"""
+    config = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': 'page_shell_benchmark',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **config['OPTIONS'],
+            'loaders': [('django.template.loaders.cached.Loader', settings.TEMPLATE_LOADERS)],
+        },
+    })
+
+
+def shell_request(role):
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    request.profile = None
+    if role:
+        user_type = role
+        if role == STAFF:
+            user_type = User.UserType.ADMIN
+            request.user = User(pk=1, user_type=user_type, is_staff=True)
+        request.profile = ProfileBundle(
+            user_id=1, user_type=user_type, email='bench@example.om', company_name='شركة القياس',
+            company_name_english='Benchmark LLC', commercial_registration='1000000', company_logo='',
+            company_logo_hash='', is_verified=True,
+        )
+    return request
+
+
+class Command(BaseCommand):
+    help = 'قياس زمن عرض غلاف الصفحة (الترويسة والقائمة والتذييل) بارداً ودافئاً لكل دور مستخدم ولغة'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=200, help='عدد مرات العرض لكل قياس')
+
+    def handle(self, *args, **options):
+        renders = options['renders']
+        backend = production_backend()
+        roles = [None, *User.UserType.values, STAFF]
+        for code, _name in settings.LANGUAGES:
+            with translation.override(code):
+                for role in roles:
+                    request = shell_request(role)
+                    results = {
+                        # تحليل القوالب من الملفات وعرض الأجزاء كاملة في كل مرة
+                        'بارد': self._measure(backend, request, renders, reset_templates=True, reset_fragments=True),
+                        'قوالب محللة': self._measure(backend, request, renders, reset_fragments=True),
+                        'دافئ': self._measure(backend, request, renders),
+                    }
+                    self.stdout.write(f'{code} / {role or "زائر"}: ' + '، '.join(
+                        f'{label} {elapsed * 1000 / renders:.2f} م.ث' for label, elapsed in results.items()
+                    ))
+        invalidate_page_shell()
+
+    @staticmethod
+    def _measure(backend, request, renders, reset_templates=False, reset_fragments=False):
+        # عرض تمهيدي يملأ المحمّل والأجزاء للقياس الدافئ
+        backend.get_template(TEMPLATE).render(request=request)
+        elapsed = 0
+        for _ in range(renders):
+            if reset_templates:
+                for loader in backend.engine.template_loaders:
+                    loader.reset()
+            if reset_fragments:
+                invalidate_page_shell()
+            started = time.perf_counter()
+            backend.get_template(TEMPLATE).render(request=request)
+            elapsed += time.perf_counter() - started
+        return elapsed
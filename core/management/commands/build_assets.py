@@ -0,0 +1,43 @@
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from core.assets import BUNDLES_DIR, brotli, build_bundle
+
+
+class Command(BaseCommand):
+    help = 'بناء حزم CSS/JS المصغرة لكل مجموعة صفحات ثم collectstatic (أسماء مبصومة ونسخ gzip/brotli)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-collect', action='store_true', help='بناء الحزم دون تشغيل collectstatic')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        output_dir = Path(settings.STATICFILES_DIRS[0]) / BUNDLES_DIR
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for name, sources in settings.STATIC_BUNDLES.items():
+            content = build_bundle(name).encode()
+            (output_dir / name).write_bytes(content)
+            source_size = sum(os.path.getsize(finders.find(source)) for source in sources)
+            self.stdout.write(f'{name}: {len(sources)} ملف، {source_size} ← {len(content)} بايت')
+        if options['no_collect']:
+            return
+
+        if not brotli:
+            self.stderr.write('brotli غير مثبتة؛ تُكتب نسخ gzip فقط')
+        call_command('collectstatic', interactive=False, verbosity=0)
+        for name in settings.STATIC_BUNDLES:
+            hashed_name = staticfiles_storage.stored_name(f'{BUNDLES_DIR}/{name}')
+            path = staticfiles_storage.path(hashed_name)
+            sizes = [
+                f'{extension} {os.path.getsize(path + extension)}'
+                for extension in ('.gz', '.br') if os.path.exists(path + extension)
+            ]
+            self.stdout.write(f'{hashed_name}: {os.path.getsize(path)} بايت' + (f' ({"، ".join(sizes)})' if sizes else ''))
+        self.stdout.write(self.style.SUCCESS(f'بُنيت الحزم خلال {time.monotonic() - started:.1f} ث'))
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.i18n import (
+    catalog_files,
+    compare_catalog,
+    parse_po,
+    warm_translations,
+    write_mo,
+)
+
+
+class Command(BaseCommand):
+    help = 'التحقق من تطابق ملفات django.mo مع django.po لكل لغة (يُشغَّل قبل النشر)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--compile', action='store_true',
+                            help='إعادة كتابة ملفات .mo غير المتطابقة بدلاً من الفشل')
+        parser.add_argument('--warm', action='store_true',
+                            help='قياس زمن تحميل كتالوجات اللغات كما يحدث عند بدء العامل')
+
+    def handle(self, *args, **options):
+        stale = []
+        for po_path, mo_path in catalog_files():
+            relative = po_path.relative_to(settings.BASE_DIR) if po_path.is_relative_to(settings.BASE_DIR) else po_path
+            if not mo_path.exists():
+                problems = ['ملف .mo غير موجود']
+            else:
+                missing, changed, extra = compare_catalog(po_path, mo_path)
+                problems = [
+                    f'{label}: {len(keys)} ({", ".join(repr(key[:40]) for key in keys[:3])})'
+                    for label, keys in (('غير مترجمة في .mo', missing), ('ترجمة مختلفة', changed),
+                                        ('زائدة في .mo', extra))
+                    if keys
+                ]
+            if not problems:
+                self.stdout.write(f'{relative}: {len(parse_po(po_path))} مدخل متطابق')
+                continue
+            if options['compile']:
+                write_mo(parse_po(po_path), mo_path)
+                self.stdout.write(self.style.WARNING(f'{relative}: أُعيدت كتابة .mo ({"؛ ".join(problems)})'))
+                continue
+            stale.append(str(relative))
+            self.stdout.write(self.style.ERROR(f'{relative}: {"؛ ".join(problems)}'))
+
+        if stale:
+            raise CommandError(
+                f'ملفات .mo لا تطابق .po في {len(stale)} كتالوج؛ شغّل compilemessages أو check_translations --compile'
+            )
+        if options['warm']:
+            started = time.monotonic()
+            codes = warm_translations()
+            self.stdout.write(f'حُمّلت كتالوجات {", ".join(codes)} خلال {(time.monotonic() - started) * 1000:.0f} م.ث')
+        self.stdout.write(self.style.SUCCESS('كتالوجات الترجمة متطابقة'))
@@ -0,0 +1,31 @@
+"""تحويل مستندات HTML إلى PDF عند توفر weasyprint وحفظها في التخزين الافتراضي"""
+import os
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+# الملفات الأصغر من هذا الحد تبقى في الذاكرة قبل الكتابة إلى التخزين
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def write_document(html, target):
+    """كتابة المستند إلى target بصيغة PDF، أو HTML كما هو إن لم تتوفر weasyprint؛ يعيد الامتداد"""
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        target.write(html.encode('utf-8'))
+        return 'html'
+    HTML(string=html).write_pdf(target)
+    return 'pdf'
+
+
+def save_document(html, name):
+    """حفظ المستند في التخزين الافتراضي باسم name مع امتداد صيغته؛ يعيد اسم الملف المحفوظ"""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as target:
+        name = f'{name}.{write_document(html, target)}'
+        target.seek(0)
+        # ملف متبقٍ من تشغيل سابق انقطع قبل تسجيل المستند
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        return default_storage.save(name, File(target, name=os.path.basename(name)))
@@ -0,0 +1,66 @@
+"""غلاف الصفحات (الترويسة والقائمة والتذييل) المخزن مؤقتاً حسب دور المستخدم واللغة
+
+تُعرض أجزاء الغلاف في includes/ داخل وسوم {% cache %} مفاتيحها (الدور، اللغة، الإصدار)،
+فلا يُعاد عرضها إلا عند أول طلب لكل تركيبة. الدور هو staff لموظفي لوحة الإدارة (is_staff)
+أياً كان نوعهم، وإلا نوع المستخدم، فروابط القائمة تتبع الصلاحيات التي تتحقق منها الصفحات. الإصدار يجمع PAGE_SHELL_RELEASE
+(يُغيَّر مع كل نشر يعدل القوالب) وعداداً في ذاكرة الأجزاء يرفعه invalidate_page_shell،
+فالإبطال لا يحتاج لحذف المفاتيح القديمة: تُهمل حتى تنتهي مدتها. الأجزاء المخزنة لا تحوي
+بيانات المستخدم نفسه ولا رمز CSRF؛ هذه تُعرض خارج وسوم التخزين.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import cached_property
+
+# الاسم الذي يبحث عنه وسم {% cache %} في CACHES قبل الرجوع إلى default
+FRAGMENT_CACHE_ALIAS = 'template_fragments'
+VERSION_KEY = 'page_shell:version'
+ANONYMOUS = 'anonymous'
+STAFF = 'staff'
+
+
+def _cache():
+    return caches[FRAGMENT_CACHE_ALIAS if FRAGMENT_CACHE_ALIAS in settings.CACHES else 'default']
+
+
+def shell_version():
+    """إصدار أجزاء الغلاف الحالي؛ يبدأ العداد بالوقت الحالي إن لم يوجد (أو أُخرج من الذاكرة)"""
+    counter = _cache().get_or_set(VERSION_KEY, lambda: int(time.time()), None)
+    return f'{settings.PAGE_SHELL_RELEASE}.{counter}'
+
+
+def invalidate_page_shell():
+    """إبطال كل أجزاء الغلاف المخزنة لكل الأنواع واللغات برفع الإصدار"""
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time()), None)
+
+
+class PageShell:
+    """متغيرات مفاتيح الغلاف في القوالب (page_shell)؛ تُحسب عند أول استخدام فقط"""
+
+    def __init__(self, request):
+        self.request = request
+
+    @cached_property
+    def user_type(self):
+        profile = getattr(self.request, 'profile', None)
+        return profile.user_type if profile else ANONYMOUS
+
+    @cached_property
+    def role(self):
+        if self.user_type == ANONYMOUS:
+            return ANONYMOUS
+        user = self.request.user
+        return STAFF if user.is_active and user.is_staff else self.user_type
+
+    @cached_property
+    def version(self):
+        return shell_version()
+
+    @property
+    def timeout(self):
+        return settings.PAGE_SHELL_CACHE_TIMEOUT
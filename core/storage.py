@@ -0,0 +1,19 @@
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from .assets import COMPRESSIBLE_EXTENSIONS, compress
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """تخزين الملفات الثابتة بأسماء مبصومة مع نسخ gzip/brotli مضغوطة مسبقاً بجانبها
+
+    الضغط يجري بعد معالجة collectstatic على الأسماء المبصومة فقط، وهي التي تُخدم بترويسات
+    تخزين طويلة؛ الأسماء الأصلية تبقى دون ضغط.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(hashed_name):
+                compress(self.path(hashed_name))
@@ -0,0 +1,21 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from core.assets import bundle_path, bundle_sources
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle(name):
+    """وسوم link/script لحزمة من STATIC_BUNDLES
+
+    تُستخدم الحزمة المبنية (build_assets) عند STATIC_BUNDLES_ENABLED، وإلا ملفاتها المصدرية
+    منفصلة كما في التطوير.
+    {% bundle 'base-rtl.css' %}
+    """
+    sources = [bundle_path(name)] if settings.STATIC_BUNDLES_ENABLED else bundle_sources(name)
+    tag = '<link rel="stylesheet" href="{}">' if name.endswith('.css') else '<script src="{}"></script>'
+    return format_html_join('\n', tag, ((static(source),) for source in sources))
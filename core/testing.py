@@ -0,0 +1,119 @@
+"""أدوات للاختبارات: اكتشاف تراجعات N+1 بمقارنة عدد الاستعلامات بين حجمين من البيانات، وبيانات اختبار، ومشغّل الاختبارات"""
+from datetime import date
+from decimal import Decimal
+from itertools import count
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.users.models import Investor, Owner, Tenant, User
+from buildings.models import Building
+from contracts.models import Contract
+from units.models import Unit
+
+
+class TestRunner(DiscoverRunner):
+    """مشغّل الاختبارات (TEST_RUNNER): الملفات الثابتة دون manifest
+
+    الاختبارات تعرض القوالب دون تشغيل collectstatic، فلا توجد أسماء مبصومة يقرؤها
+    {% static %}؛ اختبار يحتاج التخزين المبصوم يفعّله بـ override_settings.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._storages = override_settings(STORAGES={
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        })
+        self._storages.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._storages.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+def capture_queries(func, using=DEFAULT_DB_ALIAS):
+    """تنفيذ func وإعادة (نتيجتها، قائمة نصوص الاستعلامات المنفذة)"""
+    with CaptureQueriesContext(connections[using]) as context:
+        result = func()
+    return result, [query['sql'] for query in context.captured_queries]
+
+
+def assert_constant_queries(func, small, large, using=DEFAULT_DB_ALIAS):
+    """التأكد من أن func(small) وfunc(large) تنفذان العدد نفسه من الاستعلامات
+
+    small وlarge مدخلان من النوع نفسه بحجمين مختلفين (مثل queryset مقيد بـ 2 و20 صفاً)،
+    فزيادة الاستعلامات مع الحجم تعني استعلاماً لكل صف. تُعرض الاستعلامات الزائدة في رسالة الفشل.
+    """
+    _, small_queries = capture_queries(lambda: _consume(func(small)), using)
+    _, large_queries = capture_queries(lambda: _consume(func(large)), using)
+    if len(large_queries) != len(small_queries):
+        extra = '\n'.join(large_queries[len(small_queries):][:10])
+        raise AssertionError(
+            f'عدد الاستعلامات يزيد مع حجم البيانات ({len(small_queries)} مقابل {len(large_queries)}):\n{extra}'
+        )
+    return len(small_queries)
+
+
+def _consume(result):
+    # النتائج الكسولة (querysets والمولدات) لا تنفذ استعلاماتها حتى تُقرأ
+    if result is not None and not isinstance(result, (str, bytes, dict)) and hasattr(result, '__iter__'):
+        return list(result)
+    return result
+
+
+_sequence = count(1)
+
+
+def make_user(user_type=User.UserType.TENANT, **fields):
+    """مستخدم بقيم فريدة افتراضية؛ يُنشأ ملفه المطابق لنوعه بـ make_owner/make_tenant/make_investor"""
+    number = next(_sequence)
+    fields.setdefault('email', f'user{number}@example.om')
+    fields.setdefault('company_name', f'شركة الاختبار {number}')
+    fields.setdefault('commercial_registration', f'{number:010d}')
+    fields.setdefault('address', 'مسقط')
+    password = fields.pop('password', None)
+    return User.objects.create_user(password=password, user_type=user_type, **fields)
+
+
+def make_owner(**fields):
+    return Owner.objects.create(user=make_user(User.UserType.OWNER, **fields))
+
+
+def make_investor(investment_percentage=0, **fields):
+    return Investor.objects.create(
+        user=make_user(User.UserType.INVESTOR, **fields),
+        investment_percentage=investment_percentage,
+        investment_date=date(2024, 1, 1),
+    )
+
+
+def make_tenant(**fields):
+    return Tenant.objects.create(
+        user=make_user(User.UserType.TENANT, **fields),
+        company_activity='تجارة',
+        authorized_person='المفوض',
+        authorized_person_id='12345678',
+    )
+
+
+def make_building(owner=None, **fields):
+    fields.setdefault('name', f'مبنى {next(_sequence)}')
+    fields.setdefault('address', 'مسقط')
+    return Building.objects.create(owner=owner or make_owner(), **fields)
+
+
+def make_unit(building=None, **fields):
+    fields.setdefault('unit_number', str(next(_sequence)))
+    return Unit.objects.create(building=building or make_building(), **fields)
+
+
+def make_contract(tenant=None, unit=None, **fields):
+    fields.setdefault('contract_number', f'C-{next(_sequence)}')
+    fields.setdefault('start_date', date(2024, 1, 1))
+    fields.setdefault('end_date', date(2024, 12, 31))
+    fields.setdefault('monthly_rent', Decimal('100.00'))
+    fields.setdefault('status', Contract.Status.ACTIVE)
+    return Contract.objects.create(tenant=tenant or make_tenant(), unit=unit or make_unit(), **fields)
@@ -1,3 +1,254 @@
-from django.test import TestCase
+import gzip
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.template.loader import render_to_string
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from apps.users.admin import UserAdmin
+from apps.users.models import User
+from apps.users.profiles import get_profile
+from core import assets, shell, views
+from core.testing import make_user
+
+
+class MinifyCssTests(SimpleTestCase):
+    def minify(self, text):
+        # المسار الاحتياطي دون rcssmin
+        rcssmin, assets.rcssmin = assets.rcssmin, None
+        self.addCleanup(setattr, assets, 'rcssmin', rcssmin)
+        return assets.minify_css(text)
+
+    def test_keeps_descendant_pseudo_class_selector(self):
+        self.assertEqual(self.minify('a :hover { color: red; }'), 'a :hover{color:red}')
+        self.assertEqual(self.minify('nav > a:hover , p'), 'nav>a:hover,p')
+
+    def test_strips_comments_and_whitespace(self):
+        css = '/* تعليق */\n.box {\n    margin: 0 auto;\n    padding:  1px  2px;\n}\n/*! ترخيص */'
+        self.assertEqual(self.minify(css), '.box{margin:0 auto;padding:1px 2px}/*! ترخيص */')
+
+
+class BuildBundleTests(SimpleTestCase):
+    def setUp(self):
+        static = tempfile.TemporaryDirectory()
+        self.addCleanup(static.cleanup)
+        self.write(static.name, 'css/site/main.css', (
+            '.logo { background: url("../images/logo.png"); }\n'
+            ".icon { background: url(  'icons/a.svg' ); }\n"
+            '.font { src: url(/fonts/a.woff2), url(https://cdn.example.om/a.css), url(data:image/png;base64,AA==); }\n'
+            '.mask { mask: url(#shape); }\n'
+        ))
+        self.write(static.name, 'css/extra.css', '.more { background: url(img/b.png) }')
+        self.write(static.name, 'js/a.js', 'var a = 1\n\n')
+        self.write(static.name, 'js/b.js', 'var b = 2;')
+        settings_override = override_settings(STATICFILES_DIRS=[static.name], STATIC_BUNDLES={
+            'site.css': ['css/site/main.css', 'css/extra.css'],
+            'site.js': ['js/a.js', 'js/b.js'],
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    @staticmethod
+    def write(root, name, text):
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(text)
+
+    def test_relative_css_urls_point_from_bundles_dir(self):
+        content = assets.build_bundle('site.css')
+
+        self.assertIn('url("../css/images/logo.png")', content)
+        self.assertIn("url('../css/site/icons/a.svg')", content)
+        self.assertIn('url(../css/img/b.png)', content)
+        # الروابط المطلقة والخارجية وdata: والمراجع الداخلية تبقى كما هي
+        for url in ('/fonts/a.woff2', 'https://cdn.example.om/a.css', 'data:image/png;base64,AA==', '#shape'):
+            self.assertIn(f'url({url})', content)
+
+    def test_js_sources_are_separated(self):
+        self.assertEqual(assets.build_bundle('site.js').replace(' ', ''), 'vara=1;\nvarb=2;\n')
+
+
+class ServeStaticTests(SimpleTestCase):
+    hashed = 'css/site.0123abcd.css'
+    plain = 'css/site.css'
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        settings_override = override_settings(STATIC_ROOT=root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        os.makedirs(os.path.join(root.name, 'css'))
+        self.content = b'body{margin:0}' * 40
+        for name in (self.hashed, self.plain):
+            path = os.path.join(root.name, name)
+            with open(path, 'wb') as handle:
+                handle.write(self.content)
+        self.path = os.path.join(root.name, self.hashed)
+        with open(self.path + '.gz', 'wb') as handle:
+            handle.write(gzip.compress(self.content))
+        with open(self.path + '.br', 'wb') as handle:
+            handle.write(b'brotli')
+        patcher = mock.patch.object(views, 'immutable_names', return_value=frozenset({self.hashed}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, name, **headers):
+        return views.serve_static(RequestFactory().get(f'/static/{name}', headers=headers), name)
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_precompressed_encoding_follows_accept_encoding(self):
+        cases = {
+            'gzip, deflate, br': ('br', b'brotli'),
+            'gzip': ('gzip', gzip.compress(self.content)),
+            'br;q=0, gzip;q=0.5': ('gzip', gzip.compress(self.content)),
+            'identity': (None, self.content),
+        }
+        for accept, (encoding, body) in cases.items():
+            with self.subTest(accept=accept):
+                response = self.get(self.hashed, accept_encoding=accept)
+                self.assertEqual(response.get('Content-Encoding'), encoding)
+                self.assertEqual(response['Content-Type'], 'text/css')
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+                self.assertEqual(self.body(response), body)
+
+    def test_cache_headers(self):
+        response = self.get(self.hashed)
+        self.assertEqual(
+            sorted(response['Cache-Control'].split(', ')), ['immutable', 'max-age=31536000', 'public']
+        )
+        # الاسم غير المبصوم قد يتغير مع النشر، ولا توجد له نسخ مضغوطة
+        response = self.get(self.plain, accept_encoding='br, gzip')
+        self.assertEqual(sorted(response['Cache-Control'].split(', ')), ['max-age=60', 'public'])
+        self.assertNotIn('Content-Encoding', response)
+
+        response = self.get(self.hashed, if_modified_since=http_date(os.stat(self.path).st_mtime + 1))
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_missing_and_outside_paths(self):
+        for name in ('css/missing.css', '../secret.txt', 'css'):
+            with self.subTest(name=name), self.assertRaises(Http404):
+                self.get(name)
+
+
+@mock.patch.object(UserAdmin, 'list_per_page', 3)
+class KeysetChangeListTests(TestCase):
+    url = reverse('admin:users_user_changelist')
+
+    def setUp(self):
+        admin = User.objects.create_superuser('admin@example.om', 'الإدارة', '9999999999', password='secret')
+        for index in range(7):
+            make_user(User.UserType.OWNER if index % 2 else User.UserType.TENANT)
+        self.client.force_login(admin)
+
+    def changelist(self, query=''):
+        response = self.client.get(self.url + query)
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl']
+
+    def pks(self, changelist):
+        return [user.pk for user in changelist.result_list]
+
+    def walk(self, query=''):
+        """صفحات القائمة بتتبع رابط التالية ثم رابط السابقة حتى الأولى"""
+        changelist = self.changelist(query)
+        forward = [self.pks(changelist)]
+        while changelist.next_cursor is not None:
+            changelist = self.changelist(changelist.next_page_url)
+            forward.append(self.pks(changelist))
+        backward = [self.pks(changelist)]
+        while changelist.previous_cursor is not None:
+            changelist = self.changelist(changelist.previous_page_url)
+            backward.append(self.pks(changelist))
+        return forward, backward[::-1]
+
+    def test_cursor_pages_cover_every_row_once(self):
+        forward, backward = self.walk()
+
+        expected = list(User.objects.order_by('-pk').values_list('pk', flat=True))
+        self.assertEqual([len(page) for page in forward], [3, 3, 2])
+        self.assertEqual([pk for page in forward for pk in page], expected)
+        self.assertEqual(backward, forward)
+
+        changelist = self.changelist(f'?after={forward[0][-1]}')
+        self.assertTrue(changelist.keyset)
+        self.assertEqual((changelist.previous_cursor, changelist.next_cursor), (forward[1][0], forward[1][-1]))
+        self.assertEqual(self.changelist(changelist.first_page_url).result_list[0].pk, expected[0])
+
+    def test_filters_apply_to_cursor_pages(self):
+        forward, backward = self.walk('?user_type__exact=TENANT')
+
+        expected = list(
+            User.objects.filter(user_type=User.UserType.TENANT).order_by('-pk').values_list('pk', flat=True)
+        )
+        self.assertEqual([pk for page in forward for pk in page], expected)
+        self.assertEqual(backward, forward)
+        changelist = self.changelist(f'?user_type__exact=TENANT&after={expected[0]}')
+        self.assertEqual(self.pks(changelist), expected[1:4])
+        self.assertIn('user_type__exact=TENANT', changelist.next_page_url)
+
+    def test_column_sort_falls_back_to_numbered_pages(self):
+        changelist = self.changelist('?o=1')
+
+        self.assertFalse(changelist.keyset)
+        self.assertEqual(changelist.result_count, 8)
+        emails = list(User.objects.order_by('email').values_list('email', flat=True))
+        pages = [
+            [user.email for user in self.changelist(f'?o=1&p={page}').result_list] for page in (1, 2, 3)
+        ]
+        self.assertEqual([email for page in pages for email in page], emails)
+        # المؤشر يُتجاهل مع الفرز بعمود ولا يُعد معامل تصفية
+        latest = User.objects.latest('pk').pk
+        self.assertEqual(self.changelist(f'?o=1&after={latest}').result_list[0].email, emails[0])
+
+
+class NavigationTests(TestCase):
+    links = {
+        'login': reverse('users:login'),
+        'occupancy': reverse('buildings:occupancy_dashboard'),
+        'ledger': reverse('reports:export_ledger', args=['xlsx']),
+        'revenue': reverse('reports:export_revenue', args=['xlsx']),
+        'directory': reverse('users:directory_search'),
+        'admin': reverse('admin:index'),
+    }
+
+    def setUp(self):
+        shell._cache().clear()
+        self.addCleanup(shell._cache().clear)
+
+    def render(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        request.profile = get_profile(user)
+        html = render_to_string('includes/navigation.html', request=request)
+        return request, {name for name, url in self.links.items() if f'href="{url}"' in html}
+
+    def test_links_follow_role(self):
+        superuser = User.objects.create_superuser('root@example.om', 'الإدارة', '9999999999')
+        cases = [
+            (AnonymousUser(), shell.ANONYMOUS, {'login'}),
+            (make_user(User.UserType.TENANT), 'TENANT', set()),
+            (make_user(User.UserType.OWNER), 'OWNER', {'occupancy', 'ledger', 'revenue'}),
+            # نوع ADMIN دون is_staff لا يدخل لوحة الإدارة ولا يرى كل المباني
+            (make_user(User.UserType.ADMIN), 'ADMIN', set()),
+            (superuser, shell.STAFF, {'occupancy', 'ledger', 'revenue', 'directory', 'admin'}),
+            (make_user(User.UserType.OWNER, is_staff=True), shell.STAFF, {
+                'occupancy', 'ledger', 'revenue', 'directory', 'admin',
+            }),
+        ]
+        # كل دور يُعرض مرتين: الثانية من الجزء المخزن، فلا يتسرب دور إلى مفتاح دور آخر
+        for _round in range(2):
+            for user, role, links in cases:
+                with self.subTest(role=role, user=str(user)):
+                    request, shown = self.render(user)
+                    self.assertEqual(shell.PageShell(request).role, role)
+                    self.assertEqual(shown, links)
@@ -1,3 +1,80 @@
-from django.shortcuts import render
+"""خدمة الملفات الثابتة من STATIC_ROOT مباشرة (SERVE_STATIC) للتشغيل دون CDN أو nginx
 
-# Create your views here.
+الأسماء المبصومة (من manifest collectstatic) لا يتغير محتواها، فتُخدم بترويسة تخزين لسنة
+مع immutable، وتُرسل نسخة brotli أو gzip المضغوطة مسبقاً حسب Accept-Encoding.
+"""
+import mimetypes
+import os
+import posixpath
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+# الأسماء غير المبصومة قد يتغير محتواها مع النشر
+MUTABLE_MAX_AGE = 60
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+
+@lru_cache(maxsize=None)
+def immutable_names():
+    """الأسماء المبصومة في manifest (يُقرأ مرة لكل عملية؛ النشر يعيد تشغيل العمليات)"""
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def accepted_encodings(request):
+    """الترميزات التي يقبلها العميل (q=0 يعني الرفض)"""
+    encodings = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _sep, params = part.partition(';')
+        params = params.strip()
+        try:
+            quality = float(params[2:]) if params.startswith('q=') else 1
+        except ValueError:
+            quality = 1
+        if quality > 0:
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+@require_safe
+def serve_static(request, path):
+    name = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404 from None
+    if not os.path.isfile(fullpath):
+        raise Http404
+
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type = mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+        serve_path, content_encoding = fullpath, None
+        accepted = accepted_encodings(request)
+        for encoding, extension in PRECOMPRESSED:
+            if encoding in accepted and os.path.isfile(fullpath + extension):
+                serve_path, content_encoding = fullpath + extension, encoding
+                break
+        # FileResponse يملك الملف ويغلقه بعد إرسال الاستجابة، فلا يُفتح في with
+        handle = open(serve_path, 'rb')  # noqa: SIM115
+        response = FileResponse(handle, content_type=content_type, filename=os.path.basename(name))
+        if content_encoding:
+            response['Content-Encoding'] = content_encoding
+        response['Last-Modified'] = http_date(stat.st_mtime)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if name in immutable_names():
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MUTABLE_MAX_AGE)
+    return response
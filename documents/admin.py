@@ -1,3 +1,19 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Blob, Document
+
+
+@admin.register(Document)
+class DocumentAdmin(admin.ModelAdmin):
+    list_display = ('original_name', 'owner', 'kind', 'content_type', 'uploaded_at')
+    list_filter = ('kind',)
+    list_select_related = ('owner',)
+    raw_id_fields = ('owner', 'blob')
+    search_fields = ('original_name',)
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'size', 'ref_count', 'created_at', 'released_at')
+    readonly_fields = ('sha256', 'size', 'storage_name', 'ref_count', 'created_at', 'released_at')
+    search_fields = ('sha256',)
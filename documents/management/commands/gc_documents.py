@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from documents.store import GC_GRACE, collect_garbage, recount_references
+
+
+class Command(BaseCommand):
+    help = 'حذف محتويات المستندات التي لم يعد أي مستند يشير إليها'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=float, default=GC_GRACE.total_seconds() / 3600,
+            help='المهلة بالساعات بعد تحرير المحتوى قبل حذفه',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='عرض ما سيُحذف دون حذفه')
+        parser.add_argument('--recount', action='store_true', help='تصحيح أعداد المراجع من المستندات الفعلية أولاً')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            drifted = recount_references(fix=not options['dry_run'])
+            for blob_id, stored, actual in drifted[:20]:
+                self.stdout.write(f'المحتوى {blob_id}: المخزن {stored} والفعلي {actual}')
+            self.stdout.write(f'أعداد مراجع مخالفة: {len(drifted)}')
+
+        removed, freed = collect_garbage(
+            grace=timedelta(hours=options['grace_hours']),
+            dry_run=options['dry_run'],
+        )
+        verb = 'سيُحذف' if options['dry_run'] else 'حُذف'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {removed} محتوى ({freed / 1024 / 1024:.1f} م.ب)'))
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='بصمة SHA-256')),
+                ('size', models.BigIntegerField(verbose_name='الحجم (بايت)')),
+                ('storage_name', models.CharField(max_length=255, verbose_name='مسار التخزين')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='عدد المراجع')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('released_at', models.DateTimeField(blank=True, help_text='وقت وصول عدد المراجع إلى صفر؛ يُحذف المحتوى بعد مهلة من هذا الوقت', null=True, verbose_name='تاريخ آخر تحرير')),
+            ],
+            options={
+                'verbose_name': 'محتوى ملف',
+                'verbose_name_plural': 'محتويات الملفات',
+            },
+        ),
+        migrations.CreateModel(
+            name='Document',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('COMMERCIAL_REGISTRATION', 'سجل تجاري'), ('IDENTITY', 'إثبات هوية'), ('CONTRACT', 'عقد'), ('INVOICE', 'فاتورة'), ('OTHER', 'أخرى')], default='OTHER', max_length=30, verbose_name='نوع المستند')),
+                ('original_name', models.CharField(max_length=255, verbose_name='اسم الملف الأصلي')),
+                ('content_type', models.CharField(default='application/octet-stream', max_length=100, verbose_name='نوع المحتوى')),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الرفع')),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='documents', to='documents.blob', verbose_name='المحتوى')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to=settings.AUTH_USER_MODEL, verbose_name='المالك')),
+            ],
+            options={
+                'verbose_name': 'مستند',
+                'verbose_name_plural': 'المستندات',
+                'ordering': ['-uploaded_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='blob',
+            index=models.Index(condition=models.Q(('ref_count', 0)), fields=['released_at'], name='documents_unref_blob_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['owner', 'kind'], name='documents_d_owner_i_df0c54_idx'),
+        ),
+    ]
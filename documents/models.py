@@ -1,3 +1,100 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class Blob(models.Model):
+    """محتوى ملف مخزن مرة واحدة بعنوان بصمته SHA-256، ويُحسب عدد المستندات المشيرة إليه"""
+    sha256 = models.CharField(
+        _('بصمة SHA-256'),
+        max_length=64,
+        unique=True
+    )
+    size = models.BigIntegerField(
+        _('الحجم (بايت)')
+    )
+    storage_name = models.CharField(
+        _('مسار التخزين'),
+        max_length=255
+    )
+    ref_count = models.PositiveIntegerField(
+        _('عدد المراجع'),
+        default=0
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإنشاء'),
+        auto_now_add=True
+    )
+    released_at = models.DateTimeField(
+        _('تاريخ آخر تحرير'),
+        blank=True,
+        null=True,
+        help_text=_('وقت وصول عدد المراجع إلى صفر؛ يُحذف المحتوى بعد مهلة من هذا الوقت')
+    )
+
+    class Meta:
+        verbose_name = _('محتوى ملف')
+        verbose_name_plural = _('محتويات الملفات')
+        indexes = [
+            models.Index(
+                fields=['released_at'],
+                condition=models.Q(ref_count=0),
+                name='documents_unref_blob_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.sha256
+
+
+class Document(models.Model):
+    """مستند رفعه مستخدم؛ المستندات المتطابقة المحتوى تتشارك Blob واحداً"""
+
+    class Kind(models.TextChoices):
+        COMMERCIAL_REGISTRATION = 'COMMERCIAL_REGISTRATION', _('سجل تجاري')
+        IDENTITY = 'IDENTITY', _('إثبات هوية')
+        CONTRACT = 'CONTRACT', _('عقد')
+        INVOICE = 'INVOICE', _('فاتورة')
+        OTHER = 'OTHER', _('أخرى')
+
+    owner = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='documents',
+        verbose_name=_('المالك')
+    )
+    blob = models.ForeignKey(
+        Blob,
+        on_delete=models.PROTECT,
+        related_name='documents',
+        verbose_name=_('المحتوى')
+    )
+    kind = models.CharField(
+        _('نوع المستند'),
+        max_length=30,
+        choices=Kind.choices,
+        default=Kind.OTHER
+    )
+    original_name = models.CharField(
+        _('اسم الملف الأصلي'),
+        max_length=255
+    )
+    content_type = models.CharField(
+        _('نوع المحتوى'),
+        max_length=100,
+        default='application/octet-stream'
+    )
+    uploaded_at = models.DateTimeField(
+        _('تاريخ الرفع'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('مستند')
+        verbose_name_plural = _('المستندات')
+        ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['owner', 'kind']),
+        ]
+
+    def __str__(self):
+        return self.original_name
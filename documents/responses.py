@@ -0,0 +1,91 @@
+"""تقديم محتوى المستندات: عبر خادم الويب (X-Accel-Redirect / X-Sendfile) أو بدعم Range"""
+import re
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils.http import content_disposition_header
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+SERVE_DJANGO = 'django'
+SERVE_X_ACCEL = 'x-accel'
+SERVE_X_SENDFILE = 'x-sendfile'
+
+
+def parse_range(header, size):
+    """تحليل ترويسة Range لنطاق واحد؛ يعيد (البداية، النهاية الشاملة) أو None
+
+    يرفع ValueError إذا كان النطاق خارج حجم الملف.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # bytes=-N: آخر N بايت
+        start, end = max(size - int(last), 0), size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def _iter_range(handle, start, length):
+    try:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def serve_blob(request, blob, filename, content_type, as_attachment=True):
+    """استجابة تحميل لمحتوى Blob؛ البصمة تُستخدم كـ ETag لأن المحتوى لا يتغير أبداً"""
+    etag = f'"{blob.sha256}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        return HttpResponseNotModified(headers={'ETag': etag})
+
+    mode = getattr(settings, 'DOCUMENTS_SERVE_MODE', SERVE_DJANGO)
+    disposition = content_disposition_header(as_attachment, filename)
+    if mode in (SERVE_X_ACCEL, SERVE_X_SENDFILE):
+        response = HttpResponse(content_type=content_type)
+        if mode == SERVE_X_ACCEL:
+            response['X-Accel-Redirect'] = settings.DOCUMENTS_ACCEL_PREFIX + blob.storage_name
+        else:
+            response['X-Sendfile'] = default_storage.path(blob.storage_name)
+        response['Content-Disposition'] = disposition
+        response['ETag'] = etag
+        return response
+
+    try:
+        byte_range = parse_range(request.headers.get('Range'), blob.size)
+    except ValueError:
+        return HttpResponse(status=416, headers={'Content-Range': f'bytes */{blob.size}'})
+
+    handle = default_storage.open(blob.storage_name, 'rb')
+    if byte_range is None:
+        response = FileResponse(handle, as_attachment=as_attachment, filename=filename, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _iter_range(handle, start, end - start + 1), status=206, content_type=content_type
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{blob.size}'
+        response['Content-Disposition'] = disposition
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
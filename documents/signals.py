@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Document
+from .store import release
+
+
+@receiver(post_delete, sender=Document)
+def release_blob(sender, instance, **kwargs):
+    release(instance.blob_id)
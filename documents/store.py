@@ -0,0 +1,166 @@
+"""مخزن المستندات بعنونة المحتوى
+
+يُقرأ الملف على أجزاء مع حساب بصمته SHA-256 أثناء الكتابة إلى ملف مؤقت، فإذا كان
+المحتوى مخزناً مسبقاً يُزاد عدد مراجعه فقط ويُحذف الملف المؤقت دون أي كتابة إضافية.
+المحتوى الذي يصل عدد مراجعه إلى صفر يُحذف بجامع المهملات بعد مهلة.
+"""
+import hashlib
+import os
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, Exists, F, OuterRef, When
+from django.utils import timezone
+
+from core.batching import chunked
+
+from .models import Blob, Document
+
+BLOB_PREFIX = 'blobs'
+CHUNK_SIZE = 64 * 1024
+# مهلة قبل حذف المحتوى غير المرجوع إليه، تحمي عمليات الرفع الجارية بالتوازي
+GC_GRACE = timedelta(hours=24)
+
+
+def blob_name(sha256):
+    return f'{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def spool(content, chunk_size=CHUNK_SIZE):
+    """نسخ المحتوى على أجزاء إلى ملف مؤقت مع حساب البصمة؛ يعيد (الملف المؤقت، البصمة)"""
+    digest = hashlib.sha256()
+    target = TemporaryUploadedFile(
+        os.path.basename(getattr(content, 'name', None) or 'upload'),
+        getattr(content, 'content_type', None) or 'application/octet-stream',
+        0,
+        None,
+    )
+    chunks = content.chunks(chunk_size) if hasattr(content, 'chunks') else iter(
+        lambda: content.read(chunk_size), b''
+    )
+    size = 0
+    for chunk in chunks:
+        digest.update(chunk)
+        target.write(chunk)
+        size += len(chunk)
+    target.size = size
+    target.seek(0)
+    return target, digest.hexdigest()
+
+
+def _acquire(sha256):
+    """زيادة مراجع محتوى موجود؛ يعيد Blob أو None"""
+    if Blob.objects.filter(sha256=sha256).update(ref_count=F('ref_count') + 1, released_at=None):
+        return Blob.objects.get(sha256=sha256)
+    return None
+
+
+def ingest(content):
+    """تخزين المحتوى مرة واحدة وإعادة Blob بعد زيادة عدد مراجعه
+
+    إذا مرّ المحتوى عبر HashingUploadHandler تُستخدم بصمته المحسوبة أثناء الرفع ويُنقل
+    ملفه المؤقت مباشرة إلى التخزين دون قراءته مرة أخرى.
+    """
+    sha256 = getattr(content, 'sha256', None)
+    spooled = None
+    if sha256 is None:
+        spooled, sha256 = spool(content)
+        content = spooled
+    try:
+        blob = _acquire(sha256)
+        if blob is not None:
+            return blob
+
+        # يُحفظ دائماً باسم متاح: إن بقي ملف بالاسم نفسه (مثلاً أثناء حذفه بجامع المهملات)
+        # يأخذ المحتوى الجديد اسماً مختلفاً بدلاً من الاعتماد على ملف قد يُحذف
+        content.seek(0)
+        storage_name = default_storage.save(blob_name(sha256), content)
+        try:
+            with transaction.atomic():
+                return Blob.objects.create(
+                    sha256=sha256,
+                    size=content.size,
+                    storage_name=storage_name,
+                    ref_count=1,
+                )
+        except IntegrityError:
+            # رفع متزامن للمحتوى نفسه سبقنا إلى إنشاء السجل
+            default_storage.delete(storage_name)
+            blob = _acquire(sha256)
+            if blob is None:
+                raise
+            return blob
+    finally:
+        if spooled is not None:
+            spooled.close()
+
+
+def release(blob_id):
+    """إنقاص مراجع المحتوى وتسجيل وقت التحرير عند وصولها إلى صفر"""
+    Blob.objects.filter(pk=blob_id, ref_count__gt=0).update(
+        released_at=Case(When(ref_count=1, then=timezone.now()), default=F('released_at')),
+        ref_count=F('ref_count') - 1,
+    )
+
+
+def add_document(owner, content, kind=Document.Kind.OTHER, name=None, content_type=None):
+    """حفظ مستند جديد لمستخدم مع إزالة التكرار على مستوى المحتوى"""
+    blob = ingest(content)
+    try:
+        return Document.objects.create(
+            owner=owner,
+            blob=blob,
+            kind=kind,
+            original_name=os.path.basename(name or getattr(content, 'name', None) or 'document')[:255],
+            content_type=content_type or getattr(content, 'content_type', None) or 'application/octet-stream',
+        )
+    except Exception:
+        release(blob.pk)
+        raise
+
+
+def unreferenced_blobs():
+    """المحتويات التي وصل عدد مراجعها إلى صفر ولا يشير إليها أي مستند فعلاً
+
+    العداد وحده لا يكفي: إن انحرف عن عدد المستندات يبقى المحتوى محمياً (PROTECT).
+    """
+    return Blob.objects.filter(ref_count=0).exclude(Exists(Document.objects.filter(blob=OuterRef('pk'))))
+
+
+def collect_garbage(grace=GC_GRACE, dry_run=False, batch_size=500):
+    """حذف المحتويات غير المرجوع إليها منذ أكثر من grace؛ يعيد (العدد، الحجم بالبايت)"""
+    cutoff = timezone.now() - grace
+    candidates = unreferenced_blobs().filter(released_at__lt=cutoff).values_list(
+        'pk', 'storage_name', 'size'
+    )
+    removed = freed = 0
+    for batch in chunked(list(candidates), batch_size):
+        if dry_run:
+            removed += len(batch)
+            freed += sum(size for _pk, _name, size in batch)
+            continue
+        for pk, storage_name, size in batch:
+            # الحذف مشروط بعدم عودة أي مرجع منذ القراءة
+            with transaction.atomic():
+                deleted, _rows = unreferenced_blobs().filter(pk=pk).delete()
+            if deleted:
+                default_storage.delete(storage_name)
+                removed += 1
+                freed += size
+    return removed, freed
+
+
+def recount_references(fix=False):
+    """مقارنة عدد المراجع المخزن بعدد المستندات الفعلي؛ يعيد قائمة (blob_id، المخزن، الفعلي)"""
+    drifted = list(
+        Blob.objects.annotate(actual=Count('documents')).exclude(ref_count=F('actual')).values_list(
+            'pk', 'ref_count', 'actual'
+        )
+    )
+    if fix:
+        now = timezone.now()
+        for pk, _stored, actual in drifted:
+            Blob.objects.filter(pk=pk).update(ref_count=actual, released_at=None if actual else now)
+    return drifted
@@ -1,3 +1,136 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.testing import make_user
+
+from .models import Blob, Document
+from .responses import parse_range
+from .store import add_document, collect_garbage, recount_references
+
+CONTENT = bytes(range(256)) * 4
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_satisfiable_ranges(self):
+        cases = {
+            'bytes=0-99': (0, 99),
+            'bytes=1000-': (1000, 1023),
+            # النهاية بعد آخر بايت تُقتطع
+            'bytes=1000-5000': (1000, 1023),
+            'bytes=-24': (1000, 1023),
+            'bytes=-5000': (0, 1023),
+            'bytes=1023-1023': (1023, 1023),
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1024), expected)
+
+    def test_unsatisfiable_ranges(self):
+        for header in ('bytes=1024-', 'bytes=2000-3000', 'bytes=10-5', 'bytes=-0'):
+            with self.subTest(header=header), self.assertRaises(ValueError):
+                parse_range(header, 1024)
+
+    def test_ignored_headers(self):
+        # ترويسة مفقودة أو غير مفهومة أو بعدة نطاقات تعني الملف كاملاً
+        for header in (None, '', 'bytes=-', 'items=0-10', 'bytes=0-1,5-6'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 1024))
+
+
+class DocumentStoreTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.owner = make_user()
+
+    def add(self, content=CONTENT, name='lease.pdf'):
+        return add_document(self.owner, ContentFile(content, name=name))
+
+    def test_identical_uploads_share_one_blob(self):
+        first, second = self.add(), self.add(name='copy.pdf')
+        other = self.add(b'other')
+
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertNotEqual(first.blob_id, other.blob_id)
+        blob = Blob.objects.get(pk=first.blob_id)
+        self.assertEqual((blob.ref_count, blob.size), (2, len(CONTENT)))
+        _dirs, files = default_storage.listdir(blob.storage_name.rsplit('/', 1)[0])
+        self.assertEqual(files, [blob.sha256])
+
+    def test_upload_view_hashes_while_receiving(self):
+        self.client.force_login(self.owner)
+        url = reverse('documents:upload')
+        responses = [
+            self.client.post(url, {'file': SimpleUploadedFile(name, CONTENT), 'kind': Document.Kind.CONTRACT})
+            for name in ('a.pdf', 'b.pdf')
+        ]
+        self.assertEqual([response.status_code for response in responses], [201, 201])
+        self.assertEqual([response.json()['deduplicated'] for response in responses], [False, True])
+        self.assertEqual(Blob.objects.get().ref_count, 2)
+
+    def test_garbage_collection_after_grace(self):
+        kept, removed = self.add(), self.add(b'removed')
+        removed_blob = removed.blob
+        removed.delete()
+
+        self.assertEqual(collect_garbage(), (0, 0))
+        self.assertEqual(collect_garbage(grace=timedelta(0), dry_run=True), (1, len(b'removed')))
+        self.assertEqual(collect_garbage(grace=timedelta(0)), (1, len(b'removed')))
+
+        self.assertFalse(Blob.objects.filter(pk=removed_blob.pk).exists())
+        self.assertFalse(default_storage.exists(removed_blob.storage_name))
+        self.assertTrue(default_storage.exists(kept.blob.storage_name))
+
+    def test_drifted_counter_does_not_delete_referenced_blob(self):
+        document = self.add()
+        Blob.objects.filter(pk=document.blob_id).update(ref_count=0, released_at=document.uploaded_at)
+
+        self.assertEqual(collect_garbage(grace=timedelta(0)), (0, 0))
+        self.assertTrue(default_storage.exists(document.blob.storage_name))
+        self.assertEqual(recount_references(fix=True), [(document.blob_id, 0, 1)])
+        self.assertEqual(Blob.objects.get().ref_count, 1)
+
+
+@override_settings(DOCUMENTS_SERVE_MODE='django')
+class DownloadTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        owner = make_user()
+        self.document = add_document(owner, ContentFile(CONTENT, name='lease.pdf'))
+        self.client.force_login(owner)
+        self.url = reverse('documents:download', args=[self.document.pk])
+
+    def test_range_requests(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-16')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 1008-1023/{len(CONTENT)}')
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[-16:])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=1000-')
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[1000:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_full_download_and_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'documents'
+
+urlpatterns = [
+    path('upload/', views.upload, name='upload'),
+    path('<int:pk>/download/', views.download, name='download'),
+]
@@ -1,3 +1,55 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_GET, require_POST
 
-# Create your views here.
+from .models import Document
+from .responses import serve_blob
+from .store import add_document
+from .uploadhandlers import HashingUploadHandler
+
+
+@csrf_exempt
+@login_required
+@require_POST
+def upload(request):
+    """رفع مستند؛ يُحسب بصمته أثناء الاستقبال فلا يُكتب المحتوى المكرر مرة ثانية"""
+    # يجب تغيير معالجات الرفع قبل قراءة request.POST، لذا يُفحص CSRF بعدها
+    request.upload_handlers = [HashingUploadHandler(request)]
+    return _upload(request)
+
+
+@csrf_protect
+def _upload(request):
+    uploaded = request.FILES.get('file')
+    if uploaded is None:
+        return HttpResponseBadRequest()
+    kind = request.POST.get('kind', Document.Kind.OTHER)
+    if kind not in Document.Kind.values:
+        return HttpResponseBadRequest()
+
+    document = add_document(request.user, uploaded, kind=kind)
+    return JsonResponse({
+        'id': document.pk,
+        'sha256': document.blob.sha256,
+        'size': document.blob.size,
+        'deduplicated': document.blob.ref_count > 1,
+    }, status=201)
+
+
+@login_required
+@require_GET
+def download(request, pk):
+    """تحميل مستند لمالكه أو للموظفين"""
+    documents = Document.objects.select_related('blob')
+    if not request.user.is_staff:
+        documents = documents.filter(owner=request.user)
+    document = get_object_or_404(documents, pk=pk)
+    return serve_blob(
+        request,
+        document.blob,
+        document.original_name,
+        document.content_type,
+        as_attachment=request.GET.get('inline') is None,
+    )
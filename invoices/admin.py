@@ -1,3 +1,20 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Invoice, InvoiceSequence
+
+
+@admin.register(Invoice)
+class InvoiceAdmin(admin.ModelAdmin):
+    list_display = ('number', 'issuer', 'tenant', 'amount', 'issue_date', 'due_date', 'rendered_at')
+    list_filter = ('issue_date',)
+    list_select_related = ('issuer__user', 'tenant__user')
+    raw_id_fields = ('issuer', 'installment', 'tenant')
+    search_fields = ('number',)
+    readonly_fields = ('number', 'year', 'sequence', 'rendered_at')
+
+
+@admin.register(InvoiceSequence)
+class InvoiceSequenceAdmin(admin.ModelAdmin):
+    list_display = ('issuer', 'year', 'last_number')
+    list_select_related = ('issuer__user',)
+    readonly_fields = ('last_number',)
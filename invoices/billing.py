@@ -0,0 +1,108 @@
+"""إصدار فواتير الأقساط المستحقة على دفعات مع ترقيم متسلسل بلا فجوات لكل شركة مُصدِرة
+
+تُحجز أرقام كل دفعة ككتلة واحدة لكل شركة بقفل صف التسلسل مرة واحدة داخل معاملة
+الإصدار نفسها، فإذا فشلت الدفعة تُلغى الأرقام مع فواتيرها ولا تظهر فجوات.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+
+from contracts.models import Contract, Installment
+from core.batching import keyset_batches
+from payments.ledger import EntryRequest, post_entries
+from payments.models import LedgerEntry
+
+from .models import Invoice, InvoiceSequence
+
+
+def invoice_number(issuer_id, year, sequence):
+    return f'INV-{issuer_id}-{year}-{sequence:06d}'
+
+
+def allocate_numbers(counts, year):
+    """حجز كتلة أرقام لكل شركة: {issuer_id: العدد} ← {issuer_id: أول رقم في الكتلة}
+
+    يجب استدعاؤها داخل معاملة؛ تُقفل صفوف التسلسل بترتيب ثابت لتجنب الجمود.
+    """
+    InvoiceSequence.objects.bulk_create(
+        [InvoiceSequence(issuer_id=issuer_id, year=year) for issuer_id in counts],
+        ignore_conflicts=True,
+    )
+    sequences = list(
+        InvoiceSequence.objects.select_for_update().filter(
+            issuer_id__in=counts, year=year
+        ).order_by('issuer_id')
+    )
+    starts = {}
+    for sequence in sequences:
+        starts[sequence.issuer_id] = sequence.last_number + 1
+        sequence.last_number += counts[sequence.issuer_id]
+    InvoiceSequence.objects.bulk_update(sequences, ['last_number'])
+    return starts
+
+
+def due_installments(issue_date):
+    """أقساط العقود السارية المستحقة حتى issue_date والتي لم تصدر لها فاتورة"""
+    return Installment.objects.filter(
+        due_date__lte=issue_date,
+        status__in=[Installment.Status.PENDING, Installment.Status.PARTIAL],
+        amount__gt=0,
+        contract__status=Contract.Status.ACTIVE,
+        invoice__isnull=True,
+    )
+
+
+def issue_invoices(issue_date, batch_size=1000, on_batch=None):
+    """إنشاء فواتير الأقساط المستحقة وقيود المطالبة المقابلة في دفتر المستأجر
+
+    كل دفعة في معاملة واحدة، والأقساط المفوترة تُستبعد من الاختيار، لذا يمكن إعادة
+    التشغيل بعد أي انقطاع دون تكرار. يعيد عدد الفواتير المُنشأة.
+    """
+    rows = due_installments(issue_date).values(
+        'pk',
+        'contract_id',
+        'amount',
+        'due_date',
+        tenant_id=F('contract__tenant_id'),
+        issuer_id=F('contract__unit__building__owner_id'),
+    )
+
+    created = 0
+    for batch in keyset_batches(rows, batch_size):
+        # الترقيم داخل الكتلة حسب الشركة ثم القسط ليبقى حتمياً
+        batch = sorted(batch, key=lambda row: (row['issuer_id'], row['pk']))
+        with transaction.atomic():
+            next_numbers = allocate_numbers(Counter(row['issuer_id'] for row in batch), issue_date.year)
+            invoices = []
+            for row in batch:
+                sequence = next_numbers[row['issuer_id']]
+                next_numbers[row['issuer_id']] += 1
+                invoices.append(Invoice(
+                    number=invoice_number(row['issuer_id'], issue_date.year, sequence),
+                    issuer_id=row['issuer_id'],
+                    year=issue_date.year,
+                    sequence=sequence,
+                    installment_id=row['pk'],
+                    tenant_id=row['tenant_id'],
+                    amount=row['amount'],
+                    issue_date=issue_date,
+                    due_date=row['due_date'],
+                ))
+            Invoice.objects.bulk_create(invoices)
+            post_entries(
+                EntryRequest(
+                    invoice.tenant_id,
+                    LedgerEntry.EntryType.CHARGE,
+                    invoice.amount,
+                    contract_id=row['contract_id'],
+                    installment_id=invoice.installment_id,
+                    reference=invoice.number,
+                )
+                for invoice, row in zip(invoices, batch, strict=True)
+            )
+
+        created += len(invoices)
+        if on_batch:
+            on_batch(created)
+    return created
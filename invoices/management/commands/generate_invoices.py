@@ -0,0 +1,64 @@
+import os
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from invoices.billing import issue_invoices
+from invoices.rendering import render_invoices
+
+
+class Command(BaseCommand):
+    help = 'إصدار فواتير الأقساط المستحقة وتوليد ملفاتها (آمن لإعادة التشغيل بعد الانقطاع)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='تاريخ الإصدار YYYY-MM-DD (الافتراضي: اليوم)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='عدد الفواتير في كل معاملة')
+        parser.add_argument('--render-batch-size', type=int, default=500, help='عدد الملفات في كل دفعة توليد')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='عدد عمليات توليد الملفات')
+        parser.add_argument('--skip-render', action='store_true', help='إصدار الفواتير دون توليد ملفاتها')
+        parser.add_argument('--render-only', action='store_true', help='توليد الملفات المتبقية فقط')
+
+    def handle(self, *args, **options):
+        try:
+            issue_date = date.fromisoformat(options['date']) if options['date'] else timezone.localdate()
+        except ValueError as exc:
+            raise CommandError(f'صيغة تاريخ غير صحيحة: {exc}') from exc
+        if options['skip_render'] and options['render_only']:
+            raise CommandError('لا يمكن الجمع بين --skip-render و --render-only')
+
+        if not options['render_only']:
+            started = time.monotonic()
+
+            def report_issued(count):
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'صدرت {count} فاتورة ({count / elapsed:.0f} فاتورة/ث)')
+
+            created = issue_invoices(issue_date, batch_size=options['batch_size'], on_batch=report_issued)
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'الإصدار: {created} فاتورة خلال {elapsed:.1f} ث ({created / max(elapsed, 1e-9):.0f} فاتورة/ث)'
+            ))
+
+        if options['skip_render']:
+            return
+
+        started = time.monotonic()
+
+        def report_rendered(count, failed):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f'وُلّد {count} ملف، فشل {failed} ({count / elapsed:.0f} فاتورة/ث)')
+
+        rendered, errors = render_invoices(
+            batch_size=options['render_batch_size'],
+            workers=options['workers'],
+            on_batch=report_rendered,
+        )
+        elapsed = time.monotonic() - started
+        for invoice_id, error in errors[:20]:
+            self.stderr.write(f'الفاتورة {invoice_id}: {error}')
+        self.stdout.write(self.style.SUCCESS(
+            f'التوليد: {rendered} ملف خلال {elapsed:.1f} ث ({rendered / max(elapsed, 1e-9):.0f} فاتورة/ث)، '
+            f'فشل {len(errors)}'
+        ))
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contracts', '0002_installment_contracts_i_paid_at_746f5f_idx'),
+        ('users', '0003_user_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='السنة')),
+                ('last_number', models.PositiveIntegerField(default=0, verbose_name='آخر رقم مستخدم')),
+                ('issuer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invoice_sequences', to='users.owner', verbose_name='الجهة المُصدِرة')),
+            ],
+            options={
+                'verbose_name': 'تسلسل فواتير',
+                'verbose_name_plural': 'تسلسلات الفواتير',
+            },
+        ),
+        migrations.CreateModel(
+            name='Invoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.CharField(max_length=30, unique=True, verbose_name='رقم الفاتورة')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='سنة الترقيم')),
+                ('sequence', models.PositiveIntegerField(verbose_name='التسلسل')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='المبلغ')),
+                ('issue_date', models.DateField(verbose_name='تاريخ الإصدار')),
+                ('due_date', models.DateField(verbose_name='تاريخ الاستحقاق')),
+                ('document', models.FileField(blank=True, help_text='يُولَّد بعد إصدار الفاتورة', upload_to='invoices/', verbose_name='ملف الفاتورة')),
+                ('rendered_at', models.DateTimeField(blank=True, null=True, verbose_name='تاريخ توليد الملف')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('installment', models.OneToOneField(on_delete=django.db.models.deletion.PROTECT, related_name='invoice', to='contracts.installment', verbose_name='القسط')),
+                ('issuer', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='issued_invoices', to='users.owner', verbose_name='الجهة المُصدِرة')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='invoices', to='users.tenant', verbose_name='المستأجر')),
+            ],
+            options={
+                'verbose_name': 'فاتورة',
+                'verbose_name_plural': 'الفواتير',
+                'ordering': ['-issue_date', 'number'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='invoicesequence',
+            constraint=models.UniqueConstraint(fields=('issuer', 'year'), name='unique_invoice_sequence'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('rendered_at__isnull', True)), fields=['id'], name='invoice_unrendered_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='invoice',
+            constraint=models.UniqueConstraint(fields=('issuer', 'year', 'sequence'), name='unique_invoice_sequence_number'),
+        ),
+    ]
@@ -1,3 +1,106 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class InvoiceSequence(models.Model):
+    """عدّاد أرقام الفواتير لكل شركة مُصدِرة وسنة؛ تُحجز منه كتل أرقام داخل معاملة الإصدار"""
+    issuer = models.ForeignKey(
+        'users.Owner',
+        on_delete=models.CASCADE,
+        related_name='invoice_sequences',
+        verbose_name=_('الجهة المُصدِرة')
+    )
+    year = models.PositiveSmallIntegerField(
+        _('السنة')
+    )
+    last_number = models.PositiveIntegerField(
+        _('آخر رقم مستخدم'),
+        default=0
+    )
+
+    class Meta:
+        verbose_name = _('تسلسل فواتير')
+        verbose_name_plural = _('تسلسلات الفواتير')
+        constraints = [
+            models.UniqueConstraint(fields=['issuer', 'year'], name='unique_invoice_sequence'),
+        ]
+
+    def __str__(self):
+        return f"{self.issuer_id}/{self.year}: {self.last_number}"
+
+
+class Invoice(models.Model):
+    """فاتورة قسط إيجار صادرة باسم مالك المبنى"""
+    number = models.CharField(
+        _('رقم الفاتورة'),
+        max_length=30,
+        unique=True
+    )
+    issuer = models.ForeignKey(
+        'users.Owner',
+        on_delete=models.PROTECT,
+        related_name='issued_invoices',
+        verbose_name=_('الجهة المُصدِرة')
+    )
+    year = models.PositiveSmallIntegerField(
+        _('سنة الترقيم')
+    )
+    sequence = models.PositiveIntegerField(
+        _('التسلسل')
+    )
+    installment = models.OneToOneField(
+        'contracts.Installment',
+        on_delete=models.PROTECT,
+        related_name='invoice',
+        verbose_name=_('القسط')
+    )
+    tenant = models.ForeignKey(
+        'users.Tenant',
+        on_delete=models.PROTECT,
+        related_name='invoices',
+        verbose_name=_('المستأجر')
+    )
+    amount = models.DecimalField(
+        _('المبلغ'),
+        max_digits=12,
+        decimal_places=2
+    )
+    issue_date = models.DateField(
+        _('تاريخ الإصدار')
+    )
+    due_date = models.DateField(
+        _('تاريخ الاستحقاق')
+    )
+    document = models.FileField(
+        _('ملف الفاتورة'),
+        upload_to='invoices/',
+        blank=True,
+        help_text=_('يُولَّد بعد إصدار الفاتورة')
+    )
+    rendered_at = models.DateTimeField(
+        _('تاريخ توليد الملف'),
+        blank=True,
+        null=True
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإنشاء'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('فاتورة')
+        verbose_name_plural = _('الفواتير')
+        ordering = ['-issue_date', 'number']
+        constraints = [
+            models.UniqueConstraint(fields=['issuer', 'year', 'sequence'], name='unique_invoice_sequence_number'),
+        ]
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(rendered_at__isnull=True),
+                name='invoice_unrendered_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.number
@@ -0,0 +1,68 @@
+"""توليد ملفات الفواتير (عربي/إنجليزي من اليمين لليسار) في مجموعة عمليات منفصلة
+
+تُقرأ بيانات كل دفعة من الفواتير غير المولَّدة باستعلام واحد وتُرسل كقواميس بسيطة إلى
+العمليات، فلا تلمس العمليات قاعدة البيانات. كل عملية تكتب ملفها مباشرة إلى التخزين
+الافتراضي عبر ملف مؤقت، ثم تُحدَّث الفواتير بتحديث جماعي واحد لكل دفعة.
+"""
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core.batching import process_batches
+from core.pdf import save_document
+
+from .models import Invoice
+
+TEMPLATE_NAME = 'invoices/invoice.html'
+
+INVOICE_FIELDS = ('id', 'number', 'issue_date', 'due_date', 'amount')
+RELATED_FIELDS = {
+    'issuer_name': F('issuer__user__company_name'),
+    'issuer_name_english': F('issuer__user__company_name_english'),
+    'issuer_registration': F('issuer__user__commercial_registration'),
+    'issuer_tax_number': F('issuer__user__tax_number'),
+    'tenant_name': F('tenant__user__company_name'),
+    'tenant_name_english': F('tenant__user__company_name_english'),
+    'contract_number': F('installment__contract__contract_number'),
+    'building_name': F('installment__contract__unit__building__name'),
+    'building_name_english': F('installment__contract__unit__building__name_english'),
+    'unit_number': F('installment__contract__unit__unit_number'),
+    'period_start': F('installment__period_start'),
+    'period_end': F('installment__period_end'),
+}
+
+
+def render_invoice(context):
+    """توليد ملف فاتورة واحدة وحفظه؛ يعيد اسم الملف"""
+    html = render_to_string(TEMPLATE_NAME, context)
+    return save_document(html, f"invoices/{context['issue_date']:%Y/%m}/{context['number']}")
+
+
+def pending_invoices():
+    """الفواتير التي لم يُولَّد ملفها بعد"""
+    return Invoice.objects.filter(rendered_at__isnull=True)
+
+
+def render_invoices(invoices=None, batch_size=500, workers=None, on_batch=None):
+    """توليد ملفات الفواتير على دفعات؛ يعيد (عدد المولَّد، قائمة الأخطاء)
+
+    الفواتير التي يفشل توليدها تبقى دون تاريخ توليد فتُعاد محاولتها في التشغيل التالي.
+    """
+    queryset = pending_invoices() if invoices is None else invoices
+
+    def save(results):
+        now = timezone.now()
+        Invoice.objects.bulk_update(
+            [Invoice(pk=invoice_id, document=name, rendered_at=now) for invoice_id, name in results],
+            ['document', 'rendered_at'],
+        )
+
+    return process_batches(
+        queryset.values(*INVOICE_FIELDS, **RELATED_FIELDS),
+        render_invoice,
+        save,
+        batch_size,
+        key='id',
+        workers=workers,
+        on_batch=on_batch,
+    )
@@ -1,3 +1,106 @@
-from django.test import TestCase
+import tempfile
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.storage import default_storage
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+
+from contracts.models import Contract
+from contracts.schedules import generate_schedules
+from core.testing import make_building, make_contract, make_unit
+from payments.ledger import post_entries
+from payments.models import LedgerEntry
+
+from .billing import issue_invoices
+from .models import Invoice, InvoiceSequence
+from .rendering import render_invoices
+
+
+class IssueInvoicesTests(TestCase):
+    def setUp(self):
+        # مالكان (شركتان مُصدِرتان)، لكل منهما عقدان شهريان بستة أقساط مستحقة حتى 15 يونيو
+        self.buildings = [make_building(), make_building()]
+        for building in self.buildings:
+            for _ in range(2):
+                make_contract(unit=make_unit(building), start_date=date(2024, 1, 1), end_date=date(2024, 12, 31))
+        generate_schedules(Contract.objects.all())
+
+    def sequences(self, building):
+        return list(
+            Invoice.objects.filter(issuer=building.owner).order_by('sequence').values_list('sequence', flat=True)
+        )
+
+    def test_numbers_are_consecutive_across_batches_and_per_issuer(self):
+        created = issue_invoices(date(2024, 6, 15), batch_size=5)
+
+        self.assertEqual(created, 24)
+        for building in self.buildings:
+            self.assertEqual(self.sequences(building), list(range(1, 13)))
+            self.assertEqual(InvoiceSequence.objects.get(issuer=building.owner, year=2024).last_number, 12)
+        invoice = Invoice.objects.get(issuer=self.buildings[0].owner, sequence=7)
+        self.assertEqual(invoice.number, f'INV-{self.buildings[0].owner.pk}-2024-000007')
+        self.assertEqual(LedgerEntry.objects.filter(entry_type=LedgerEntry.EntryType.CHARGE).count(), 24)
+
+        # الأقساط المستحقة لاحقاً تكمل الترقيم دون تكرار ما صدر
+        self.assertEqual(issue_invoices(date(2024, 7, 15), batch_size=5), 4)
+        for building in self.buildings:
+            self.assertEqual(self.sequences(building), list(range(1, 15)))
+
+    def test_failed_batch_leaves_no_gap(self):
+        calls = []
+
+        def fail_second_batch(requests):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError('انقطاع')
+            return post_entries(requests)
+
+        with mock.patch('invoices.billing.post_entries', side_effect=fail_second_batch), self.assertRaises(RuntimeError):
+            issue_invoices(date(2024, 6, 15), batch_size=5)
+        self.assertEqual(Invoice.objects.count(), 5)
+        self.assertEqual(sum(InvoiceSequence.objects.values_list('last_number', flat=True)), 5)
+
+        self.assertEqual(issue_invoices(date(2024, 6, 15), batch_size=5), 19)
+        for building in self.buildings:
+            self.assertEqual(self.sequences(building), list(range(1, 13)))
+
+
+class RenderInvoicesTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        contract = make_contract(start_date=date(2024, 1, 1), end_date=date(2024, 3, 31))
+        generate_schedules(Contract.objects.filter(pk=contract.pk))
+        issue_invoices(date(2024, 3, 1))
+
+    def test_renders_pending_invoices_once(self):
+        rendered, errors = render_invoices(batch_size=2)
+
+        self.assertEqual((rendered, errors), (3, []))
+        for invoice in Invoice.objects.all():
+            self.assertIsNotNone(invoice.rendered_at)
+            self.assertTrue(invoice.document.name.startswith(f'invoices/2024/03/{invoice.number}.'))
+            with default_storage.open(invoice.document.name) as handle:
+                self.assertTrue(handle.read())
+        self.assertEqual(render_invoices(), (0, []))
+
+    def test_failed_invoice_is_retried_on_next_run(self):
+        failing = Invoice.objects.order_by('sequence').first()
+
+        def render(template_name, context):
+            if context['id'] == failing.pk:
+                raise ValueError('قالب معطوب')
+            return render_to_string(template_name, context)
+
+        with mock.patch('invoices.rendering.render_to_string', side_effect=render):
+            rendered, errors = render_invoices()
+
+        self.assertEqual((rendered, errors), (2, [(failing.pk, 'قالب معطوب')]))
+        failing.refresh_from_db()
+        self.assertIsNone(failing.rendered_at)
+        self.assertEqual(render_invoices(), (1, []))
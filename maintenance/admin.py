@@ -1,3 +1,20 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import MaintenanceRequest, Technician
+
+
+@admin.register(Technician)
+class TechnicianAdmin(admin.ModelAdmin):
+    list_display = ('name', 'specialty', 'is_active')
+    list_filter = ('specialty', 'is_active')
+    filter_horizontal = ('buildings',)
+
+
+@admin.register(MaintenanceRequest)
+class MaintenanceRequestAdmin(admin.ModelAdmin):
+    list_display = ('title', 'building', 'category', 'priority', 'status', 'sla_due_at', 'assigned_to')
+    list_filter = ('status', 'priority', 'category')
+    list_select_related = ('building', 'assigned_to')
+    raw_id_fields = ('building', 'unit', 'reported_by', 'assigned_to')
+    readonly_fields = ('sla_due_at', 'assigned_at', 'resolved_at')
+    show_full_result_count = False
@@ -0,0 +1,76 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from buildings.models import Building
+from maintenance.models import Category, MaintenanceRequest, Technician
+from maintenance.scheduling import claim_next, open_requests, prepare_request
+
+
+class Command(BaseCommand):
+    help = 'اختبار حمل لإسناد طلبات الصيانة: زمن حجز الطلب التالي مع عدد كبير من الطلبات المفتوحة؛ تُلغى البيانات بعد القياس'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tickets', type=int, default=100000, help='عدد الطلبات المفتوحة')
+        parser.add_argument('--claims', type=int, default=2000, help='عدد عمليات الحجز المقاسة')
+        parser.add_argument('--technicians', type=int, default=30)
+        parser.add_argument('--restricted', type=float, default=0.3, help='نسبة الفنيين المقيدين بمبانٍ محددة')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        building_ids = list(Building.objects.values_list('pk', flat=True))
+        if not building_ids:
+            raise CommandError('لا توجد مبانٍ لإنشاء طلبات عليها')
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        categories = Category.values
+        priorities = MaintenanceRequest.Priority.values
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            MaintenanceRequest.objects.bulk_create(
+                (
+                    prepare_request(MaintenanceRequest(
+                        building_id=rng.choice(building_ids),
+                        title=f'طلب {index}',
+                        category=rng.choice(categories),
+                        priority=rng.choice(priorities),
+                        created_at=now - timedelta(minutes=rng.randrange(60 * 24 * 14)),
+                    ))
+                    for index in range(options['tickets'])
+                ),
+                batch_size=5000,
+            )
+            self.stdout.write(f'إنشاء {options["tickets"]} طلب: {time.perf_counter() - started:.1f} ث')
+
+            technicians = Technician.objects.bulk_create([
+                Technician(name=f'فني {index}', specialty=rng.choice(categories))
+                for index in range(options['technicians'])
+            ])
+            for technician in technicians:
+                if rng.random() < options['restricted']:
+                    technician.buildings.set(rng.sample(building_ids, min(3, len(building_ids))))
+
+            latencies = []
+            claimed = 0
+            for index in range(options['claims']):
+                technician = technicians[index % len(technicians)]
+                started = time.perf_counter()
+                request = claim_next(technician)
+                latencies.append((time.perf_counter() - started) * 1000)
+                claimed += request is not None
+
+            remaining = open_requests().count()
+            transaction.set_rollback(True)
+
+        latencies.sort()
+        self.stdout.write(f'عمليات الحجز: {len(latencies)} (ناجحة {claimed})، المتبقي مفتوحاً: {remaining}')
+        self.stdout.write(f'المتوسط: {statistics.mean(latencies):.2f} مللي ث')
+        for label, ratio in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            self.stdout.write(f'{label}: {latencies[int(ratio * (len(latencies) - 1))]:.2f} مللي ث')
+        self.stdout.write(self.style.SUCCESS(f'الأقصى: {latencies[-1]:.2f} مللي ث'))
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('buildings', '0002_building_investors'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('units', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Technician',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150, verbose_name='اسم الفني')),
+                ('specialty', models.CharField(choices=[('PLUMBING', 'سباكة'), ('ELECTRICAL', 'كهرباء'), ('HVAC', 'تكييف'), ('CARPENTRY', 'نجارة'), ('CLEANING', 'نظافة'), ('GENERAL', 'صيانة عامة')], default='GENERAL', max_length=20, verbose_name='التخصص')),
+                ('is_active', models.BooleanField(default=True, verbose_name='نشط')),
+                ('buildings', models.ManyToManyField(blank=True, help_text='اتركها فارغة ليخدم الفني جميع المباني', related_name='technicians', to='buildings.building', verbose_name='المباني')),
+            ],
+            options={
+                'verbose_name': 'فني صيانة',
+                'verbose_name_plural': 'فنيو الصيانة',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MaintenanceRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='عنوان الطلب')),
+                ('description', models.TextField(blank=True, default='', verbose_name='الوصف')),
+                ('category', models.CharField(choices=[('PLUMBING', 'سباكة'), ('ELECTRICAL', 'كهرباء'), ('HVAC', 'تكييف'), ('CARPENTRY', 'نجارة'), ('CLEANING', 'نظافة'), ('GENERAL', 'صيانة عامة')], default='GENERAL', max_length=20, verbose_name='التصنيف')),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'منخفضة'), (2, 'عادية'), (3, 'عالية'), (4, 'طارئة')], default=2, verbose_name='الأولوية')),
+                ('status', models.CharField(choices=[('OPEN', 'مفتوح'), ('ASSIGNED', 'مُسند'), ('IN_PROGRESS', 'قيد التنفيذ'), ('RESOLVED', 'منجز'), ('CANCELLED', 'ملغى')], default='OPEN', max_length=20, verbose_name='الحالة')),
+                ('sla_due_at', models.DateTimeField(help_text='يُحسب تلقائياً من الأولوية؛ الطلبات الأقرب موعداً تُسند أولاً', verbose_name='موعد الاستحقاق')),
+                ('assigned_at', models.DateTimeField(blank=True, null=True, verbose_name='تاريخ الإسناد')),
+                ('resolved_at', models.DateTimeField(blank=True, null=True, verbose_name='تاريخ الإنجاز')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='تاريخ الإنشاء')),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='requests', to='maintenance.technician', verbose_name='الفني المسؤول')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_requests', to='buildings.building', verbose_name='المبنى')),
+                ('reported_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='maintenance_requests', to=settings.AUTH_USER_MODEL, verbose_name='مقدم الطلب')),
+                ('unit', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='maintenance_requests', to='units.unit', verbose_name='الوحدة')),
+            ],
+            options={
+                'verbose_name': 'طلب صيانة',
+                'verbose_name_plural': 'طلبات الصيانة',
+                'ordering': ['sla_due_at', 'id'],
+                'indexes': [models.Index(condition=models.Q(('status', 'OPEN')), fields=['category', 'sla_due_at', 'id'], name='maint_open_category_queue_idx'), models.Index(condition=models.Q(('status', 'OPEN')), fields=['sla_due_at', 'id'], name='maint_open_queue_idx'), models.Index(condition=models.Q(('status', 'OPEN')), fields=['building', 'category', 'sla_due_at', 'id'], name='maint_open_building_queue_idx'), models.Index(condition=models.Q(('status__in', ['ASSIGNED', 'IN_PROGRESS'])), fields=['assigned_to', 'sla_due_at'], name='maint_active_assignee_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,194 @@
+from datetime import timedelta
+
 from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Category(models.TextChoices):
+    PLUMBING = 'PLUMBING', _('سباكة')
+    ELECTRICAL = 'ELECTRICAL', _('كهرباء')
+    HVAC = 'HVAC', _('تكييف')
+    CARPENTRY = 'CARPENTRY', _('نجارة')
+    CLEANING = 'CLEANING', _('نظافة')
+    GENERAL = 'GENERAL', _('صيانة عامة')
+
+
+class Technician(models.Model):
+    """فني صيانة يستلم الطلبات من قائمة الانتظار"""
+    name = models.CharField(
+        _('اسم الفني'),
+        max_length=150
+    )
+    specialty = models.CharField(
+        _('التخصص'),
+        max_length=20,
+        choices=Category.choices,
+        default=Category.GENERAL
+    )
+    buildings = models.ManyToManyField(
+        'buildings.Building',
+        blank=True,
+        related_name='technicians',
+        verbose_name=_('المباني'),
+        help_text=_('اتركها فارغة ليخدم الفني جميع المباني')
+    )
+    is_active = models.BooleanField(
+        _('نشط'),
+        default=True
+    )
+
+    class Meta:
+        verbose_name = _('فني صيانة')
+        verbose_name_plural = _('فنيو الصيانة')
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} ({self.get_specialty_display()})"
+
+    def queue_categories(self):
+        """التصنيفات التي يستلمها الفني: تخصصه والصيانة العامة"""
+        return sorted({self.specialty, Category.GENERAL})
+
+
+class MaintenanceRequest(models.Model):
+    """طلب صيانة
+
+    موعد الاستحقاق (SLA) يُحسب من الأولوية عند الإنشاء، والجدولة حسب أقرب موعد أولاً؛
+    فالطلب الطارئ يتقدم على العادي، والطلب العادي القديم يتقدم على العاجل الجديد.
+    """
+
+    class Priority(models.IntegerChoices):
+        LOW = 1, _('منخفضة')
+        NORMAL = 2, _('عادية')
+        HIGH = 3, _('عالية')
+        EMERGENCY = 4, _('طارئة')
+
+    class Status(models.TextChoices):
+        OPEN = 'OPEN', _('مفتوح')
+        ASSIGNED = 'ASSIGNED', _('مُسند')
+        IN_PROGRESS = 'IN_PROGRESS', _('قيد التنفيذ')
+        RESOLVED = 'RESOLVED', _('منجز')
+        CANCELLED = 'CANCELLED', _('ملغى')
+
+    # مدة الاستجابة المستهدفة لكل أولوية
+    SLA = {
+        Priority.LOW: timedelta(days=7),
+        Priority.NORMAL: timedelta(days=3),
+        Priority.HIGH: timedelta(hours=24),
+        Priority.EMERGENCY: timedelta(hours=4),
+    }
+
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.CASCADE,
+        related_name='maintenance_requests',
+        verbose_name=_('المبنى')
+    )
+    unit = models.ForeignKey(
+        'units.Unit',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='maintenance_requests',
+        verbose_name=_('الوحدة')
+    )
+    reported_by = models.ForeignKey(
+        'users.User',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='maintenance_requests',
+        verbose_name=_('مقدم الطلب')
+    )
+    title = models.CharField(
+        _('عنوان الطلب'),
+        max_length=200
+    )
+    description = models.TextField(
+        _('الوصف'),
+        blank=True,
+        default=''
+    )
+    category = models.CharField(
+        _('التصنيف'),
+        max_length=20,
+        choices=Category.choices,
+        default=Category.GENERAL
+    )
+    priority = models.PositiveSmallIntegerField(
+        _('الأولوية'),
+        choices=Priority.choices,
+        default=Priority.NORMAL
+    )
+    status = models.CharField(
+        _('الحالة'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.OPEN
+    )
+    sla_due_at = models.DateTimeField(
+        _('موعد الاستحقاق'),
+        help_text=_('يُحسب تلقائياً من الأولوية؛ الطلبات الأقرب موعداً تُسند أولاً')
+    )
+    assigned_to = models.ForeignKey(
+        Technician,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='requests',
+        verbose_name=_('الفني المسؤول')
+    )
+    assigned_at = models.DateTimeField(
+        _('تاريخ الإسناد'),
+        blank=True,
+        null=True
+    )
+    resolved_at = models.DateTimeField(
+        _('تاريخ الإنجاز'),
+        blank=True,
+        null=True
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإنشاء'),
+        default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = _('طلب صيانة')
+        verbose_name_plural = _('طلبات الصيانة')
+        ordering = ['sla_due_at', 'id']
+        # الفهارس الجزئية تغطي الطلبات المفتوحة فقط، فيبقى حجمها بحجم قائمة الانتظار لا بحجم الأرشيف
+        indexes = [
+            models.Index(
+                fields=['category', 'sla_due_at', 'id'],
+                condition=models.Q(status='OPEN'),
+                name='maint_open_category_queue_idx',
+            ),
+            models.Index(
+                fields=['sla_due_at', 'id'],
+                condition=models.Q(status='OPEN'),
+                name='maint_open_queue_idx',
+            ),
+            models.Index(
+                fields=['building', 'category', 'sla_due_at', 'id'],
+                condition=models.Q(status='OPEN'),
+                name='maint_open_building_queue_idx',
+            ),
+            models.Index(
+                fields=['assigned_to', 'sla_due_at'],
+                condition=models.Q(status__in=['ASSIGNED', 'IN_PROGRESS']),
+                name='maint_active_assignee_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.get_status_display()})"
+
+    def compute_sla_due_at(self):
+        return self.created_at + self.SLA[self.priority]
 
-# Create your models here.
+    def save(self, *args, **kwargs):
+        if self.sla_due_at is None:
+            self.sla_due_at = self.compute_sla_due_at()
+        super().save(*args, **kwargs)
@@ -0,0 +1,117 @@
+"""جدولة طلبات الصيانة وإسنادها للفنيين
+
+الطلب التالي لفني هو أقرب الطلبات المفتوحة موعداً ضمن تصنيفاته (ومبانيه إن حُددت).
+يُقرأ باستعلام واحد مرتب بـ LIMIT 1 على الفهارس الجزئية للطلبات المفتوحة، ثم يُحجز
+الطلب المختار بتحديث مشروط على صفه فقط؛ وحيث يدعم المحرك FOR UPDATE SKIP LOCKED
+تُتجاوز الطلبات التي يحجزها عامل آخر في اللحظة نفسها.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import MaintenanceRequest
+
+MAX_CLAIM_ATTEMPTS = 5
+
+
+def open_requests():
+    return MaintenanceRequest.objects.filter(status=MaintenanceRequest.Status.OPEN)
+
+
+def prepare_request(request):
+    """حساب موعد الاستحقاق قبل الإدراج الجماعي (bulk_create لا يستدعي save)"""
+    if request.sla_due_at is None:
+        request.sla_due_at = request.compute_sla_due_at()
+    return request
+
+
+def technician_queue(technician):
+    """الطلبات المفتوحة التي يمكن للفني استلامها مرتبة حسب أقرب موعد"""
+    queue = open_requests().filter(category__in=technician.queue_categories())
+    building_ids = list(technician.buildings.values_list('pk', flat=True))
+    if building_ids:
+        queue = queue.filter(building_id__in=building_ids)
+    return queue.order_by('sla_due_at', 'id')
+
+
+def next_request(technician, lock=False):
+    """أقرب طلب مفتوح موعداً يمكن للفني استلامه (دون حجزه)؛ الفني غير النشط لا يستلم طلبات"""
+    if not technician.is_active:
+        return None
+    queue = technician_queue(technician)
+    if lock:
+        # مع LIMIT 1 لا يُقفل إلا الصف المختار، وتُتجاوز الصفوف التي يحجزها عامل آخر
+        queue = queue.select_for_update(skip_locked=True, of=('self',))
+    return queue.first()
+
+
+def claim_next(technician, now=None):
+    """حجز الطلب التالي للفني وإسناده إليه؛ يعيد الطلب أو None عند فراغ القائمة
+
+    الحجز تحديث مشروط على حالة الصف، فإذا سبق عامل آخر إلى الطلب نفسه يُعاد الاختيار.
+    """
+    now = now or timezone.now()
+    for _attempt in range(MAX_CLAIM_ATTEMPTS):
+        with transaction.atomic():
+            request = next_request(technician, lock=True)
+            if request is None:
+                return None
+            claimed = open_requests().filter(pk=request.pk).update(
+                status=MaintenanceRequest.Status.ASSIGNED,
+                assigned_to=technician,
+                assigned_at=now,
+            )
+        if claimed:
+            request.status = MaintenanceRequest.Status.ASSIGNED
+            request.assigned_to = technician
+            request.assigned_at = now
+            return request
+    return None
+
+
+def _transition(request, from_statuses, **updates):
+    updated = MaintenanceRequest.objects.filter(pk=request.pk, status__in=from_statuses).update(**updates)
+    if updated:
+        for name, value in updates.items():
+            setattr(request, name, value)
+    return bool(updated)
+
+
+def start_work(request):
+    return _transition(
+        request,
+        [MaintenanceRequest.Status.ASSIGNED],
+        status=MaintenanceRequest.Status.IN_PROGRESS,
+    )
+
+
+def resolve(request, now=None):
+    return _transition(
+        request,
+        [MaintenanceRequest.Status.ASSIGNED, MaintenanceRequest.Status.IN_PROGRESS],
+        status=MaintenanceRequest.Status.RESOLVED,
+        resolved_at=now or timezone.now(),
+    )
+
+
+def release(request):
+    """إعادة طلب مُسند إلى قائمة الانتظار بموعد استحقاقه الأصلي"""
+    return _transition(
+        request,
+        [MaintenanceRequest.Status.ASSIGNED, MaintenanceRequest.Status.IN_PROGRESS],
+        status=MaintenanceRequest.Status.OPEN,
+        assigned_to=None,
+        assigned_at=None,
+    )
+
+
+def overdue_requests(now=None):
+    """الطلبات المفتوحة التي تجاوزت موعد استحقاقها"""
+    return open_requests().filter(sla_due_at__lt=now or timezone.now()).order_by('sla_due_at', 'id')
+
+
+def technician_workload(technician):
+    """الطلبات المُسندة للفني ولم تُنجز بعد مرتبة حسب الموعد"""
+    return MaintenanceRequest.objects.filter(
+        assigned_to=technician,
+        status__in=[MaintenanceRequest.Status.ASSIGNED, MaintenanceRequest.Status.IN_PROGRESS],
+    ).order_by('sla_due_at')
@@ -1,3 +1,138 @@
+from datetime import datetime, timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from core.testing import capture_queries, make_building
+
+from .models import Category, MaintenanceRequest, Technician
+from .scheduling import (
+    claim_next,
+    overdue_requests,
+    prepare_request,
+    release,
+    resolve,
+    start_work,
+    technician_workload,
+)
+
+NOW = timezone.make_aware(datetime(2024, 5, 1, 8, 0))
+
+
+def make_request(building, category=Category.GENERAL, priority=MaintenanceRequest.Priority.NORMAL, hours_ago=0):
+    return MaintenanceRequest.objects.create(
+        building=building,
+        title='تسرب',
+        category=category,
+        priority=priority,
+        created_at=NOW - timedelta(hours=hours_ago),
+    )
+
+
+class SlaTests(TestCase):
+    def test_due_date_follows_priority(self):
+        building = make_building()
+        expected = {
+            MaintenanceRequest.Priority.LOW: timedelta(days=7),
+            MaintenanceRequest.Priority.NORMAL: timedelta(days=3),
+            MaintenanceRequest.Priority.HIGH: timedelta(hours=24),
+            MaintenanceRequest.Priority.EMERGENCY: timedelta(hours=4),
+        }
+        for priority, delay in expected.items():
+            with self.subTest(priority=priority):
+                self.assertEqual(make_request(building, priority=priority).sla_due_at, NOW + delay)
+                # bulk_create لا يستدعي save، فيُحسب الموعد مسبقاً
+                request = prepare_request(MaintenanceRequest(building=building, priority=priority, created_at=NOW))
+                self.assertEqual(request.sla_due_at, NOW + delay)
+
+    def test_overdue_requests(self):
+        building = make_building()
+        late = make_request(building, priority=MaintenanceRequest.Priority.EMERGENCY, hours_ago=5)
+        make_request(building, priority=MaintenanceRequest.Priority.EMERGENCY, hours_ago=3)
+        self.assertEqual(list(overdue_requests(NOW)), [late])
+
+
+class ClaimTests(TestCase):
+    def setUp(self):
+        self.building, self.other_building = make_building(), make_building()
+        self.plumber = Technician.objects.create(name='سالم', specialty=Category.PLUMBING)
+
+    def test_claims_earliest_due_request_in_own_categories(self):
+        normal = make_request(self.building, Category.PLUMBING)
+        make_request(self.building, Category.ELECTRICAL, MaintenanceRequest.Priority.EMERGENCY)
+        # عادي قديم يتقدم على عاجل جديد
+        old_general = make_request(self.other_building, Category.GENERAL, hours_ago=60)
+
+        self.assertEqual(claim_next(self.plumber, now=NOW), old_general)
+        self.assertEqual(claim_next(self.plumber, now=NOW), normal)
+        self.assertIsNone(claim_next(self.plumber, now=NOW))
+
+        normal.refresh_from_db()
+        self.assertEqual(
+            (normal.status, normal.assigned_to, normal.assigned_at),
+            (MaintenanceRequest.Status.ASSIGNED, self.plumber, NOW),
+        )
+        self.assertEqual(list(technician_workload(self.plumber)), [old_general, normal])
+
+    def test_restricted_technician_only_sees_own_buildings(self):
+        self.plumber.buildings.set([self.building])
+        make_request(self.other_building, Category.PLUMBING, hours_ago=70)
+        own = make_request(self.building, Category.PLUMBING)
+
+        self.assertEqual(claim_next(self.plumber, now=NOW), own)
+        self.assertIsNone(claim_next(self.plumber, now=NOW))
+
+    def test_inactive_technician_claims_nothing(self):
+        make_request(self.building, Category.PLUMBING)
+        self.plumber.is_active = False
+        self.plumber.save(update_fields=['is_active'])
+
+        self.assertIsNone(claim_next(self.plumber, now=NOW))
+        self.assertEqual(MaintenanceRequest.objects.get().status, MaintenanceRequest.Status.OPEN)
+
+    def test_claim_queries_do_not_grow_with_buildings(self):
+        make_request(self.building, Category.PLUMBING)
+        self.plumber.buildings.set([self.building])
+        _request, few = capture_queries(lambda: claim_next(self.plumber, now=NOW))
+
+        release(MaintenanceRequest.objects.get())
+        self.plumber.buildings.set([self.building, self.other_building, *(make_building() for _ in range(5))])
+        _request, many = capture_queries(lambda: claim_next(self.plumber, now=NOW))
+
+        self.assertEqual(len(few), len(many))
+
+    def test_claimed_request_is_not_claimed_twice(self):
+        make_request(self.building, Category.GENERAL)
+        electrician = Technician.objects.create(name='خالد', specialty=Category.ELECTRICAL)
+
+        self.assertIsNotNone(claim_next(self.plumber, now=NOW))
+        self.assertIsNone(claim_next(electrician, now=NOW))
+
+
+class TransitionTests(TestCase):
+    def setUp(self):
+        self.technician = Technician.objects.create(name='سالم')
+        make_request(make_building())
+        self.request = claim_next(self.technician, now=NOW)
+
+    def test_assigned_request_is_started_and_resolved(self):
+        self.assertTrue(start_work(self.request))
+        self.assertFalse(start_work(self.request))
+        self.assertTrue(resolve(self.request, now=NOW))
+
+        self.request.refresh_from_db()
+        self.assertEqual((self.request.status, self.request.resolved_at), (MaintenanceRequest.Status.RESOLVED, NOW))
+        self.assertFalse(release(self.request))
+        self.assertEqual(list(technician_workload(self.technician)), [])
+
+    def test_released_request_returns_to_queue_with_original_due_date(self):
+        due = self.request.sla_due_at
+        self.assertTrue(release(self.request))
 
-# Create your tests here.
+        self.request.refresh_from_db()
+        self.assertEqual(
+            (self.request.status, self.request.assigned_to, self.request.sla_due_at),
+            (MaintenanceRequest.Status.OPEN, None, due),
+        )
+        self.assertFalse(resolve(self.request))
+        self.assertEqual(claim_next(self.technician, now=NOW), self.request)
@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ExpiryScan, Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'channel', 'kind', 'address', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'channel', 'kind')
+    list_select_related = ('recipient',)
+    raw_id_fields = ('recipient', 'merged_into')
+    search_fields = ('address',)
+    show_full_result_count = False
+
+
+@admin.register(ExpiryScan)
+class ExpiryScanAdmin(admin.ModelAdmin):
+    list_display = ('name', 'scanned_through', 'reminders', 'updated_at')
@@ -0,0 +1,122 @@
+"""واجهات إرسال الرسائل النصية، على نمط واجهات البريد في Django
+
+الواجهة الفعلية لمزود الرسائل تُحدد في NOTIFICATIONS_SMS_BACKEND؛ الواجهات المحلية
+هنا (طباعة، ملف، ذاكرة) تسمح بتشغيل الاختبارات وقياس الأداء دون اتصال خارجي.
+"""
+import os
+import sys
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+DEFAULT_SMS_BACKEND = 'notifications.backends.ConsoleSMSBackend'
+
+
+@dataclass
+class SMSMessage:
+    to: str
+    body: str
+
+
+class BaseSMSBackend:
+    """اتصال واحد يُفتح لدفعة كاملة ثم يُغلق، مثل EmailBackend"""
+
+    def __init__(self, fail_silently=False, **kwargs):
+        self.fail_silently = fail_silently
+
+    def open(self):
+        return False
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        try:
+            self.open()
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def send_messages(self, messages):
+        """إرسال قائمة رسائل وإعادة عدد المُرسل منها"""
+        raise NotImplementedError
+
+
+class ConsoleSMSBackend(BaseSMSBackend):
+    """طباعة الرسائل على المخرج القياسي"""
+
+    def __init__(self, *args, stream=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stream = stream or sys.stdout
+        self._lock = threading.RLock()
+
+    def write_message(self, message):
+        self.stream.write(f'SMS to {message.to}\n{message.body}\n{"-" * 40}\n')
+
+    def send_messages(self, messages):
+        if not messages:
+            return 0
+        with self._lock:
+            for message in messages:
+                self.write_message(message)
+            self.stream.flush()
+        return len(messages)
+
+
+class FileSMSBackend(ConsoleSMSBackend):
+    """كتابة رسائل كل اتصال في ملف مستقل داخل NOTIFICATIONS_SMS_FILE_PATH"""
+
+    def __init__(self, *args, file_path=None, **kwargs):
+        self.file_path = os.path.abspath(file_path or settings.NOTIFICATIONS_SMS_FILE_PATH)
+        os.makedirs(self.file_path, exist_ok=True)
+        self._fname = None
+        super().__init__(*args, stream=None, **kwargs)
+        self.stream = None
+
+    def open(self):
+        if self.stream is None:
+            if self._fname is None:
+                self._fname = os.path.join(
+                    self.file_path, f'{timezone.now():%Y%m%d-%H%M%S}-{abs(id(self))}.log'
+                )
+            # الملف يبقى مفتوحاً طوال الاتصال ويغلقه close() كما في EmailBackend المبني على الملفات
+            self.stream = open(self._fname, 'a', encoding='utf-8')  # noqa: SIM115
+            return True
+        return False
+
+    def close(self):
+        try:
+            if self.stream is not None:
+                self.stream.close()
+        finally:
+            self.stream = None
+
+    def send_messages(self, messages):
+        new_connection = self.open()
+        try:
+            return super().send_messages(messages)
+        finally:
+            if new_connection:
+                self.close()
+
+
+class LocmemSMSBackend(BaseSMSBackend):
+    """حفظ الرسائل في outbox بالذاكرة (للاختبارات وقياس الأداء)"""
+    outbox = []
+
+    def send_messages(self, messages):
+        LocmemSMSBackend.outbox.extend(messages)
+        return len(messages)
+
+
+def get_sms_connection(backend=None, fail_silently=False, **kwargs):
+    """إنشاء اتصال بواجهة الرسائل النصية المحددة أو الافتراضية"""
+    backend = backend or getattr(settings, 'NOTIFICATIONS_SMS_BACKEND', DEFAULT_SMS_BACKEND)
+    return import_string(backend)(fail_silently=fail_silently, **kwargs)
@@ -0,0 +1,267 @@
+"""عامل إرسال الإشعارات من صندوق الصادر
+
+يحجز العامل دفعة من الإشعارات المعلقة (SELECT ... FOR UPDATE SKIP LOCKED حيث يدعمها
+المحرك، مع تحديث مشروط يضمن الحجز الحصري في غيرها)، ويدمج إشعارات المستلم الواحد
+ذات مفتاح الدمج نفسه في رسالة واحدة، ثم يرسل رسائل كل قناة عبر اتصال واحد للدفعة
+مع احترام حدود المعدل لكل قناة.
+"""
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from core.batching import chunked
+from core.ratelimit import TokenBucket
+
+from .backends import SMSMessage, get_sms_connection
+from .models import Notification
+
+# الإشعارات المحجوزة منذ أكثر من هذه المدة تُعد متروكة من عامل توقف وتُحجز من جديد
+CLAIM_LEASE = timedelta(minutes=10)
+MAX_ATTEMPTS = 5
+RETRY_DELAYS = (timedelta(minutes=1), timedelta(minutes=5), timedelta(minutes=30), timedelta(hours=2))
+# (رسالة/ث، أقصى عدد في دفعة واحدة) لكل قناة
+DEFAULT_RATE_LIMITS = {
+    Notification.Channel.EMAIL: (10, 50),
+    Notification.Channel.SMS: (5, 20),
+}
+
+
+def enqueue(recipient, body, kind=Notification.Kind.GENERAL, channel=Notification.Channel.EMAIL,
+            address=None, **fields):
+    """إضافة إشعار إلى صندوق الصادر؛ العنوان الافتراضي للبريد هو بريد المستلم"""
+    return Notification.objects.create(
+        recipient=recipient,
+        body=body,
+        kind=kind,
+        channel=channel,
+        address=address or recipient.email,
+        **fields
+    )
+
+
+def enqueue_many(notifications, batch_size=1000):
+    """إضافة مجموعة إشعارات (كائنات Notification غير محفوظة) بإدراج جماعي"""
+    return Notification.objects.bulk_create(notifications, batch_size=batch_size)
+
+
+@dataclass
+class OutgoingMessage:
+    """رسالة فعلية واحدة تمثل إشعاراً أو مجموعة إشعارات مدمجة"""
+    notifications: list
+
+    @property
+    def primary(self):
+        return self.notifications[0]
+
+    @property
+    def subject(self):
+        if len(self.notifications) == 1:
+            return self.primary.subject
+        return _('%(kind)s: %(count)d تنبيهات') % {
+            'kind': self.primary.get_kind_display(),
+            'count': len(self.notifications),
+        }
+
+    @property
+    def body(self):
+        return '\n\n'.join(notification.body for notification in self.notifications)
+
+    @property
+    def html_body(self):
+        parts = [notification.html_body for notification in self.notifications if notification.html_body]
+        if len(parts) != len(self.notifications):
+            return ''
+        return '<hr>'.join(parts)
+
+
+def coalesce(notifications):
+    """تجميع إشعارات كل مستلم ذات القناة ومفتاح الدمج نفسهما في رسالة واحدة"""
+    groups = defaultdict(list)
+    for notification in notifications:
+        key = notification.coalesce_key or f'#{notification.pk}'
+        groups[(notification.recipient_id, notification.channel, key)].append(notification)
+    return [OutgoingMessage(group) for group in groups.values()]
+
+
+@dataclass
+class DispatchResult:
+    claimed: int = 0
+    messages: int = 0
+    sent: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def merge(self, other):
+        self.claimed += other.claimed
+        self.messages += other.messages
+        self.sent += other.sent
+        self.failed += other.failed
+        self.errors.extend(other.errors)
+
+
+class Dispatcher:
+    """يرسل الإشعارات المعلقة على دفعات؛ يمكن تشغيل أكثر من عامل بالتوازي"""
+
+    def __init__(self, batch_size=200, email_backend=None, sms_backend=None, rate_limits=None):
+        self.batch_size = batch_size
+        self.email_backend = email_backend
+        self.sms_backend = sms_backend
+        if rate_limits is None:
+            rate_limits = getattr(settings, 'NOTIFICATIONS_RATE_LIMITS', DEFAULT_RATE_LIMITS)
+        self.limiters = {
+            channel: TokenBucket(rate, burst)
+            for channel, (rate, burst) in rate_limits.items()
+        }
+        self.senders = {
+            Notification.Channel.EMAIL: self._send_emails,
+            Notification.Channel.SMS: self._send_sms,
+        }
+
+    def claim(self):
+        """حجز دفعة من الإشعارات المتاحة وإعادتها"""
+        now = timezone.now()
+        token = uuid.uuid4().hex
+        claimable = (
+            Q(status=Notification.Status.PENDING, available_at__lte=now)
+            | Q(status=Notification.Status.SENDING, claimed_at__lt=now - CLAIM_LEASE)
+        )
+        with transaction.atomic():
+            ids = list(
+                Notification.objects.select_for_update(skip_locked=True).filter(claimable).order_by(
+                    'available_at', 'id'
+                ).values_list('pk', flat=True)[:self.batch_size]
+            )
+            if not ids:
+                return []
+            # الشرط يتكرر في التحديث لأن المحركات دون أقفال صفوف (SQLite) لا تحجز عند القراءة
+            Notification.objects.filter(claimable, pk__in=ids).update(
+                status=Notification.Status.SENDING,
+                claim_token=token,
+                claimed_at=now,
+                attempts=F('attempts') + 1,
+            )
+        return list(Notification.objects.filter(claim_token=token).order_by('id'))
+
+    def dispatch_batch(self):
+        result = DispatchResult()
+        notifications = self.claim()
+        if not notifications:
+            return result
+        result.claimed = len(notifications)
+
+        by_channel = defaultdict(list)
+        for message in coalesce(notifications):
+            by_channel[message.primary.channel].append(message)
+        result.messages = sum(len(messages) for messages in by_channel.values())
+
+        sent, failed = [], []
+        for channel, messages in by_channel.items():
+            self.senders[channel](messages, sent, failed)
+
+        self._mark_sent(sent)
+        self._mark_failed(failed)
+        result.sent = sum(len(message.notifications) for message in sent)
+        result.failed = sum(len(message.notifications) for message, _error in failed)
+        result.errors = [(message.primary.pk, error) for message, error in failed]
+        return result
+
+    def run(self, max_batches=None, loop=False, idle_interval=5.0, on_batch=None):
+        """إرسال الدفعات حتى يفرغ الصندوق (أو بلا توقف مع loop)"""
+        total = DispatchResult()
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            result = self.dispatch_batch()
+            if result.claimed:
+                batches += 1
+                total.merge(result)
+                if on_batch:
+                    on_batch(total)
+                continue
+            if not loop:
+                break
+            time.sleep(idle_interval)
+        return total
+
+    def _send_chunks(self, channel, connection, messages, build, sent, failed):
+        limiter = self.limiters.get(channel)
+        chunk_size = int(limiter.capacity) if limiter else len(messages)
+        for chunk in chunked(messages, max(1, chunk_size)):
+            if limiter:
+                limiter.wait(len(chunk))
+            # SMTP يرفع الخطأ عند أول رسالة مرفوضة بعد أن يكون أرسل ما قبلها، فتُرسل الرسائل
+            # واحدة واحدة على الاتصال المفتوح نفسه كي لا يُعاد إرسال ما وصل مع الفاشلة
+            for message in chunk:
+                try:
+                    delivered = connection.send_messages([build(message)])
+                except Exception as exc:
+                    failed.append((message, str(exc)))
+                else:
+                    if delivered:
+                        sent.append(message)
+                    else:
+                        failed.append((message, _('لم تُرسل الرسالة')))
+
+    def _send_emails(self, messages, sent, failed):
+        connection = get_connection(self.email_backend)
+
+        def build(message):
+            email = EmailMultiAlternatives(
+                message.subject, message.body, to=[message.primary.address], connection=connection
+            )
+            if message.html_body:
+                email.attach_alternative(message.html_body, 'text/html')
+            return email
+
+        # اتصال SMTP واحد لكل الدفعة بدلاً من اتصال لكل رسالة
+        with connection:
+            self._send_chunks(Notification.Channel.EMAIL, connection, messages, build, sent, failed)
+
+    def _send_sms(self, messages, sent, failed):
+        with get_sms_connection(self.sms_backend) as connection:
+            self._send_chunks(
+                Notification.Channel.SMS,
+                connection,
+                messages,
+                lambda message: SMSMessage(message.primary.address, message.body),
+                sent,
+                failed,
+            )
+
+    def _mark_sent(self, messages):
+        if not messages:
+            return
+        now = timezone.now()
+        with transaction.atomic():
+            Notification.objects.filter(
+                pk__in=[message.primary.pk for message in messages]
+            ).update(status=Notification.Status.SENT, sent_at=now, last_error='')
+            for message in messages:
+                if len(message.notifications) > 1:
+                    Notification.objects.filter(
+                        pk__in=[notification.pk for notification in message.notifications[1:]]
+                    ).update(
+                        status=Notification.Status.COALESCED,
+                        sent_at=now,
+                        merged_into=message.primary.pk,
+                        last_error='',
+                    )
+
+    def _mark_failed(self, failures):
+        now = timezone.now()
+        for message, error in failures:
+            for notification in message.notifications:
+                if notification.attempts >= MAX_ATTEMPTS:
+                    updates = {'status': Notification.Status.FAILED}
+                else:
+                    delay = RETRY_DELAYS[min(notification.attempts, len(RETRY_DELAYS)) - 1]
+                    updates = {'status': Notification.Status.PENDING, 'available_at': now + delay}
+                Notification.objects.filter(pk=notification.pk).update(last_error=error, **updates)
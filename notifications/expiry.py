@@ -0,0 +1,149 @@
+"""ماسح يومي لتواريخ انتهاء التأمين وعقود الاستثمار وعقود الإيجار
+
+كل تذكير يُرسل قبل الانتهاء بعدد أيام من NOTIFICATIONS_EXPIRY_REMINDER_DAYS، فالفحص اليومي لا يقرأ
+إلا «دلاء» أيام محددة: لكل مهلة n يُقرأ نطاق تواريخ الانتهاء [آخر فحص + 1 + n، اليوم + n]
+بمسح نطاق على فهرس حقل التاريخ، ثم تُضاف التذكيرات إلى صندوق الصادر بإدراج جماعي.
+يُسجَّل آخر يوم مفحوص لكل ماسح في المعاملة نفسها، فإعادة التشغيل في اليوم ذاته لا تكرر
+التذكيرات، والأيام الفائتة (توقف الجدولة) تُغطى في التشغيل التالي.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.users.models import Investor, Tenant
+from contracts.models import Contract
+from core.batching import chunked
+
+from .dispatch import enqueue_many
+from .models import ExpiryScan, Notification
+
+DEFAULT_REMINDER_DAYS = (30, 7, 1)
+ONE_DAY = timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class ExpiryScanner:
+    """وصف ماسح: الاستعلام وحقل تاريخ الانتهاء ومسار المستلم ونص التذكير"""
+    name: str
+    kind: str
+    queryset: object
+    date_field: str
+    recipient_field: str
+    email_field: str
+    subject: str
+    body: str
+    extra_fields: tuple = ()
+
+    def rows(self, start, end, chunk_size):
+        """صفوف الانتهاء في [start, end] مرتبة حسب التاريخ (مسح نطاق على فهرس الحقل)"""
+        return self.queryset().filter(**{f'{self.date_field}__range': (start, end)}).order_by(
+            self.date_field
+        ).values(
+            *self.extra_fields,
+            recipient_id=F(self.recipient_field),
+            email=F(self.email_field),
+            expiry=F(self.date_field),
+        ).iterator(chunk_size=chunk_size)
+
+
+SCANNERS = {
+    'insurance': ExpiryScanner(
+        name='insurance',
+        kind=Notification.Kind.INSURANCE_EXPIRY,
+        queryset=lambda: Tenant.objects.all(),
+        date_field='insurance_expiry',
+        recipient_field='user_id',
+        email_field='user__email',
+        subject='تنبيه انتهاء التأمين',
+        body='تنتهي بوليصة التأمين {insurance_policy} بتاريخ {expiry} (بعد {days} يوم).',
+        extra_fields=('insurance_policy',),
+    ),
+    'investment': ExpiryScanner(
+        name='investment',
+        kind=Notification.Kind.CONTRACT_EXPIRY,
+        queryset=lambda: Investor.objects.all(),
+        date_field='contract_end_date',
+        recipient_field='user_id',
+        email_field='user__email',
+        subject='تنبيه انتهاء عقد الاستثمار',
+        body='ينتهي عقد الاستثمار بتاريخ {expiry} (بعد {days} يوم).',
+    ),
+    'lease': ExpiryScanner(
+        name='lease',
+        kind=Notification.Kind.CONTRACT_EXPIRY,
+        queryset=lambda: Contract.objects.filter(status=Contract.Status.ACTIVE),
+        date_field='end_date',
+        recipient_field='tenant__user_id',
+        email_field='tenant__user__email',
+        subject='تنبيه انتهاء عقد الإيجار',
+        body='ينتهي عقد الإيجار {contract_number} بتاريخ {expiry} (بعد {days} يوم).',
+        extra_fields=('contract_number',),
+    ),
+}
+
+
+def reminder_buckets(scanned_through, today, reminder_days):
+    """نطاقات تواريخ الانتهاء المستحقة للتذكير منذ آخر فحص: [(المهلة، البداية، النهاية)]"""
+    first_day = today if scanned_through is None else scanned_through + ONE_DAY
+    if first_day > today:
+        return []
+    buckets = []
+    for days in sorted(set(reminder_days), reverse=True):
+        # الأيام الفائتة لا تُذكِّر بما انتهى فعلاً
+        start = max(first_day + timedelta(days=days), today)
+        end = today + timedelta(days=days)
+        if start <= end:
+            buckets.append((days, start, end))
+    return buckets
+
+
+def _notifications(scanner, rows, today):
+    for row in rows:
+        yield Notification(
+            recipient_id=row['recipient_id'],
+            channel=Notification.Channel.EMAIL,
+            kind=scanner.kind,
+            address=row['email'],
+            subject=scanner.subject,
+            body=scanner.body.format(**row, days=(row['expiry'] - today).days),
+            # تذكيرات المستلم الواحد من الماسح نفسه تُرسل كرسالة واحدة
+            coalesce_key=f'{scanner.name}-expiry',
+        )
+
+
+def scan_expiries(today=None, names=None, reminder_days=None, batch_size=2000, on_bucket=None):
+    """فحص دلاء تواريخ الانتهاء المستحقة لكل ماسح وإضافة تذكيراتها؛ يعيد {الماسح: عدد التذكيرات}"""
+    today = today or timezone.localdate()
+    if reminder_days is None:
+        reminder_days = getattr(settings, 'NOTIFICATIONS_EXPIRY_REMINDER_DAYS', DEFAULT_REMINDER_DAYS)
+    totals = {}
+    for name in names or SCANNERS:
+        scanner = SCANNERS[name]
+        with transaction.atomic():
+            # قفل صف الماسح يمنع تشغيلين متزامنين من إرسال التذكيرات نفسها؛ يُنشأ الصف أولاً ليوجد
+            # ما يُقفل في أول تشغيل (ويبدأ من أمس فيُفحص اليوم وحده)
+            state, _created = ExpiryScan.objects.select_for_update().get_or_create(
+                name=name, defaults={'scanned_through': today - ONE_DAY}
+            )
+            buckets = reminder_buckets(state.scanned_through, today, reminder_days)
+            if not buckets:
+                totals[name] = 0
+                continue
+            total = 0
+            for days, start, end in buckets:
+                created = 0
+                notifications = _notifications(scanner, scanner.rows(start, end, batch_size), today)
+                for batch in chunked(notifications, batch_size):
+                    enqueue_many(batch, batch_size=batch_size)
+                    created += len(batch)
+                total += created
+                if on_bucket:
+                    on_bucket(name, days, start, end, created)
+            state.scanned_through, state.reminders = today, total
+            state.save(update_fields=['scanned_through', 'reminders', 'updated_at'])
+        totals[name] = total
+    return totals
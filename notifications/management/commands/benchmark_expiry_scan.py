@@ -0,0 +1,95 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.users.models import Tenant, User
+from core.batching import chunked
+from notifications.expiry import reminder_buckets, scan_expiries
+from notifications.models import ExpiryScan, Notification
+
+
+def naive_expiring(today, reminder_days):
+    """الطريقة السابقة: تحميل كل المستأجرين وحساب المستحقين للتذكير في بايثون"""
+    targets = {today + timedelta(days=days) for days in reminder_days}
+    return sum(
+        1 for tenant in Tenant.objects.all().iterator(chunk_size=5000)
+        if tenant.has_valid_insurance and tenant.insurance_expiry in targets
+    )
+
+
+class Command(BaseCommand):
+    help = 'قياس سرعة ماسح انتهاء التأمين بمسح نطاقات الفهرس مقابل تحميل كل المستأجرين؛ تُلغى البيانات بعد القياس'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=1000000)
+        parser.add_argument('--days', type=int, default=730, help='مدى تواريخ انتهاء التأمين من اليوم')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        today = timezone.localdate()
+        reminder_days = (30, 7, 1)
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            first_id = (User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+            for ids in chunked(range(first_id, first_id + options['tenants']), batch_size):
+                users = User.objects.bulk_create([
+                    User(
+                        pk=user_id,
+                        email=f'bench-{user_id}@expiry.om',
+                        company_name=f'شركة قياس {user_id}',
+                        commercial_registration=f'9{user_id:011d}',
+                        address='-',
+                        user_type=User.UserType.TENANT,
+                        password='!',
+                    )
+                    for user_id in ids
+                ])
+                Tenant.objects.bulk_create([
+                    Tenant(
+                        user=user,
+                        company_activity='-',
+                        authorized_person='-',
+                        authorized_person_id='-',
+                        insurance_policy=f'P-{user.pk}',
+                        insurance_expiry=today + timedelta(days=rng.randrange(options['days'])),
+                    )
+                    for user in users
+                ])
+            self.stdout.write(f'الإعداد: {options["tenants"]} مستأجر خلال {time.perf_counter() - started:.1f} ث')
+
+            started = time.perf_counter()
+            expected = naive_expiring(today, reminder_days)
+            naive = time.perf_counter() - started
+            self.stdout.write(f'تحميل كل المستأجرين: {naive:.2f} ث ({expected} مستحق)')
+
+            ExpiryScan.objects.filter(name='insurance').delete()
+            started = time.perf_counter()
+            totals = scan_expiries(today=today, names=['insurance'], reminder_days=reminder_days, batch_size=2000)
+            scanned = time.perf_counter() - started
+            self.stdout.write(
+                f'مسح الدلاء ({len(reminder_buckets(None, today, reminder_days))} نطاق): '
+                f'{scanned:.3f} ث ({totals["insurance"]} تذكير)'
+            )
+
+            # فحص اليوم التالي بعد يوم فائت: نطاقان لكل مهلة يُقرآن معاً
+            started = time.perf_counter()
+            catch_up = scan_expiries(
+                today=today + timedelta(days=2), names=['insurance'], reminder_days=reminder_days, batch_size=2000
+            )
+            self.stdout.write(f'فحص بعد يوم فائت: {time.perf_counter() - started:.3f} ث ({catch_up["insurance"]} تذكير)')
+            created = Notification.objects.filter(kind=Notification.Kind.INSURANCE_EXPIRY).count()
+            transaction.set_rollback(True)
+
+        if totals['insurance'] != expected:
+            self.stderr.write(f'اختلاف في العدد: {totals["insurance"]} مقابل {expected}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{created} تذكير؛ التسريع مقابل تحميل كل المستأجرين {naive / max(scanned, 1e-9):.0f}x'
+        ))
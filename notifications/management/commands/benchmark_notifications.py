@@ -0,0 +1,68 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.users.models import User
+from notifications.dispatch import Dispatcher, enqueue_many
+from notifications.models import Notification
+
+BACKENDS = {
+    'locmem': ('django.core.mail.backends.locmem.EmailBackend', 'notifications.backends.LocmemSMSBackend'),
+    'file': ('django.core.mail.backends.filebased.EmailBackend', 'notifications.backends.FileSMSBackend'),
+}
+
+
+class Command(BaseCommand):
+    help = 'قياس سرعة عامل الإشعارات (إشعار/ث) بواجهات إرسال محلية دون اتصال خارجي؛ تُلغى البيانات بعد القياس'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=20000)
+        parser.add_argument('--recipients', type=int, default=2000)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--sms-ratio', type=float, default=0.3, help='نسبة الإشعارات النصية')
+        parser.add_argument('--backend', choices=sorted(BACKENDS), default='locmem')
+        parser.add_argument('--rate', type=float, help='حد المعدل لكل قناة (رسالة/ث)؛ الافتراضي بلا حد فعلي')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        recipients = list(User.objects.values_list('pk', 'email')[:options['recipients']])
+        if not recipients:
+            raise CommandError('لا يوجد مستخدمون لاستخدامهم كمستلمين')
+        rng = random.Random(options['seed'])
+        rate = options['rate'] or 10 ** 9
+        email_backend, sms_backend = BACKENDS[options['backend']]
+
+        with transaction.atomic():
+            notifications = []
+            for index in range(options['count']):
+                user_id, email = rng.choice(recipients)
+                sms = rng.random() < options['sms_ratio']
+                notifications.append(Notification(
+                    recipient_id=user_id,
+                    channel=Notification.Channel.SMS if sms else Notification.Channel.EMAIL,
+                    kind=Notification.Kind.RENT_REMINDER,
+                    address=f'+9689{user_id:07d}' if sms else email,
+                    subject='تذكير بالإيجار',
+                    body=f'تذكير رقم {index}: يرجى سداد القسط المستحق',
+                    coalesce_key='rent-reminder',
+                ))
+            enqueue_many(notifications)
+
+            dispatcher = Dispatcher(
+                batch_size=options['batch_size'],
+                email_backend=email_backend,
+                sms_backend=sms_backend,
+                rate_limits=dict.fromkeys(Notification.Channel.values, (rate, options['batch_size'])),
+            )
+            started = time.perf_counter()
+            total = dispatcher.run()
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'الإشعارات: {total.claimed}')
+        self.stdout.write(f'الرسائل بعد الدمج: {total.messages}')
+        self.stdout.write(f'فشل: {total.failed}')
+        self.stdout.write(f'الزمن: {elapsed:.3f} ث')
+        self.stdout.write(self.style.SUCCESS(f'الإنتاجية: {total.claimed / elapsed:.0f} إشعار/ث'))
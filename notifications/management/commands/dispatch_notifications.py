@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.dispatch import Dispatcher
+
+
+class Command(BaseCommand):
+    help = 'إرسال الإشعارات المعلقة من صندوق الصادر على دفعات'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='عدد الإشعارات المحجوزة في كل دفعة')
+        parser.add_argument('--max-batches', type=int, help='التوقف بعد هذا العدد من الدفعات')
+        parser.add_argument('--loop', action='store_true', help='الاستمرار في انتظار إشعارات جديدة')
+        parser.add_argument('--interval', type=float, default=5.0, help='ثوانٍ الانتظار عند فراغ الصندوق')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def report(total):
+            self.stdout.write(
+                f'محجوز {total.claimed}، رسائل {total.messages}، مُرسل {total.sent}، فشل {total.failed}'
+            )
+
+        total = Dispatcher(batch_size=options['batch_size']).run(
+            max_batches=options['max_batches'],
+            loop=options['loop'],
+            idle_interval=options['interval'],
+            on_batch=report,
+        )
+        for notification_id, error in total.errors[:20]:
+            self.stderr.write(f'الإشعار {notification_id}: {error}')
+        self.stdout.write(self.style.SUCCESS(
+            f'تم إرسال {total.sent} إشعار في {total.messages} رسالة خلال {time.monotonic() - started:.1f} ث'
+        ))
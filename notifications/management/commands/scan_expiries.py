@@ -0,0 +1,38 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.expiry import SCANNERS, scan_expiries
+
+
+class Command(BaseCommand):
+    help = 'الفحص اليومي لتواريخ انتهاء التأمين وعقود الاستثمار والإيجار وإضافة التذكيرات إلى صندوق الصادر'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='يوم الفحص بالصيغة YYYY-MM-DD (الافتراضي: اليوم)')
+        parser.add_argument('--scanner', choices=sorted(SCANNERS), action='append', dest='scanners',
+                            help='تقييد الفحص بماسح (يمكن تكراره)')
+        parser.add_argument('--days', type=int, action='append', help='مهلة التذكير بالأيام (يمكن تكراره)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='عدد التذكيرات في كل إدراج جماعي')
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError as exc:
+            raise CommandError(f'صيغة تاريخ غير صحيحة: {exc}') from exc
+
+        def report(name, days, start, end, created):
+            self.stdout.write(f'{name}: قبل {days} يوم ({start} - {end}): {created} تذكير')
+
+        started = time.monotonic()
+        totals = scan_expiries(
+            today=today,
+            names=options['scanners'],
+            reminder_days=options['days'],
+            batch_size=options['batch_size'],
+            on_bucket=report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'أُضيف {sum(totals.values())} تذكير خلال {time.monotonic() - started:.1f} ث'
+        ))
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('EMAIL', 'بريد إلكتروني'), ('SMS', 'رسالة نصية')], default='EMAIL', max_length=10, verbose_name='القناة')),
+                ('kind', models.CharField(choices=[('GENERAL', 'عام'), ('WELCOME', 'ترحيب'), ('RENT_REMINDER', 'تذكير بالإيجار'), ('INVOICE_ISSUED', 'إصدار فاتورة'), ('CONTRACT_EXPIRY', 'انتهاء عقد'), ('INSURANCE_EXPIRY', 'انتهاء تأمين')], default='GENERAL', max_length=30, verbose_name='نوع الإشعار')),
+                ('address', models.CharField(help_text='البريد الإلكتروني أو رقم الهاتف وقت إنشاء الإشعار', max_length=254, verbose_name='عنوان الإرسال')),
+                ('subject', models.CharField(blank=True, default='', max_length=200, verbose_name='العنوان')),
+                ('body', models.TextField(verbose_name='النص')),
+                ('html_body', models.TextField(blank=True, default='', verbose_name='نص HTML')),
+                ('coalesce_key', models.CharField(blank=True, default='', help_text='الإشعارات المعلقة لنفس المستلم والقناة والمفتاح تُرسل كرسالة واحدة', max_length=100, verbose_name='مفتاح الدمج')),
+                ('status', models.CharField(choices=[('PENDING', 'بانتظار الإرسال'), ('SENDING', 'قيد الإرسال'), ('SENT', 'مُرسل'), ('COALESCED', 'مدمج في رسالة أخرى'), ('FAILED', 'فشل')], default='PENDING', max_length=20, verbose_name='الحالة')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='متاح للإرسال من')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='عدد المحاولات')),
+                ('claim_token', models.CharField(blank=True, default='', editable=False, max_length=32, verbose_name='رمز الحجز')),
+                ('claimed_at', models.DateTimeField(blank=True, editable=False, null=True, verbose_name='تاريخ الحجز')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='تاريخ الإرسال')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='آخر خطأ')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('merged_into', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='merged', to='notifications.notification', verbose_name='مدمج في')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL, verbose_name='المستلم')),
+            ],
+            options={
+                'verbose_name': 'إشعار',
+                'verbose_name_plural': 'الإشعارات',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'available_at', 'id'], name='notificatio_status_b84be2_idx'), models.Index(fields=['claim_token'], name='notificatio_claim_t_66ad01_idx'), models.Index(fields=['recipient', 'kind'], name='notificatio_recipie_41b9e1_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiryScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=30, unique=True, verbose_name='الماسح')),
+                ('scanned_through', models.DateField(verbose_name='آخر يوم مفحوص')),
+                ('reminders', models.PositiveIntegerField(default=0, verbose_name='عدد التذكيرات في آخر فحص')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='آخر تحديث')),
+            ],
+            options={
+                'verbose_name': 'فحص تواريخ الانتهاء',
+                'verbose_name_plural': 'فحوص تواريخ الانتهاء',
+            },
+        ),
+    ]
@@ -1,3 +1,160 @@
 from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class Notification(models.Model):
+    """إشعار في صندوق الصادر المحلي، يرسله عامل الإرسال على دفعات"""
+
+    class Channel(models.TextChoices):
+        EMAIL = 'EMAIL', _('بريد إلكتروني')
+        SMS = 'SMS', _('رسالة نصية')
+
+    class Kind(models.TextChoices):
+        GENERAL = 'GENERAL', _('عام')
+        WELCOME = 'WELCOME', _('ترحيب')
+        RENT_REMINDER = 'RENT_REMINDER', _('تذكير بالإيجار')
+        INVOICE_ISSUED = 'INVOICE_ISSUED', _('إصدار فاتورة')
+        CONTRACT_EXPIRY = 'CONTRACT_EXPIRY', _('انتهاء عقد')
+        INSURANCE_EXPIRY = 'INSURANCE_EXPIRY', _('انتهاء تأمين')
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', _('بانتظار الإرسال')
+        SENDING = 'SENDING', _('قيد الإرسال')
+        SENT = 'SENT', _('مُرسل')
+        COALESCED = 'COALESCED', _('مدمج في رسالة أخرى')
+        FAILED = 'FAILED', _('فشل')
+
+    recipient = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name=_('المستلم')
+    )
+    channel = models.CharField(
+        _('القناة'),
+        max_length=10,
+        choices=Channel.choices,
+        default=Channel.EMAIL
+    )
+    kind = models.CharField(
+        _('نوع الإشعار'),
+        max_length=30,
+        choices=Kind.choices,
+        default=Kind.GENERAL
+    )
+    address = models.CharField(
+        _('عنوان الإرسال'),
+        max_length=254,
+        help_text=_('البريد الإلكتروني أو رقم الهاتف وقت إنشاء الإشعار')
+    )
+    subject = models.CharField(
+        _('العنوان'),
+        max_length=200,
+        blank=True,
+        default=''
+    )
+    body = models.TextField(
+        _('النص')
+    )
+    html_body = models.TextField(
+        _('نص HTML'),
+        blank=True,
+        default=''
+    )
+    coalesce_key = models.CharField(
+        _('مفتاح الدمج'),
+        max_length=100,
+        blank=True,
+        default='',
+        help_text=_('الإشعارات المعلقة لنفس المستلم والقناة والمفتاح تُرسل كرسالة واحدة')
+    )
+    status = models.CharField(
+        _('الحالة'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    available_at = models.DateTimeField(
+        _('متاح للإرسال من'),
+        default=timezone.now
+    )
+    attempts = models.PositiveSmallIntegerField(
+        _('عدد المحاولات'),
+        default=0
+    )
+    claim_token = models.CharField(
+        _('رمز الحجز'),
+        max_length=32,
+        blank=True,
+        default='',
+        editable=False
+    )
+    claimed_at = models.DateTimeField(
+        _('تاريخ الحجز'),
+        blank=True,
+        null=True,
+        editable=False
+    )
+    merged_into = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='merged',
+        verbose_name=_('مدمج في')
+    )
+    sent_at = models.DateTimeField(
+        _('تاريخ الإرسال'),
+        blank=True,
+        null=True
+    )
+    last_error = models.TextField(
+        _('آخر خطأ'),
+        blank=True,
+        default=''
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإنشاء'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('إشعار')
+        verbose_name_plural = _('الإشعارات')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at', 'id']),
+            models.Index(fields=['claim_token']),
+            models.Index(fields=['recipient', 'kind']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} → {self.address}"
+
+
+class ExpiryScan(models.Model):
+    """آخر يوم فحصه ماسح تواريخ الانتهاء لكل نوع تذكير (notifications.expiry)"""
+    name = models.CharField(
+        _('الماسح'),
+        max_length=30,
+        unique=True
+    )
+    scanned_through = models.DateField(
+        _('آخر يوم مفحوص')
+    )
+    reminders = models.PositiveIntegerField(
+        _('عدد التذكيرات في آخر فحص'),
+        default=0
+    )
+    updated_at = models.DateTimeField(
+        _('آخر تحديث'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('فحص تواريخ الانتهاء')
+        verbose_name_plural = _('فحوص تواريخ الانتهاء')
+
+    def __str__(self):
+        return f"{self.name} ({self.scanned_through})"
@@ -1,3 +1,119 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from smtplib import SMTPRecipientsRefused
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import SimpleTestCase, TestCase
+
+from core.testing import make_tenant, make_user
+
+from .dispatch import Dispatcher, enqueue
+from .expiry import reminder_buckets, scan_expiries
+from .models import ExpiryScan, Notification
+
+REJECTED = 'rejected@example.om'
+TODAY = date(2024, 3, 1)
+DAYS = (30, 7, 1)
+
+
+def day(offset):
+    return TODAY + timedelta(days=offset)
+
+
+class RejectingEmailBackend(EmailBackend):
+    """يرفض عنواناً واحداً كما يفعل SMTP بعد أن يكون أرسل الرسائل التي قبله"""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if REJECTED in message.to:
+                raise SMTPRecipientsRefused({REJECTED: (550, b'mailbox unavailable')})
+            super().send_messages([message])
+        return len(messages)
+
+
+class DispatcherTests(TestCase):
+    def test_rejected_message_fails_alone(self):
+        user = make_user()
+        addresses = ['first@example.om', REJECTED, 'last@example.om']
+        for address in addresses:
+            enqueue(user, 'تذكير', address=address, subject='تذكير')
+
+        dispatcher = Dispatcher(
+            email_backend=f'{__name__}.RejectingEmailBackend',
+            rate_limits={Notification.Channel.EMAIL: (1000, 10)},
+        )
+        result = dispatcher.dispatch_batch()
+
+        self.assertEqual((result.sent, result.failed), (2, 1))
+        self.assertEqual([message.to[0] for message in mail.outbox], ['first@example.om', 'last@example.om'])
+        statuses = dict(Notification.objects.values_list('address', 'status'))
+        self.assertEqual(statuses, {
+            'first@example.om': Notification.Status.SENT,
+            REJECTED: Notification.Status.PENDING,
+            'last@example.om': Notification.Status.SENT,
+        })
+        self.assertIn(REJECTED, Notification.objects.get(address=REJECTED).last_error)
+
+
+class ReminderBucketTests(SimpleTestCase):
+    def test_first_run_reads_one_day_per_reminder(self):
+        self.assertEqual(
+            reminder_buckets(None, TODAY, DAYS),
+            [(30, day(30), day(30)), (7, day(7), day(7)), (1, day(1), day(1))],
+        )
+        self.assertEqual(reminder_buckets(day(-1), TODAY, DAYS), reminder_buckets(None, TODAY, DAYS))
+
+    def test_same_day_rerun_reads_nothing(self):
+        self.assertEqual(reminder_buckets(TODAY, TODAY, DAYS), [])
+        self.assertEqual(reminder_buckets(day(1), TODAY, DAYS), [])
+
+    def test_gap_covers_missed_days_without_expired_dates(self):
+        # توقف الفحص ثلاثة أيام: كل دلو يمتد ليشمل الأيام الفائتة، ولا يرجع قبل اليوم
+        self.assertEqual(
+            reminder_buckets(day(-3), TODAY, DAYS),
+            [(30, day(28), day(30)), (7, day(5), day(7)), (1, TODAY, day(1))],
+        )
+
+
+class ScanExpiriesTests(TestCase):
+    def setUp(self):
+        self.expiries = {}
+        for offset in (-1, 1, 2, 3, 4, 7, 9, 20, 30, 31, 33):
+            tenant = make_tenant()
+            tenant.insurance_expiry = day(offset)
+            tenant.save(update_fields=['insurance_expiry'])
+            self.expiries[offset] = tenant.user_id
+
+    def reminded(self):
+        return sorted(
+            (notification.recipient_id, notification.body)
+            for notification in Notification.objects.filter(kind=Notification.Kind.INSURANCE_EXPIRY)
+        )
+
+    def recipients(self, *offsets):
+        return sorted(self.expiries[offset] for offset in offsets)
+
+    def test_same_day_rerun_and_missed_days(self):
+        self.assertEqual(scan_expiries(TODAY, names=['insurance'], reminder_days=DAYS), {'insurance': 3})
+        self.assertEqual(sorted(user_id for user_id, _body in self.reminded()), self.recipients(1, 7, 30))
+        self.assertIn('(بعد 7 يوم)', dict(self.reminded())[self.expiries[7]])
+
+        # إعادة التشغيل في اليوم نفسه لا تكرر شيئاً
+        self.assertEqual(scan_expiries(TODAY, names=['insurance'], reminder_days=DAYS), {'insurance': 0})
+        self.assertEqual(Notification.objects.count(), 3)
+
+        # بعد توقف يومين: تُغطى تواريخ الأيام الفائتة، وما انتهى قبل اليوم (offset 2) لا يُذكَّر به
+        created_before = set(Notification.objects.values_list('pk', flat=True))
+        self.assertEqual(scan_expiries(day(3), names=['insurance'], reminder_days=DAYS), {'insurance': 5})
+        new = Notification.objects.exclude(pk__in=created_before)
+        self.assertEqual(sorted(new.values_list('recipient_id', flat=True)), self.recipients(3, 4, 9, 31, 33))
+        self.assertEqual(
+            ExpiryScan.objects.values_list('scanned_through', 'reminders').get(name='insurance'), (day(3), 5)
+        )
+
+    def test_first_run_creates_scan_row(self):
+        self.assertFalse(ExpiryScan.objects.exists())
+        scan_expiries(TODAY, names=['insurance'], reminder_days=DAYS)
+        self.assertEqual(ExpiryScan.objects.get().scanned_through, TODAY)
+        # مستأجر انتهى تأمينه قبل أول فحص لا يُذكَّر به أبداً
+        self.assertNotIn(self.expiries[-1], [user_id for user_id, _body in self.reminded()])
@@ -1,3 +1,19 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ParkingPermit, ParkingSlot
+
+
+@admin.register(ParkingSlot)
+class ParkingSlotAdmin(admin.ModelAdmin):
+    list_display = ('code', 'building', 'level', 'slot_type', 'is_active')
+    list_filter = ('slot_type', 'is_active', 'building')
+    search_fields = ('code',)
+
+
+@admin.register(ParkingPermit)
+class ParkingPermitAdmin(admin.ModelAdmin):
+    list_display = ('slot', 'tenant', 'vehicle_plate', 'start_date', 'end_date', 'status')
+    list_filter = ('status',)
+    list_select_related = ('slot__building', 'tenant__user')
+    raw_id_fields = ('slot', 'tenant', 'contract')
+    search_fields = ('vehicle_plate',)
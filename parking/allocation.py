@@ -0,0 +1,158 @@
+"""تخصيص المواقف لتصاريح محددة المدة
+
+يُحمَّل لكل عملية تخصيص فهرس فترات في الذاكرة من التصاريح السارية المتقاطعة مع أفق
+الطلب فقط (استعلام واحد على فهرس الموقف والتاريخ)، ثم يُختار لكل مركبة أول موقف خالٍ
+ويُسجل في الفهرس حتى لا تتعارض مركبات الطلب نفسه. على PostgreSQL يحمي قيد الاستبعاد
+من الحجز المزدوج المتزامن، وفي غيره يُعاد التحقق داخل المعاملة قبل تثبيتها.
+"""
+from dataclasses import dataclass
+from datetime import date
+from itertools import islice
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils.translation import gettext as _
+
+from .intervals import IntervalIndex
+from .models import ParkingPermit, ParkingSlot
+
+MAX_ALLOCATION_ATTEMPTS = 3
+
+
+class ParkingUnavailable(ValueError):
+    """لا توجد مواقف خالية كافية للطلب"""
+
+
+@dataclass
+class FleetVehicle:
+    plate: str
+    start_date: date
+    end_date: date
+
+
+def active_permits(start, end):
+    """التصاريح السارية المتداخلة مع الفترة [start, end]"""
+    return ParkingPermit.objects.filter(
+        status=ParkingPermit.Status.ACTIVE,
+        start_date__lte=end,
+        end_date__gte=start,
+    )
+
+
+def candidate_slots(buildings, slot_type=None):
+    slots = ParkingSlot.objects.filter(building__in=buildings, is_active=True)
+    if slot_type:
+        slots = slots.filter(slot_type=slot_type)
+    # ترتيب المباني كما وردت يحدد أولوية التعبئة بين الأبراج
+    order = {pk: position for position, pk in enumerate(_pks(buildings))}
+    return sorted(slots.only('pk', 'building_id', 'level', 'code'), key=lambda slot: (
+        order.get(slot.building_id, len(order)), slot.level, slot.code
+    ))
+
+
+def _pks(buildings):
+    return [getattr(building, 'pk', building) for building in buildings]
+
+
+def load_index(slot_ids, start, end, exclude_ids=()):
+    """فهرس فترات التصاريح السارية للمواقف المعطاة ضمن الأفق [start, end]"""
+    permits = active_permits(start, end).filter(slot_id__in=slot_ids)
+    if exclude_ids:
+        permits = permits.exclude(pk__in=exclude_ids)
+    return IntervalIndex(permits.values_list('slot_id', 'start_date', 'end_date').iterator())
+
+
+def find_free_slots(buildings, start, end, slot_type=None, limit=None):
+    """المواقف الخالية طوال الفترة [start, end] مرتبة حسب المبنى والمستوى"""
+    if connection.vendor == 'postgresql':
+        # فهرس GiST لقيد الاستبعاد يجيب عن NOT EXISTS مباشرة
+        slots = ParkingSlot.objects.filter(building__in=buildings, is_active=True).exclude(
+            Exists(active_permits(start, end).filter(slot_id=OuterRef('pk')))
+        )
+        if slot_type:
+            slots = slots.filter(slot_type=slot_type)
+        return list(slots.order_by('building_id', 'level', 'code')[:limit])
+
+    slots = candidate_slots(buildings, slot_type)
+    index = load_index([slot.pk for slot in slots], start, end)
+    return list(islice((slot for slot in slots if not index.overlaps(slot.pk, start, end)), limit))
+
+
+def allocate_fleet(tenant, vehicles, buildings, slot_type=None, contract=None):
+    """تخصيص مواقف لجميع مركبات المستأجر في استدعاء واحد (الكل أو لا شيء)
+
+    vehicles: قائمة FleetVehicle، ولكل مركبة فترتها الخاصة. تُنشأ التصاريح بإدراج
+    جماعي واحد. يرفع ParkingUnavailable إذا لم تكفِ المواقف الخالية.
+    """
+    vehicles = list(vehicles)
+    if not vehicles:
+        return []
+    for vehicle in vehicles:
+        if vehicle.end_date < vehicle.start_date:
+            raise ValueError(_('يجب أن يكون تاريخ النهاية بعد تاريخ البداية: %s') % vehicle.plate)
+
+    for attempt in range(1, MAX_ALLOCATION_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                permits = _plan(tenant, vehicles, buildings, slot_type, contract)
+                ParkingPermit.objects.bulk_create(permits)
+                if connection.vendor != 'postgresql':
+                    _check_conflicts(permits)
+                return permits
+        except IntegrityError:
+            # عملية متزامنة حجزت أحد المواقف المختارة: يُعاد التخطيط ببيانات محدثة
+            if attempt == MAX_ALLOCATION_ATTEMPTS:
+                raise
+    return []
+
+
+def _plan(tenant, vehicles, buildings, slot_type, contract):
+    horizon_start = min(vehicle.start_date for vehicle in vehicles)
+    horizon_end = max(vehicle.end_date for vehicle in vehicles)
+    slots = candidate_slots(buildings, slot_type)
+    index = load_index([slot.pk for slot in slots], horizon_start, horizon_end)
+
+    permits = []
+    # المركبات الأطول مدة أولاً، فهي الأصعب في إيجاد موقف خالٍ
+    for vehicle in sorted(vehicles, key=lambda item: (item.start_date - item.end_date, item.start_date)):
+        slot = next(
+            (slot for slot in slots if not index.overlaps(slot.pk, vehicle.start_date, vehicle.end_date)),
+            None,
+        )
+        if slot is None:
+            raise ParkingUnavailable(
+                _('لا يوجد موقف خالٍ للمركبة %(plate)s من %(start)s إلى %(end)s') % {
+                    'plate': vehicle.plate,
+                    'start': vehicle.start_date,
+                    'end': vehicle.end_date,
+                }
+            )
+        index.add(slot.pk, vehicle.start_date, vehicle.end_date)
+        permits.append(ParkingPermit(
+            slot=slot,
+            tenant=tenant,
+            contract=contract,
+            vehicle_plate=vehicle.plate,
+            start_date=vehicle.start_date,
+            end_date=vehicle.end_date,
+        ))
+    return permits
+
+
+def _check_conflicts(permits):
+    """التحقق بعد الإدراج من عدم تداخل التصاريح الجديدة مع تصاريح أُدرجت بالتوازي"""
+    index = load_index(
+        {permit.slot_id for permit in permits},
+        min(permit.start_date for permit in permits),
+        max(permit.end_date for permit in permits),
+        exclude_ids=[permit.pk for permit in permits],
+    )
+    for permit in permits:
+        if index.overlaps(permit.slot_id, permit.start_date, permit.end_date):
+            raise IntegrityError(_('تعارض تصريح الموقف %s مع تصريح آخر') % permit.slot_id)
+
+
+def cancel_permit(permit):
+    return ParkingPermit.objects.filter(pk=permit.pk, status=ParkingPermit.Status.ACTIVE).update(
+        status=ParkingPermit.Status.CANCELLED
+    )
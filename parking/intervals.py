@@ -0,0 +1,41 @@
+"""فهرس فترات زمنية في الذاكرة للتحقق السريع من التداخل"""
+from bisect import bisect_right
+from collections import defaultdict
+
+
+class IntervalIndex:
+    """فترات مغلقة [start, end] مجمعة حسب المفتاح (الموقف) ومرتبة حسب البداية
+
+    يُحتفظ لكل مفتاح بأكبر نهاية حتى كل موضع، فالتحقق من تداخل فترة مع فترات المفتاح
+    بحث ثنائي واحد O(log n) بدلاً من المرور على جميع التصاريح.
+    """
+
+    def __init__(self, intervals=()):
+        self._starts = defaultdict(list)
+        self._ends = defaultdict(list)
+        self._max_ends = defaultdict(list)
+        for key, start, end in intervals:
+            self.add(key, start, end)
+
+    def __len__(self):
+        return sum(len(starts) for starts in self._starts.values())
+
+    def add(self, key, start, end):
+        starts, ends, max_ends = self._starts[key], self._ends[key], self._max_ends[key]
+        position = bisect_right(starts, start)
+        starts.insert(position, start)
+        ends.insert(position, end)
+        max_ends.insert(position, end)
+        running = max_ends[position - 1] if position else None
+        for index in range(position, len(max_ends)):
+            running = ends[index] if running is None else max(running, ends[index])
+            max_ends[index] = running
+
+    def overlaps(self, key, start, end):
+        """هل تتداخل الفترة [start, end] مع أي فترة مسجلة للمفتاح؟"""
+        starts = self._starts.get(key)
+        if not starts:
+            return False
+        # الفترات التي تبدأ قبل نهاية الفترة المطلوبة أو عندها تقع في [0, position)
+        position = bisect_right(starts, end)
+        return bool(position) and self._max_ends[key][position - 1] >= start
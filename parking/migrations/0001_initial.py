@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('buildings', '0002_building_investors'),
+        ('contracts', '0002_installment_contracts_i_paid_at_746f5f_idx'),
+        ('users', '0003_user_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParkingSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, verbose_name='رقم الموقف')),
+                ('level', models.SmallIntegerField(default=0, help_text='القيم السالبة للطوابق السفلية', verbose_name='المستوى')),
+                ('slot_type', models.CharField(choices=[('STANDARD', 'عادي'), ('COMPACT', 'صغير'), ('ACCESSIBLE', 'لذوي الإعاقة'), ('EV', 'شحن كهربائي'), ('COVERED', 'مظلل')], default='STANDARD', max_length=20, verbose_name='نوع الموقف')),
+                ('is_active', models.BooleanField(default=True, verbose_name='متاح للتخصيص')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parking_slots', to='buildings.building', verbose_name='المبنى')),
+            ],
+            options={
+                'verbose_name': 'موقف',
+                'verbose_name_plural': 'المواقف',
+                'ordering': ['building', 'level', 'code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ParkingPermit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vehicle_plate', models.CharField(blank=True, default='', max_length=20, verbose_name='رقم اللوحة')),
+                ('start_date', models.DateField(verbose_name='تاريخ البداية')),
+                ('end_date', models.DateField(verbose_name='تاريخ النهاية')),
+                ('status', models.CharField(choices=[('ACTIVE', 'ساري'), ('CANCELLED', 'ملغى')], default='ACTIVE', max_length=20, verbose_name='الحالة')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('contract', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='parking_permits', to='contracts.contract', verbose_name='العقد')),
+                ('slot', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='permits', to='parking.parkingslot', verbose_name='الموقف')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parking_permits', to='users.tenant', verbose_name='المستأجر')),
+            ],
+            options={
+                'verbose_name': 'تصريح موقف',
+                'verbose_name_plural': 'تصاريح المواقف',
+                'ordering': ['slot', 'start_date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='parkingslot',
+            index=models.Index(fields=['building', 'slot_type', 'level', 'code'], name='parking_par_buildin_739419_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='parkingslot',
+            constraint=models.UniqueConstraint(fields=('building', 'code'), name='unique_parking_slot_code'),
+        ),
+        migrations.AddIndex(
+            model_name='parkingpermit',
+            index=models.Index(condition=models.Q(('status', 'ACTIVE')), fields=['slot', 'end_date', 'start_date'], name='parking_active_permit_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parkingpermit',
+            index=models.Index(fields=['tenant', 'status'], name='parking_par_tenant__94e374_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='parkingpermit',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gte', models.F('start_date'))), name='parking_permit_valid_range'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+from django.db.models import F, Func, Q
+
+CONSTRAINT = 'parking_permit_no_overlap'
+
+
+def exclusion_constraint():
+    """قيد استبعاد يمنع تداخل تصريحين ساريين على الموقف نفسه
+
+    لا يُضاف إلى Meta.constraints لأن SQLite لا يفهم EXCLUDE ويعيد بناء الجدول بكل قيود
+    النموذج عند أي تعديل لاحق، ولأن django.contrib.postgres يتطلب psycopg عند الاستيراد.
+    """
+    from django.contrib.postgres.constraints import ExclusionConstraint
+    from django.contrib.postgres.fields import (
+        DateRangeField,
+        RangeBoundary,
+        RangeOperators,
+    )
+
+    date_range = Func(
+        F('start_date'),
+        F('end_date'),
+        RangeBoundary(inclusive_lower=True, inclusive_upper=True),
+        function='daterange',
+        output_field=DateRangeField(),
+    )
+    return ExclusionConstraint(
+        name=CONSTRAINT,
+        expressions=[('slot', RangeOperators.EQUAL), (date_range, RangeOperators.OVERLAPS)],
+        condition=Q(status='ACTIVE'),
+    )
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # btree_gist يسمح بمقارنة slot_id (=) داخل فهرس GiST
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.add_constraint(apps.get_model('parking', 'ParkingPermit'), exclusion_constraint())
+
+
+def remove_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_constraint(apps.get_model('parking', 'ParkingPermit'), exclusion_constraint())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_exclusion_constraint, remove_exclusion_constraint),
+    ]
@@ -1,3 +1,144 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class ParkingSlot(models.Model):
+    """موقف سيارة في مبنى"""
+
+    class SlotType(models.TextChoices):
+        STANDARD = 'STANDARD', _('عادي')
+        COMPACT = 'COMPACT', _('صغير')
+        ACCESSIBLE = 'ACCESSIBLE', _('لذوي الإعاقة')
+        EV = 'EV', _('شحن كهربائي')
+        COVERED = 'COVERED', _('مظلل')
+
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.CASCADE,
+        related_name='parking_slots',
+        verbose_name=_('المبنى')
+    )
+    code = models.CharField(
+        _('رقم الموقف'),
+        max_length=20
+    )
+    level = models.SmallIntegerField(
+        _('المستوى'),
+        default=0,
+        help_text=_('القيم السالبة للطوابق السفلية')
+    )
+    slot_type = models.CharField(
+        _('نوع الموقف'),
+        max_length=20,
+        choices=SlotType.choices,
+        default=SlotType.STANDARD
+    )
+    is_active = models.BooleanField(
+        _('متاح للتخصيص'),
+        default=True
+    )
+
+    class Meta:
+        verbose_name = _('موقف')
+        verbose_name_plural = _('المواقف')
+        ordering = ['building', 'level', 'code']
+        constraints = [
+            models.UniqueConstraint(fields=['building', 'code'], name='unique_parking_slot_code'),
+        ]
+        indexes = [
+            models.Index(fields=['building', 'slot_type', 'level', 'code']),
+        ]
+
+    def __str__(self):
+        return f"{self.building} - {self.code}"
+
+
+class ParkingPermit(models.Model):
+    """تصريح استخدام موقف لمستأجر خلال فترة (شاملة للطرفين)
+
+    لا يجوز تداخل تصريحين ساريين على الموقف نفسه؛ على PostgreSQL يفرض ذلك قيد استبعاد
+    (EXCLUDE USING gist) يُنشأ في الترحيل، وفي المحركات الأخرى تتحقق منه خدمة التخصيص.
+    """
+
+    class Status(models.TextChoices):
+        ACTIVE = 'ACTIVE', _('ساري')
+        CANCELLED = 'CANCELLED', _('ملغى')
+
+    slot = models.ForeignKey(
+        ParkingSlot,
+        on_delete=models.PROTECT,
+        related_name='permits',
+        verbose_name=_('الموقف')
+    )
+    tenant = models.ForeignKey(
+        'users.Tenant',
+        on_delete=models.CASCADE,
+        related_name='parking_permits',
+        verbose_name=_('المستأجر')
+    )
+    contract = models.ForeignKey(
+        'contracts.Contract',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='parking_permits',
+        verbose_name=_('العقد')
+    )
+    vehicle_plate = models.CharField(
+        _('رقم اللوحة'),
+        max_length=20,
+        blank=True,
+        default=''
+    )
+    start_date = models.DateField(
+        _('تاريخ البداية')
+    )
+    end_date = models.DateField(
+        _('تاريخ النهاية')
+    )
+    status = models.CharField(
+        _('الحالة'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.ACTIVE
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإنشاء'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('تصريح موقف')
+        verbose_name_plural = _('تصاريح المواقف')
+        ordering = ['slot', 'start_date']
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end_date__gte=models.F('start_date')),
+                name='parking_permit_valid_range',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['slot', 'end_date', 'start_date'],
+                condition=models.Q(status='ACTIVE'),
+                name='parking_active_permit_idx',
+            ),
+            models.Index(fields=['tenant', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.slot} ({self.start_date} - {self.end_date})"
+
+    def clean(self):
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValidationError({'end_date': _('يجب أن يكون تاريخ النهاية بعد تاريخ البداية')})
+        if self.slot_id and self.start_date and self.end_date and self.status == self.Status.ACTIVE:
+            overlapping = ParkingPermit.objects.filter(
+                slot_id=self.slot_id,
+                status=self.Status.ACTIVE,
+                start_date__lte=self.end_date,
+                end_date__gte=self.start_date,
+            ).exclude(pk=self.pk)
+            if overlapping.exists():
+                raise ValidationError(_('الموقف محجوز بتصريح آخر خلال هذه الفترة'))
@@ -1,3 +1,108 @@
+from datetime import date
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from core.testing import make_building, make_tenant
+
+from . import allocation
+from .allocation import (
+    FleetVehicle,
+    ParkingUnavailable,
+    allocate_fleet,
+    find_free_slots,
+)
+from .intervals import IntervalIndex
+from .models import ParkingPermit, ParkingSlot
+
+
+class IntervalIndexTests(TestCase):
+    def test_closed_intervals_overlap_at_their_ends(self):
+        index = IntervalIndex([
+            ('A', date(2024, 1, 1), date(2024, 1, 31)),
+            ('A', date(2024, 3, 1), date(2024, 3, 31)),
+            ('B', date(2024, 2, 1), date(2024, 2, 29)),
+        ])
+        self.assertEqual(len(index), 3)
+        self.assertTrue(index.overlaps('A', date(2024, 1, 31), date(2024, 2, 10)))
+        self.assertTrue(index.overlaps('A', date(2024, 2, 10), date(2024, 3, 1)))
+        self.assertFalse(index.overlaps('A', date(2024, 2, 1), date(2024, 2, 29)))
+        self.assertFalse(index.overlaps('C', date(2024, 1, 1), date(2024, 12, 31)))
+
+    def test_long_interval_added_later_covers_later_starts(self):
+        index = IntervalIndex()
+        index.add('A', date(2024, 6, 1), date(2024, 6, 5))
+        index.add('A', date(2024, 1, 1), date(2024, 12, 31))
+        self.assertTrue(index.overlaps('A', date(2024, 9, 1), date(2024, 9, 2)))
+
+
+class AllocationTests(TestCase):
+    def setUp(self):
+        self.tenant = make_tenant()
+        self.building = make_building()
+        self.slots = [
+            ParkingSlot.objects.create(building=self.building, code=f'P{number}') for number in range(1, 4)
+        ]
+
+    def permit(self, slot, start, end, **fields):
+        return ParkingPermit.objects.create(slot=slot, tenant=self.tenant, start_date=start, end_date=end, **fields)
+
+    def assert_no_overlaps(self):
+        permits = ParkingPermit.objects.filter(status=ParkingPermit.Status.ACTIVE).order_by('slot', 'start_date')
+        previous = {}
+        for permit in permits:
+            if permit.slot_id in previous:
+                self.assertGreater(permit.start_date, previous[permit.slot_id])
+            previous[permit.slot_id] = permit.end_date
+
+    def test_fleet_avoids_existing_and_own_overlaps(self):
+        self.permit(self.slots[0], date(2024, 1, 1), date(2024, 6, 30))
+        vehicles = [
+            FleetVehicle('A-1', date(2024, 3, 1), date(2024, 12, 31)),
+            FleetVehicle('A-2', date(2024, 3, 1), date(2024, 3, 31)),
+            FleetVehicle('A-3', date(2024, 7, 1), date(2024, 7, 31)),
+        ]
+
+        permits = allocate_fleet(self.tenant, vehicles, [self.building])
+
+        slots = {permit.vehicle_plate: permit.slot_id for permit in permits}
+        self.assertEqual(slots, {'A-1': self.slots[1].pk, 'A-2': self.slots[2].pk, 'A-3': self.slots[0].pk})
+        self.assert_no_overlaps()
+
+    def test_cancelled_permits_free_the_slot(self):
+        for slot in self.slots:
+            self.permit(slot, date(2024, 1, 1), date(2024, 12, 31))
+        vehicle = FleetVehicle('B-1', date(2024, 5, 1), date(2024, 5, 31))
+        with self.assertRaises(ParkingUnavailable):
+            allocate_fleet(self.tenant, [vehicle], [self.building])
+
+        allocation.cancel_permit(ParkingPermit.objects.get(slot=self.slots[1]))
+        self.assertEqual(find_free_slots([self.building], vehicle.start_date, vehicle.end_date), [self.slots[1]])
+        [permit] = allocate_fleet(self.tenant, [vehicle], [self.building])
+        self.assertEqual(permit.slot_id, self.slots[1].pk)
+
+    def test_shortage_allocates_nothing(self):
+        vehicles = [FleetVehicle(f'C-{number}', date(2024, 1, 1), date(2024, 1, 31)) for number in range(4)]
+        with self.assertRaises(ParkingUnavailable):
+            allocate_fleet(self.tenant, vehicles, [self.building])
+        self.assertFalse(ParkingPermit.objects.exists())
+
+    def test_concurrent_booking_is_detected_and_replanned(self):
+        self.permit(self.slots[0], date(2024, 2, 10), date(2024, 3, 10))
+        vehicle = FleetVehicle('D-1', date(2024, 2, 1), date(2024, 2, 28))
+        load_index = allocation.load_index
+        calls = []
+
+        def stale_first_read(*args, **kwargs):
+            calls.append(args)
+            # أول تخطيط يقرأ الفهرس قبل أن تثبت عملية أخرى تصريحها على الموقف الأول
+            return IntervalIndex() if len(calls) == 1 else load_index(*args, **kwargs)
+
+        with mock.patch.object(allocation, 'load_index', side_effect=stale_first_read):
+            [permit] = allocate_fleet(self.tenant, [vehicle], [self.building])
+
+        # تخطيط، كشف التعارض بعد الإدراج، ثم تخطيط جديد وتحقق ناجح
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(permit.slot_id, self.slots[1].pk)
+        self.assertEqual(ParkingPermit.objects.filter(vehicle_plate='D-1').count(), 1)
+        self.assert_no_overlaps()
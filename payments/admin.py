@@ -1,3 +1,47 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import DistributionRun, LedgerEntry, PayoutLine, TenantBalance
+
+
+@admin.register(DistributionRun)
+class DistributionRunAdmin(admin.ModelAdmin):
+    list_display = ('run_id', 'period_start', 'period_end', 'status', 'buildings_done', 'completed_at')
+    list_filter = ('status',)
+
+
+@admin.register(PayoutLine)
+class PayoutLineAdmin(admin.ModelAdmin):
+    list_display = ('run', 'building', 'stakeholder', 'role', 'share_percentage', 'amount')
+    list_filter = ('role', 'run')
+    list_select_related = ('run', 'building', 'stakeholder')
+    raw_id_fields = ('building', 'stakeholder')
+
+
+class ReadOnlyAdminMixin:
+    """القيود والأرصدة تُكتب عبر خدمة الدفتر فقط"""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'tenant', 'entry_type', 'amount', 'balance_after', 'reference', 'posted_at')
+    list_filter = ('entry_type',)
+    list_select_related = ('tenant__user',)
+    raw_id_fields = ('tenant', 'contract', 'installment')
+    search_fields = ('reference',)
+    show_full_result_count = False
+
+
+@admin.register(TenantBalance)
+class TenantBalanceAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ('tenant', 'balance', 'entries_count', 'updated_at')
+    list_select_related = ('tenant__user',)
+    raw_id_fields = ('tenant',)
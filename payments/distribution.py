@@ -0,0 +1,141 @@
+"""توزيع الإيجار المحصل لكل مبنى على المالك والمستثمرين بحساب عشري دقيق
+
+يُجمع المحصل لكل مبنى داخل قاعدة البيانات، وتُقرأ حصص أصحاب المصلحة لكل دفعة مبانٍ
+باستعلامين، ثم تُكتب بنود التوزيع وعلامات الاكتمال بإدراج جماعي في معاملة لكل دفعة.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import ROUND_DOWN, Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from buildings.models import Building
+from core.batching import chunked
+
+from .models import DistributionBuilding, DistributionRun, LedgerEntry, PayoutLine
+
+CENT = Decimal('0.01')
+HUNDRED = Decimal(100)
+
+
+def distribution_run_id(period_start, period_end):
+    """معرّف ثابت للفترة يجعل إعادة التشغيل آمنة (idempotent)"""
+    return f'DIST-{period_start:%Y%m%d}-{period_end:%Y%m%d}'
+
+
+def split_amount(total, weights):
+    """تقسيم المبلغ حسب الأوزان بالتقريب للأسفل، مع إضافة الباقي لصاحب الوزن الأكبر
+
+    weights: قائمة (المفتاح، الوزن). يعيد قاموساً {المفتاح: المبلغ} مجموعه يساوي total تماماً.
+    """
+    weight_sum = sum(weight for _key, weight in weights)
+    if not weight_sum:
+        return {}
+    shares = {
+        key: (total * weight / weight_sum).quantize(CENT, rounding=ROUND_DOWN)
+        for key, weight in weights
+    }
+    # عند التساوي يُختار صاحب أصغر مفتاح ليبقى التوزيع حتمياً بين التشغيلات
+    largest = max(weights, key=lambda item: (item[1], -item[0]))[0]
+    shares[largest] += total - sum(shares.values())
+    return shares
+
+
+def collected_rent(period_start, period_end, exclude_run=None):
+    """الإيجار المحصل لكل مبنى في الفترة محسوباً بـ GROUP BY داخل قاعدة البيانات
+
+    يُجمع من قيود الدفعات في الدفتر حسب تاريخ ترحيل كل قيد. Installment.amount_paid مجموع
+    جارٍ يحمل تاريخ آخر دفعة فقط، فالجمع منه ينقل الدفعات السابقة إلى فترة الدفعة الأخيرة.
+    """
+    tz = timezone.get_current_timezone()
+    payments = LedgerEntry.objects.filter(
+        entry_type=LedgerEntry.EntryType.PAYMENT,
+        contract__isnull=False,
+        posted_at__gte=timezone.make_aware(datetime.combine(period_start, time.min), tz),
+        posted_at__lt=timezone.make_aware(datetime.combine(period_end + timedelta(days=1), time.min), tz),
+    )
+    if exclude_run is not None:
+        payments = payments.exclude(
+            contract__unit__building_id__in=exclude_run.buildings.values('building_id')
+        )
+    # مبالغ الدفعات سالبة في الدفتر (تنقص رصيد المستأجر)
+    return payments.values(
+        building_id=F('contract__unit__building_id')
+    ).annotate(collected=-Sum('amount')).order_by('building_id')
+
+
+def _stakeholders(building_ids):
+    """أوزان المالك والمستثمرين لكل مبنى: {building_id: [(user_id, role, weight)]}"""
+    stakeholders = defaultdict(list)
+    owners = Building.objects.filter(pk__in=building_ids).values_list(
+        'pk', 'owner_id', 'owner__ownership_percentage'
+    )
+    for building_id, user_id, weight in owners:
+        stakeholders[building_id].append((user_id, PayoutLine.Role.OWNER, weight))
+    investors = Building.investors.through.objects.filter(building_id__in=building_ids).values_list(
+        'building_id', 'investor_id', 'investor__investment_percentage'
+    )
+    for building_id, user_id, weight in investors:
+        stakeholders[building_id].append((user_id, PayoutLine.Role.INVESTOR, weight))
+    return stakeholders
+
+
+def run_distribution(period_start, period_end, chunk_size=500, on_chunk=None):
+    """تنفيذ أو استئناف عملية توزيع الفترة وإعادة كائن DistributionRun
+
+    المبنى الذي ليس له أصحاب مصلحة بأوزان موجبة لا يُوزَّع إيجاره ولا تُكتب له علامة
+    اكتمال، فتبقى العملية قيد التنفيذ وتُعاد محاولته عند إعادة التشغيل بعد تصحيح الحصص.
+    معرّفات هذه المباني في run.skipped_buildings.
+    """
+    run, _created = DistributionRun.objects.get_or_create(
+        run_id=distribution_run_id(period_start, period_end),
+        defaults={'period_start': period_start, 'period_end': period_end},
+    )
+    run.skipped_buildings = []
+    if run.status == DistributionRun.Status.COMPLETED:
+        return run
+
+    # صف واحد لكل مبنى لم يُنجز بعد؛ حجمه صغير فيُقرأ كاملاً قبل بدء الكتابة
+    pending = list(collected_rent(period_start, period_end, exclude_run=run))
+    for chunk in chunked(pending, chunk_size):
+        stakeholders = _stakeholders([row['building_id'] for row in chunk])
+        lines, markers = [], []
+        for row in chunk:
+            building_id, collected = row['building_id'], row['collected']
+            holders = stakeholders.get(building_id, [])
+            weights = [(user_id, weight) for user_id, _role, weight in holders if weight > 0]
+            weight_sum = sum(weight for _user_id, weight in weights)
+            shares = split_amount(collected, weights)
+            if not shares:
+                run.skipped_buildings.append(building_id)
+                continue
+            for user_id, role, weight in holders:
+                if user_id not in shares:
+                    continue
+                lines.append(PayoutLine(
+                    run=run,
+                    building_id=building_id,
+                    stakeholder_id=user_id,
+                    role=role,
+                    share_percentage=(weight * HUNDRED / weight_sum).quantize(CENT),
+                    amount=shares[user_id],
+                ))
+            markers.append(DistributionBuilding(run=run, building_id=building_id, collected_amount=collected))
+
+        with transaction.atomic():
+            PayoutLine.objects.bulk_create(lines)
+            DistributionBuilding.objects.bulk_create(markers)
+            DistributionRun.objects.filter(pk=run.pk).update(buildings_done=F('buildings_done') + len(markers))
+        if on_chunk:
+            on_chunk(run, len(markers), len(lines))
+
+    run.buildings_done = run.buildings.count()
+    if run.skipped_buildings:
+        run.save(update_fields=['buildings_done'])
+        return run
+    run.status = DistributionRun.Status.COMPLETED
+    run.completed_at = timezone.now()
+    run.save(update_fields=['status', 'completed_at', 'buildings_done'])
+    return run
@@ -0,0 +1,266 @@
+"""دفتر حساب المستأجرين: ترحيل القيود، الأرصدة الجارية، نقاط الإقفال والتحقق من الاتساق"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, Subquery, Value, When
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from contracts.models import Installment
+from core.batching import chunked
+
+from .models import LedgerCheckpoint, LedgerEntry, TenantBalance
+from .signals import entries_posted
+
+# اتجاه أثر كل نوع قيد على رصيد المستأجر (التسويات تُرحَّل بإشارتها كما هي)
+ENTRY_SIGNS = {
+    LedgerEntry.EntryType.CHARGE: 1,
+    LedgerEntry.EntryType.PAYMENT: -1,
+    LedgerEntry.EntryType.CREDIT: -1,
+}
+
+
+@dataclass
+class EntryRequest:
+    """طلب ترحيل قيد؛ المبلغ موجب دائماً عدا التسويات"""
+    tenant_id: int
+    entry_type: str
+    amount: Decimal
+    contract_id: int = None
+    installment_id: int = None
+    reference: str = ''
+    description: str = ''
+
+    def signed_amount(self):
+        amount = Decimal(self.amount)
+        if self.entry_type == LedgerEntry.EntryType.ADJUSTMENT:
+            return amount
+        if amount <= 0:
+            raise ValueError(_('يجب أن يكون مبلغ القيد موجباً'))
+        return amount * ENTRY_SIGNS[self.entry_type]
+
+
+def post_entry(tenant_id, entry_type, amount, **fields):
+    """ترحيل قيد واحد وتحديث الرصيد الجاري في نفس المعاملة"""
+    return post_entries([EntryRequest(tenant_id, entry_type, amount, **fields)])[0]
+
+
+def post_entries(requests):
+    """ترحيل مجموعة قيود دفعة واحدة
+
+    تُقفل صفوف أرصدة المستأجرين المعنيين بترتيب ثابت (تجنباً للجمود)، ويُحسب الرصيد
+    بعد كل قيد، ثم تُدرج القيود وتُحدَّث الأرصدة جماعياً.
+    """
+    requests = list(requests)
+    amounts = [request.signed_amount() for request in requests]
+    tenant_ids = sorted({request.tenant_id for request in requests})
+
+    with transaction.atomic():
+        TenantBalance.objects.bulk_create(
+            [TenantBalance(tenant_id=tenant_id) for tenant_id in tenant_ids],
+            ignore_conflicts=True,
+        )
+        balances = {
+            balance.tenant_id: balance
+            for balance in TenantBalance.objects.select_for_update().filter(
+                tenant_id__in=tenant_ids
+            ).order_by('tenant_id')
+        }
+
+        entries = []
+        for request, amount in zip(requests, amounts, strict=True):
+            balance = balances[request.tenant_id]
+            balance.balance += amount
+            balance.entries_count += 1
+            entries.append(LedgerEntry(
+                tenant_id=request.tenant_id,
+                contract_id=request.contract_id,
+                installment_id=request.installment_id,
+                entry_type=request.entry_type,
+                amount=amount,
+                balance_after=balance.balance,
+                reference=request.reference,
+                description=request.description,
+            ))
+        LedgerEntry.objects.bulk_create(entries)
+
+        now = timezone.now()
+        for entry in entries:
+            balance = balances[entry.tenant_id]
+            balance.last_entry_id = max(balance.last_entry_id, entry.pk)
+            balance.updated_at = now
+        TenantBalance.objects.bulk_update(
+            balances.values(), ['balance', 'last_entry_id', 'entries_count', 'updated_at']
+        )
+        _apply_installment_payments(entries, now)
+        entries_posted.send(sender=LedgerEntry, entries=entries)
+    return entries
+
+
+def _apply_installment_payments(entries, paid_at):
+    paid = defaultdict(Decimal)
+    for entry in entries:
+        if entry.installment_id and entry.entry_type == LedgerEntry.EntryType.PAYMENT:
+            paid[entry.installment_id] -= entry.amount
+    for installment_id, amount in paid.items():
+        Installment.objects.filter(pk=installment_id).update(
+            amount_paid=F('amount_paid') + amount,
+            paid_at=paid_at,
+            status=Case(
+                When(amount__lte=F('amount_paid') + amount, then=Value(Installment.Status.PAID)),
+                default=Value(Installment.Status.PARTIAL),
+            ),
+        )
+
+
+def tenant_balance(tenant_id):
+    """رصيد المستأجر الحالي بقراءة صف واحد"""
+    return TenantBalance.objects.filter(tenant_id=tenant_id).values_list(
+        'balance', flat=True
+    ).first() or Decimal(0)
+
+
+def statement(tenant_id, start, end):
+    """كشف حساب لفترة: (الرصيد الافتتاحي، قيود الفترة، الرصيد الختامي)
+
+    الرصيد الافتتاحي هو الرصيد المخزن بعد آخر قيد قبل الفترة، فلا يُجمع التاريخ السابق.
+    """
+    entries = LedgerEntry.objects.filter(tenant_id=tenant_id)
+    opening = entries.filter(posted_at__lt=start).order_by('-id').values_list(
+        'balance_after', flat=True
+    ).first() or Decimal(0)
+    period = list(entries.filter(posted_at__gte=start, posted_at__lt=end).order_by('id'))
+    closing = period[-1].balance_after if period else opening
+    return opening, period, closing
+
+
+def create_checkpoints(as_of, chunk_size=5000):
+    """تسجيل نقطة إقفال لكل مستأجر عند آخر قيد قبل as_of؛ النقاط الموجودة مسبقاً تُتجاوز، ويعيد عدد المستأجرين المعالجين"""
+    last_ids = LedgerEntry.objects.filter(posted_at__lt=as_of).values('tenant_id').annotate(
+        last_id=Max('id')
+    ).values('last_id')
+    rows = LedgerEntry.objects.filter(pk__in=Subquery(last_ids)).values_list(
+        'tenant_id', 'id', 'balance_after'
+    ).iterator(chunk_size=chunk_size)
+
+    processed = 0
+    for chunk in chunked(rows, chunk_size):
+        LedgerCheckpoint.objects.bulk_create(
+            [
+                LedgerCheckpoint(tenant_id=tenant_id, last_entry_id=entry_id, balance=balance, as_of=as_of)
+                for tenant_id, entry_id, balance in chunk
+            ],
+            ignore_conflicts=True,
+        )
+        processed += len(chunk)
+    return processed
+
+
+@dataclass
+class LedgerCheckResult:
+    tenants: int = 0
+    entries: int = 0
+    entry_mismatches: list = field(default_factory=list)
+    balance_mismatches: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.entry_mismatches and not self.balance_mismatches
+
+
+def check_ledger(tenant_ids=None, from_checkpoint=False, fix=False, chunk_size=5000, on_progress=None):
+    """إعادة حساب الأرصدة من القيود الخام بمسح متدفق مرتب حسب المستأجر
+
+    مع from_checkpoint يبدأ كل مستأجر من آخر نقطة إقفال له بدلاً من أول قيد.
+    مع fix تُصحَّح أرصدة TenantBalance المخالفة مع آخر قيد وعدد القيود (القيود نفسها لا تُعدَّل).
+    """
+    result = LedgerCheckResult()
+    starts = {}
+    if from_checkpoint:
+        checkpoints = LedgerCheckpoint.objects.order_by('tenant_id', '-last_entry_id')
+        if tenant_ids:
+            checkpoints = checkpoints.filter(tenant_id__in=tenant_ids)
+        for tenant_id, rows in groupby(
+            checkpoints.values_list('tenant_id', 'last_entry_id', 'balance').iterator(chunk_size=chunk_size),
+            key=lambda row: row[0],
+        ):
+            _tenant, last_entry_id, balance = next(rows)
+            starts[tenant_id] = (last_entry_id, balance)
+
+    entries = LedgerEntry.objects.all()
+    if tenant_ids:
+        entries = entries.filter(tenant_id__in=tenant_ids)
+    if starts and not tenant_ids:
+        # لا حاجة لقراءة ما قبل أقدم نقطة إقفال
+        entries = entries.filter(id__gt=min(last_id for last_id, _balance in starts.values()))
+    rows = entries.order_by('tenant_id', 'id').values_list(
+        'tenant_id', 'id', 'amount', 'balance_after'
+    ).iterator(chunk_size=chunk_size)
+
+    computed = {}
+    for tenant_id, tenant_rows in groupby(rows, key=lambda row: row[0]):
+        after_id, balance = starts.get(tenant_id, (0, Decimal(0)))
+        for _tenant, entry_id, amount, balance_after in tenant_rows:
+            if entry_id <= after_id:
+                continue
+            balance += amount
+            result.entries += 1
+            if balance != balance_after:
+                result.entry_mismatches.append((tenant_id, entry_id, balance, balance_after))
+        computed[tenant_id] = balance
+        result.tenants += 1
+        if on_progress and result.tenants % chunk_size == 0:
+            on_progress(result)
+
+    # المستأجرون الذين لم تظهر لهم قيود بعد نقطة الإقفال رصيدهم رصيد النقطة
+    for tenant_id, (_last_id, balance) in starts.items():
+        computed.setdefault(tenant_id, balance)
+
+    stored = TenantBalance.objects.all()
+    if tenant_ids:
+        stored = stored.filter(tenant_id__in=tenant_ids)
+    to_fix = []
+    seen = set()
+    for balance_row in stored.iterator(chunk_size=chunk_size):
+        seen.add(balance_row.tenant_id)
+        expected = computed.get(balance_row.tenant_id, Decimal(0))
+        if balance_row.balance != expected:
+            result.balance_mismatches.append((balance_row.tenant_id, expected, balance_row.balance))
+            balance_row.balance = expected
+            to_fix.append(balance_row)
+    for tenant_id, expected in computed.items():
+        if tenant_id not in seen and expected:
+            result.balance_mismatches.append((tenant_id, expected, None))
+            to_fix.append(TenantBalance(tenant_id=tenant_id, balance=expected))
+
+    if fix and to_fix:
+        _refresh_balance_totals(to_fix, chunk_size)
+        with transaction.atomic():
+            TenantBalance.objects.bulk_create(
+                [balance for balance in to_fix if balance._state.adding],
+                ignore_conflicts=True,
+            )
+            TenantBalance.objects.bulk_update(
+                [balance for balance in to_fix if not balance._state.adding],
+                ['balance', 'last_entry_id', 'entries_count'],
+                batch_size=chunk_size,
+            )
+    return result
+
+
+def _refresh_balance_totals(balances, chunk_size):
+    """آخر قيد وعدد القيود للأرصدة المصححة من القيود نفسها (قد يبدأ الفحص من نقطة إقفال)"""
+    for chunk in chunked(balances, chunk_size):
+        totals = {
+            tenant_id: (last_id, count)
+            for tenant_id, last_id, count in LedgerEntry.objects.filter(
+                tenant_id__in=[balance.tenant_id for balance in chunk]
+            ).order_by().values('tenant_id').annotate(last_id=Max('id'), count=Count('id')).values_list(
+                'tenant_id', 'last_id', 'count'
+            )
+        }
+        for balance in chunk:
+            balance.last_entry_id, balance.entries_count = totals.get(balance.tenant_id, (0, 0))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.ledger import check_ledger
+
+
+class Command(BaseCommand):
+    help = 'إعادة حساب أرصدة المستأجرين من قيود الدفتر ومقارنتها بالأرصدة المخزنة'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, action='append', dest='tenants', help='معرّف مستأجر (يمكن تكراره)')
+        parser.add_argument('--from-checkpoints', action='store_true', help='البدء من آخر نقطة إقفال لكل مستأجر')
+        parser.add_argument('--fix', action='store_true', help='تصحيح الأرصدة المخزنة المخالفة')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='عدد الصفوف المقروءة في كل دفعة')
+        parser.add_argument('--show', type=int, default=20, help='عدد المخالفات المعروضة من كل نوع')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def report(result):
+            self.stdout.write(f'{result.tenants} مستأجر، {result.entries} قيد')
+
+        result = check_ledger(
+            tenant_ids=options['tenants'],
+            from_checkpoint=options['from_checkpoints'],
+            fix=options['fix'],
+            chunk_size=options['chunk_size'],
+            on_progress=report,
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'تم فحص {result.entries} قيد لـ {result.tenants} مستأجر خلال {elapsed:.1f} ث'
+        )
+        if result.ok:
+            self.stdout.write(self.style.SUCCESS('الدفتر متسق'))
+            return
+
+        for tenant_id, entry_id, expected, stored in result.entry_mismatches[:options['show']]:
+            self.stderr.write(f'قيد {entry_id} (مستأجر {tenant_id}): المتوقع {expected} والمخزن {stored}')
+        for tenant_id, expected, stored in result.balance_mismatches[:options['show']]:
+            self.stderr.write(f'رصيد المستأجر {tenant_id}: المتوقع {expected} والمخزن {stored}')
+        if options['fix'] and not result.entry_mismatches:
+            self.stdout.write(self.style.WARNING(f'تم تصحيح {len(result.balance_mismatches)} رصيد'))
+            return
+        raise CommandError(
+            f'مخالفات: {len(result.entry_mismatches)} قيد، {len(result.balance_mismatches)} رصيد'
+        )
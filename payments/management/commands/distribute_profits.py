@@ -0,0 +1,40 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.distribution import run_distribution
+
+
+class Command(BaseCommand):
+    help = 'توزيع الإيجار المحصل في فترة على ملاك ومستثمري كل مبنى (آمن لإعادة التشغيل والاستئناف)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help='بداية الفترة YYYY-MM-DD')
+        parser.add_argument('--end', required=True, help='نهاية الفترة YYYY-MM-DD (شاملة)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='عدد المباني في كل معاملة')
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start'])
+            end = date.fromisoformat(options['end'])
+        except ValueError as exc:
+            raise CommandError(f'صيغة تاريخ غير صحيحة: {exc}') from exc
+        if start > end:
+            raise CommandError('يجب أن تسبق بداية الفترة نهايتها')
+
+        started = time.monotonic()
+
+        def report(run, buildings, lines):
+            self.stdout.write(f'{run.run_id}: +{buildings} مبنى، +{lines} بند')
+
+        run = run_distribution(start, end, chunk_size=options['chunk_size'], on_chunk=report)
+        self.stdout.write(self.style.SUCCESS(
+            f'{run.run_id}: {run.get_status_display()} - {run.buildings_done} مبنى '
+            f'خلال {time.monotonic() - started:.1f} ث'
+        ))
+        if run.skipped_buildings:
+            raise CommandError(
+                'مبانٍ لها إيجار محصل دون مالك أو مستثمر بنسبة موجبة، لم يُوزَّع إيجارها: '
+                + ', '.join(map(str, run.skipped_buildings))
+            )
@@ -0,0 +1,26 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from payments.ledger import create_checkpoints
+
+
+class Command(BaseCommand):
+    help = 'تسجيل نقاط إقفال لأرصدة المستأجرين (تُشغّل دورياً، مثلاً في بداية كل شهر)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--as-of', help='تاريخ الإقفال YYYY-MM-DD (الافتراضي: الآن)؛ تُشمل القيود قبله')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='عدد النقاط في كل إدراج')
+
+    def handle(self, *args, **options):
+        as_of = timezone.now()
+        if options['as_of']:
+            try:
+                day = datetime.strptime(options['as_of'], '%Y-%m-%d').date()
+            except ValueError as exc:
+                raise CommandError(f'صيغة تاريخ غير صحيحة: {exc}') from exc
+            as_of = timezone.make_aware(datetime.combine(day, time.min))
+
+        processed = create_checkpoints(as_of, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'تمت معالجة {processed} مستأجر حتى {as_of:%Y-%m-%d %H:%M}'))
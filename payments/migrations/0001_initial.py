@@ -0,0 +1,75 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('buildings', '0002_building_investors'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistributionRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(max_length=40, unique=True, verbose_name='معرّف العملية')),
+                ('period_start', models.DateField(verbose_name='بداية الفترة')),
+                ('period_end', models.DateField(verbose_name='نهاية الفترة')),
+                ('status', models.CharField(choices=[('RUNNING', 'قيد التنفيذ'), ('COMPLETED', 'مكتملة')], default='RUNNING', max_length=20, verbose_name='الحالة')),
+                ('buildings_done', models.PositiveIntegerField(default=0, verbose_name='المباني المنجزة')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ البدء')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='تاريخ الاكتمال')),
+            ],
+            options={
+                'verbose_name': 'عملية توزيع أرباح',
+                'verbose_name_plural': 'عمليات توزيع الأرباح',
+                'ordering': ['-period_start'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DistributionBuilding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('collected_amount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='الإيجار المحصل')),
+                ('processed_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ المعالجة')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='distributions', to='buildings.building', verbose_name='المبنى')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buildings', to='payments.distributionrun', verbose_name='العملية')),
+            ],
+            options={
+                'verbose_name': 'مبنى ضمن التوزيع',
+                'verbose_name_plural': 'مباني التوزيع',
+            },
+        ),
+        migrations.CreateModel(
+            name='PayoutLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('OWNER', 'مالك'), ('INVESTOR', 'مستثمر')], max_length=10, verbose_name='الصفة')),
+                ('share_percentage', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='نسبة الحصة')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='المبلغ')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='payout_lines', to='buildings.building', verbose_name='المبنى')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payout_lines', to='payments.distributionrun', verbose_name='العملية')),
+                ('stakeholder', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='payout_lines', to=settings.AUTH_USER_MODEL, verbose_name='المستفيد')),
+            ],
+            options={
+                'verbose_name': 'بند توزيع',
+                'verbose_name_plural': 'بنود التوزيع',
+                'indexes': [models.Index(fields=['stakeholder', 'run'], name='payments_pa_stakeho_059646_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='payoutline',
+            constraint=models.UniqueConstraint(fields=('run', 'building', 'stakeholder'), name='unique_payout_line'),
+        ),
+        migrations.AddConstraint(
+            model_name='distributionbuilding',
+            constraint=models.UniqueConstraint(fields=('run', 'building'), name='unique_distribution_building'),
+        ),
+    ]
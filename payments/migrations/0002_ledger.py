@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0002_installment_contracts_i_paid_at_746f5f_idx'),
+        ('users', '0003_user_search_name'),
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantBalance',
+            fields=[
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to='users.tenant', verbose_name='المستأجر')),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='الرصيد')),
+                ('last_entry_id', models.BigIntegerField(default=0, verbose_name='آخر قيد')),
+                ('entries_count', models.PositiveIntegerField(default=0, verbose_name='عدد القيود')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='آخر تحديث')),
+            ],
+            options={
+                'verbose_name': 'رصيد مستأجر',
+                'verbose_name_plural': 'أرصدة المستأجرين',
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_entry_id', models.BigIntegerField(verbose_name='آخر قيد مشمول')),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='الرصيد')),
+                ('as_of', models.DateTimeField(verbose_name='حتى تاريخ')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_checkpoints', to='users.tenant', verbose_name='المستأجر')),
+            ],
+            options={
+                'verbose_name': 'نقطة إقفال',
+                'verbose_name_plural': 'نقاط الإقفال',
+                'ordering': ['tenant', '-last_entry_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_type', models.CharField(choices=[('CHARGE', 'مطالبة'), ('PAYMENT', 'دفعة'), ('CREDIT', 'خصم'), ('ADJUSTMENT', 'تسوية')], max_length=20, verbose_name='نوع القيد')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='المبلغ')),
+                ('balance_after', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='الرصيد بعد القيد')),
+                ('reference', models.CharField(blank=True, default='', max_length=50, verbose_name='المرجع')),
+                ('description', models.CharField(blank=True, default='', max_length=255, verbose_name='البيان')),
+                ('posted_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الترحيل')),
+                ('contract', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='contracts.contract', verbose_name='العقد')),
+                ('installment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='contracts.installment', verbose_name='القسط')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='users.tenant', verbose_name='المستأجر')),
+            ],
+            options={
+                'verbose_name': 'قيد دفتر',
+                'verbose_name_plural': 'قيود الدفتر',
+                'ordering': ['tenant', 'id'],
+                'indexes': [models.Index(fields=['tenant', 'id'], name='payments_le_tenant__8a7390_idx'), models.Index(fields=['tenant', 'posted_at'], name='payments_le_tenant__71199c_idx'), models.Index(fields=['posted_at'], name='payments_le_posted__6df797_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ledgercheckpoint',
+            constraint=models.UniqueConstraint(fields=('tenant', 'last_entry_id'), name='unique_ledger_checkpoint'),
+        ),
+    ]
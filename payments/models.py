@@ -1,3 +1,324 @@
+from django.conf import settings
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class DistributionRun(models.Model):
+    """عملية توزيع أرباح فترة محددة بين الملاك والمستثمرين
+
+    معرّف العملية مشتق من الفترة، فإعادة تشغيلها تستأنف المباني غير المكتملة فقط.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = 'RUNNING', _('قيد التنفيذ')
+        COMPLETED = 'COMPLETED', _('مكتملة')
+
+    run_id = models.CharField(
+        _('معرّف العملية'),
+        max_length=40,
+        unique=True
+    )
+    period_start = models.DateField(
+        _('بداية الفترة')
+    )
+    period_end = models.DateField(
+        _('نهاية الفترة')
+    )
+    status = models.CharField(
+        _('الحالة'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.RUNNING
+    )
+    buildings_done = models.PositiveIntegerField(
+        _('المباني المنجزة'),
+        default=0
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ البدء'),
+        auto_now_add=True
+    )
+    completed_at = models.DateTimeField(
+        _('تاريخ الاكتمال'),
+        blank=True,
+        null=True
+    )
+
+    class Meta:
+        verbose_name = _('عملية توزيع أرباح')
+        verbose_name_plural = _('عمليات توزيع الأرباح')
+        ordering = ['-period_start']
+
+    def __str__(self):
+        return self.run_id
+
+
+class DistributionBuilding(models.Model):
+    """علامة اكتمال توزيع مبنى ضمن العملية (أساس الاستئناف)"""
+    run = models.ForeignKey(
+        DistributionRun,
+        on_delete=models.CASCADE,
+        related_name='buildings',
+        verbose_name=_('العملية')
+    )
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.PROTECT,
+        related_name='distributions',
+        verbose_name=_('المبنى')
+    )
+    collected_amount = models.DecimalField(
+        _('الإيجار المحصل'),
+        max_digits=14,
+        decimal_places=2
+    )
+    processed_at = models.DateTimeField(
+        _('تاريخ المعالجة'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('مبنى ضمن التوزيع')
+        verbose_name_plural = _('مباني التوزيع')
+        constraints = [
+            models.UniqueConstraint(fields=['run', 'building'], name='unique_distribution_building'),
+        ]
+
+    def __str__(self):
+        return f"{self.run} - {self.building}"
+
+
+class PayoutLine(models.Model):
+    """حصة صاحب مصلحة (مالك أو مستثمر) من إيجار مبنى في عملية توزيع"""
+
+    class Role(models.TextChoices):
+        OWNER = 'OWNER', _('مالك')
+        INVESTOR = 'INVESTOR', _('مستثمر')
+
+    run = models.ForeignKey(
+        DistributionRun,
+        on_delete=models.CASCADE,
+        related_name='payout_lines',
+        verbose_name=_('العملية')
+    )
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.PROTECT,
+        related_name='payout_lines',
+        verbose_name=_('المبنى')
+    )
+    stakeholder = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name='payout_lines',
+        verbose_name=_('المستفيد')
+    )
+    role = models.CharField(
+        _('الصفة'),
+        max_length=10,
+        choices=Role.choices
+    )
+    share_percentage = models.DecimalField(
+        _('نسبة الحصة'),
+        max_digits=5,
+        decimal_places=2
+    )
+    amount = models.DecimalField(
+        _('المبلغ'),
+        max_digits=14,
+        decimal_places=2
+    )
+
+    class Meta:
+        verbose_name = _('بند توزيع')
+        verbose_name_plural = _('بنود التوزيع')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['run', 'building', 'stakeholder'],
+                name='unique_payout_line',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['stakeholder', 'run']),
+        ]
+
+    def __str__(self):
+        return f"{self.stakeholder} - {self.amount}"
+
+
+class ImmutableLedgerError(ValueError):
+    """محاولة تعديل أو حذف قيد مُرحَّل"""
+
+
+class LedgerEntryQuerySet(models.QuerySet):
+    """القيود غير قابلة للتعديل أو الحذف بعد ترحيلها"""
+
+    def update(self, **kwargs):
+        raise ImmutableLedgerError(_('لا يمكن تعديل قيود الدفتر بعد ترحيلها'))
+
+    def delete(self):
+        raise ImmutableLedgerError(_('لا يمكن حذف قيود الدفتر بعد ترحيلها'))
+
+
+class LedgerEntry(models.Model):
+    """قيد في دفتر حساب المستأجر (إلحاق فقط)
+
+    المبلغ موقّع: المطالبات موجبة والمدفوعات والخصومات سالبة، والرصيد الموجب يعني
+    مبلغاً مستحقاً على المستأجر. يُخزَّن الرصيد بعد كل قيد لتكون كشوف الحساب مسحاً
+    لنطاق محدود دون جمع كامل التاريخ.
+    """
+
+    class EntryType(models.TextChoices):
+        CHARGE = 'CHARGE', _('مطالبة')
+        PAYMENT = 'PAYMENT', _('دفعة')
+        CREDIT = 'CREDIT', _('خصم')
+        ADJUSTMENT = 'ADJUSTMENT', _('تسوية')
+
+    tenant = models.ForeignKey(
+        'users.Tenant',
+        on_delete=models.PROTECT,
+        related_name='ledger_entries',
+        verbose_name=_('المستأجر')
+    )
+    contract = models.ForeignKey(
+        'contracts.Contract',
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True,
+        related_name='ledger_entries',
+        verbose_name=_('العقد')
+    )
+    installment = models.ForeignKey(
+        'contracts.Installment',
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True,
+        related_name='ledger_entries',
+        verbose_name=_('القسط')
+    )
+    entry_type = models.CharField(
+        _('نوع القيد'),
+        max_length=20,
+        choices=EntryType.choices
+    )
+    amount = models.DecimalField(
+        _('المبلغ'),
+        max_digits=14,
+        decimal_places=2
+    )
+    balance_after = models.DecimalField(
+        _('الرصيد بعد القيد'),
+        max_digits=14,
+        decimal_places=2
+    )
+    reference = models.CharField(
+        _('المرجع'),
+        max_length=50,
+        blank=True,
+        default=''
+    )
+    description = models.CharField(
+        _('البيان'),
+        max_length=255,
+        blank=True,
+        default=''
+    )
+    posted_at = models.DateTimeField(
+        _('تاريخ الترحيل'),
+        auto_now_add=True
+    )
+
+    objects = LedgerEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _('قيد دفتر')
+        verbose_name_plural = _('قيود الدفتر')
+        ordering = ['tenant', 'id']
+        indexes = [
+            models.Index(fields=['tenant', 'id']),
+            models.Index(fields=['tenant', 'posted_at']),
+            models.Index(fields=['posted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant} {self.get_entry_type_display()} {self.amount}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ImmutableLedgerError(_('لا يمكن تعديل قيود الدفتر بعد ترحيلها'))
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ImmutableLedgerError(_('لا يمكن حذف قيود الدفتر بعد ترحيلها'))
+
+
+class TenantBalance(models.Model):
+    """الرصيد الجاري للمستأجر، يُحدَّث في نفس معاملة كل قيد"""
+    tenant = models.OneToOneField(
+        'users.Tenant',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='balance',
+        verbose_name=_('المستأجر')
+    )
+    balance = models.DecimalField(
+        _('الرصيد'),
+        max_digits=14,
+        decimal_places=2,
+        default=0
+    )
+    last_entry_id = models.BigIntegerField(
+        _('آخر قيد'),
+        default=0
+    )
+    entries_count = models.PositiveIntegerField(
+        _('عدد القيود'),
+        default=0
+    )
+    updated_at = models.DateTimeField(
+        _('آخر تحديث'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('رصيد مستأجر')
+        verbose_name_plural = _('أرصدة المستأجرين')
+
+    def __str__(self):
+        return f"{self.tenant} ({self.balance})"
+
+
+class LedgerCheckpoint(models.Model):
+    """نقطة إقفال دورية لرصيد المستأجر تُستخدم كنقطة بداية للتحقق والكشوف"""
+    tenant = models.ForeignKey(
+        'users.Tenant',
+        on_delete=models.CASCADE,
+        related_name='ledger_checkpoints',
+        verbose_name=_('المستأجر')
+    )
+    last_entry_id = models.BigIntegerField(
+        _('آخر قيد مشمول')
+    )
+    balance = models.DecimalField(
+        _('الرصيد'),
+        max_digits=14,
+        decimal_places=2
+    )
+    as_of = models.DateTimeField(
+        _('حتى تاريخ')
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإنشاء'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('نقطة إقفال')
+        verbose_name_plural = _('نقاط الإقفال')
+        ordering = ['tenant', '-last_entry_id']
+        constraints = [
+            models.UniqueConstraint(fields=['tenant', 'last_entry_id'], name='unique_ledger_checkpoint'),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant} @ {self.as_of:%Y-%m-%d}"
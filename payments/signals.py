@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# يُرسل داخل معاملة الترحيل بعد إدراج القيود جماعياً (bulk_create لا يرسل post_save)
+# الوسائط: entries (قائمة LedgerEntry المحفوظة)
+entries_posted = Signal()
@@ -1,3 +1,205 @@
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+
+from contracts.models import Contract
+from contracts.schedules import generate_schedules
+from core.testing import (
+    make_building,
+    make_contract,
+    make_owner,
+    make_tenant,
+    make_unit,
+)
+
+from .distribution import collected_rent, run_distribution
+from .ledger import (
+    EntryRequest,
+    check_ledger,
+    create_checkpoints,
+    post_entries,
+    post_entry,
+    tenant_balance,
+)
+from .models import (
+    DistributionRun,
+    LedgerCheckpoint,
+    LedgerEntry,
+    PayoutLine,
+    TenantBalance,
+)
+
+
+def pay_first_installment(contract, amount, paid_at=datetime(2024, 1, 10)):
+    """ترحيل دفعة على أول قسط بتاريخ ترحيل محدد"""
+    installment = contract.installments.order_by('sequence').first()
+    with mock.patch('django.utils.timezone.now', return_value=timezone.make_aware(paid_at)):
+        post_entry(
+            contract.tenant_id,
+            LedgerEntry.EntryType.PAYMENT,
+            amount,
+            contract_id=contract.pk,
+            installment_id=installment.pk,
+        )
+
+
+class DistributionTests(TestCase):
+    def setUp(self):
+        self.owned = make_building()
+        self.orphan = make_building(owner=make_owner())
+        self.orphan.owner.ownership_percentage = 0
+        self.orphan.owner.save(update_fields=['ownership_percentage'])
+        for building in (self.owned, self.orphan):
+            make_contract(unit=make_unit(building))
+        generate_schedules(Contract.objects.all())
+        for contract in Contract.objects.all():
+            pay_first_installment(contract, Decimal('100.00'))
+
+    def test_building_without_weights_is_skipped_and_retried(self):
+        run = run_distribution(date(2024, 1, 1), date(2024, 1, 31))
+
+        self.assertEqual(run.skipped_buildings, [self.orphan.pk])
+        self.assertEqual(run.status, DistributionRun.Status.RUNNING)
+        self.assertEqual(run.buildings_done, 1)
+        self.assertEqual(list(run.buildings.values_list('building_id', flat=True)), [self.owned.pk])
+
+        # بعد تصحيح الحصة تستأنف العملية المبنى المتخطى فقط
+        self.orphan.owner.ownership_percentage = 100
+        self.orphan.owner.save(update_fields=['ownership_percentage'])
+        run = run_distribution(date(2024, 1, 1), date(2024, 1, 31))
+
+        self.assertEqual(run.skipped_buildings, [])
+        self.assertEqual(run.status, DistributionRun.Status.COMPLETED)
+        self.assertEqual(run.buildings_done, 2)
+        self.assertEqual(PayoutLine.objects.filter(building=self.orphan).get().amount, Decimal('100.00'))
+        self.assertEqual(PayoutLine.objects.filter(building=self.owned).count(), 1)
+
+    def test_split_payment_is_collected_in_the_period_it_was_posted(self):
+        contract = make_contract(unit=make_unit(self.owned))
+        generate_schedules(Contract.objects.filter(pk=contract.pk))
+        pay_first_installment(contract, Decimal('50.00'), paid_at=datetime(2024, 2, 5))
+        pay_first_installment(contract, Decimal('50.00'), paid_at=datetime(2024, 3, 5))
+
+        collected = {
+            month: {row['building_id']: row['collected'] for row in collected_rent(start, end)}
+            for month, (start, end) in {
+                'JAN': (date(2024, 1, 1), date(2024, 1, 31)),
+                'FEB': (date(2024, 2, 1), date(2024, 2, 29)),
+                'MAR': (date(2024, 3, 1), date(2024, 3, 31)),
+            }.items()
+        }
+
+        self.assertEqual(collected['JAN'][self.owned.pk], Decimal('100.00'))
+        self.assertEqual(collected['FEB'], {self.owned.pk: Decimal('50.00')})
+        self.assertEqual(collected['MAR'], {self.owned.pk: Decimal('50.00')})
+        installment = contract.installments.order_by('sequence').first()
+        self.assertEqual(installment.amount_paid, Decimal('100.00'))
+
+        # توزيع فبراير قبل دفعة مارس لا يتأثر بها
+        run = run_distribution(date(2024, 2, 1), date(2024, 2, 29))
+        self.assertEqual(PayoutLine.objects.filter(run=run).get().amount, Decimal('50.00'))
+
+    def test_command_fails_when_buildings_are_skipped(self):
+        with self.assertRaisesMessage(CommandError, str(self.orphan.pk)):
+            call_command('distribute_profits', start='2024-01-01', end='2024-01-31', stdout=StringIO())
+
+
+class LedgerTests(TestCase):
+    def setUp(self):
+        self.tenant, self.other = make_tenant(), make_tenant()
+        post_entries([
+            EntryRequest(self.tenant.pk, LedgerEntry.EntryType.CHARGE, Decimal('100.00')),
+            EntryRequest(self.other.pk, LedgerEntry.EntryType.CHARGE, Decimal('40.00')),
+            EntryRequest(self.tenant.pk, LedgerEntry.EntryType.PAYMENT, Decimal('30.50')),
+            EntryRequest(self.tenant.pk, LedgerEntry.EntryType.ADJUSTMENT, Decimal('-5.25')),
+        ])
+
+    def execute(self, sql, params):
+        # القيود غير قابلة للتعديل عبر ORM، فالعبث يُحاكى بـ SQL مباشر
+        with connection.cursor() as cursor:
+            cursor.execute(sql.format(table=LedgerEntry._meta.db_table), params)
+
+    def test_running_balance_after_each_entry(self):
+        entries = LedgerEntry.objects.filter(tenant=self.tenant).order_by('id')
+        self.assertEqual(
+            [(entry.amount, entry.balance_after) for entry in entries],
+            [
+                (Decimal('100.00'), Decimal('100.00')),
+                (Decimal('-30.50'), Decimal('69.50')),
+                (Decimal('-5.25'), Decimal('64.25')),
+            ],
+        )
+        self.assertEqual(tenant_balance(self.tenant.pk), Decimal('64.25'))
+        self.assertEqual(tenant_balance(self.other.pk), Decimal('40.00'))
+        self.assertEqual(TenantBalance.objects.get(tenant=self.tenant).entries_count, 3)
+        with self.assertRaises(ValueError):
+            post_entry(self.tenant.pk, LedgerEntry.EntryType.PAYMENT, Decimal('-1'))
+
+    def test_checkpoint_balance_matches_full_recomputation(self):
+        as_of = timezone.now()
+        self.assertEqual(create_checkpoints(as_of), 2)
+        self.assertEqual(create_checkpoints(as_of), 2)
+        self.assertEqual(LedgerCheckpoint.objects.count(), 2)
+        checkpoint = LedgerCheckpoint.objects.get(tenant=self.tenant)
+        self.assertEqual(checkpoint.balance, Decimal('64.25'))
+        self.assertEqual(checkpoint.last_entry_id, LedgerEntry.objects.filter(tenant=self.tenant).latest('id').pk)
+
+        post_entry(self.tenant.pk, LedgerEntry.EntryType.CREDIT, Decimal('4.25'))
+        full = check_ledger()
+        incremental = check_ledger(from_checkpoint=True)
+
+        self.assertTrue(full.ok)
+        self.assertTrue(incremental.ok)
+        self.assertEqual((full.entries, incremental.entries), (5, 1))
+        self.assertEqual(tenant_balance(self.tenant.pk), Decimal('60.00'))
+
+    def test_tampered_amount_is_detected_and_fixed(self):
+        entry = LedgerEntry.objects.filter(tenant=self.tenant).order_by('id')[1]
+        self.execute('UPDATE {table} SET amount = %s WHERE id = %s', ['-20.50', entry.pk])
+
+        result = check_ledger(fix=True)
+
+        self.assertFalse(result.ok)
+        self.assertEqual(
+            result.entry_mismatches[0], (self.tenant.pk, entry.pk, Decimal('79.50'), Decimal('69.50'))
+        )
+        self.assertEqual(result.balance_mismatches, [(self.tenant.pk, Decimal('74.25'), Decimal('64.25'))])
+        self.assertEqual(tenant_balance(self.tenant.pk), Decimal('74.25'))
+        self.assertEqual(tenant_balance(self.other.pk), Decimal('40.00'))
+        balance = TenantBalance.objects.get(tenant=self.tenant)
+        self.assertEqual(balance.last_entry_id, LedgerEntry.objects.filter(tenant=self.tenant).latest('id').pk)
+        self.assertEqual(balance.entries_count, 3)
+
+    def test_missing_rows_are_detected(self):
+        entries = list(LedgerEntry.objects.filter(tenant=self.tenant).order_by('id'))
+        # حذف قيد وسيط يكسر سلسلة الأرصدة، وحذف آخر قيد يظهر في الرصيد المخزن فقط
+        self.execute('DELETE FROM {table} WHERE id = %s', [entries[1].pk])
+        result = check_ledger(tenant_ids=[self.tenant.pk])
+        self.assertEqual([mismatch[1] for mismatch in result.entry_mismatches], [entries[2].pk])
+
+        self.execute('DELETE FROM {table} WHERE id = %s', [entries[2].pk])
+        result = check_ledger(tenant_ids=[self.tenant.pk])
+        self.assertEqual(result.entry_mismatches, [])
+        self.assertEqual(result.balance_mismatches, [(self.tenant.pk, Decimal('100.00'), Decimal('64.25'))])
+
+        check_ledger(tenant_ids=[self.tenant.pk], fix=True)
+        balance = TenantBalance.objects.get(tenant=self.tenant)
+        self.assertEqual(
+            (balance.balance, balance.last_entry_id, balance.entries_count), (Decimal('100.00'), entries[0].pk, 1)
+        )
+
+    def test_tampering_after_checkpoint_is_detected_from_checkpoint(self):
+        create_checkpoints(timezone.now())
+        entry = post_entry(self.tenant.pk, LedgerEntry.EntryType.CHARGE, Decimal('10.00'))
+        self.execute('UPDATE {table} SET balance_after = %s WHERE id = %s', ['0.00', entry.pk])
+
+        result = check_ledger(from_checkpoint=True)
 
-# Create your tests here.
+        self.assertEqual(result.entry_mismatches, [(self.tenant.pk, entry.pk, Decimal('74.25'), Decimal('0.00'))])
+        self.assertEqual(result.balance_mismatches, [])
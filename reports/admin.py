@@ -1,3 +1,17 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import DailyRevenue, MonthlyRevenue
+
+
+@admin.register(DailyRevenue)
+class DailyRevenueAdmin(admin.ModelAdmin):
+    list_display = ('building', 'unit_type', 'day', 'billed', 'collected', 'adjustments', 'entries_count')
+    list_filter = ('unit_type', 'day')
+    list_select_related = ('building',)
+
+
+@admin.register(MonthlyRevenue)
+class MonthlyRevenueAdmin(admin.ModelAdmin):
+    list_display = ('building', 'unit_type', 'month', 'billed', 'collected', 'adjustments', 'entries_count')
+    list_filter = ('unit_type', 'month')
+    list_select_related = ('building',)
@@ -0,0 +1,282 @@
+"""تصدير التقارير إلى CSV وXLSX كتدفق بذاكرة ثابتة
+
+تُقرأ الصفوف بـ iterator(chunk_size) وتُكتب إلى مخزن صغير يُفرَّغ إلى الاستجابة بعد
+كل دفعة، فلا يُحمَّل الاستعلام ولا الملف الناتج في الذاكرة مهما بلغ عدد الصفوف.
+ملف XLSX يُكتب مباشرة كأرشيف ZIP متدفق (سلاسل نصية مضمنة دون جدول سلاسل مشتركة)،
+وتُقسم الصفوف على أوراق متعددة عند تجاوز حد Excel للورقة الواحدة.
+"""
+import csv
+import itertools
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from payments.models import LedgerEntry
+from units.models import Unit
+
+# عدد الصفوف بين كل تفريغ للمخزن إلى الاستجابة
+FLUSH_ROWS = 1000
+# حد Excel لعدد صفوف الورقة الواحدة مع صف العناوين
+XLSX_MAX_ROWS = 1_048_575
+EXCEL_EPOCH = datetime(1899, 12, 30)
+# محارف التحكم غير المسموحة في XML
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+# بدايات نص يفسرها Excel صيغةً عند فتح ملف CSV
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Column:
+    """عمود تصدير: الحقل وعنوانه وعرضه في XLSX، وخيارات لعرض تسمية القيمة بدلاً منها"""
+
+    def __init__(self, field, label, width=16, choices=None):
+        self.field = field
+        self.label = label
+        self.width = width
+        self.choices = dict(choices) if choices else None
+
+
+LEDGER_COLUMNS = (
+    Column('posted_at', _('تاريخ الترحيل'), width=18),
+    Column('entry_type', _('نوع القيد'), choices=LedgerEntry.EntryType.choices, width=12),
+    Column('amount', _('المبلغ'), width=12),
+    Column('balance_after', _('الرصيد بعد القيد'), width=14),
+    Column('tenant_name', _('المستأجر'), width=28),
+    Column('contract_number', _('رقم العقد')),
+    Column('building_name', _('المبنى'), width=24),
+    Column('unit_number', _('الوحدة'), width=10),
+    Column('reference', _('المرجع'), width=20),
+    Column('description', _('الوصف'), width=36),
+)
+LEDGER_FIELDS = {
+    'tenant_name': F('tenant__user__company_name'),
+    'contract_number': F('contract__contract_number'),
+    'building_name': F('contract__unit__building__name'),
+    'unit_number': F('contract__unit__unit_number'),
+}
+
+REVENUE_COLUMNS = (
+    Column('period', _('الفترة'), width=12),
+    Column('building_name', _('المبنى'), width=24),
+    Column('unit_type', _('نوع الوحدة'), choices=Unit.UnitType.choices, width=12),
+    Column('billed', _('المطالبات'), width=14),
+    Column('collected', _('المحصّل'), width=14),
+    Column('adjustments', _('الخصومات والتسويات'), width=14),
+    Column('balance_change', _('التغير في المتأخرات'), width=14),
+    Column('collection_rate', _('نسبة التحصيل %'), width=12),
+)
+
+
+def ledger_rows(entries, chunk_size=2000):
+    """صفوف قيود الدفتر كصفوف بسيطة بترتيب LEDGER_COLUMNS دون إنشاء كائنات النماذج"""
+    fields = [column.field for column in LEDGER_COLUMNS]
+    return entries.annotate(**LEDGER_FIELDS).order_by('posted_at', 'pk').values_list(*fields).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def _display(column, value):
+    if value is not None and column.choices is not None:
+        return column.choices.get(value, value)
+    return value
+
+
+class _Buffer:
+    """مخزن كتابة يُفرَّغ دورياً إلى الاستجابة المتدفقة"""
+
+    def __init__(self, empty):
+        self.empty = empty
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = self.empty.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _csv_value(column, value):
+    value = _display(column, value)
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # النصوص المدخلة (الوصف والمرجع واسم المستأجر) تُكتب نصاً لا صيغة
+        return f"'{value}"
+    return '' if value is None else value
+
+
+def stream_csv(columns, rows):
+    """تدفق CSV بترميز UTF-8 مع BOM ليتعرف Excel على النص العربي"""
+    buffer = _Buffer('')
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow([str(column.label) for column in columns])
+    yield buffer.drain()
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_csv_value(column, value) for column, value in zip(columns, row, strict=True)])
+        if count % FLUSH_ROWS == 0:
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    # كل ملف XML غير محدد أدناه ورقة عمل، فلا حاجة لمعرفة عدد الأوراق مسبقاً
+    '<Default Extension="xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+# الأنماط: 0 افتراضي، 1 تاريخ، 2 تاريخ ووقت، 3 عنوان عريض
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Arial"/></font>'
+    '<font><b/><sz val="11"/><name val="Arial"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '</styleSheet>'
+)
+
+
+def _inline_string(text, style=''):
+    text = INVALID_XML_CHARS.sub('', str(text))
+    return f'<c t="inlineStr"{style}><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def _xlsx_cell(column, value):
+    value = _display(column, value)
+    if value is None or value == '':
+        return '<c/>'
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.make_naive(value)
+        serial = (value - EXCEL_EPOCH).total_seconds() / 86400
+        return f'<c s="2"><v>{serial:.6f}</v></c>'
+    if isinstance(value, date):
+        return f'<c s="1"><v>{(value - EXCEL_EPOCH.date()).days}</v></c>'
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    return _inline_string(value)
+
+
+def _sheet_header(columns):
+    widths = ''.join(
+        f'<col min="{index}" max="{index}" width="{column.width}" customWidth="1"/>'
+        for index, column in enumerate(columns, start=1)
+    )
+    header = ''.join(_inline_string(column.label, ' s="3"') for column in columns)
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        # ورقة من اليمين لليسار مع تثبيت صف العناوين
+        '<sheetViews><sheetView rightToLeft="1" workbookViewId="0">'
+        '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+        '</sheetView></sheetViews>'
+        f'<cols>{widths}</cols><sheetData><row>{header}</row>'
+    ).encode('utf-8')
+
+
+SHEET_FOOTER = b'</sheetData></worksheet>'
+
+
+def _workbook(sheet_name, sheets):
+    names = [sheet_name if sheets == 1 else f'{sheet_name} {index}' for index in range(1, sheets + 1)]
+    entries = ''.join(
+        f'<sheet name="{escape(name[:31])}" sheetId="{index}" r:id="rId{index}"/>'
+        for index, name in enumerate(names, start=1)
+    )
+    rels = ''.join(
+        f'<Relationship Id="rId{index}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{index}.xml"/>'
+        for index in range(1, sheets + 1)
+    )
+    workbook = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<bookViews><workbookView rightToLeft="1"/></bookViews>'
+        f'<sheets>{entries}</sheets></workbook>'
+    )
+    workbook_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'{rels}<Relationship Id="rId{sheets + 1}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/></Relationships>'
+    )
+    return workbook, workbook_rels
+
+
+def stream_xlsx(columns, rows, sheet_name='Report', max_rows=XLSX_MAX_ROWS):
+    """تدفق ملف XLSX يُكتب صفاً صفاً؛ الذاكرة المستخدمة لا تتعلق بعدد الصفوف"""
+    buffer = _Buffer(b'')
+    archive = zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+    archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+    archive.writestr('_rels/.rels', ROOT_RELS)
+    archive.writestr('xl/styles.xml', STYLES)
+    yield buffer.drain()
+
+    rows = iter(rows)
+    sheets = 0
+    pending = next(rows, None)
+    while pending is not None or not sheets:
+        sheets += 1
+        with archive.open(f'xl/worksheets/sheet{sheets}.xml', 'w') as sheet:
+            sheet.write(_sheet_header(columns))
+            lines = []
+            for row in itertools.islice(itertools.chain([pending] if pending is not None else [], rows), max_rows):
+                lines.append('<row>' + ''.join(_xlsx_cell(column, value) for column, value in zip(columns, row, strict=True)) + '</row>')
+                if len(lines) == FLUSH_ROWS:
+                    sheet.write(''.join(lines).encode('utf-8'))
+                    lines = []
+                    yield buffer.drain()
+            sheet.write(''.join(lines).encode('utf-8'))
+            sheet.write(SHEET_FOOTER)
+        yield buffer.drain()
+        # الصف التالي إن وُجد يبدأ ورقة جديدة
+        pending = next(rows, None)
+
+    workbook, workbook_rels = _workbook(sheet_name, sheets)
+    archive.writestr('xl/workbook.xml', workbook)
+    archive.writestr('xl/_rels/workbook.xml.rels', workbook_rels)
+    archive.close()
+    yield buffer.drain()
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('buildings', '0002_building_investors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_type', models.CharField(choices=[('APARTMENT', 'شقة'), ('OFFICE', 'مكتب'), ('SHOP', 'محل تجاري'), ('WAREHOUSE', 'مستودع')], max_length=20, verbose_name='نوع الوحدة')),
+                ('billed', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='المطالبات')),
+                ('collected', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='المحصّل')),
+                ('adjustments', models.DecimalField(decimal_places=2, default=0, help_text='صافي أثر الخصومات والتسويات على أرصدة المستأجرين (سالب للخصومات)', max_digits=14, verbose_name='الخصومات والتسويات')),
+                ('entries_count', models.PositiveIntegerField(default=0, verbose_name='عدد القيود')),
+                ('day', models.DateField(verbose_name='اليوم')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_rollups', to='buildings.building', verbose_name='المبنى')),
+            ],
+            options={
+                'verbose_name': 'إيراد يومي',
+                'verbose_name_plural': 'الإيرادات اليومية',
+                'ordering': ['-day', 'building'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_type', models.CharField(choices=[('APARTMENT', 'شقة'), ('OFFICE', 'مكتب'), ('SHOP', 'محل تجاري'), ('WAREHOUSE', 'مستودع')], max_length=20, verbose_name='نوع الوحدة')),
+                ('billed', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='المطالبات')),
+                ('collected', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='المحصّل')),
+                ('adjustments', models.DecimalField(decimal_places=2, default=0, help_text='صافي أثر الخصومات والتسويات على أرصدة المستأجرين (سالب للخصومات)', max_digits=14, verbose_name='الخصومات والتسويات')),
+                ('entries_count', models.PositiveIntegerField(default=0, verbose_name='عدد القيود')),
+                ('month', models.DateField(help_text='أول يوم في الشهر', verbose_name='الشهر')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_rollups', to='buildings.building', verbose_name='المبنى')),
+            ],
+            options={
+                'verbose_name': 'إيراد شهري',
+                'verbose_name_plural': 'الإيرادات الشهرية',
+                'ordering': ['-month', 'building'],
+                'indexes': [models.Index(fields=['month', 'building'], name='reports_mon_month_285f00_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyrevenue',
+            constraint=models.UniqueConstraint(fields=('building', 'unit_type', 'month'), name='unique_monthly_revenue'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyrevenue',
+            index=models.Index(fields=['day', 'building'], name='reports_dai_day_2ab8b2_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrevenue',
+            constraint=models.UniqueConstraint(fields=('building', 'unit_type', 'day'), name='unique_daily_revenue'),
+        ),
+    ]
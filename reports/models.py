@@ -1,3 +1,95 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from units.models import Unit
+
+
+class RevenueRollup(models.Model):
+    """مجاميع قيود دفتر المستأجرين لكل مبنى ونوع وحدة خلال فترة
+
+    الرصيد المستحق (المتأخرات) في نهاية أي فترة هو المجموع التراكمي لـ
+    billed - collected + adjustments حتى تلك الفترة.
+    """
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.CASCADE,
+        related_name='%(class)s_rollups',
+        verbose_name=_('المبنى')
+    )
+    unit_type = models.CharField(
+        _('نوع الوحدة'),
+        max_length=20,
+        choices=Unit.UnitType.choices
+    )
+    billed = models.DecimalField(
+        _('المطالبات'),
+        max_digits=14,
+        decimal_places=2,
+        default=0
+    )
+    collected = models.DecimalField(
+        _('المحصّل'),
+        max_digits=14,
+        decimal_places=2,
+        default=0
+    )
+    adjustments = models.DecimalField(
+        _('الخصومات والتسويات'),
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_('صافي أثر الخصومات والتسويات على أرصدة المستأجرين (سالب للخصومات)')
+    )
+    entries_count = models.PositiveIntegerField(
+        _('عدد القيود'),
+        default=0
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def balance_change(self):
+        """أثر الفترة على المتأخرات"""
+        return self.billed - self.collected + self.adjustments
+
+
+class DailyRevenue(RevenueRollup):
+    day = models.DateField(
+        _('اليوم')
+    )
+
+    class Meta:
+        verbose_name = _('إيراد يومي')
+        verbose_name_plural = _('الإيرادات اليومية')
+        ordering = ['-day', 'building']
+        constraints = [
+            models.UniqueConstraint(fields=['building', 'unit_type', 'day'], name='unique_daily_revenue'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'building']),
+        ]
+
+    def __str__(self):
+        return f"{self.building_id} - {self.unit_type} ({self.day})"
+
+
+class MonthlyRevenue(RevenueRollup):
+    month = models.DateField(
+        _('الشهر'),
+        help_text=_('أول يوم في الشهر')
+    )
+
+    class Meta:
+        verbose_name = _('إيراد شهري')
+        verbose_name_plural = _('الإيرادات الشهرية')
+        ordering = ['-month', 'building']
+        constraints = [
+            models.UniqueConstraint(fields=['building', 'unit_type', 'month'], name='unique_monthly_revenue'),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'building']),
+        ]
+
+    def __str__(self):
+        return f"{self.building_id} - {self.unit_type} ({self.month:%Y-%m})"
@@ -0,0 +1,137 @@
+"""قراءة تقارير الإيرادات والمتأخرات والإشغال من جداول التجميع دون المرور بالدفتر
+
+يُجاب كل تقرير من أخشن جدول قادر عليه: الأشهر الكاملة في الفترة تُقرأ من المجاميع
+الشهرية، والأيام الطرفية من شهر غير مكتمل فقط تُقرأ من المجاميع اليومية.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from buildings.occupancy import occupancy_summary
+from core.dates import add_months, iter_months, month_start
+
+from .models import DailyRevenue, MonthlyRevenue
+from .rollups import ROLLUP_FIELDS
+
+DAY = 'day'
+MONTH = 'month'
+TOTAL = 'total'
+ONE_DAY = timedelta(days=1)
+
+
+def month_end(value):
+    return add_months(month_start(value), 1) - ONE_DAY
+
+
+def split_period(start, end):
+    """تقسيم [start, end] إلى فترات أيام طرفية ونطاق الأشهر الكاملة (أو None)"""
+    first_month = start if start.day == 1 else add_months(month_start(start), 1)
+    last_month = month_start(end) if end == month_end(end) else add_months(month_start(end), -1)
+    if first_month > last_month:
+        return [(start, end)], None
+    day_ranges = []
+    if start < first_month:
+        day_ranges.append((start, first_month - ONE_DAY))
+    if month_end(last_month) < end:
+        day_ranges.append((add_months(last_month, 1), end))
+    return day_ranges, (first_month, last_month)
+
+
+def _grouped(queryset, period_field, by_building, by_unit_type):
+    fields = [period_field]
+    if by_building:
+        fields.append('building_id')
+    if by_unit_type:
+        fields.append('unit_type')
+    return queryset.values(*fields).annotate(
+        **{f'total_{name}': Sum(name) for name in ROLLUP_FIELDS}
+    ).order_by()
+
+
+def _period_key(value, granularity):
+    if granularity == DAY:
+        return value
+    if granularity == MONTH:
+        return month_start(value)
+    return None
+
+
+def revenue_report(start, end, buildings=None, by_building=False, by_unit_type=False, granularity=MONTH):
+    """المطالبات والمحصّل والتسويات للفترة [start, end] مجمعة حسب granularity (day/month/total)"""
+    if granularity == DAY:
+        sources = [(DailyRevenue, 'day', (start, end))]
+    else:
+        day_ranges, months = split_period(start, end)
+        sources = [(DailyRevenue, 'day', day_range) for day_range in day_ranges]
+        if months:
+            sources.append((MonthlyRevenue, 'month', months))
+
+    totals = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+    for model, period_field, period_range in sources:
+        queryset = model.objects.filter(**{f'{period_field}__range': period_range})
+        if buildings is not None:
+            queryset = queryset.filter(building__in=buildings)
+        for row in _grouped(queryset, period_field, by_building, by_unit_type):
+            key = (
+                _period_key(row[period_field], granularity),
+                row.get('building_id'),
+                row.get('unit_type'),
+            )
+            for name in ROLLUP_FIELDS:
+                totals[key][name] += row[f'total_{name}'] or 0
+
+    return [
+        {
+            'period': period,
+            'building_id': building_id,
+            'unit_type': unit_type,
+            **values,
+            'balance_change': values['billed'] - values['collected'] + values['adjustments'],
+            'collection_rate': round(values['collected'] * 100 / values['billed'], 2) if values['billed'] else 0,
+        }
+        for (period, building_id, unit_type), values in sorted(
+            totals.items(), key=lambda item: (item[0][0] or start, item[0][1] or 0, item[0][2] or '')
+        )
+    ]
+
+
+def arrears_report(start, end, buildings=None, by_building=False, by_unit_type=False):
+    """المتأخرات (الرصيد المستحق التراكمي) في نهاية كل شهر من start حتى end
+
+    الرصيد الافتتاحي يُجمع من المجاميع الشهرية لكل ما قبل الفترة، ثم يُضاف أثر كل شهر.
+    """
+    months = list(iter_months(start, end))
+    rows = MonthlyRevenue.objects.filter(month__lte=months[-1])
+    if buildings is not None:
+        rows = rows.filter(building__in=buildings)
+
+    opening = defaultdict(Decimal)
+    changes = defaultdict(Decimal)
+    for row in _grouped(rows, 'month', by_building, by_unit_type):
+        group = (row.get('building_id'), row.get('unit_type'))
+        change = row['total_billed'] - row['total_collected'] + row['total_adjustments']
+        if row['month'] < months[0]:
+            opening[group] += change
+        else:
+            changes[(row['month'], *group)] += change
+
+    report = []
+    for group in sorted(opening.keys() | {key[1:] for key in changes}, key=lambda g: (g[0] or 0, g[1] or '')):
+        balance = opening[group]
+        for month in months:
+            balance += changes.get((month, *group), 0)
+            report.append({
+                'month': month,
+                'building_id': group[0],
+                'unit_type': group[1],
+                'arrears': balance,
+            })
+    report.sort(key=lambda row: row['month'])
+    return report
+
+
+def occupancy_report(start, end, buildings=None, by_building=False, by_unit_type=False):
+    """الإشغال الشهري من لقطات الإشغال المحدَّثة تدريجياً مع تغيّر الوحدات والعقود"""
+    return occupancy_summary(start, end, buildings=buildings, by_building=by_building, by_unit_type=by_unit_type)
@@ -0,0 +1,150 @@
+"""جداول التجميع اليومية والشهرية لإيرادات ومتأخرات المباني
+
+تُحدَّث المجاميع تدريجياً داخل معاملة ترحيل القيود (إشارة entries_posted)، فتُطبق
+فروق كل دفعة قيود على صف واحد لكل (مبنى، نوع وحدة، يوم) و(مبنى، نوع وحدة، شهر)
+بدلاً من إعادة التجميع من الدفتر. القيود غير المرتبطة بعقد لا تُنسب لمبنى فلا تدخل
+في المجاميع. إعادة البناء الكاملة تقرأ الدفتر على دفعات دون تحميله في الذاكرة.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from contracts.models import Contract
+from core.dates import add_months, month_start
+from payments.models import LedgerEntry
+
+from .models import DailyRevenue, MonthlyRevenue
+
+ROLLUP_FIELDS = ('billed', 'collected', 'adjustments', 'entries_count')
+
+
+def _empty():
+    return {'billed': Decimal(0), 'collected': Decimal(0), 'adjustments': Decimal(0), 'entries_count': 0}
+
+
+def _accumulate(totals, entry_type, amount):
+    if entry_type == LedgerEntry.EntryType.CHARGE:
+        totals['billed'] += amount
+    elif entry_type == LedgerEntry.EntryType.PAYMENT:
+        totals['collected'] -= amount
+    else:
+        totals['adjustments'] += amount
+    totals['entries_count'] += 1
+
+
+def _monthly_totals(daily):
+    monthly = defaultdict(_empty)
+    for (building_id, unit_type, day), deltas in daily.items():
+        totals = monthly[(building_id, unit_type, month_start(day))]
+        for name in ROLLUP_FIELDS:
+            totals[name] += deltas[name]
+    return monthly
+
+
+def _apply(model, period_field, key, deltas):
+    building_id, unit_type, period = key
+    rows = model.objects.filter(building_id=building_id, unit_type=unit_type, **{period_field: period})
+    increments = {name: F(name) + value for name, value in deltas.items()}
+    if rows.update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(building_id=building_id, unit_type=unit_type, **{period_field: period}, **deltas)
+    except IntegrityError:
+        # أنشأته عملية متزامنة
+        rows.update(**increments)
+
+
+def apply_entries(entries):
+    """تطبيق فروق مجموعة قيود مرحّلة على المجاميع اليومية والشهرية"""
+    contract_ids = {entry.contract_id for entry in entries if entry.contract_id}
+    if not contract_ids:
+        return
+    placement = {
+        pk: (building_id, unit_type)
+        for pk, building_id, unit_type in Contract.objects.filter(pk__in=contract_ids).values_list(
+            'pk', 'unit__building_id', 'unit__unit_type'
+        )
+    }
+
+    daily = defaultdict(_empty)
+    for entry in entries:
+        if entry.contract_id not in placement:
+            continue
+        day = timezone.localdate(entry.posted_at)
+        _accumulate(daily[(*placement[entry.contract_id], day)], entry.entry_type, entry.amount)
+
+    monthly = _monthly_totals(daily)
+
+    with transaction.atomic():
+        # ترتيب ثابت للمفاتيح يمنع الجمود بين عمليات الترحيل المتزامنة
+        for key in sorted(daily):
+            _apply(DailyRevenue, 'day', key, daily[key])
+        for key in sorted(monthly):
+            _apply(MonthlyRevenue, 'month', key, monthly[key])
+
+
+def _period_rows(model, period_field, start, end, building_ids):
+    rows = model.objects.all()
+    if start:
+        rows = rows.filter(**{f'{period_field}__gte': start})
+    if end:
+        rows = rows.filter(**{f'{period_field}__lte': end})
+    if building_ids:
+        rows = rows.filter(building_id__in=building_ids)
+    return rows
+
+
+def rebuild_rollups(start=None, end=None, building_ids=None, chunk_size=5000, on_progress=None):
+    """إعادة حساب المجاميع من الدفتر لأشهر الفترة [start, end] كاملة (كل السجل عند عدم تحديدها)
+
+    تُقرأ القيود على دفعات وتُجمع في الذاكرة بمفاتيح المجاميع فقط، ثم تُستبدل صفوف
+    الفترة بإدراج جماعي في معاملة واحدة. يعيد (عدد القيود، عدد الصفوف اليومية).
+    """
+    tz = timezone.get_current_timezone()
+    entries = LedgerEntry.objects.filter(contract__isnull=False)
+    if building_ids:
+        entries = entries.filter(contract__unit__building_id__in=building_ids)
+    if start:
+        start = month_start(start)
+        entries = entries.filter(posted_at__gte=timezone.make_aware(datetime.combine(start, time.min), tz))
+    if end:
+        end = add_months(month_start(end), 1) - timedelta(days=1)
+        entries = entries.filter(
+            posted_at__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+        )
+    rows = entries.values_list(
+        'contract__unit__building_id', 'contract__unit__unit_type', 'posted_at', 'entry_type', 'amount'
+    ).iterator(chunk_size=chunk_size)
+
+    daily = defaultdict(_empty)
+    processed = 0
+    for building_id, unit_type, posted_at, entry_type, amount in rows:
+        _accumulate(daily[(building_id, unit_type, timezone.localtime(posted_at, tz).date())], entry_type, amount)
+        processed += 1
+        if on_progress and processed % chunk_size == 0:
+            on_progress(processed)
+    monthly = _monthly_totals(daily)
+
+    with transaction.atomic():
+        _period_rows(DailyRevenue, 'day', start, end, building_ids).delete()
+        _period_rows(MonthlyRevenue, 'month', start, end, building_ids).delete()
+        DailyRevenue.objects.bulk_create(
+            [
+                DailyRevenue(building_id=building_id, unit_type=unit_type, day=day, **totals)
+                for (building_id, unit_type, day), totals in daily.items()
+            ],
+            batch_size=chunk_size,
+        )
+        MonthlyRevenue.objects.bulk_create(
+            [
+                MonthlyRevenue(building_id=building_id, unit_type=unit_type, month=month, **totals)
+                for (building_id, unit_type, month), totals in monthly.items()
+            ],
+            batch_size=chunk_size,
+        )
+    return processed, len(daily)
@@ -0,0 +1,10 @@
+from django.dispatch import receiver
+
+from payments.signals import entries_posted
+
+from .rollups import apply_entries
+
+
+@receiver(entries_posted)
+def update_rollups(sender, entries, **kwargs):
+    apply_entries(entries)
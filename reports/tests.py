@@ -1,3 +1,267 @@
+import csv
+import io
+import zipfile
+from collections import defaultdict
+from datetime import date, datetime, time
+from decimal import Decimal
+from unittest import skipUnless
+from xml.etree import ElementTree
+
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import make_building, make_contract, make_tenant, make_unit, make_user
+from payments.ledger import EntryRequest, post_entries
+from payments.models import LedgerEntry
+from units.models import Unit
+
+from .exports import Column, stream_csv, stream_xlsx
+from .models import DailyRevenue, MonthlyRevenue
+from .queries import DAY, MONTH, TOTAL, revenue_report
+from .rollups import ROLLUP_FIELDS, rebuild_rollups
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+CHARGE, PAYMENT, CREDIT, ADJUSTMENT = (
+    LedgerEntry.EntryType.CHARGE,
+    LedgerEntry.EntryType.PAYMENT,
+    LedgerEntry.EntryType.CREDIT,
+    LedgerEntry.EntryType.ADJUSTMENT,
+)
+
+
+def naive_totals(period=lambda day: day, start=None, end=None):
+    """المجاميع محسوبة مباشرة من كل قيود الدفتر صفاً صفاً للمقارنة"""
+    totals = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+    entries = LedgerEntry.objects.filter(contract__isnull=False).select_related('contract__unit')
+    for entry in entries:
+        day = timezone.localdate(entry.posted_at)
+        if (start and day < start) or (end and day > end):
+            continue
+        row = totals[(period(day), entry.contract.unit.building_id, entry.contract.unit.unit_type)]
+        if entry.entry_type == CHARGE:
+            row['billed'] += entry.amount
+        elif entry.entry_type == PAYMENT:
+            row['collected'] -= entry.amount
+        else:
+            row['adjustments'] += entry.amount
+        row['entries_count'] += 1
+    return dict(totals)
+
+
+def stored_totals(model, period_field):
+    return {
+        (row[period_field], row['building_id'], row['unit_type']): {name: row[name] for name in ROLLUP_FIELDS}
+        for row in model.objects.values(period_field, 'building_id', 'unit_type', *ROLLUP_FIELDS)
+    }
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        tenant = make_tenant()
+        tower, mall = make_building(), make_building()
+        self.contracts = [
+            make_contract(tenant=tenant, unit=make_unit(tower, unit_type=Unit.UnitType.APARTMENT)),
+            make_contract(tenant=tenant, unit=make_unit(tower, unit_type=Unit.UnitType.OFFICE)),
+            make_contract(tenant=tenant, unit=make_unit(mall, unit_type=Unit.UnitType.SHOP)),
+        ]
+        self.posted = [
+            (0, CHARGE, '100.00', date(2024, 1, 10)),
+            (0, PAYMENT, '60.00', date(2024, 1, 31)),
+            (1, CHARGE, '250.50', date(2024, 1, 31)),
+            (2, CHARGE, '400.00', date(2024, 2, 1)),
+            (2, CREDIT, '25.00', date(2024, 2, 14)),
+            (1, PAYMENT, '250.50', date(2024, 2, 29)),
+            (0, ADJUSTMENT, '-10.00', date(2024, 3, 1)),
+            (2, PAYMENT, '375.00', date(2024, 3, 20)),
+        ]
+        entries = post_entries(
+            EntryRequest(tenant.pk, entry_type, Decimal(amount), contract_id=self.contracts[index].pk)
+            for index, entry_type, amount, _day in self.posted
+        )
+        # قيد دون عقد لا يُنسب لمبنى
+        post_entries([EntryRequest(tenant.pk, CHARGE, Decimal('999.00'))])
+        self.entries = entries
+
+    def backdate(self):
+        """نقل القيود إلى أيامها (القيود غير قابلة للتعديل عبر ORM)"""
+        tz = timezone.get_current_timezone()
+        with connection.cursor() as cursor:
+            for entry, (_index, _type, _amount, day) in zip(self.entries, self.posted, strict=True):
+                cursor.execute(
+                    f'UPDATE {LedgerEntry._meta.db_table} SET posted_at = %s WHERE id = %s',
+                    [timezone.make_aware(datetime.combine(day, time(12)), tz), entry.pk],
+                )
+
+    def test_incremental_rollups_match_ledger(self):
+        self.assertEqual(stored_totals(DailyRevenue, 'day'), naive_totals())
+        self.assertEqual(
+            stored_totals(MonthlyRevenue, 'month'), naive_totals(lambda day: day.replace(day=1))
+        )
+
+    def test_rebuild_matches_ledger(self):
+        self.backdate()
+        self.assertEqual(rebuild_rollups(), (len(self.posted), len(naive_totals())))
+        self.assertEqual(stored_totals(DailyRevenue, 'day'), naive_totals())
+        self.assertEqual(
+            stored_totals(MonthlyRevenue, 'month'), naive_totals(lambda day: day.replace(day=1))
+        )
+
+    def test_partial_rebuild_keeps_other_months(self):
+        self.backdate()
+        rebuild_rollups()
+        january = MonthlyRevenue.objects.filter(month=date(2024, 1, 1)).count()
+        DailyRevenue.objects.filter(day__month=2).update(billed=0)
+        rebuild_rollups(start=date(2024, 2, 10), end=date(2024, 2, 11))
+        self.assertEqual(stored_totals(DailyRevenue, 'day'), naive_totals())
+        self.assertEqual(MonthlyRevenue.objects.filter(month=date(2024, 1, 1)).count(), january)
+
+    def test_report_matches_naive_aggregate(self):
+        self.backdate()
+        rebuild_rollups()
+        # شهر كامل في الوسط وأيام طرفية من شهرين غير مكتملين
+        start, end = date(2024, 1, 15), date(2024, 3, 10)
+        cases = [
+            (DAY, lambda day: day),
+            (MONTH, lambda day: day.replace(day=1)),
+            (TOTAL, lambda day: None),
+        ]
+        for granularity, period in cases:
+            for by_building, by_unit_type in ((False, False), (True, False), (True, True)):
+                with self.subTest(granularity=granularity, by_building=by_building, by_unit_type=by_unit_type):
+                    expected = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+                    for (key_period, building_id, unit_type), values in naive_totals(period, start, end).items():
+                        key = (
+                            key_period,
+                            building_id if by_building else None,
+                            unit_type if by_unit_type else None,
+                        )
+                        for name in ROLLUP_FIELDS:
+                            expected[key][name] += values[name]
+
+                    report = revenue_report(
+                        start, end, by_building=by_building, by_unit_type=by_unit_type, granularity=granularity
+                    )
+
+                    self.assertEqual(
+                        {
+                            (row['period'], row['building_id'], row['unit_type']): {
+                                name: row[name] for name in ROLLUP_FIELDS
+                            }
+                            for row in report
+                        },
+                        dict(expected),
+                    )
+
+
+def read_xlsx(data):
+    """قراءة مصنف XLSX بمكتبات Python القياسية: {اسم الورقة: [[قيم الخلايا]]}"""
+    namespace = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    sheets = {}
+    for index, sheet in enumerate(workbook.iterfind('m:sheets/m:sheet', namespace), start=1):
+        root = ElementTree.fromstring(archive.read(f'xl/worksheets/sheet{index}.xml'))
+        sheets[sheet.get('name')] = [
+            [
+                cell.findtext('m:is/m:t', namespaces=namespace)
+                if cell.get('t') == 'inlineStr' else cell.findtext('m:v', namespaces=namespace)
+                for cell in row.iterfind('m:c', namespace)
+            ]
+            for row in root.iterfind('m:sheetData/m:row', namespace)
+        ]
+    return sheets
+
+
+class ExportTests(TestCase):
+    columns = (
+        Column('day', 'اليوم'),
+        Column('posted_at', 'الوقت'),
+        Column('entry_type', 'النوع', choices=LedgerEntry.EntryType.choices),
+        Column('amount', 'المبلغ'),
+        Column('note', 'ملاحظة'),
+    )
+
+    def rows(self, count=1):
+        posted_at = timezone.make_aware(datetime(2024, 1, 15, 9, 30))
+        return [
+            (date(2024, 1, 15), posted_at, CHARGE, Decimal(f'{number}.50'), f'<بند & {number}>\x01')
+            for number in range(1, count + 1)
+        ] + [(None, None, 'UNKNOWN', 0, '')]
+
+    def test_csv_values(self):
+        content = ''.join(stream_csv(self.columns, self.rows()))
+        self.assertTrue(content.startswith('\ufeff'))
+        self.assertEqual(list(csv.reader(io.StringIO(content[1:]))), [
+            ['اليوم', 'الوقت', 'النوع', 'المبلغ', 'ملاحظة'],
+            ['2024-01-15', '2024-01-15 09:30', 'مطالبة', '1.50', '<بند & 1>\x01'],
+            ['', '', 'UNKNOWN', '0', ''],
+        ])
+
+    def test_csv_escapes_formulas_in_text(self):
+        rows = [
+            (None, None, PAYMENT, Decimal('-5.00'), text)
+            for text in ('=HYPERLINK("http://x")', '+1', '-2+3', '@SUM(A1)', '\tأ', 'عادي - 1')
+        ]
+        content = ''.join(stream_csv(self.columns, rows))
+        self.assertEqual([row[3:] for row in csv.reader(io.StringIO(content[1:]))][1:], [
+            ['-5.00', '\'=HYPERLINK("http://x")'],
+            ['-5.00', "'+1"],
+            ['-5.00', "'-2+3"],
+            ['-5.00', "'@SUM(A1)"],
+            ['-5.00', "'\tأ"],
+            ['-5.00', 'عادي - 1'],
+        ])
+
+    def test_xlsx_splits_sheets_and_encodes_cells(self):
+        data = b''.join(stream_xlsx(self.columns, self.rows(4), sheet_name='Ledger', max_rows=2))
+
+        sheets = read_xlsx(data)
+        self.assertEqual(list(sheets), ['Ledger 1', 'Ledger 2', 'Ledger 3'])
+        self.assertEqual([len(rows) for rows in sheets.values()], [3, 3, 2])
+        header, first = sheets['Ledger 1'][:2]
+        self.assertEqual(header, ['اليوم', 'الوقت', 'النوع', 'المبلغ', 'ملاحظة'])
+        # الأرقام التسلسلية لـ Excel تبدأ من 1899-12-30، والوقت بالتوقيت المحلي
+        self.assertEqual(first, ['45306', '45306.395833', 'مطالبة', '1.50', '<بند & 1>'])
+        self.assertEqual(sheets['Ledger 3'][-1], [None, None, 'UNKNOWN', '0', None])
+
+    def test_empty_xlsx_has_header_sheet(self):
+        sheets = read_xlsx(b''.join(stream_xlsx(self.columns, [], sheet_name='Revenue')))
+        self.assertEqual(sheets, {'Revenue': [['اليوم', 'الوقت', 'النوع', 'المبلغ', 'ملاحظة']]})
+
+    @skipUnless(openpyxl, 'openpyxl غير مثبتة')
+    def test_xlsx_opens_in_openpyxl(self):
+        data = b''.join(stream_xlsx(self.columns, self.rows(3), sheet_name='Ledger', max_rows=2))
+        workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True)
+        self.assertEqual(workbook.sheetnames, ['Ledger 1', 'Ledger 2'])
+        rows = [row for sheet in workbook for row in sheet.iter_rows(min_row=2, values_only=True)]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0][:4], (datetime(2024, 1, 15), datetime(2024, 1, 15, 9, 30), 'مطالبة', 1.5))
+        self.assertEqual(rows[-1][2:4], ('UNKNOWN', 0))
+
+    def test_ledger_export_view_streams_a_valid_workbook(self):
+        tenant = make_tenant()
+        contract = make_contract(tenant=tenant)
+        post_entries([
+            EntryRequest(tenant.pk, CHARGE, Decimal('100.00'), contract_id=contract.pk, reference='INV-1'),
+            EntryRequest(tenant.pk, PAYMENT, Decimal('40.00'), contract_id=contract.pk),
+        ])
+        self.client.force_login(make_user(is_staff=True))
+        today = timezone.localdate().isoformat()
+
+        response = self.client.get(
+            reverse('reports:export_ledger', args=['xlsx']), {'start': today, 'end': today}
+        )
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        rows = read_xlsx(b''.join(response.streaming_content))['Ledger']
+        self.assertEqual(len(rows), 3)
+        self.assertEqual([row[2] for row in rows[1:]], ['100.00', '-40.00'])
+        self.assertEqual(rows[1][4], tenant.user.company_name)
+        self.assertEqual(rows[1][8], 'INV-1')
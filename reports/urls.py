@@ -0,0 +1,10 @@
+from django.urls import re_path
+
+from . import views
+
+app_name = 'reports'
+
+urlpatterns = [
+    re_path(r'^export/ledger\.(?P<export_format>csv|xlsx)$', views.export_ledger, name='export_ledger'),
+    re_path(r'^export/revenue\.(?P<export_format>csv|xlsx)$', views.export_revenue, name='export_revenue'),
+]
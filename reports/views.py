@@ -1,3 +1,118 @@
-from django.shortcuts import render
+from datetime import date, datetime, time, timedelta
 
-# Create your views here.
+from django.contrib.auth.decorators import login_required
+from django.http import (
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    StreamingHttpResponse,
+)
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from buildings.models import Building
+from config.routers import read_from_replica, stream_from_replica
+from core.dates import add_months
+from payments.models import LedgerEntry
+
+from .exports import (
+    LEDGER_COLUMNS,
+    REVENUE_COLUMNS,
+    ledger_rows,
+    stream_csv,
+    stream_xlsx,
+)
+from .queries import DAY, MONTH, TOTAL, revenue_report
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def _owned_buildings(user):
+    """مباني المستخدم: None للموظفين (كل المباني)، أو مباني المالك، أو False لغيرهما"""
+    if user.is_staff:
+        return None
+    if user.user_type == user.UserType.OWNER:
+        return Building.objects.filter(owner__user=user)
+    return False
+
+
+def _period(request):
+    end = date.fromisoformat(request.GET['end']) if 'end' in request.GET else timezone.localdate()
+    start = date.fromisoformat(request.GET['start']) if 'start' in request.GET else add_months(end, -12)
+    if start > end:
+        raise ValueError(start)
+    return start, end
+
+
+def _export(columns, rows, export_format, filename, sheet_name):
+    stream = stream_csv(columns, rows) if export_format == 'csv' else stream_xlsx(columns, rows, sheet_name)
+    response = StreamingHttpResponse(stream_from_replica(stream), content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    # يمنع nginx من تجميع الاستجابة كاملة قبل إرسالها
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+@require_GET
+def export_ledger(request, export_format):
+    """تصدير قيود دفتر المستأجرين لمباني المالك خلال فترة كتدفق CSV أو XLSX"""
+    buildings = _owned_buildings(request.user)
+    if buildings is False:
+        return HttpResponseForbidden()
+    try:
+        start, end = _period(request)
+        building_id = int(request.GET['building']) if request.GET.get('building') else None
+    except ValueError:
+        return HttpResponseBadRequest()
+
+    tz = timezone.get_current_timezone()
+    entries = LedgerEntry.objects.filter(
+        posted_at__gte=timezone.make_aware(datetime.combine(start, time.min), tz),
+        posted_at__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+    if buildings is not None:
+        entries = entries.filter(contract__unit__building__in=buildings)
+    if building_id is not None:
+        entries = entries.filter(contract__unit__building_id=building_id)
+    return _export(LEDGER_COLUMNS, ledger_rows(entries), export_format, f'ledger-{start}-{end}', 'Ledger')
+
+
+@login_required
+@require_GET
+def export_revenue(request, export_format):
+    """تصدير تقرير الإيرادات من جداول التجميع كـ CSV أو XLSX"""
+    buildings = _owned_buildings(request.user)
+    if buildings is False:
+        return HttpResponseForbidden()
+    granularity = request.GET.get('granularity', MONTH)
+    if granularity not in (DAY, MONTH, TOTAL):
+        return HttpResponseBadRequest()
+    try:
+        start, end = _period(request)
+    except ValueError:
+        return HttpResponseBadRequest()
+
+    group_by = request.GET.getlist('by')
+    with read_from_replica():
+        report = revenue_report(
+            start,
+            end,
+            buildings=buildings,
+            by_building='building' in group_by,
+            by_unit_type='unit_type' in group_by,
+            granularity=granularity,
+        )
+        names = dict(Building.objects.filter(
+            pk__in={row['building_id'] for row in report if row['building_id']}
+        ).values_list('pk', 'name'))
+    rows = (
+        [
+            row['period'], names.get(row['building_id'], ''), row['unit_type'], row['billed'],
+            row['collected'], row['adjustments'], row['balance_change'], row['collection_rate'],
+        ]
+        for row in report
+    )
+    return _export(REVENUE_COLUMNS, rows, export_format, f'revenue-{start}-{end}', 'Revenue')
@@ -1,3 +1,19 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import LockerLease, StorageLocker
+
+
+@admin.register(StorageLocker)
+class StorageLockerAdmin(admin.ModelAdmin):
+    list_display = ('code', 'building', 'size', 'monthly_rate', 'is_active')
+    list_filter = ('size', 'is_active', 'building')
+    search_fields = ('code',)
+    show_full_result_count = False
+
+
+@admin.register(LockerLease)
+class LockerLeaseAdmin(admin.ModelAdmin):
+    list_display = ('locker', 'tenant', 'start_date', 'end_date', 'status')
+    list_filter = ('status',)
+    list_select_related = ('locker__building', 'tenant__user')
+    raw_id_fields = ('locker', 'tenant')
@@ -0,0 +1,232 @@
+"""خرائط بتات إشغال الخزائن اليومية لكل مبنى
+
+كل يوم فيه إشغال يُخزن كسلسلة بايتات مضغوطة (بت لكل خزانة)، فتوفر الخزائن خلال فترة
+هو: خريطة الخزائن النشطة AND NOT (OR لخرائط أيام الفترة)؛ استعلام واحد يقرأ صفاً لكل
+يوم بدلاً من فحص التأجيرات صفاً صفاً. الأيام التي لا صف لها لا إشغال فيها.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Max
+
+from core.batching import chunked
+
+from .models import LockerLease, LockerMask, LockerOccupancyDay, StorageLocker
+
+ONE_DAY = timedelta(days=1)
+
+
+def to_int(data):
+    return int.from_bytes(bytes(data or b''), 'little')
+
+
+def to_bytes(value):
+    return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+
+def iter_bits(value):
+    """مواضع البتات المضبوطة في العدد"""
+    while value:
+        lowest = value & -value
+        yield lowest.bit_length() - 1
+        value ^= lowest
+
+
+def _days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += ONE_DAY
+
+
+def next_bit_index(building_id):
+    last = StorageLocker.objects.filter(building_id=building_id).aggregate(last=Max('bit_index'))['last']
+    return 0 if last is None else last + 1
+
+
+def add_lockers(building, lockers, batch_size=2000):
+    """إضافة خزائن لمبنى بإدراج جماعي مع مواضع بتات متتالية ثم تحديث خرائط المبنى"""
+    with transaction.atomic():
+        position = next_bit_index(building.pk)
+        for offset, locker in enumerate(lockers):
+            locker.building = building
+            locker.bit_index = position + offset
+        created = StorageLocker.objects.bulk_create(lockers, batch_size=batch_size)
+        rebuild_masks(building.pk)
+    return created
+
+
+def rebuild_masks(building_id):
+    """إعادة حساب خريطة الخزائن النشطة وخرائط الأحجام للمبنى"""
+    masks = defaultdict(int)
+    lockers = StorageLocker.objects.filter(building_id=building_id, is_active=True).values_list(
+        'bit_index', 'size'
+    )
+    for bit_index, size in lockers.iterator(chunk_size=5000):
+        bit = 1 << bit_index
+        masks[LockerMask.ACTIVE] |= bit
+        masks[size] |= bit
+    with transaction.atomic():
+        LockerMask.objects.filter(building_id=building_id).delete()
+        LockerMask.objects.bulk_create([
+            LockerMask(building_id=building_id, name=name, bitmap=to_bytes(value))
+            for name, value in masks.items()
+        ])
+
+
+def update_locker_masks(building_id, bit_index, previous=None, current=None):
+    """تعديل بت خزانة واحدة في خرائط المبنى بدلاً من إعادة بنائها
+
+    previous وcurrent زوجا (نشطة، الحجم) قبل التعديل وبعده، وNone للخزانة الجديدة أو المحذوفة.
+    """
+    bit = 1 << bit_index
+    names = {LockerMask.ACTIVE} | {size for _active, size in filter(None, (previous, current))}
+    wanted = {LockerMask.ACTIVE, current[1]} if current and current[0] else set()
+    with transaction.atomic():
+        LockerMask.objects.bulk_create(
+            [LockerMask(building_id=building_id, name=name) for name in names],
+            ignore_conflicts=True,
+        )
+        masks = list(LockerMask.objects.select_for_update().filter(
+            building_id=building_id, name__in=names
+        ).order_by('name'))
+        for mask in masks:
+            value = to_int(mask.bitmap)
+            mask.bitmap = to_bytes(value | bit if mask.name in wanted else value & ~bit)
+        LockerMask.objects.bulk_update(masks, ['bitmap'])
+
+
+def _mask(building_id, size=None):
+    names = [LockerMask.ACTIVE] + ([size] if size else [])
+    masks = dict(LockerMask.objects.filter(building_id=building_id, name__in=names).values_list('name', 'bitmap'))
+    value = to_int(masks.get(LockerMask.ACTIVE))
+    if size:
+        value &= to_int(masks.get(size))
+    return value
+
+
+def occupied_bits(building_id, start, end):
+    """اتحاد خرائط إشغال أيام الفترة [start, end]"""
+    bitmaps = LockerOccupancyDay.objects.filter(
+        building_id=building_id, day__range=(start, end)
+    ).values_list('bitmap', flat=True)
+    return reduce(or_, map(to_int, bitmaps), 0)
+
+
+def available_bits(building_id, start, end, size=None):
+    return _mask(building_id, size) & ~occupied_bits(building_id, start, end)
+
+
+def available_count(building_id, start, end, size=None):
+    """عدد الخزائن الخالية طوال الفترة"""
+    return available_bits(building_id, start, end, size).bit_count()
+
+
+def available_lockers(building_id, start, end, size=None, chunk_size=500):
+    """الخزائن الخالية طوال الفترة مرتبة حسب موضعها
+
+    تُقرأ على دفعات من مواضع البتات حتى لا تتجاوز معاملات IN حد المحرك (SQLite خصوصاً).
+    """
+    lockers = []
+    # iter_bits تعيد المواضع تصاعدياً، فتبقى الدفعات المتتالية مرتبة
+    for bit_indexes in chunked(iter_bits(available_bits(building_id, start, end, size)), chunk_size):
+        lockers.extend(StorageLocker.objects.filter(
+            building_id=building_id, bit_index__in=bit_indexes
+        ).order_by('bit_index'))
+    return lockers
+
+
+def _update_days(building_id, start, end, change):
+    """تطبيق change(day, value) على خرائط أيام الفترة مع قفل صفوفها"""
+    days = list(_days(start, end))
+    LockerOccupancyDay.objects.bulk_create(
+        [LockerOccupancyDay(building_id=building_id, day=day) for day in days],
+        ignore_conflicts=True,
+    )
+    rows = list(LockerOccupancyDay.objects.select_for_update().filter(
+        building_id=building_id, day__range=(start, end)
+    ).order_by('day'))
+    for row in rows:
+        row.bitmap = to_bytes(change(row.day, to_int(row.bitmap)))
+    LockerOccupancyDay.objects.bulk_update(rows, ['bitmap'], batch_size=500)
+
+
+def mark_lease(building_id, bit_index, start, end):
+    """تعليم الخزانة مشغولة في أيام الفترة"""
+    bit = 1 << bit_index
+    with transaction.atomic():
+        _update_days(building_id, start, end, lambda day, value: value | bit)
+
+
+def unmark_lease(building_id, locker_id, bit_index, start, end, exclude_lease=None):
+    """إزالة إشغال الخزانة من أيام الفترة عدا الأيام التي تغطيها تأجيرات سارية أخرى لها"""
+    bit = 1 << bit_index
+    others = LockerLease.objects.filter(
+        locker_id=locker_id,
+        status=LockerLease.Status.ACTIVE,
+        start_date__lte=end,
+        end_date__gte=start,
+    )
+    if exclude_lease is not None:
+        others = others.exclude(pk=exclude_lease)
+    still_occupied = {
+        day
+        for other_start, other_end in others.values_list('start_date', 'end_date')
+        for day in _days(max(other_start, start), min(other_end, end))
+    }
+    with transaction.atomic():
+        _update_days(
+            building_id, start, end,
+            lambda day, value: value if day in still_occupied else value & ~bit,
+        )
+
+
+def rebuild_bitmaps(building_ids=None, batch_size=1000, on_building=None):
+    """إعادة بناء خرائط الإشغال اليومية من التأجيرات السارية؛ يعيد عدد الأيام المكتوبة
+
+    تُحوَّل كل تأجيرة إلى حدثي بداية ونهاية ثم تُمسح الأيام مرة واحدة بترتيبها، فالكلفة
+    تتناسب مع عدد التأجيرات والأيام لا مع حاصل ضربهما.
+    """
+    if building_ids is None:
+        building_ids = StorageLocker.objects.values_list('building_id', flat=True).distinct()
+
+    written = 0
+    for building_id in list(building_ids):
+        rebuild_masks(building_id)
+        events = defaultdict(list)
+        leases = LockerLease.objects.filter(
+            locker__building_id=building_id, status=LockerLease.Status.ACTIVE
+        ).values_list('locker__bit_index', 'start_date', 'end_date')
+        for bit_index, start, end in leases.iterator(chunk_size=5000):
+            events[start].append((bit_index, 1))
+            events[end + ONE_DAY].append((bit_index, -1))
+
+        rows = []
+        current, counts = 0, defaultdict(int)
+        event_days = sorted(events)
+        for index, day in enumerate(event_days):
+            for bit_index, delta in events[day]:
+                counts[bit_index] += delta
+                if counts[bit_index]:
+                    current |= 1 << bit_index
+                else:
+                    current &= ~(1 << bit_index)
+            if not current:
+                continue
+            bitmap = to_bytes(current)
+            next_day = event_days[index + 1] if index + 1 < len(event_days) else day + ONE_DAY
+            rows.extend(
+                LockerOccupancyDay(building_id=building_id, day=covered, bitmap=bitmap)
+                for covered in _days(day, next_day - ONE_DAY)
+            )
+
+        with transaction.atomic():
+            LockerOccupancyDay.objects.filter(building_id=building_id).delete()
+            LockerOccupancyDay.objects.bulk_create(rows, batch_size=batch_size)
+        written += len(rows)
+        if on_building:
+            on_building(building_id, len(rows))
+    return written
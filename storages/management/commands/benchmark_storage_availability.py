@@ -0,0 +1,90 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from apps.users.models import Tenant
+from buildings.models import Building
+from storages.bitmaps import add_lockers, available_count, rebuild_bitmaps
+from storages.models import LockerLease, StorageLocker
+
+
+def naive_available_count(building_id, start, end, size=None):
+    """الاستعلام المباشر: الخزائن النشطة التي لا تتداخل معها أي تأجيرة سارية"""
+    lockers = StorageLocker.objects.filter(building_id=building_id, is_active=True)
+    if size:
+        lockers = lockers.filter(size=size)
+    return lockers.exclude(Exists(LockerLease.objects.filter(
+        locker_id=OuterRef('pk'),
+        status=LockerLease.Status.ACTIVE,
+        start_date__lte=end,
+        end_date__gte=start,
+    ))).count()
+
+
+class Command(BaseCommand):
+    help = 'مقارنة سرعة استعلام توفر الخزائن بخرائط البتات مقابل الاستعلام المباشر؛ تُلغى البيانات بعد القياس'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lockers', type=int, default=20000)
+        parser.add_argument('--leases-per-locker', type=int, default=3)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        building = Building.objects.first()
+        tenant_ids = list(Tenant.objects.values_list('pk', flat=True)[:1000])
+        if building is None or not tenant_ids:
+            raise CommandError('يتطلب القياس مبنى ومستأجرين موجودين')
+        rng = random.Random(options['seed'])
+        origin = date(2026, 1, 1)
+        sizes = StorageLocker.Size.values
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            lockers = add_lockers(building, [
+                StorageLocker(code=f'BM-{index}', size=rng.choice(sizes))
+                for index in range(options['lockers'])
+            ])
+            leases = []
+            for locker in lockers:
+                day = origin + timedelta(days=rng.randrange(60))
+                for _index in range(options['leases_per_locker']):
+                    length = rng.randrange(7, 180)
+                    leases.append(LockerLease(
+                        locker=locker,
+                        tenant_id=rng.choice(tenant_ids),
+                        start_date=day,
+                        end_date=day + timedelta(days=length),
+                    ))
+                    day += timedelta(days=length + rng.randrange(1, 60))
+            LockerLease.objects.bulk_create(leases, batch_size=5000)
+            rebuild_bitmaps([building.pk])
+            self.stdout.write(
+                f'الإعداد: {len(lockers)} خزانة، {len(leases)} تأجيرة خلال {time.perf_counter() - started:.1f} ث'
+            )
+
+            ranges = []
+            for _index in range(options['queries']):
+                start = origin + timedelta(days=rng.randrange(365))
+                ranges.append((start, start + timedelta(days=rng.randrange(1, 90)), rng.choice([None, *sizes])))
+
+            timings = {}
+            for label, function in (('bitmap', available_count), ('naive', naive_available_count)):
+                started = time.perf_counter()
+                results = [function(building.pk, start, end, size) for start, end, size in ranges]
+                timings[label] = (time.perf_counter() - started, results)
+            transaction.set_rollback(True)
+
+        if timings['bitmap'][1] != timings['naive'][1]:
+            raise CommandError('نتائج خرائط البتات لا تطابق الاستعلام المباشر')
+        for label, (elapsed, _results) in timings.items():
+            self.stdout.write(f'{label}: {elapsed * 1000 / len(ranges):.2f} مللي ث/استعلام')
+        self.stdout.write(self.style.SUCCESS(
+            f'التسريع: {timings["naive"][0] / timings["bitmap"][0]:.1f}x '
+            f'(متوسط الخزائن الخالية {statistics.mean(timings["bitmap"][1]):.0f})'
+        ))
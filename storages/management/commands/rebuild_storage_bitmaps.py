@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from storages.bitmaps import rebuild_bitmaps
+
+
+class Command(BaseCommand):
+    help = 'إعادة بناء خرائط إشغال الخزائن اليومية وخرائط الأحجام من التأجيرات السارية'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--building', type=int, action='append', dest='buildings', help='معرّف مبنى (يمكن تكراره)')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def report(building_id, days):
+            self.stdout.write(f'المبنى {building_id}: {days} يوم')
+
+        written = rebuild_bitmaps(options['buildings'], on_building=report)
+        self.stdout.write(self.style.SUCCESS(
+            f'تمت كتابة {written} خريطة يومية خلال {time.monotonic() - started:.1f} ث'
+        ))
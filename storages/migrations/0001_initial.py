@@ -0,0 +1,97 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('buildings', '0002_building_investors'),
+        ('users', '0003_user_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorageLocker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, verbose_name='رقم الخزانة')),
+                ('size', models.CharField(choices=[('SMALL', 'صغيرة'), ('MEDIUM', 'متوسطة'), ('LARGE', 'كبيرة')], default='SMALL', max_length=10, verbose_name='الحجم')),
+                ('monthly_rate', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='الإيجار الشهري')),
+                ('bit_index', models.PositiveIntegerField(editable=False, help_text='موضع الخزانة في خرائط الإشغال اليومية للمبنى', verbose_name='موضع البت')),
+                ('is_active', models.BooleanField(default=True, verbose_name='متاحة للتأجير')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='storage_lockers', to='buildings.building', verbose_name='المبنى')),
+            ],
+            options={
+                'verbose_name': 'خزانة تخزين',
+                'verbose_name_plural': 'خزائن التخزين',
+                'ordering': ['building', 'bit_index'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LockerOccupancyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='اليوم')),
+                ('bitmap', models.BinaryField(default=bytes, verbose_name='خريطة الإشغال')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='locker_occupancy_days', to='buildings.building', verbose_name='المبنى')),
+            ],
+            options={
+                'verbose_name': 'إشغال الخزائن اليومي',
+                'verbose_name_plural': 'إشغال الخزائن اليومي',
+            },
+        ),
+        migrations.CreateModel(
+            name='LockerMask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20, verbose_name='اسم الخريطة')),
+                ('bitmap', models.BinaryField(default=bytes, verbose_name='الخريطة')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='locker_masks', to='buildings.building', verbose_name='المبنى')),
+            ],
+            options={
+                'verbose_name': 'خريطة خزائن',
+                'verbose_name_plural': 'خرائط الخزائن',
+            },
+        ),
+        migrations.CreateModel(
+            name='LockerLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField(verbose_name='تاريخ البداية')),
+                ('end_date', models.DateField(verbose_name='تاريخ النهاية')),
+                ('status', models.CharField(choices=[('ACTIVE', 'ساري'), ('CANCELLED', 'ملغى')], default='ACTIVE', max_length=20, verbose_name='الحالة')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('locker', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='leases', to='storages.storagelocker', verbose_name='الخزانة')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='locker_leases', to='users.tenant', verbose_name='المستأجر')),
+            ],
+            options={
+                'verbose_name': 'تأجير خزانة',
+                'verbose_name_plural': 'تأجير الخزائن',
+                'ordering': ['locker', 'start_date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='storagelocker',
+            constraint=models.UniqueConstraint(fields=('building', 'code'), name='unique_storage_locker_code'),
+        ),
+        migrations.AddConstraint(
+            model_name='storagelocker',
+            constraint=models.UniqueConstraint(fields=('building', 'bit_index'), name='unique_storage_locker_bit'),
+        ),
+        migrations.AddConstraint(
+            model_name='lockeroccupancyday',
+            constraint=models.UniqueConstraint(fields=('building', 'day'), name='unique_locker_occupancy_day'),
+        ),
+        migrations.AddConstraint(
+            model_name='lockermask',
+            constraint=models.UniqueConstraint(fields=('building', 'name'), name='unique_locker_mask'),
+        ),
+        migrations.AddIndex(
+            model_name='lockerlease',
+            index=models.Index(condition=models.Q(('status', 'ACTIVE')), fields=['locker', 'end_date', 'start_date'], name='storage_active_lease_idx'),
+        ),
+    ]
@@ -1,3 +1,207 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class StorageLocker(models.Model):
+    """خزانة تخزين في مبنى مستودعات؛ لكل خزانة موضع بت ثابت في خرائط إشغال المبنى"""
+
+    class Size(models.TextChoices):
+        SMALL = 'SMALL', _('صغيرة')
+        MEDIUM = 'MEDIUM', _('متوسطة')
+        LARGE = 'LARGE', _('كبيرة')
+
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.CASCADE,
+        related_name='storage_lockers',
+        verbose_name=_('المبنى')
+    )
+    code = models.CharField(
+        _('رقم الخزانة'),
+        max_length=20
+    )
+    size = models.CharField(
+        _('الحجم'),
+        max_length=10,
+        choices=Size.choices,
+        default=Size.SMALL
+    )
+    monthly_rate = models.DecimalField(
+        _('الإيجار الشهري'),
+        max_digits=10,
+        decimal_places=2,
+        default=0
+    )
+    bit_index = models.PositiveIntegerField(
+        _('موضع البت'),
+        editable=False,
+        help_text=_('موضع الخزانة في خرائط الإشغال اليومية للمبنى')
+    )
+    is_active = models.BooleanField(
+        _('متاحة للتأجير'),
+        default=True
+    )
+
+    class Meta:
+        verbose_name = _('خزانة تخزين')
+        verbose_name_plural = _('خزائن التخزين')
+        ordering = ['building', 'bit_index']
+        constraints = [
+            models.UniqueConstraint(fields=['building', 'code'], name='unique_storage_locker_code'),
+            models.UniqueConstraint(fields=['building', 'bit_index'], name='unique_storage_locker_bit'),
+        ]
+
+    def __str__(self):
+        return f"{self.building} - {self.code}"
+
+    def save(self, *args, **kwargs):
+        if self.bit_index is None:
+            last = StorageLocker.objects.filter(building_id=self.building_id).aggregate(
+                last=models.Max('bit_index')
+            )['last']
+            self.bit_index = 0 if last is None else last + 1
+        super().save(*args, **kwargs)
+
+
+class LockerUnavailable(ValueError):
+    """الخزانة مؤجرة بتأجيرة سارية أخرى خلال الفترة"""
+
+
+class LockerLease(models.Model):
+    """تأجير خزانة لمستأجر خلال فترة (شاملة للطرفين)
+
+    لا يجوز تداخل تأجيرتين ساريتين على الخزانة نفسها؛ يُتحقق من ذلك عند الحفظ بعد قفل
+    صف الخزانة، فلا يمر حفظان متزامنان لتأجيرتين متداخلتين.
+    """
+
+    class Status(models.TextChoices):
+        ACTIVE = 'ACTIVE', _('ساري')
+        CANCELLED = 'CANCELLED', _('ملغى')
+
+    locker = models.ForeignKey(
+        StorageLocker,
+        on_delete=models.PROTECT,
+        related_name='leases',
+        verbose_name=_('الخزانة')
+    )
+    tenant = models.ForeignKey(
+        'users.Tenant',
+        on_delete=models.CASCADE,
+        related_name='locker_leases',
+        verbose_name=_('المستأجر')
+    )
+    start_date = models.DateField(
+        _('تاريخ البداية')
+    )
+    end_date = models.DateField(
+        _('تاريخ النهاية')
+    )
+    status = models.CharField(
+        _('الحالة'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.ACTIVE
+    )
+    created_at = models.DateTimeField(
+        _('تاريخ الإنشاء'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('تأجير خزانة')
+        verbose_name_plural = _('تأجير الخزائن')
+        ordering = ['locker', 'start_date']
+        indexes = [
+            models.Index(
+                fields=['locker', 'end_date', 'start_date'],
+                condition=models.Q(status='ACTIVE'),
+                name='storage_active_lease_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.locker} ({self.start_date} - {self.end_date})"
+
+    def clean(self):
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValidationError({'end_date': _('يجب أن يكون تاريخ النهاية بعد تاريخ البداية')})
+        if self.locker_id and self.start_date and self.end_date and self.overlapping_leases().exists():
+            raise ValidationError(_('الخزانة مؤجرة بتأجيرة أخرى خلال هذه الفترة'))
+
+    def overlapping_leases(self):
+        """التأجيرات السارية الأخرى على الخزانة نفسها المتداخلة مع فترة هذه التأجيرة"""
+        if self.status != self.Status.ACTIVE:
+            return LockerLease.objects.none()
+        return LockerLease.objects.filter(
+            locker_id=self.locker_id,
+            status=self.Status.ACTIVE,
+            start_date__lte=self.end_date,
+            end_date__gte=self.start_date,
+        ).exclude(pk=self.pk)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.status == self.Status.ACTIVE:
+                # قفل صف الخزانة يسلسل حفظ تأجيراتها المتزامنة
+                StorageLocker.objects.select_for_update().filter(pk=self.locker_id).values_list('pk', flat=True).get()
+                if self.overlapping_leases().exists():
+                    raise LockerUnavailable(_('الخزانة مؤجرة بتأجيرة أخرى خلال هذه الفترة'))
+            super().save(*args, **kwargs)
+
+
+class LockerOccupancyDay(models.Model):
+    """خريطة بتات إشغال خزائن المبنى في يوم: البت i يخص الخزانة ذات bit_index = i"""
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.CASCADE,
+        related_name='locker_occupancy_days',
+        verbose_name=_('المبنى')
+    )
+    day = models.DateField(
+        _('اليوم')
+    )
+    bitmap = models.BinaryField(
+        _('خريطة الإشغال'),
+        default=bytes
+    )
+
+    class Meta:
+        verbose_name = _('إشغال الخزائن اليومي')
+        verbose_name_plural = _('إشغال الخزائن اليومي')
+        constraints = [
+            models.UniqueConstraint(fields=['building', 'day'], name='unique_locker_occupancy_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.building_id} @ {self.day}"
+
+
+class LockerMask(models.Model):
+    """خرائط ثابتة لكل مبنى: الخزائن النشطة وخزائن كل حجم"""
+    ACTIVE = 'ACTIVE'
+
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.CASCADE,
+        related_name='locker_masks',
+        verbose_name=_('المبنى')
+    )
+    name = models.CharField(
+        _('اسم الخريطة'),
+        max_length=20
+    )
+    bitmap = models.BinaryField(
+        _('الخريطة'),
+        default=bytes
+    )
+
+    class Meta:
+        verbose_name = _('خريطة خزائن')
+        verbose_name_plural = _('خرائط الخزائن')
+        constraints = [
+            models.UniqueConstraint(fields=['building', 'name'], name='unique_locker_mask'),
+        ]
+
+    def __str__(self):
+        return f"{self.building_id}: {self.name}"
@@ -0,0 +1,79 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .bitmaps import mark_lease, rebuild_masks, unmark_lease, update_locker_masks
+from .models import LockerLease, StorageLocker
+
+LOCKER_FIELDS = ('building_id', 'is_active', 'size')
+LEASE_FIELDS = ('locker_id', 'start_date', 'end_date', 'status')
+
+
+def _locker_position(locker_id):
+    return StorageLocker.objects.filter(pk=locker_id).values_list('building_id', 'bit_index').get()
+
+
+@receiver(pre_save, sender=StorageLocker)
+def capture_previous_locker(sender, instance, raw=False, **kwargs):
+    instance._previous_locker = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_locker = StorageLocker.objects.filter(pk=instance.pk).values_list(*LOCKER_FIELDS).first()
+
+
+@receiver(post_save, sender=StorageLocker)
+def refresh_masks_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_locker', None)
+    current = (instance.building_id, instance.is_active, instance.size)
+    if previous == current:
+        return
+    if previous and previous[0] != instance.building_id:
+        # نقل الخزانة إلى مبنى آخر يغيّر خرائط المبنيين
+        rebuild_masks(previous[0])
+        rebuild_masks(instance.building_id)
+        return
+    update_locker_masks(instance.building_id, instance.bit_index, previous and previous[1:], current[1:])
+
+
+@receiver(post_delete, sender=StorageLocker)
+def refresh_masks_on_delete(sender, instance, origin=None, **kwargs):
+    # عند حذف المبنى كاملاً تُحذف خرائطه معه
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model._meta.label == 'buildings.Building':
+        return
+    update_locker_masks(instance.building_id, instance.bit_index, (instance.is_active, instance.size))
+
+
+@receiver(pre_save, sender=LockerLease)
+def capture_previous_lease(sender, instance, raw=False, **kwargs):
+    instance._previous_lease = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_lease = LockerLease.objects.filter(pk=instance.pk).values_list(*LEASE_FIELDS).first()
+
+
+@receiver(post_save, sender=LockerLease)
+def update_bitmaps_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_lease', None)
+    if previous and previous[3] == LockerLease.Status.ACTIVE:
+        locker_id, start, end, _status = previous
+        building_id, bit_index = _locker_position(locker_id)
+        unmark_lease(building_id, locker_id, bit_index, start, end, exclude_lease=instance.pk)
+    if instance.status == LockerLease.Status.ACTIVE:
+        building_id, bit_index = _locker_position(instance.locker_id)
+        mark_lease(building_id, bit_index, instance.start_date, instance.end_date)
+
+
+@receiver(post_delete, sender=LockerLease)
+def update_bitmaps_on_delete(sender, instance, **kwargs):
+    if instance.status != LockerLease.Status.ACTIVE:
+        return
+    building_id, bit_index = _locker_position(instance.locker_id)
+    unmark_lease(
+        building_id, instance.locker_id, bit_index, instance.start_date, instance.end_date,
+        exclude_lease=instance.pk,
+    )
@@ -1,3 +1,113 @@
+from datetime import date, timedelta
+
+from django.core.exceptions import ValidationError
 from django.test import TestCase
 
-# Create your tests here.
+from core.testing import capture_queries, make_building, make_tenant
+
+from .bitmaps import (
+    available_count,
+    available_lockers,
+    rebuild_bitmaps,
+    to_int,
+)
+from .management.commands.benchmark_storage_availability import naive_available_count
+from .models import (
+    LockerLease,
+    LockerMask,
+    LockerOccupancyDay,
+    LockerUnavailable,
+    StorageLocker,
+)
+
+START = date(2024, 1, 1)
+
+
+class BitmapTests(TestCase):
+    def setUp(self):
+        self.building = make_building()
+        self.tenant = make_tenant()
+        sizes = [StorageLocker.Size.SMALL, StorageLocker.Size.MEDIUM, StorageLocker.Size.LARGE]
+        self.lockers = [
+            StorageLocker.objects.create(building=self.building, code=f'L{index}', size=sizes[index % 3])
+            for index in range(8)
+        ]
+
+    def lease(self, locker, start, days, **fields):
+        return LockerLease.objects.create(
+            locker=locker, tenant=self.tenant, start_date=start, end_date=start + timedelta(days=days), **fields
+        )
+
+    def snapshot(self):
+        """الخرائط المخزنة دون الصفوف الفارغة (التحديث التدريجي يبقيها وإعادة البناء لا تكتبها)"""
+        masks = LockerMask.objects.filter(building=self.building).values_list('name', 'bitmap')
+        days = LockerOccupancyDay.objects.filter(building=self.building).values_list('day', 'bitmap')
+        return (
+            {name: to_int(bitmap) for name, bitmap in masks if to_int(bitmap)},
+            {day: to_int(bitmap) for day, bitmap in days if to_int(bitmap)},
+        )
+
+    def test_incremental_updates_match_full_rebuild(self):
+        first, second, third = self.lockers[:3]
+        self.lease(first, START, 10)
+        self.lease(first, START + timedelta(days=20), 5)
+        moved = self.lease(second, START + timedelta(days=3), 7)
+        cancelled = self.lease(third, START, 30)
+        deleted = self.lease(self.lockers[3], START + timedelta(days=1), 2)
+
+        moved.start_date, moved.end_date = START + timedelta(days=12), START + timedelta(days=15)
+        moved.save()
+        cancelled.status = LockerLease.Status.CANCELLED
+        cancelled.save()
+        deleted.delete()
+        self.lockers[4].is_active = False
+        self.lockers[4].save()
+        self.lockers[5].size = StorageLocker.Size.SMALL
+        self.lockers[5].save()
+        self.lockers[6].delete()
+        StorageLocker.objects.create(building=self.building, code='L8', size=StorageLocker.Size.LARGE)
+
+        incremental = self.snapshot()
+        rebuild_bitmaps([self.building.pk])
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_saving_unrelated_fields_leaves_masks_alone(self):
+        locker = self.lockers[0]
+        locker.monthly_rate = 25
+        _result, queries = capture_queries(locker.save)
+        self.assertFalse([query for query in queries if LockerMask._meta.db_table in query])
+
+    def test_availability_matches_naive_query(self):
+        self.lease(self.lockers[0], START, 10)
+        self.lease(self.lockers[2], START + timedelta(days=5), 10)
+        self.lockers[7].is_active = False
+        self.lockers[7].save()
+
+        for start, end, size in (
+            (START, START + timedelta(days=3), None),
+            (START + timedelta(days=4), START + timedelta(days=20), None),
+            (START, START + timedelta(days=30), StorageLocker.Size.LARGE),
+            (START + timedelta(days=40), START + timedelta(days=41), StorageLocker.Size.SMALL),
+        ):
+            with self.subTest(start=start, end=end, size=size):
+                expected = naive_available_count(self.building.pk, start, end, size)
+                self.assertEqual(available_count(self.building.pk, start, end, size), expected)
+                lockers = available_lockers(self.building.pk, start, end, size, chunk_size=2)
+                self.assertEqual(len(lockers), expected)
+                self.assertEqual(lockers, sorted(lockers, key=lambda locker: locker.bit_index))
+
+    def test_overlapping_active_leases_are_rejected(self):
+        locker = self.lockers[0]
+        lease = self.lease(locker, START, 10)
+
+        with self.assertRaises(LockerUnavailable):
+            self.lease(locker, START + timedelta(days=10), 5)
+        with self.assertRaises(ValidationError):
+            LockerLease(locker=locker, tenant=self.tenant, start_date=START, end_date=START).full_clean()
+
+        # التأجيرة التالية مباشرة، والتأجيرة الملغاة، وإعادة حفظ التأجيرة نفسها مسموحة
+        self.lease(locker, START + timedelta(days=11), 5)
+        self.lease(locker, START, 3, status=LockerLease.Status.CANCELLED)
+        lease.end_date = START + timedelta(days=9)
+        lease.save()
+        self.assertEqual(available_count(self.building.pk, START, START + timedelta(days=16)), 7)
@@ -1,3 +1,11 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Unit
+
+
+@admin.register(Unit)
+class UnitAdmin(admin.ModelAdmin):
+    list_display = ('unit_number', 'building', 'unit_type', 'status', 'status_changed_at')
+    list_filter = ('unit_type', 'status')
+    list_select_related = ('building',)
+    search_fields = ('unit_number', 'building__name')
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('buildings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Unit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_number', models.CharField(help_text='رقم الوحدة داخل المبنى', max_length=20, verbose_name='رقم الوحدة')),
+                ('unit_type', models.CharField(choices=[('APARTMENT', 'شقة'), ('OFFICE', 'مكتب'), ('SHOP', 'محل تجاري'), ('WAREHOUSE', 'مستودع')], default='APARTMENT', max_length=20, verbose_name='نوع الوحدة')),
+                ('floor', models.SmallIntegerField(default=0, verbose_name='الطابق')),
+                ('area', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, verbose_name='المساحة (م²)')),
+                ('status', models.CharField(choices=[('VACANT', 'شاغرة'), ('OCCUPIED', 'مؤجرة'), ('RESERVED', 'محجوزة'), ('MAINTENANCE', 'تحت الصيانة')], default='VACANT', max_length=20, verbose_name='حالة الإيجار')),
+                ('status_changed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='تاريخ تغيير الحالة')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='units', to='buildings.building', verbose_name='المبنى')),
+            ],
+            options={
+                'verbose_name': 'وحدة',
+                'verbose_name_plural': 'الوحدات',
+                'ordering': ['building', 'unit_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UnitStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('VACANT', 'شاغرة'), ('OCCUPIED', 'مؤجرة'), ('RESERVED', 'محجوزة'), ('MAINTENANCE', 'تحت الصيانة')], max_length=20, verbose_name='الحالة')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='تاريخ التغيير')),
+                ('unit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='units.unit', verbose_name='الوحدة')),
+            ],
+            options={
+                'verbose_name': 'تغيير حالة وحدة',
+                'verbose_name_plural': 'تغييرات حالة الوحدات',
+                'ordering': ['unit', 'changed_at'],
+                'indexes': [models.Index(fields=['unit', 'changed_at'], name='units_units_unit_id_fa8264_idx'), models.Index(fields=['changed_at'], name='units_units_changed_62854b_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['building', 'unit_type', 'status'], name='units_unit_buildin_8cdc89_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='unit',
+            constraint=models.UniqueConstraint(fields=('building', 'unit_number'), name='unique_unit_number_per_building'),
+        ),
+    ]
@@ -1,3 +1,133 @@
 from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+# الحقول التي يؤثر تغيّرها على لقطات الإشغال
+OCCUPANCY_FIELDS = ('building_id', 'unit_type', 'status')
+
+
+class Unit(models.Model):
+    """نموذج الوحدة الإيجارية داخل المبنى"""
+
+    class UnitType(models.TextChoices):
+        APARTMENT = 'APARTMENT', _('شقة')
+        OFFICE = 'OFFICE', _('مكتب')
+        SHOP = 'SHOP', _('محل تجاري')
+        WAREHOUSE = 'WAREHOUSE', _('مستودع')
+
+    class Status(models.TextChoices):
+        VACANT = 'VACANT', _('شاغرة')
+        OCCUPIED = 'OCCUPIED', _('مؤجرة')
+        RESERVED = 'RESERVED', _('محجوزة')
+        MAINTENANCE = 'MAINTENANCE', _('تحت الصيانة')
+
+    building = models.ForeignKey(
+        'buildings.Building',
+        on_delete=models.CASCADE,
+        related_name='units',
+        verbose_name=_('المبنى')
+    )
+    unit_number = models.CharField(
+        _('رقم الوحدة'),
+        max_length=20,
+        help_text=_('رقم الوحدة داخل المبنى')
+    )
+    unit_type = models.CharField(
+        _('نوع الوحدة'),
+        max_length=20,
+        choices=UnitType.choices,
+        default=UnitType.APARTMENT
+    )
+    floor = models.SmallIntegerField(
+        _('الطابق'),
+        default=0
+    )
+    area = models.DecimalField(
+        _('المساحة (م²)'),
+        max_digits=8,
+        decimal_places=2,
+        blank=True,
+        null=True
+    )
+    status = models.CharField(
+        _('حالة الإيجار'),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.VACANT
+    )
+    status_changed_at = models.DateTimeField(
+        _('تاريخ تغيير الحالة'),
+        default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = _('وحدة')
+        verbose_name_plural = _('الوحدات')
+        ordering = ['building', 'unit_number']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['building', 'unit_number'],
+                name='unique_unit_number_per_building',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['building', 'unit_type', 'status']),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.remember_occupancy_state()
+
+    def __str__(self):
+        return f"{self.building} - {self.unit_number}"
+
+    def save(self, *args, **kwargs):
+        previous_status = self._occupancy_state[2]
+        if not self._state.adding and previous_status is not None and previous_status != self.status:
+            self.status_changed_at = timezone.now()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'status_changed_at'}
+        super().save(*args, **kwargs)
+
+    @property
+    def is_occupied(self):
+        return self.status == self.Status.OCCUPIED
+
+    def remember_occupancy_state(self):
+        """حفظ الحالة الحالية لمقارنتها بعد الحفظ وحساب فرق الإشغال
+
+        تُقرأ القيم من __dict__ مباشرة حتى لا تُحمَّل الحقول المؤجلة (only/defer) باستعلام لكل صف.
+        """
+        self._occupancy_state = tuple(self.__dict__.get(name) for name in OCCUPANCY_FIELDS)
+
+
+class UnitStatusChange(models.Model):
+    """سجل تاريخي لتغيّرات حالة الوحدة يُستخدم لإعادة بناء لقطات الإشغال"""
+    unit = models.ForeignKey(
+        Unit,
+        on_delete=models.CASCADE,
+        related_name='status_changes',
+        verbose_name=_('الوحدة')
+    )
+    status = models.CharField(
+        _('الحالة'),
+        max_length=20,
+        choices=Unit.Status.choices
+    )
+    changed_at = models.DateTimeField(
+        _('تاريخ التغيير'),
+        default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = _('تغيير حالة وحدة')
+        verbose_name_plural = _('تغييرات حالة الوحدات')
+        ordering = ['unit', 'changed_at']
+        indexes = [
+            models.Index(fields=['unit', 'changed_at']),
+            models.Index(fields=['changed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.unit} → {self.get_status_display()}"
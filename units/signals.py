@@ -0,0 +1,35 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from buildings.occupancy import apply_occupancy_delta, record_unit_change
+
+from .models import OCCUPANCY_FIELDS, Unit
+
+
+@receiver(pre_save, sender=Unit)
+def capture_previous_state(sender, instance, **kwargs):
+    """استكمال الحالة السابقة من قاعدة البيانات إذا كانت حقولها مؤجلة عند التحميل"""
+    if instance._state.adding:
+        return
+    if None in instance._occupancy_state:
+        instance._occupancy_state = Unit.objects.filter(pk=instance.pk).values_list(
+            *OCCUPANCY_FIELDS
+        ).get()
+
+
+@receiver(post_save, sender=Unit)
+def update_occupancy_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    record_unit_change(instance, created, instance._occupancy_state)
+    instance.remember_occupancy_state()
+
+
+@receiver(post_delete, sender=Unit)
+def update_occupancy_on_delete(sender, instance, origin=None, **kwargs):
+    # عند حذف المبنى كاملاً تُحذف لقطاته معه فلا داعي لتحديثها
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model._meta.label == 'buildings.Building':
+        return
+    apply_occupancy_delta(instance.building_id, instance.unit_type, -1, -int(instance.is_occupied))